@@ -0,0 +1,72 @@
+"""Approval gate for new Teams, kept in the Team's status conditions.
+
+With APPROVAL_REQUIRED=true the configure pipeline does not render a Team that
+has never been rendered until it carries the approved-by annotation. A Team
+waiting for approval gets an Approved=False condition and the pipeline exits
+straight away, so pending Teams hold no pods. Approving (tools/approve_teams.py,
+or the annotation plus the manual reconciliation label) re-runs the pipeline,
+which then renders the Team and flips the condition to True.
+
+Teams that were rendered before are never gated; holding them back would empty
+their Work and delete their organization.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+APPROVED_BY_ANNOTATION: str = "platform.kratix.io/approved-by"
+APPROVED_CONDITION: str = "Approved"
+
+PENDING: str = "Pending"
+APPROVED: str = "Approved"
+NOT_REQUIRED: str = "NotRequired"
+
+
+def approval_required() -> bool:
+  return os.environ.get("APPROVAL_REQUIRED", "false").lower() == "true"
+
+
+def approval_state(team: Dict[str, Any], required: bool) -> str:
+  """Return Pending, Approved or NotRequired for a Team body"""
+  annotations: Dict[str, str] = team.get("metadata", {}).get("annotations") or {}
+  if annotations.get(APPROVED_BY_ANNOTATION):
+    return APPROVED
+  if not required or (team.get("status") or {}).get("teamId"):
+    return NOT_REQUIRED
+  return PENDING
+
+
+def approved_by(team: Dict[str, Any]) -> Optional[str]:
+  return (team.get("metadata", {}).get("annotations") or {}).get(APPROVED_BY_ANNOTATION)
+
+
+def approval_condition(team: Dict[str, Any], state: str) -> Dict[str, Any]:
+  """Approved condition for *state*, keeping the transition time if unchanged"""
+  status: str = "False" if state == PENDING else "True"
+  messages: Dict[str, str] = {
+    PENDING: "Waiting for approval; run tools/approve_teams.py to approve",
+    APPROVED: f"Approved by {approved_by(team)}",
+    NOT_REQUIRED: "Approval is not required for this team",
+  }
+
+  previous: Optional[Dict[str, Any]] = condition(team)
+  transition: str = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+  if previous and previous.get("status") == status and previous.get("lastTransitionTime"):
+    transition = previous["lastTransitionTime"]
+
+  return {
+    "type": APPROVED_CONDITION,
+    "status": status,
+    "reason": "PendingApproval" if state == PENDING else state,
+    "message": messages[state],
+    "lastTransitionTime": transition,
+  }
+
+
+def condition(team: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+  """The Team's current Approved condition, if it has one"""
+  for entry in (team.get("status") or {}).get("conditions") or []:
+    if entry.get("type") == APPROVED_CONDITION:
+      return entry
+  return None
@@ -0,0 +1,157 @@
+"""Sub-resources of a composite Team.
+
+In composite mode the Team pipeline renders nothing itself. It applies a
+TeamOrg, a TeamCatalogEntry and a TeamRepos resource, each owned by the Team,
+and their Promises render the Terraform, Backstage and repository files.
+Kratix runs the three pipelines in parallel with their own Work and status, so
+a failing catalog render no longer holds back the organization and the other
+way round. Deleting the Team garbage-collects the sub-resources.
+"""
+
+import time
+from datetime import timedelta
+from typing import Dict, Any, List, Optional
+
+import kratix_sdk as ks
+import tracing
+
+GROUP: str = "platform.kratix.io"
+VERSION: str = "v1alpha1"
+TEAM_LABEL: str = "platform.kratix.io/team"
+
+# Sub-resource kind -> plural
+SUB_RESOURCES: Dict[str, str] = {
+  "TeamOrg": "teamorgs",
+  "TeamCatalogEntry": "teamcatalogentries",
+  "TeamRepos": "teamrepos",
+}
+
+# How soon a TeamRepos pipeline runs again when its TeamOrg has not caught up
+ORG_RETRY_AFTER: timedelta = timedelta(seconds=15)
+
+
+def sub_resources(team_resource: ks.Resource, team_id: str, team_name: str, team_email: str, parent_id: Optional[str], members: Optional[List[str]], membership_sync: str, provisioner: str, repos: List[str], template_version: Optional[str] = None) -> List[Dict[str, Any]]:
+  """Return the TeamOrg, TeamCatalogEntry and TeamRepos bodies for a Team
+
+  Sub-resources share the Team's name, so a change of spec.id reaches them as
+  a spec change and each renders its own moved blocks. The template version
+  is passed the same way, so re-rendering the Team re-renders them too.
+  The Team's trace ID goes on as an annotation, so their pipelines and
+  outputs join the Team's trace.
+  """
+  name: str = team_resource.get_name()
+  owner: Dict[str, Any] = {
+    "apiVersion": f"{GROUP}/{VERSION}",
+    "kind": "Team",
+    "name": name,
+    "uid": team_resource.get_value("metadata.uid", default=""),
+    "controller": True,
+  }
+
+  def body(kind: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    if template_version:
+      spec["templateVersion"] = template_version
+    return {
+      "apiVersion": f"{GROUP}/{VERSION}",
+      "kind": kind,
+      "metadata": {
+        "name": name,
+        "namespace": team_resource.get_namespace() or "default",
+        "labels": {TEAM_LABEL: name},
+        "annotations": {tracing.TRACE_ID_ANNOTATION: tracing.trace_id(team_resource)},
+        "ownerReferences": [owner],
+      },
+      "spec": spec,
+    }
+
+  org: Dict[str, Any] = {"id": team_id, "name": team_name, "email": team_email, "membershipSync": membership_sync, "provisioner": provisioner}
+  catalog: Dict[str, Any] = {"id": team_id, "name": team_name, "email": team_email}
+  if members is not None:
+    org["members"] = members
+  if members:
+    catalog["members"] = members
+  if parent_id:
+    catalog["parent"] = parent_id
+
+  return [
+    body("TeamOrg", org),
+    body("TeamCatalogEntry", catalog),
+    body("TeamRepos", {"id": team_id, "name": team_name, "repos": repos}),
+  ]
+
+
+class SubResourceClient:
+  """Apply and read sub-resources through the Kubernetes API"""
+
+  def __init__(self, retries: int = 10) -> None:
+    from kubernetes import client, config
+
+    try:
+      config.load_incluster_config()
+    except config.ConfigException:
+      config.load_kube_config()
+
+    self.retries = retries
+    self.custom = client.CustomObjectsApi()
+
+  def apply(self, body: Dict[str, Any]) -> str:
+    """Create or update *body* and return created, updated or unchanged"""
+    from kubernetes.client.rest import ApiException
+
+    plural: str = SUB_RESOURCES[body["kind"]]
+    namespace: str = body["metadata"]["namespace"]
+    name: str = body["metadata"]["name"]
+
+    for attempt in range(self.retries):
+      try:
+        current: Optional[Dict[str, Any]] = self.custom.get_namespaced_custom_object(GROUP, VERSION, namespace, plural, name)
+      except ApiException as e:
+        if e.status != 404:
+          raise
+        current = None
+
+      try:
+        if current is None:
+          self.custom.create_namespaced_custom_object(GROUP, VERSION, namespace, plural, body)
+          return "created"
+        if current.get("spec") == body["spec"]:
+          return "unchanged"
+
+        # Keep Kratix's labels and finalizers; resourceVersion makes this a compare-and-swap
+        metadata: Dict[str, Any] = dict(current["metadata"])
+        metadata["labels"] = {**metadata.get("labels", {}), **body["metadata"]["labels"]}
+        metadata["annotations"] = {**metadata.get("annotations", {}), **body["metadata"].get("annotations", {})}
+        metadata["ownerReferences"] = body["metadata"]["ownerReferences"]
+        self.custom.replace_namespaced_custom_object(GROUP, VERSION, namespace, plural, name, {**body, "metadata": metadata})
+        return "updated"
+      except ApiException as e:
+        if e.status != 409:
+          raise
+        time.sleep(0.1 * (attempt + 1))
+
+    raise RuntimeError(f"Could not apply {body['kind']}/{name} after {self.retries} attempts")
+
+  def status(self, kind: str, namespace: str, name: str) -> Dict[str, Any]:
+    """Return the status of a sub-resource, or {} if it does not exist"""
+    from kubernetes.client.rest import ApiException
+
+    try:
+      resource: Dict[str, Any] = self.custom.get_namespaced_custom_object(GROUP, VERSION, namespace, SUB_RESOURCES[kind], name)
+    except ApiException as e:
+      if e.status != 404:
+        raise
+      return {}
+    return resource.get("status") or {}
+
+
+def sub_resource_client() -> SubResourceClient:
+  return SubResourceClient()
+
+
+def rendered_org_id(client: Any, namespace: str, name: str) -> Optional[str]:
+  """Return the team id the sibling TeamOrg last rendered, or None
+
+  Repository Terraform references the org resource, so rendering it before
+  the org's Work exists would fail the deploy workflow's plan for everyone.
+  """
+  return client.status("TeamOrg", namespace, name).get("teamId")
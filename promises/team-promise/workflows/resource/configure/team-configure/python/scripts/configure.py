@@ -2,8 +2,43 @@
 
 import yaml
 import os
-from typing import Dict, Any
+import gzip
+import hashlib
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
 import kratix_sdk as ks
+import hierarchy
+import gitea_provisioner
+import composite
+import approval
+import terraform_data
+import tracing
+
+# Terraform templates ship alongside this script in the pipeline image
+SCRIPTS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR: str = os.path.join(SCRIPTS_DIR, "terraform_templates")
+# Modules whose code decides what a Team renders. Helpers that don't change
+# the outputs (tracing, GC, approval, the API provisioner) are left out, so
+# editing them doesn't send every Team through a rollout
+RENDERER_MODULES: List[str] = ["configure.py", "composite.py", "subresources.py", "terraform_data.py"]
+
+# etcd rejects objects over ~1.5MB; keep the Work well clear of that by default
+DEFAULT_WORK_SIZE_BUDGET: int = 1_000_000
+WORK_SIZE_WARN_RATIO: float = 0.8
+
+# How spec.members reaches Gitea: rendered into Terraform, or synced by the
+# deploy workflow as a diff against the previous member list
+MEMBERSHIP_SYNC_MODES: List[str] = ["terraform", "api"]
+
+# Output directory scheduled to the catalog Destination when fan-out is enabled
+CATALOG_DIRECTORY: str = "catalog"
+
+# monolithic renders every output here; composite requests TeamOrg,
+# TeamCatalogEntry and TeamRepos resources whose own pipelines render them
+PIPELINE_MODES: List[str] = ["monolithic", "composite"]
 
 
 def main() -> None:
@@ -11,70 +46,569 @@ def main() -> None:
   sdk = ks.KratixSDK()
   team_resource = sdk.read_resource_input()
 
+  if sdk.is_delete_action():
+    delete(team_resource)
+    return
+
+  tracing.run_traced(team_resource, "configure", lambda: configure_team(sdk, team_resource))
+
+
+def configure_team(sdk: ks.KratixSDK, team_resource: ks.Resource) -> None:
+  """Render a Team's outputs, or request its sub-resources in composite mode"""
   # Extract team properties using get_value
-  team_name: str = team_resource.get_value("metadata.name")
+  team_id, team_display_name, team_email = team_identity(team_resource)
+
+  print(f"Configuring team: {team_display_name} (ID: {team_id}, Email: {team_email})")
+
+  # New teams wait for approval without holding a pipeline pod
+  approval_state: str = approval.approval_state(team_resource.data, approval.approval_required())
+  conditions: List[Dict[str, Any]] = [approval.approval_condition(team_resource.data, approval_state)]
+  print(f'team_approval_pending{{team="{team_id}"}} {int(approval_state == approval.PENDING)}')
+  if approval_state == approval.PENDING:
+    write_pending_status(sdk, team_id, conditions)
+    return
+
+  # Ids this team was previously rendered with, oldest first
+  previous_ids: List[str] = get_previous_ids(team_resource, team_id)
+  claim_team_id(team_resource, team_id, previous_ids)
+
+  parent_id: Optional[str] = team_resource.get_value("spec.parent", default=None)
+  members: Optional[List[str]] = read_members(team_resource)
+  membership_sync: str = read_membership_sync(team_resource)
+  provisioner: str = read_provisioner(team_resource)
+  repos: List[str] = read_repos(team_resource)
+
+  pipeline_mode: str = get_pipeline_mode(team_resource)
+  if pipeline_mode == "composite":
+    request_sub_resources(sdk, team_resource, team_id, previous_ids, composite.sub_resources(
+      team_resource, team_id, team_display_name, team_email, parent_id, members, membership_sync, provisioner, repos, template_version(),
+    ), conditions)
+    return
+
+  # Place the team in the hierarchy index; fails on cycles or excessive depth
+  children: List[str] = update_hierarchy(team_resource, team_id, parent_id)
+
+  # With fan-out enabled, catalog files go to their own Destination
+  selectors: List[ks.DestinationSelector] = destination_selectors()
+  catalog_prefix: str = f"{CATALOG_DIRECTORY}/" if any(s.directory == CATALOG_DIRECTORY for s in selectors) else ""
+
+  # Per-team HCL, or JSON fragments for the kratix repo's teams module
+  terraform_layout, hcl_id = terraform_data.terraform_layout(team_resource)
+  key: str = team_resource.get_name()
+
+  outputs: List[str] = [write_backstage_team(sdk, team_id, team_display_name, team_email, parent_id, children, members, catalog_prefix)]
+  infra_trace: Dict[str, str] = org_trace(team_resource, team_id, team_display_name, team_email, previous_ids, members, membership_sync, provisioner, terraform_layout, key, hcl_id)
+  outputs += render_org(sdk, team_id, team_display_name, team_email, previous_ids, members, membership_sync, provisioner, terraform_layout, key, hcl_id, infra_trace["infraTraceId"])
+  outputs += render_repos(sdk, team_id, team_display_name, repos, previous_ids, terraform_layout, key, hcl_id)
+
+  write_outputs_status(sdk, team_resource, team_id, previous_ids, outputs, selectors, pipeline_mode, conditions, terraform_layout, hcl_id, infra_trace)
+
+
+def team_identity(team_resource: ks.Resource) -> Tuple[str, str, str]:
+  """Return the team's id, display name and email"""
   team_id: str = team_resource.get_value("spec.id")
   team_display_name: str = team_resource.get_value("spec.name")
-  
+
   # Get email with default constructed from team_id
   default_email: str = f"{team_id}@example.com"
   team_email: str = team_resource.get_value("spec.email", default=default_email)
-  
-  print(f"Configuring team: {team_display_name} (ID: {team_id}, Email: {team_email})")
+  return team_id, team_display_name, team_email
+
+
+def read_members(team_resource: ks.Resource) -> Optional[List[str]]:
+  """Gitea usernames for the team's members team; None leaves membership unmanaged"""
+  members: Optional[List[str]] = team_resource.get_value("spec.members", default=None)
+  if members is not None:
+    members = sorted(set(members))
+  return members
+
+
+def read_membership_sync(team_resource: ks.Resource) -> str:
+  membership_sync: str = team_resource.get_value("spec.membershipSync", default="terraform")
+  if membership_sync not in MEMBERSHIP_SYNC_MODES:
+    raise ValueError(f"Unknown membershipSync {membership_sync}, expected one of {MEMBERSHIP_SYNC_MODES}")
+  return membership_sync
+
+
+def read_provisioner(team_resource: ks.Resource) -> str:
+  """terraform leaves the org to the deploy workflow; api also creates it directly"""
+  provisioner: str = team_resource.get_value("spec.provisioner", default=os.environ.get("GITEA_PROVISIONER", "terraform"))
+  if provisioner not in gitea_provisioner.PROVISIONER_MODES:
+    raise ValueError(f"Unknown provisioner {provisioner}, expected one of {gitea_provisioner.PROVISIONER_MODES}")
+  return provisioner
+
+
+def read_repos(team_resource: ks.Resource) -> List[str]:
+  """Default repositories for the team's org, from spec.repos or DEFAULT_TEAM_REPOS"""
+  repos: Optional[List[str]] = team_resource.get_value("spec.repos", default=None)
+  if repos is None:
+    repos = [repo.strip() for repo in os.environ.get("DEFAULT_TEAM_REPOS", "").split(",") if repo.strip()]
+  return sorted(set(repos))
+
 
+def get_pipeline_mode(team_resource: ks.Resource) -> str:
+  """Return whether this team renders its outputs itself or through sub-resources
+
+  The mode is fixed once a team has been rendered: switching would delete the
+  outputs from one Work before another recreates them, and Terraform would
+  destroy the org in between.
+  """
+  recorded: Optional[str] = team_resource.get_value("status.pipelineMode", default=None)
+  if recorded is None and team_resource.get_value("status.teamId", default=None):
+    # Rendered before pipeline modes existed
+    recorded = "monolithic"
+
+  requested: str = team_resource.get_value("spec.pipelineMode", default=recorded or os.environ.get("TEAM_PIPELINE_MODE", "monolithic"))
+  if requested not in PIPELINE_MODES:
+    raise ValueError(f"Unknown pipelineMode {requested}, expected one of {PIPELINE_MODES}")
+  if recorded and requested != recorded:
+    raise ValueError(f"Team is rendered in {recorded} mode and cannot switch to {requested}")
+  return requested
+
+
+def write_backstage_team(sdk: ks.KratixSDK, team_id: str, team_name: str, team_email: str, parent_id: Optional[str], children: List[str], members: Optional[List[str]], prefix: str = "") -> str:
+  """Write the Backstage Group for the team and return its path"""
   # Create Backstage team definition
   backstage_team: Dict[str, Any] = {
     "apiVersion": "backstage.io/v1alpha1",
     "kind": "Group",
     "metadata": {
-      "name": team_id, 
-      "description": f"Team {team_display_name}",
+      "name": team_id,
+      "description": f"Team {team_name}",
       "annotations": {
         "contact.email": team_email
       }
     },
-    "spec": {"type": "team", "displayName": team_display_name, "children": []},
+    "spec": {"type": "team", "displayName": team_name, "children": children},
   }
+  if parent_id:
+    backstage_team["spec"]["parent"] = parent_id
+  if members:
+    backstage_team["spec"]["members"] = members
+
+  # Optionally check the generated document against the Backstage Group schema
+  if validate_outputs_enabled():
+    import schemas
+    schemas.backstage_group_validator().validate(backstage_team)
 
   # Write Backstage team definition to output
+  backstage_path: str = f"{prefix}backstage-team-{team_id}.yaml"
   yaml_content: str = yaml.dump(backstage_team, default_flow_style=False)
-  sdk.write_output(f"backstage-team-{team_id}.yaml", yaml_content.encode("utf-8"))
+  sdk.write_output(backstage_path, yaml_content.encode("utf-8"))
+
+  print(f"Generated Backstage team definition for {team_name}")
+  return backstage_path
+
+
+def render_org(sdk: ks.KratixSDK, team_id: str, team_name: str, team_email: str, previous_ids: List[str], members: Optional[List[str]], membership_sync: str, provisioner: str, layout: str = "hcl", key: str = "", hcl_id: Optional[str] = None, trace_id: Optional[str] = None) -> List[str]:
+  """Write the org's Terraform in *layout*, and its membership file in api sync mode
 
-  print(f"Generated Backstage team definition for {team_display_name}")
+  *trace_id* is written into the org's Terraform, where the deploy workflow
+  finds it for the changed files of each commit. Pass the one org_trace picks,
+  so changes that leave the org alone don't rewrite its file.
+  """
+  outputs: List[str] = []
+  org_id: Optional[int] = None
+  if provisioner == "api":
+    org_id = provision_org(team_id, team_name, team_email, previous_ids)
 
   # Generate Terraform files for organization creation
   try:
-    generate_terraform_files(sdk, team_id, team_display_name, team_email)
-    print(f"Successfully generated Terraform files for {team_display_name}")
+    if layout == "data":
+      outputs += terraform_data.write_team_data(sdk, key, team_id, team_name, team_email, members, membership_sync, org_id, hcl_id, trace_id)
+    else:
+      outputs.append(generate_terraform_files(sdk, team_id, team_name, team_email, previous_ids, members, membership_sync, org_id, trace_id))
+    print(f"Successfully generated Terraform files for {team_name}")
   except Exception as e:
     print(f"ERROR generating Terraform files: {e}")
     import traceback
     traceback.print_exc()
 
+  if members is not None and membership_sync == "api":
+    outputs.append(generate_membership_file(sdk, team_id, members))
+  return outputs
+
+
+def render_repos(sdk: ks.KratixSDK, team_id: str, team_name: str, repos: List[str], previous_ids: List[str], layout: str = "hcl", key: str = "", hcl_id: Optional[str] = None) -> List[str]:
+  """Write the team's default repositories in *layout* and return the paths"""
+  if layout == "data":
+    return terraform_data.write_repos_data(sdk, key, team_id, repos, hcl_id)
+  repos_path: Optional[str] = generate_repos_file(sdk, team_id, team_name, repos, previous_ids)
+  return [repos_path] if repos_path else []
+
+
+def org_trace(team_resource: ks.Resource, *inputs: Any) -> Dict[str, str]:
+  """Trace ID for the org's Terraform, with the fingerprint of the *inputs* it was rendered from
+
+  The trace ID of the change being rendered is new for every spec change, so
+  writing it into the org's Terraform each time would make a catalog-only
+  change commit to the infra repo and start a deploy. The org keeps the trace
+  ID recorded in its status until its rendered inputs change.
+  """
+  fingerprint: str = hashlib.sha256(json.dumps([template_version(), *inputs], sort_keys=True).encode("utf-8")).hexdigest()[:16]
+  recorded: Optional[str] = team_resource.get_value("status.infraTraceId", default=None)
+  if recorded and team_resource.get_value("status.infraFingerprint", default=None) == fingerprint:
+    return {"infraTraceId": recorded, "infraFingerprint": fingerprint}
+  return {"infraTraceId": tracing.trace_id(team_resource), "infraFingerprint": fingerprint}
+
+
+def write_outputs_status(sdk: ks.KratixSDK, team_resource: ks.Resource, team_id: str, previous_ids: List[str], outputs: List[str], selectors: List[ks.DestinationSelector], pipeline_mode: Optional[str] = None, conditions: Optional[List[Dict[str, Any]]] = None, terraform_layout: Optional[str] = None, hcl_id: Optional[str] = None, infra_trace: Optional[Dict[str, str]] = None) -> None:
+  """Schedule the outputs, enforce the Work size budget and record the status"""
+  if selectors:
+    sdk.write_destination_selectors(selectors)
+
+  work_size: int = check_work_size(team_id, projected_work_size(ks.get_output_dir(), outputs))
+
+  write_output_status(sdk, team_resource, team_id, previous_ids, outputs, work_size, pipeline_mode, conditions, terraform_layout, hcl_id, infra_trace)
+
+
+def request_sub_resources(sdk: ks.KratixSDK, team_resource: ks.Resource, team_id: str, previous_ids: List[str], bodies: List[Dict[str, Any]], conditions: Optional[List[Dict[str, Any]]] = None) -> None:
+  """Apply the composite Team's sub-resources and record them in the status
+
+  The Team writes no outputs of its own; its sub-resources' pipelines render
+  them and run in parallel.
+  """
+  client = composite.sub_resource_client()
+  sub_resources: List[str] = []
+  for body in bodies:
+    action: str = client.apply(body)
+    reference: str = f"{body['kind']}/{body['metadata']['name']}"
+    print(f"Requested {reference} ({action})")
+    sub_resources.append(reference)
+
+  status = ks.Status()
+  status.set("teamId", team_id)
+  status.set("previousIds", previous_ids)
+  status.set("pipelineMode", "composite")
+  status.set("templateVersion", template_version())
+  status.set("traceId", tracing.trace_id(team_resource))
+  status.set("subResources", sub_resources)
+  status.set("outputs", [])
+  if conditions:
+    status.set("conditions", conditions)
+  sdk.write_status(status)
+
+
+def write_pending_status(sdk: ks.KratixSDK, team_id: str, conditions: List[Dict[str, Any]]) -> None:
+  """Record that the team waits for approval; nothing is rendered yet"""
+  print(f"Team {team_id} is waiting for approval; no outputs written")
+  status = ks.Status()
+  status.set("conditions", conditions)
+  status.set("outputs", [])
+  sdk.write_status(status)
+
+
+@lru_cache(maxsize=None)
+def template_version() -> str:
+  """Short hash of the templates and renderer modules that shape the rendered outputs
+
+  Every status the pipeline writes carries it as templateVersion, so
+  tools/rollout_teams.py can tell which Teams still need re-rendering after a
+  template or renderer change.
+  """
+  digest = hashlib.sha256()
+  # Named relative to their own directory, so a TEMPLATE_DIR pointed elsewhere still hashes
+  paths: List[Tuple[str, Path]] = [(name, Path(SCRIPTS_DIR, name)) for name in RENDERER_MODULES]
+  paths += [(f"terraform_templates/{p.relative_to(TEMPLATE_DIR).as_posix()}", p) for p in Path(TEMPLATE_DIR).rglob("*") if p.is_file()]
+  for name, path in sorted(paths):
+    digest.update(name.encode("utf-8") + b"\0")
+    digest.update(path.read_bytes() + b"\0")
+  return digest.hexdigest()[:12]
+
+
+def validate_outputs_enabled() -> bool:
+  """Whether generated documents should be schema-validated before writing"""
+  return os.environ.get("VALIDATE_OUTPUTS", "false").lower() == "true"
+
+
+def parse_selector(value: str) -> Dict[str, str]:
+  """Parse a "key=value,key=value" label selector"""
+  labels: Dict[str, str] = {}
+  for pair in filter(None, (part.strip() for part in value.split(","))):
+    key, sep, label = pair.partition("=")
+    if not sep or not key.strip():
+      raise ValueError(f"Invalid destination selector {value!r}, expected key=value[,key=value]")
+    labels[key.strip()] = label.strip()
+  return labels
+
 
-def generate_terraform_files(sdk: ks.KratixSDK, team_id: str, team_name: str, team_email: str) -> None:
+def destination_selectors() -> List[ks.DestinationSelector]:
+  """Destination selectors from CATALOG_/INFRA_DESTINATION_SELECTOR, if set
+
+  Backstage files are written under catalog/ and scheduled to the catalog
+  Destination; everything else goes to the infra Destination. Catalog-only
+  changes then never touch the Terraform repository.
+  """
+  selectors: List[ks.DestinationSelector] = []
+  catalog: Dict[str, str] = parse_selector(os.environ.get("CATALOG_DESTINATION_SELECTOR", ""))
+  infra: Dict[str, str] = parse_selector(os.environ.get("INFRA_DESTINATION_SELECTOR", ""))
+  if catalog:
+    selectors.append(ks.DestinationSelector(directory=CATALOG_DIRECTORY, match_labels=catalog))
+  if infra:
+    selectors.append(ks.DestinationSelector(match_labels=infra))
+  return selectors
+
+
+def get_previous_ids(team_resource: ks.Resource, team_id: str) -> List[str]:
+  """Return the ids this team was rendered with before, oldest first.
+
+  The chain is kept until the team is renamed back to one of its old ids,
+  so a rename is still carried into Terraform even if the pipeline runs
+  again before the deploy workflow has applied it.
+  """
+  previous_ids: List[str] = list(team_resource.get_value("status.previousIds", default=None) or [])
+  last_id: Optional[str] = team_resource.get_value("status.teamId", default=None)
+  if last_id and last_id != team_id:
+    print(f"Team id changed from {last_id} to {team_id}")
+    if last_id not in previous_ids:
+      previous_ids.append(last_id)
+
+  if team_id in previous_ids:
+    # Renamed back to an old id; the org already lives under that address
+    return previous_ids[previous_ids.index(team_id) + 1:]
+  return previous_ids
+
+
+def claim_team_id(team_resource: ks.Resource, team_id: str, previous_ids: List[str]) -> None:
+  """Fail if another team's moved blocks still refer to *team_id*, and record the ids this team retired"""
+  store = hierarchy.index_store(team_resource.get_namespace() or "default")
+  if store is None:
+    return
+
+  name: str = team_resource.get_name()
+
+  def change(index: hierarchy.HierarchyIndex) -> Set[str]:
+    index.claim_id(team_id, name, previous_ids)
+    return set()
+
+  store.update(change)
+
+
+def projected_work_size(output_dir: Path, outputs: List[str]) -> int:
+  """Projected size in bytes of the Work payload Kratix builds from the outputs
+
+  Kratix stores each output gzipped (Go's default level 6) and base64 encoded
+  next to its file path. Only this run's *outputs* are sized: the pipeline pod
+  starts from an empty output directory, but a shared one (as in the
+  benchmarks) holds other teams' files too.
+  """
+  total: int = 0
+  for output in sorted(set(outputs)):
+    compressed: int = len(gzip.compress((output_dir / output).read_bytes(), compresslevel=6))
+    total += 4 * math.ceil(compressed / 3) + len(output)
+  return total
+
+
+def check_work_size(team_id: str, work_size: int) -> int:
+  """Report the projected Work size and enforce WORK_SIZE_BUDGET_BYTES"""
+  budget: int = int(os.environ.get("WORK_SIZE_BUDGET_BYTES", DEFAULT_WORK_SIZE_BUDGET))
+
+  print(f'team_work_size_bytes{{team="{team_id}"}} {work_size}')
+  print(f'team_work_size_budget_bytes{{team="{team_id}"}} {budget}')
+
+  if work_size > budget:
+    raise RuntimeError(f"Projected Work size {work_size} bytes exceeds budget of {budget} bytes")
+  if work_size >= budget * WORK_SIZE_WARN_RATIO:
+    print(f"WARNING: Projected Work size {work_size} bytes is {work_size / budget:.0%} of the {budget} byte budget")
+  return work_size
+
+
+def update_hierarchy(team_resource: ks.Resource, team_id: str, parent_id: Optional[str]) -> List[str]:
+  """Record this team's parent in the hierarchy index and return its children
+
+  Parents whose children changed are requeued so their Backstage Group picks
+  up the new children list.
+  """
+  store = hierarchy.index_store(team_resource.get_namespace() or "default")
+  if store is None:
+    return []
+
+  name: str = team_resource.get_name()
+  last_id: Optional[str] = team_resource.get_value("status.teamId", default=None)
+
+  def change(index: hierarchy.HierarchyIndex) -> Set[str]:
+    affected: Set[str] = set()
+    if last_id and last_id != team_id:
+      affected |= index.remove(last_id)
+    affected |= index.set_parent(team_id, parent_id, name, hierarchy.max_depth())
+    return affected
+
+  index, affected = store.update(change)
+  store.requeue(sorted(index.names[a] for a in affected if a in index.names and a != team_id))
+  return index.children_of(team_id)
+
+
+def provision_org(team_id: str, team_name: str, team_email: str, previous_ids: List[str]) -> Optional[int]:
+  """Create or update the org through the Gitea API and return its id
+
+  Renames are left to Terraform's moved blocks. Errors are not fatal, because
+  the deploy workflow still creates the org from the rendered Terraform.
+  """
+  if previous_ids:
+    print(f"Team {team_id} was renamed; leaving the organization rename to Terraform")
+    return None
+
+  try:
+    provisioner = gitea_provisioner.GiteaOrgProvisioner.from_env()
+    org_id, action = provisioner.reconcile(gitea_provisioner.org_definition(team_id, team_name, team_email))
+  except (gitea_provisioner.GiteaApiError, OSError, ValueError) as e:
+    print(f"WARNING: Gitea API provisioning failed for {team_id}, falling back to Terraform: {e}")
+    return None
+
+  print(f"Provisioned organization {team_id} through the Gitea API ({action}, id {org_id})")
+  return org_id
+
+
+def write_output_status(sdk: ks.KratixSDK, team_resource: ks.Resource, team_id: str, previous_ids: List[str], outputs: List[str], work_size: int, pipeline_mode: Optional[str] = None, conditions: Optional[List[Dict[str, Any]]] = None, terraform_layout: Optional[str] = None, hcl_id: Optional[str] = None, infra_trace: Optional[Dict[str, str]] = None) -> None:
+  """Record the emitted paths, id history and Work size in the resource status"""
+  status = ks.Status()
+  status.set("teamId", team_id)
+  status.set("templateVersion", template_version())
+  status.set("traceId", tracing.trace_id(team_resource))
+  if pipeline_mode:
+    status.set("pipelineMode", pipeline_mode)
+  if terraform_layout:
+    status.set("terraformLayout", terraform_layout)
+  if hcl_id:
+    # Kept so the moved blocks out of the hcl layout stay in place
+    status.set("hclTeamId", hcl_id)
+  if conditions:
+    status.set("conditions", conditions)
+  for name, value in (infra_trace or {}).items():
+    # The trace ID in the org's Terraform, kept until its inputs change
+    status.set(name, value)
+  status.set("outputs", outputs)
+  status.set("previousIds", previous_ids)
+  status.set("workSizeBytes", work_size)
+
+  # Kratix replaces the Work with this run's outputs, so anything emitted last
+  # time but not this time is removed from the state store in the same commit
+  previous_outputs: List[str] = team_resource.get_value("status.outputs", default=None) or []
+  stale_outputs: List[str] = [path for path in previous_outputs if path not in outputs]
+  status.set("removedOutputs", stale_outputs)
+  for path in stale_outputs:
+    print(f"Removing stale output: {path}")
+
+  sdk.write_status(status)
+
+
+def delete(team_resource: ks.Resource) -> None:
+  """Handle the delete workflow for a team resource"""
+  # Kratix deletes the Work (and with it every file in status.outputs) once
+  # this pipeline succeeds; Terraform then destroys the org on the next apply.
+  outputs: List[str] = team_resource.get_value("status.outputs", default=None) or []
+  team_id: str = team_resource.get_value("spec.id", default=team_resource.get_name())
+  print(f"Deleting team: {team_id}")
+  for path in outputs:
+    print(f"Removing output: {path}")
+
+  remove_from_hierarchy(team_resource, team_id)
+
+
+def remove_from_hierarchy(team_resource: ks.Resource, team_id: str) -> None:
+  """Drop the team from the hierarchy index and requeue its parent"""
+  store = hierarchy.index_store(team_resource.get_namespace() or "default")
+  if store is not None:
+    name: str = team_resource.get_name()
+
+    def change(index: hierarchy.HierarchyIndex) -> Set[str]:
+      # The team's Terraform and its moved blocks go with it
+      index.release(name)
+      return index.remove(team_id)
+
+    index, affected = store.update(change)
+    store.requeue(sorted(index.names[a] for a in affected if a in index.names))
+
+
+def generate_terraform_files(sdk: ks.KratixSDK, team_id: str, team_name: str, team_email: str, previous_ids: Optional[List[str]] = None, members: Optional[List[str]] = None, membership_sync: str = "terraform", org_import_id: Optional[int] = None, trace_id: Optional[str] = None) -> str:
   """Generate Terraform files for creating Gitea organization"""
-  
-  # Get the directory of the current script for template location
-  script_dir: str = os.path.dirname(os.path.abspath(__file__))
-  template_dir: str = os.path.join(script_dir, "terraform_templates")
-  
+
   # Read organization Terraform template
-  org_template_path: str = os.path.join(template_dir, "organization.tf.template")
+  org_template_path: str = os.path.join(TEMPLATE_DIR, "organization.tf.template")
   with open(org_template_path, "r") as f:
     org_template: str = f.read()
-  
+
   # Replace template variables with actual values
   org_content: str = org_template.replace("{{team_id}}", team_id).replace("{{team_name}}", team_name).replace("{{team_email}}", team_email)
-  
+  if trace_id:
+    org_content = f"# trace-id: {trace_id}\n" + org_content
+
+  # Adopt an org the API provisioner already created
+  if org_import_id is not None:
+    with open(os.path.join(TEMPLATE_DIR, "import.tf.template"), "r") as f:
+      org_content += f.read().replace("{{to_address}}", f"gitea_org.team_{team_id}").replace("{{org_id}}", str(org_import_id))
+
+  # Members team; in api mode Terraform only creates it and the workflow syncs members
+  resources: List[str] = ["gitea_org.team_{id}"]
+  if members is not None:
+    team_template_name: str = "team-members-api.tf.template" if membership_sync == "api" else "team-members.tf.template"
+    with open(os.path.join(TEMPLATE_DIR, team_template_name), "r") as f:
+      team_template: str = f.read()
+
+    member_lines: str = "".join(f"    {json.dumps(member)},\n" for member in members)
+    org_content += team_template.replace("{{team_id}}", team_id).replace("{{team_name}}", team_name).replace("{{members}}", member_lines)
+    resources.append("gitea_team.team_{id}_members")
+
+  # Chain moved blocks so Terraform renames the org instead of replacing it
+  org_content += moved_blocks(resources, team_id, previous_ids)
+
   # Write team-specific organization Terraform file
   # Note: provider.tf and variables.tf live in the template kratix repo
   # and are NOT written here, so they survive team resource deletion.
-  sdk.write_output(f"terraform/org-{team_id}.tf", org_content.encode("utf-8"))
+  org_path: str = f"terraform/org-{team_id}.tf"
+  sdk.write_output(org_path, org_content.encode("utf-8"))
 
   print(f"Generated Terraform files for organization: {team_id}")
+  return org_path
+
+
+def moved_blocks(resources: List[str], team_id: str, previous_ids: Optional[List[str]]) -> str:
+  """Moved blocks taking each resource address ("{id}" for the team id) through the id chain"""
+  if not previous_ids:
+    return ""
+
+  moved_template_path: str = os.path.join(TEMPLATE_DIR, "moved.tf.template")
+  with open(moved_template_path, "r") as f:
+    moved_template: str = f.read()
+
+  content: str = ""
+  chain: List[str] = previous_ids + [team_id]
+  for resource in resources:
+    for from_id, to_id in zip(chain, chain[1:]):
+      content += moved_template.replace("{{from_address}}", resource.format(id=from_id)).replace("{{to_address}}", resource.format(id=to_id))
+  return content
+
+
+def generate_repos_file(sdk: ks.KratixSDK, team_id: str, team_name: str, repos: List[str], previous_ids: Optional[List[str]] = None) -> Optional[str]:
+  """Write Terraform for the team's default repositories, if it has any"""
+  if not repos:
+    return None
+
+  with open(os.path.join(TEMPLATE_DIR, "repository.tf.template"), "r") as f:
+    repo_template: str = f.read()
+
+  repos_content: str = "\n".join(
+    repo_template.replace("{{team_id}}", team_id).replace("{{team_name}}", team_name).replace("{{repo}}", repo)
+    for repo in repos
+  )
+  repos_content += moved_blocks([f"gitea_repository.team_{{id}}_{repo}" for repo in repos], team_id, previous_ids)
+
+  repos_path: str = f"terraform/repos-{team_id}.tf"
+  sdk.write_output(repos_path, repos_content.encode("utf-8"))
+
+  print(f"Generated Terraform files for {len(repos)} repositories of {team_id}")
+  return repos_path
+
+
+def generate_membership_file(sdk: ks.KratixSDK, team_id: str, members: List[str]) -> str:
+  """Write the desired member list for the deploy workflow's membership sync"""
+  membership: Dict[str, Any] = {"org": team_id, "team": "members", "members": members}
+  members_path: str = f"members/team-{team_id}.json"
+  sdk.write_output(members_path, (json.dumps(membership, indent=2) + "\n").encode("utf-8"))
+
+  print(f"Generated membership file for {team_id} with {len(members)} members")
+  return members_path
 
 
 if __name__ == "__main__":
   main()
-
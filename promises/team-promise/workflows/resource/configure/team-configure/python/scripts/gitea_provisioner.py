@@ -0,0 +1,89 @@
+"""Direct Gitea API provisioner for team organizations.
+
+In api mode the pipeline creates or updates the organization itself instead of
+waiting for Work -> Git -> Gitea Actions -> terraform apply. The org is
+described by the same fields organization.tf.template renders, so Terraform
+still plans the org (importing it by id) and reports any drift.
+
+The provisioner is enabled with GITEA_PROVISIONER=api (or spec.provisioner)
+and needs GITEA_API_URL and GITEA_TOKEN.
+"""
+
+import json
+import os
+import ssl
+import urllib.error
+import urllib.request
+from typing import Dict, Any, Optional, Tuple
+
+PROVISIONER_MODES = ["terraform", "api"]
+ORG_FIELDS = ["full_name", "description", "website", "location", "visibility"]
+
+
+class GiteaApiError(Exception):
+  def __init__(self, status: int, message: str) -> None:
+    super().__init__(f"HTTP {status}: {message}")
+    self.status = status
+
+
+def org_definition(team_id: str, team_name: str, team_email: str) -> Dict[str, str]:
+  """Fields of the team's organization, as rendered by organization.tf.template"""
+  return {
+    "name": team_id,
+    "full_name": team_name,
+    "description": f"Organization for team {team_name} ({team_email})",
+    "website": "",
+    "location": "",
+    "visibility": "public",
+  }
+
+
+class GiteaOrgProvisioner:
+  """Idempotently create or update Gitea organizations through the API"""
+
+  def __init__(self, base_url: str, token: str, verify_tls: bool = True, timeout: float = 10.0) -> None:
+    self.base_url = base_url.rstrip("/")
+    self.token = token
+    self.timeout = timeout
+    self.context: Optional[ssl.SSLContext] = None if verify_tls else ssl._create_unverified_context()
+
+  @classmethod
+  def from_env(cls) -> "GiteaOrgProvisioner":
+    token: Optional[str] = os.environ.get("GITEA_TOKEN")
+    if not token:
+      raise ValueError("GITEA_TOKEN must be set for the api provisioner")
+    return cls(
+      os.environ.get("GITEA_API_URL", "http://localhost:8080"),
+      token,
+      verify_tls=os.environ.get("GITEA_INSECURE_SKIP_VERIFY", "false").lower() != "true",
+    )
+
+  def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+    data: Optional[bytes] = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(f"{self.base_url}/api/v1{path}", data=data, method=method, headers={
+      "Authorization": f"token {self.token}",
+      "Accept": "application/json",
+      "Content-Type": "application/json",
+    })
+    try:
+      with urllib.request.urlopen(request, timeout=self.timeout, context=self.context) as response:
+        content: bytes = response.read()
+    except urllib.error.HTTPError as e:
+      raise GiteaApiError(e.code, e.read().decode("utf-8", "replace")) from e
+    return json.loads(content) if content else None
+
+  def reconcile(self, org: Dict[str, str]) -> Tuple[int, str]:
+    """Make the organization match *org*; return its id and created/updated/unchanged"""
+    try:
+      current: Dict[str, Any] = self.request("GET", f"/orgs/{org['name']}")
+    except GiteaApiError as e:
+      if e.status != 404:
+        raise
+      created: Dict[str, Any] = self.request("POST", "/orgs", {"username": org["name"], **{f: org[f] for f in ORG_FIELDS}})
+      return created["id"], "created"
+
+    changes: Dict[str, str] = {f: org[f] for f in ORG_FIELDS if current.get(f, "") != org[f]}
+    if not changes:
+      return current["id"], "unchanged"
+    self.request("PATCH", f"/orgs/{org['name']}", changes)
+    return current["id"], "updated"
@@ -0,0 +1,262 @@
+"""Team hierarchy index used to render Backstage parent/children.
+
+The index keeps parent and children maps keyed by team id, so one team being
+added, moved or deleted is an O(1) update plus a walk of its ancestors (cycle
+and depth checks) and of its own subtree (depth check when moving). Nothing
+rescans the Team resources.
+
+The index is persisted in a ConfigMap when HIERARCHY_INDEX_CONFIGMAP is set
+(the pipeline in a cluster), or in a JSON file when HIERARCHY_INDEX_PATH is set
+(local runs and tests). Writes use optimistic concurrency so concurrent
+pipelines don't lose each other's updates.
+
+It also records the ids a renamed team retired. Its Terraform keeps moved
+blocks from those ids, and Terraform rejects the whole plan if another team
+declares an org under one of them, so such a team is refused here instead.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Any, List, Optional, Set, Callable, Tuple
+
+DEFAULT_MAX_DEPTH: int = 10
+INDEX_KEY: str = "index.json"
+MANUAL_RECONCILIATION_LABEL: str = "kratix.io/manual-reconciliation"
+
+# A composite Team renders its Backstage Group from a TeamCatalogEntry of the
+# same name, so that is what gets requeued when it exists
+REQUEUE_PLURALS: List[str] = ["teamcatalogentries", "teams"]
+
+
+class HierarchyError(ValueError):
+  """Raised when a parent change would create a cycle or exceed the depth limit"""
+
+
+class RetiredIdError(ValueError):
+  """Raised when a team takes an id another team's moved blocks still refer to"""
+
+
+class HierarchyIndex:
+  """Parent/children index over team ids"""
+
+  def __init__(self, parents: Optional[Dict[str, str]] = None, names: Optional[Dict[str, str]] = None, retired: Optional[Dict[str, str]] = None) -> None:
+    self.parents: Dict[str, str] = dict(parents or {})
+    self.names: Dict[str, str] = dict(names or {})
+    # Retired team id -> resource name of the team that was renamed away from it
+    self.retired: Dict[str, str] = dict(retired or {})
+    self.children: Dict[str, Set[str]] = {}
+    for child, parent in self.parents.items():
+      self.children.setdefault(parent, set()).add(child)
+
+  @classmethod
+  def from_dict(cls, data: Dict[str, Any]) -> "HierarchyIndex":
+    return cls(data.get("parents"), data.get("names"), data.get("retired"))
+
+  def to_dict(self) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"parents": dict(sorted(self.parents.items())), "names": dict(sorted(self.names.items()))}
+    if self.retired:
+      data["retired"] = dict(sorted(self.retired.items()))
+    return data
+
+  def children_of(self, team_id: str) -> List[str]:
+    return sorted(self.children.get(team_id, ()))
+
+  def depth(self, team_id: str) -> int:
+    """Number of ancestors above *team_id*"""
+    depth: int = 0
+    current: Optional[str] = self.parents.get(team_id)
+    while current is not None:
+      depth += 1
+      current = self.parents.get(current)
+    return depth
+
+  def height(self, team_id: str) -> int:
+    """Number of levels below *team_id* (0 for a leaf)"""
+    height: int = 0
+    level: Set[str] = self.children.get(team_id, set())
+    while level:
+      height += 1
+      level = {grandchild for child in level for grandchild in self.children.get(child, ())}
+    return height
+
+  def check_parent(self, team_id: str, parent_id: Optional[str], max_depth: int = DEFAULT_MAX_DEPTH) -> None:
+    """Raise HierarchyError if making *parent_id* the parent of *team_id* is invalid"""
+    if parent_id is None:
+      return
+    if parent_id == team_id:
+      raise HierarchyError(f"Team {team_id} cannot be its own parent")
+
+    # Walk up from the new parent; meeting team_id means a cycle
+    depth: int = 1
+    current: Optional[str] = parent_id
+    while current is not None:
+      if current == team_id:
+        raise HierarchyError(f"Setting parent of {team_id} to {parent_id} would create a cycle")
+      current = self.parents.get(current)
+      if current is not None:
+        depth += 1
+
+    total: int = depth + self.height(team_id)
+    if total > max_depth:
+      raise HierarchyError(f"Setting parent of {team_id} to {parent_id} gives depth {total}, above the limit of {max_depth}")
+
+  def set_parent(self, team_id: str, parent_id: Optional[str], name: str, max_depth: int = DEFAULT_MAX_DEPTH) -> Set[str]:
+    """Record *team_id* under *parent_id* and return the team ids whose children changed"""
+    self.check_parent(team_id, parent_id, max_depth)
+    self.names[team_id] = name
+
+    old_parent: Optional[str] = self.parents.get(team_id)
+    if old_parent == parent_id:
+      return set()
+
+    affected: Set[str] = set()
+    if old_parent is not None:
+      affected |= self.remove(team_id)
+      self.names[team_id] = name
+    if parent_id is not None:
+      self.parents[team_id] = parent_id
+      self.children.setdefault(parent_id, set()).add(team_id)
+      affected.add(parent_id)
+    return affected
+
+  def claim_id(self, team_id: str, name: str, previous_ids: List[str]) -> None:
+    """Record the ids team *name* retired, raising RetiredIdError if *team_id* is another team's"""
+    owner: Optional[str] = self.retired.get(team_id)
+    if owner is not None and owner != name:
+      raise RetiredIdError(
+        f"Team id {team_id} was retired by Team {owner}, whose Terraform still moves its organization away from "
+        f"{team_id}; choose another id, or delete Team {owner} first"
+      )
+    self.release(name)
+    for retired_id in previous_ids:
+      self.retired[retired_id] = name
+
+  def release(self, name: str) -> None:
+    """Forget the ids team *name* retired"""
+    self.retired = {retired_id: owner for retired_id, owner in self.retired.items() if owner != name}
+
+  def remove(self, team_id: str) -> Set[str]:
+    """Drop *team_id* from the index and return the team ids whose children changed
+
+    Children of a removed team keep pointing at it, so they reattach if the
+    team is recreated.
+    """
+    self.names.pop(team_id, None)
+    old_parent: Optional[str] = self.parents.pop(team_id, None)
+    if old_parent is None:
+      return set()
+    self.children[old_parent].discard(team_id)
+    if not self.children[old_parent]:
+      del self.children[old_parent]
+    return {old_parent}
+
+
+class FileIndexStore:
+  """Persist the index as JSON in a local file"""
+
+  def __init__(self, path: str) -> None:
+    self.path = path
+
+  def update(self, change: Callable[[HierarchyIndex], Set[str]]) -> Tuple[HierarchyIndex, Set[str]]:
+    data: Dict[str, Any] = {}
+    if os.path.exists(self.path):
+      with open(self.path, "r") as f:
+        data = json.load(f)
+    index = HierarchyIndex.from_dict(data)
+    affected = change(index)
+    with open(self.path, "w") as f:
+      json.dump(index.to_dict(), f, indent=2)
+    return index, affected
+
+  def requeue(self, names: List[str]) -> None:
+    for name in names:
+      print(f"Parent team {name} needs reconciling to refresh its children")
+
+
+class ConfigMapIndexStore:
+  """Persist the index in a ConfigMap, retrying on write conflicts"""
+
+  def __init__(self, name: str, namespace: str, retries: int = 10) -> None:
+    from kubernetes import client, config
+
+    try:
+      config.load_incluster_config()
+    except config.ConfigException:
+      config.load_kube_config()
+
+    self.name = name
+    self.namespace = namespace
+    self.retries = retries
+    self.core = client.CoreV1Api()
+    self.custom = client.CustomObjectsApi()
+
+  def update(self, change: Callable[[HierarchyIndex], Set[str]]) -> Tuple[HierarchyIndex, Set[str]]:
+    from kubernetes import client
+    from kubernetes.client.rest import ApiException
+
+    for attempt in range(self.retries):
+      try:
+        cm = self.core.read_namespaced_config_map(self.name, self.namespace)
+      except ApiException as e:
+        if e.status != 404:
+          raise
+        cm = None
+
+      data: Dict[str, Any] = json.loads((cm.data or {}).get(INDEX_KEY, "{}")) if cm else {}
+      index = HierarchyIndex.from_dict(data)
+      affected = change(index)
+      body: Dict[str, str] = {INDEX_KEY: json.dumps(index.to_dict(), separators=(",", ":"))}
+
+      try:
+        if cm is None:
+          self.core.create_namespaced_config_map(self.namespace, client.V1ConfigMap(
+            metadata=client.V1ObjectMeta(name=self.name), data=body,
+          ))
+        else:
+          # resourceVersion makes this a compare-and-swap
+          cm.data = body
+          self.core.replace_namespaced_config_map(self.name, self.namespace, cm)
+        return index, affected
+      except ApiException as e:
+        if e.status not in (409, 422):
+          raise
+        time.sleep(0.1 * (attempt + 1))
+
+    raise RuntimeError(f"Could not update ConfigMap {self.name} after {self.retries} attempts")
+
+  def requeue(self, names: List[str]) -> None:
+    """Ask Kratix to re-run the pipeline rendering the given teams' Backstage Groups"""
+    from kubernetes.client.rest import ApiException
+
+    for name in names:
+      for plural in REQUEUE_PLURALS:
+        try:
+          self.custom.patch_namespaced_custom_object(
+            group="platform.kratix.io",
+            version="v1alpha1",
+            namespace=self.namespace,
+            plural=plural,
+            name=name,
+            body={"metadata": {"labels": {MANUAL_RECONCILIATION_LABEL: "true"}}},
+          )
+          print(f"Requested reconciliation of parent team {name}")
+          break
+        except ApiException as e:
+          if e.status != 404:
+            raise
+
+
+def index_store(namespace: str) -> Optional[Any]:
+  """Return the configured index store, or None if no index is configured"""
+  configmap: Optional[str] = os.environ.get("HIERARCHY_INDEX_CONFIGMAP")
+  if configmap:
+    return ConfigMapIndexStore(configmap, namespace)
+  path: Optional[str] = os.environ.get("HIERARCHY_INDEX_PATH")
+  if path:
+    return FileIndexStore(path)
+  return None
+
+
+def max_depth() -> int:
+  return int(os.environ.get("HIERARCHY_MAX_DEPTH", DEFAULT_MAX_DEPTH))
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Retention for the Team Promises' finished pipeline Jobs and pods.
+
+Every reconcile of a Team (and of its composite sub-resources) leaves a
+finished Job and pod behind. At fleet scale they slow every list call the
+controller and the tools make. This runs as the team-pipeline-gc CronJob
+(manifests/pipeline-gc.yaml) and enforces, per resource and pipeline:
+
+  - the newest KEEP_SUCCEEDED_RUNS succeeded Jobs are kept
+  - failed Jobs are kept for FAILED_TTL_HOURS after they finished
+  - Jobs that are still running are never touched
+
+Jobs are deleted in batches of DELETE_BATCH_SIZE with background propagation,
+so their pods go with them. Pipeline pods whose Job no longer exists are
+deleted too. The reclaimed counts and the pod/Job list latency before and
+after cleanup are printed as Prometheus metrics.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+PROMISE_LABEL: str = "kratix.io/promise-name"
+RESOURCE_LABEL: str = "kratix.io/resource-name"
+PIPELINE_LABEL: str = "kratix.io/pipeline-name"
+
+TEAM_PROMISES: List[str] = ["team", "team-org", "team-catalog", "team-repos"]
+
+
+def job_state(job: Dict[str, Any]) -> Tuple[str, Optional[datetime]]:
+  """Return succeeded, failed or running, and when the Job finished"""
+  for condition in (job.get("status") or {}).get("conditions") or []:
+    if condition.get("status") == "True" and condition.get("type") in ("Complete", "Failed"):
+      finished: Optional[datetime] = parse_time(condition.get("lastTransitionTime"))
+      return ("succeeded" if condition["type"] == "Complete" else "failed"), finished
+  return "running", None
+
+
+def plan_deletions(jobs: List[Dict[str, Any]], keep_succeeded: int, failed_ttl: timedelta, now: datetime) -> List[Tuple[Dict[str, Any], str]]:
+  """Jobs to delete under the retention policy, each with its reason (retention or ttl)"""
+  runs: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+  for job in jobs:
+    labels: Dict[str, str] = job["metadata"].get("labels") or {}
+    key = (labels.get(PROMISE_LABEL, ""), labels.get(RESOURCE_LABEL, ""), labels.get(PIPELINE_LABEL, ""))
+    runs.setdefault(key, []).append(job)
+
+  deletions: List[Tuple[Dict[str, Any], str]] = []
+  for group in runs.values():
+    group.sort(key=lambda job: job["metadata"].get("creationTimestamp") or "", reverse=True)
+    succeeded: int = 0
+    for job in group:
+      state, finished = job_state(job)
+      if state == "succeeded":
+        succeeded += 1
+        if succeeded > keep_succeeded:
+          deletions.append((job, "retention"))
+      elif state == "failed" and finished is not None and now - finished > failed_ttl:
+        deletions.append((job, "ttl"))
+  return deletions
+
+
+def orphan_pods(pods: List[Dict[str, Any]], job_names: List[str]) -> List[Dict[str, Any]]:
+  """Finished pipeline pods whose owning Job is gone"""
+  existing = set(job_names)
+  orphans: List[Dict[str, Any]] = []
+  for pod in pods:
+    if (pod.get("status") or {}).get("phase") not in ("Succeeded", "Failed"):
+      continue
+    owners: List[str] = [ref["name"] for ref in pod["metadata"].get("ownerReferences") or [] if ref.get("kind") == "Job"]
+    if not owners or not any(owner in existing for owner in owners):
+      orphans.append(pod)
+  return orphans
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+  return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+class PipelineGC:
+  """Lists and deletes the Team Promises' pipeline Jobs and pods in one namespace"""
+
+  def __init__(self, namespace: str, promises: List[str] = TEAM_PROMISES) -> None:
+    from kubernetes import client, config
+
+    try:
+      config.load_incluster_config()
+    except config.ConfigException:
+      config.load_kube_config()
+    self.batch = client.BatchV1Api()
+    self.core = client.CoreV1Api()
+    self.serialize = client.ApiClient().sanitize_for_serialization
+    self.namespace = namespace
+    self.selector: str = f"{PROMISE_LABEL} in ({','.join(promises)})"
+
+  def list_jobs(self) -> List[Dict[str, Any]]:
+    return self.serialize(self.batch.list_namespaced_job(self.namespace, label_selector=self.selector)).get("items") or []
+
+  def list_pods(self) -> List[Dict[str, Any]]:
+    return self.serialize(self.core.list_namespaced_pod(self.namespace, label_selector=self.selector)).get("items") or []
+
+  def timed_list(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], float]:
+    """List Jobs and pods, returning both and the seconds it took"""
+    start: float = time.perf_counter()
+    jobs, pods = self.list_jobs(), self.list_pods()
+    return jobs, pods, time.perf_counter() - start
+
+  def delete_job(self, name: str) -> None:
+    self.batch.delete_namespaced_job(name, self.namespace, propagation_policy="Background")
+
+  def delete_pod(self, name: str) -> None:
+    self.core.delete_namespaced_pod(name, self.namespace)
+
+
+def delete_in_batches(delete: Any, names: List[str], batch_size: int, interval: float, workers: int = 4) -> Tuple[int, List[str]]:
+  """Delete *names* in batches, pausing between them; return the count deleted and the errors"""
+  deleted: int = 0
+  errors: List[str] = []
+
+  def attempt(name: str) -> Optional[str]:
+    try:
+      delete(name)
+      return None
+    except Exception as e:
+      # Already gone counts as reclaimed
+      return None if getattr(e, "status", None) == 404 else f"{name}: {e}"
+
+  for start in range(0, len(names), max(1, batch_size)):
+    batch: List[str] = names[start:start + max(1, batch_size)]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+      failures: List[str] = [error for error in pool.map(attempt, batch) if error]
+    deleted += len(batch) - len(failures)
+    errors += failures
+    if start + len(batch) < len(names):
+      time.sleep(interval)
+  return deleted, errors
+
+
+def metrics_text(reclaimed: Dict[Tuple[str, str], int], before: float, after: float, remaining: int) -> str:
+  lines: List[str] = [
+    "# HELP team_pipeline_gc_reclaimed Pipeline objects deleted by this run",
+    "# TYPE team_pipeline_gc_reclaimed gauge",
+  ]
+  lines += [f'team_pipeline_gc_reclaimed{{kind="{kind}",reason="{reason}"}} {count}' for (kind, reason), count in sorted(reclaimed.items())]
+  lines += [
+    "# HELP team_pipeline_gc_list_seconds Time to list the pipeline Jobs and pods",
+    "# TYPE team_pipeline_gc_list_seconds gauge",
+    f'team_pipeline_gc_list_seconds{{phase="before"}} {before:.4f}',
+    f'team_pipeline_gc_list_seconds{{phase="after"}} {after:.4f}',
+    "# HELP team_pipeline_gc_jobs Pipeline Jobs left after this run",
+    "# TYPE team_pipeline_gc_jobs gauge",
+    f"team_pipeline_gc_jobs {remaining}",
+  ]
+  return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--namespace", default=os.environ.get("PIPELINE_NAMESPACE", "default"))
+  parser.add_argument("--keep-succeeded", type=int, default=int(os.environ.get("KEEP_SUCCEEDED_RUNS", "3")))
+  parser.add_argument("--failed-ttl-hours", type=float, default=float(os.environ.get("FAILED_TTL_HOURS", "72")))
+  parser.add_argument("--batch-size", type=int, default=int(os.environ.get("DELETE_BATCH_SIZE", "50")))
+  parser.add_argument("--batch-interval", type=float, default=float(os.environ.get("DELETE_BATCH_INTERVAL_SECONDS", "1")))
+  parser.add_argument("--settle-seconds", type=float, default=10, help="Wait before measuring the list latency again")
+  parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted")
+  args = parser.parse_args(argv)
+
+  gc = PipelineGC(args.namespace)
+  jobs, pods, before = gc.timed_list()
+  deletions = plan_deletions(jobs, args.keep_succeeded, timedelta(hours=args.failed_ttl_hours), datetime.now(timezone.utc))
+  orphans = orphan_pods(pods, [job["metadata"]["name"] for job in jobs])
+  print(f"Found {len(jobs)} pipeline Jobs and {len(pods)} pods; {len(deletions)} Jobs and {len(orphans)} orphaned pods to delete")
+
+  if args.dry_run:
+    for job, reason in deletions:
+      print(f"Would delete Job {job['metadata']['name']} ({reason})")
+    for pod in orphans:
+      print(f"Would delete pod {pod['metadata']['name']} (orphaned)")
+    return 0
+
+  reclaimed: Dict[Tuple[str, str], int] = {}
+  errors: List[str] = []
+  for reason in ("retention", "ttl"):
+    names: List[str] = [job["metadata"]["name"] for job, r in deletions if r == reason]
+    reclaimed[("job", reason)], failed = delete_in_batches(gc.delete_job, names, args.batch_size, args.batch_interval)
+    errors += failed
+  reclaimed[("pod", "orphaned")], failed = delete_in_batches(gc.delete_pod, [pod["metadata"]["name"] for pod in orphans], args.batch_size, args.batch_interval)
+  errors += failed
+
+  # Pods are deleted in the background after their Job
+  if any(reclaimed.values()):
+    time.sleep(args.settle_seconds)
+  jobs, _, after = gc.timed_list()
+
+  for error in errors:
+    print(f"ERROR deleting {error}")
+  print(metrics_text(reclaimed, before, after, len(jobs)), end="")
+  return 1 if errors else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
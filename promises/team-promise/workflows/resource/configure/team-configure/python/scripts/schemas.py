@@ -0,0 +1,132 @@
+"""Compiled JSON schema validators shared by the pipeline and the tests.
+
+Validators are built once per process (format checker included) and cached,
+so validating every generated document costs a tree walk rather than a
+schema compile.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any
+
+import yaml
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+
+
+def _find_promise() -> Path:
+  """Locate promise.yaml by walking up from this script.
+
+  promise.yaml is not shipped in the pipeline image, so the Team validator is
+  only available from a repository checkout (or via TEAM_PROMISE_PATH).
+  """
+  for parent in Path(__file__).resolve().parents:
+    if (parent / "promise.yaml").exists():
+      return parent / "promise.yaml"
+  return Path("promise.yaml")
+
+
+PROMISE_PATH: Path = Path(os.environ["TEAM_PROMISE_PATH"]) if "TEAM_PROMISE_PATH" in os.environ else _find_promise()
+
+# Backstage Group schema based on official spec
+BACKSTAGE_GROUP_SCHEMA: Dict[str, Any] = {
+  "type": "object",
+  "required": ["apiVersion", "kind", "metadata", "spec"],
+  "properties": {
+    "apiVersion": {
+      "type": "string",
+      "enum": ["backstage.io/v1alpha1"]
+    },
+    "kind": {
+      "type": "string",
+      "enum": ["Group"]
+    },
+    "metadata": {
+      "type": "object",
+      "required": ["name"],
+      "properties": {
+        "name": {
+          "type": "string",
+          "pattern": "^[a-zA-Z0-9_-]+$"
+        },
+        "description": {
+          "type": "string"
+        },
+        "annotations": {
+          "type": "object"
+        },
+        "labels": {
+          "type": "object"
+        }
+      }
+    },
+    "spec": {
+      "type": "object",
+      "required": ["type"],
+      "properties": {
+        "type": {
+          "type": "string",
+          "enum": ["team", "business-unit", "product-area", "department"]
+        },
+        "displayName": {
+          "type": "string"
+        },
+        "description": {
+          "type": "string"
+        },
+        "parent": {
+          "type": "string"
+        },
+        "children": {
+          "type": "array",
+          "items": {
+            "type": "string"
+          }
+        },
+        "members": {
+          "type": "array",
+          "items": {
+            "type": "string"
+          }
+        }
+      }
+    }
+  }
+}
+
+
+def compile_validator(schema: Dict[str, Any]) -> Validator:
+  """Check *schema* and return a validator for it with format checking enabled"""
+  cls = validator_for(schema)
+  cls.check_schema(schema)
+  return cls(schema, format_checker=cls.FORMAT_CHECKER)
+
+
+@lru_cache(maxsize=None)
+def load_promise(promise_path: Path = PROMISE_PATH) -> Dict[str, Any]:
+  """Load and cache the Team Promise definition"""
+  with open(promise_path, "r") as f:
+    return yaml.safe_load(f)
+
+
+def team_crd(promise_path: Path = PROMISE_PATH) -> Dict[str, Any]:
+  """Return the Team CRD embedded in the Promise"""
+  return load_promise(promise_path)["spec"]["api"]
+
+
+def team_schema(promise_path: Path = PROMISE_PATH) -> Dict[str, Any]:
+  """Return the Team CRD openAPIV3Schema"""
+  return team_crd(promise_path)["spec"]["versions"][0]["schema"]["openAPIV3Schema"]
+
+
+@lru_cache(maxsize=None)
+def team_validator(promise_path: Path = PROMISE_PATH) -> Validator:
+  """Return the cached validator for Team resources"""
+  return compile_validator(team_schema(promise_path))
+
+
+@lru_cache(maxsize=None)
+def backstage_group_validator() -> Validator:
+  """Return the cached validator for generated Backstage Group entities"""
+  return compile_validator(BACKSTAGE_GROUP_SCHEMA)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Pipeline for the composite Team's TeamOrg, TeamCatalogEntry and TeamRepos.
+
+The three Promises share the team-configure image and this entrypoint picks
+the renderer from the resource kind. Each writes the same files the
+monolithic Team pipeline does, so a team's state store contents don't depend
+on the pipeline mode.
+"""
+
+from typing import Dict, List, Optional, Callable
+
+import kratix_sdk as ks
+import configure
+import composite
+import terraform_data
+import tracing
+
+
+def main() -> None:
+  sdk = ks.KratixSDK()
+  resource = sdk.read_resource_input()
+
+  kind: str = resource.get_group_version_kind().kind
+  if kind not in HANDLERS:
+    raise ValueError(f"Unsupported resource kind {kind}, expected one of {sorted(HANDLERS)}")
+
+  if sdk.is_delete_action():
+    team_id: str = resource.get_value("spec.id", default=resource.get_name())
+    print(f"Deleting {kind} for team: {team_id}")
+    for path in resource.get_value("status.outputs", default=None) or []:
+      print(f"Removing output: {path}")
+    if kind == "TeamCatalogEntry":
+      configure.remove_from_hierarchy(resource, team_id)
+    return
+
+  tracing.run_traced(resource, "configure", lambda: HANDLERS[kind](sdk, resource))
+
+
+def infra_selectors() -> List[ks.DestinationSelector]:
+  return [s for s in configure.destination_selectors() if s.directory != configure.CATALOG_DIRECTORY]
+
+
+def configure_org(sdk: ks.KratixSDK, resource: ks.Resource) -> None:
+  """Render the org's Terraform and membership file"""
+  team_id, team_name, team_email = configure.team_identity(resource)
+  print(f"Configuring organization: {team_name} (ID: {team_id})")
+
+  previous_ids: List[str] = configure.get_previous_ids(resource, team_id)
+  terraform_layout, hcl_id = terraform_data.terraform_layout(resource)
+  members: Optional[List[str]] = configure.read_members(resource)
+  membership_sync: str = configure.read_membership_sync(resource)
+  provisioner: str = configure.read_provisioner(resource)
+  infra_trace: Dict[str, str] = configure.org_trace(resource, team_id, team_name, team_email, previous_ids, members, membership_sync, provisioner, terraform_layout, resource.get_name(), hcl_id)
+  outputs: List[str] = configure.render_org(
+    sdk, team_id, team_name, team_email, previous_ids, members, membership_sync, provisioner,
+    terraform_layout, resource.get_name(), hcl_id, infra_trace["infraTraceId"],
+  )
+  configure.write_outputs_status(sdk, resource, team_id, previous_ids, outputs, infra_selectors(), terraform_layout=terraform_layout, hcl_id=hcl_id, infra_trace=infra_trace)
+
+
+def configure_catalog_entry(sdk: ks.KratixSDK, resource: ks.Resource) -> None:
+  """Render the Backstage Group and keep the hierarchy index up to date"""
+  team_id, team_name, team_email = configure.team_identity(resource)
+  print(f"Configuring catalog entry: {team_name} (ID: {team_id})")
+
+  previous_ids: List[str] = configure.get_previous_ids(resource, team_id)
+  parent_id: Optional[str] = resource.get_value("spec.parent", default=None)
+  children: List[str] = configure.update_hierarchy(resource, team_id, parent_id)
+
+  selectors: List[ks.DestinationSelector] = [s for s in configure.destination_selectors() if s.directory == configure.CATALOG_DIRECTORY]
+  prefix: str = f"{configure.CATALOG_DIRECTORY}/" if selectors else ""
+  outputs: List[str] = [configure.write_backstage_team(sdk, team_id, team_name, team_email, parent_id, children, configure.read_members(resource), prefix)]
+  configure.write_outputs_status(sdk, resource, team_id, previous_ids, outputs, selectors)
+
+
+def configure_repos(sdk: ks.KratixSDK, resource: ks.Resource) -> None:
+  """Render the default repositories once the org has been rendered
+
+  The TeamOrg is checked once. If it has not rendered this team id yet, the
+  pipeline asks Kratix to run again after ORG_RETRY_AFTER instead of holding
+  its pod. Meanwhile a renamed team keeps rendering under the id its org still
+  has, so its repositories never drop out of the Work.
+  """
+  team_id: str = resource.get_value("spec.id")
+  team_name: str = resource.get_value("spec.name")
+  repos: List[str] = sorted(set(resource.get_value("spec.repos", default=None) or []))
+  print(f"Configuring {len(repos)} repositories for team: {team_name} (ID: {team_id})")
+
+  if repos:
+    org_id: Optional[str] = composite.rendered_org_id(composite.sub_resource_client(), resource.get_namespace() or "default", resource.get_name())
+    if org_id != team_id:
+      print(f"Organization {team_id} is not rendered yet; retrying in {composite.ORG_RETRY_AFTER.total_seconds():.0f}s")
+      sdk.write_retry_after(composite.ORG_RETRY_AFTER, f"Waiting for organization {team_id}")
+      last_id: Optional[str] = resource.get_value("status.teamId", default=None)
+      if not last_id or org_id != last_id:
+        write_waiting_status(sdk)
+        return
+      team_id = last_id
+
+  previous_ids: List[str] = configure.get_previous_ids(resource, team_id)
+  terraform_layout, hcl_id = terraform_data.terraform_layout(resource)
+  outputs: List[str] = configure.render_repos(sdk, team_id, team_name, repos, previous_ids, terraform_layout, resource.get_name(), hcl_id)
+  configure.write_outputs_status(sdk, resource, team_id, previous_ids, outputs, infra_selectors(), terraform_layout=terraform_layout, hcl_id=hcl_id)
+
+
+def write_waiting_status(sdk: ks.KratixSDK) -> None:
+  """Record that nothing is rendered until the org exists"""
+  status = ks.Status()
+  status.set("outputs", [])
+  sdk.write_status(status)
+
+
+HANDLERS: Dict[str, Callable[[ks.KratixSDK, ks.Resource], None]] = {
+  "TeamOrg": configure_org,
+  "TeamCatalogEntry": configure_catalog_entry,
+  "TeamRepos": configure_repos,
+}
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,128 @@
+"""Data layout for the teams' Terraform.
+
+With TERRAFORM_LAYOUT=data the pipeline writes no HCL resources per team.
+Each team becomes a JSON file under terraform/teams/ (org and members) and,
+with default repositories, terraform/team-repos/. Both are serialized with
+json.dumps, so names and emails need no escaping. terraform/teams.tf in the
+kratix repo reads the files, and the teams module creates every org, members
+team and repository with one for_each each.
+
+Teams are keyed by their resource name rather than spec.id. A rename then
+only changes the org's name attribute and needs no moved blocks. A team
+still gets a small adopt-*.tf file in two cases: an import block when the
+API provisioner created its org, and moved blocks into the module when it
+was rendered with the hcl layout before.
+"""
+
+import os
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+import kratix_sdk as ks
+
+# Terraform templates ship alongside this script in the pipeline image
+TEMPLATE_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "terraform_templates")
+
+# hcl renders org-{id}.tf and repos-{id}.tf per team; data renders JSON fragments
+TERRAFORM_LAYOUTS: List[str] = ["hcl", "data"]
+
+TEAMS_DIRECTORY: str = "terraform/teams"
+REPOS_DIRECTORY: str = "terraform/team-repos"
+MODULE: str = "module.teams"
+
+
+def terraform_layout(resource: ks.Resource) -> Tuple[str, Optional[str]]:
+  """Return the Terraform layout and, for teams moved from hcl to data, the id of their HCL addresses
+
+  A team can move from hcl to data: moved blocks take its resources into the
+  module. It cannot move back, because its resources would be destroyed and
+  recreated under the per-team addresses.
+  """
+  rendered_id: Optional[str] = resource.get_value("status.teamId", default=None)
+  recorded: Optional[str] = resource.get_value("status.terraformLayout", default=None)
+  if recorded is None and rendered_id:
+    # Rendered before the data layout existed
+    recorded = "hcl"
+
+  requested: str = os.environ.get("TERRAFORM_LAYOUT", "hcl")
+  if requested not in TERRAFORM_LAYOUTS:
+    raise ValueError(f"Unknown TERRAFORM_LAYOUT {requested}, expected one of {TERRAFORM_LAYOUTS}")
+  if recorded == "data" and requested == "hcl":
+    raise ValueError("Team is rendered with the data Terraform layout and cannot switch back to hcl")
+  if requested == "hcl":
+    return requested, None
+
+  hcl_id: Optional[str] = resource.get_value("status.hclTeamId", default=None)
+  if recorded == "hcl":
+    hcl_id = rendered_id
+  return requested, hcl_id
+
+
+def address(resource_type: str, key: str) -> str:
+  """Address of a for_each instance in the teams module"""
+  return f"{MODULE}.{resource_type}[{json.dumps(key)}]"
+
+
+def write_team_data(sdk: ks.KratixSDK, key: str, team_id: str, team_name: str, team_email: str, members: Optional[List[str]], membership_sync: str, org_import_id: Optional[int] = None, hcl_id: Optional[str] = None, trace_id: Optional[str] = None) -> List[str]:
+  """Write the team's org and members as JSON, plus its adopt file if needed; return the paths"""
+  team: Dict[str, Any] = {"id": team_id, "name": team_name, "email": team_email}
+  if trace_id:
+    team["trace_id"] = trace_id
+  if members is not None:
+    team["members"] = members
+    team["membership_sync"] = membership_sync
+
+  team_path: str = f"{TEAMS_DIRECTORY}/{key}.json"
+  sdk.write_output(team_path, (json.dumps(team, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+  outputs: List[str] = [team_path]
+
+  content: str = ""
+  if org_import_id is not None:
+    content += template("import.tf.template", to_address=address("gitea_org.team", key), org_id=str(org_import_id))
+  if hcl_id:
+    content += moved(f"gitea_org.team_{hcl_id}", address("gitea_org.team", key))
+    if members is not None:
+      members_resource: str = "gitea_team.members_api" if membership_sync == "api" else "gitea_team.members"
+      content += moved(f"gitea_team.team_{hcl_id}_members", address(members_resource, key))
+  if content:
+    outputs.append(write_adopt_file(sdk, f"terraform/adopt-{key}.tf", content))
+
+  print(f"Generated Terraform data for organization: {team_id}")
+  return outputs
+
+
+def write_repos_data(sdk: ks.KratixSDK, key: str, team_id: str, repos: List[str], hcl_id: Optional[str] = None) -> List[str]:
+  """Write the team's default repositories as JSON, plus moved blocks from the hcl layout; return the paths"""
+  if not repos:
+    return []
+
+  repos_path: str = f"{REPOS_DIRECTORY}/{key}.json"
+  sdk.write_output(repos_path, (json.dumps({"repos": repos}, indent=2) + "\n").encode("utf-8"))
+  outputs: List[str] = [repos_path]
+
+  if hcl_id:
+    content: str = "".join(
+      moved(f"gitea_repository.team_{hcl_id}_{repo}", address("gitea_repository.repo", f"{key}/{repo}"))
+      for repo in repos
+    )
+    outputs.append(write_adopt_file(sdk, f"terraform/adopt-repos-{key}.tf", content))
+
+  print(f"Generated Terraform data for {len(repos)} repositories of {team_id}")
+  return outputs
+
+
+def write_adopt_file(sdk: ks.KratixSDK, path: str, content: str) -> str:
+  sdk.write_output(path, content.lstrip("\n").encode("utf-8"))
+  return path
+
+
+def moved(from_address: str, to_address: str) -> str:
+  return template("moved.tf.template", from_address=from_address, to_address=to_address)
+
+
+def template(name: str, **values: str) -> str:
+  with open(os.path.join(TEMPLATE_DIR, name), "r") as f:
+    content: str = f.read()
+  for placeholder, value in values.items():
+    content = content.replace("{{" + placeholder + "}}", value)
+  return content
@@ -0,0 +1,135 @@
+"""Trace correlation from a Team change to its applied Gitea org.
+
+Every provisioning hop shares one trace ID. The Team's
+platform.kratix.io/trace-id annotation sets it (the import tool stamps one).
+Without the annotation, the ID is derived from the resource's uid and
+generation, so all reconciles of one spec change share it. The pipeline:
+
+- records the ID in status.traceId;
+- writes it into the Terraform it renders ("# trace-id:" comments, or
+  "trace_id" in the data layout), where the deploy workflow picks it up;
+- passes it to composite sub-resources as the same annotation.
+
+With OTEL_EXPORTER_OTLP_ENDPOINT set, the pipeline exports its spans as
+OTLP/HTTP JSON: the wait from the Team change to the pipeline start, and the
+pipeline run itself. tools/trace_collector.py is a local stand-in for a
+collector, and tools/trace_report.py breaks the latency down per hop. Export
+failures are only logged.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import secrets
+import urllib.request
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable
+
+import kratix_sdk as ks
+
+TRACE_ID_ANNOTATION: str = "platform.kratix.io/trace-id"
+SERVICE_NAME: str = "team-configure"
+TRACE_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def trace_id(resource: ks.Resource) -> str:
+  """32 hex character trace ID from the annotation, or derived from uid and generation"""
+  annotations: Dict[str, str] = resource.get_value("metadata.annotations", default=None) or {}
+  annotated: str = annotations.get(TRACE_ID_ANNOTATION) or ""
+  if TRACE_ID_PATTERN.fullmatch(annotated):
+    return annotated
+  if annotated:
+    print(f"WARNING: ignoring {TRACE_ID_ANNOTATION} {annotated!r}, expected 32 lowercase hex characters")
+  seed: str = f"{resource.get_value('metadata.uid', default=resource.get_name())}/{resource.get_value('metadata.generation', default=0)}"
+  return hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+
+
+def changed_at(resource: ks.Resource) -> Optional[float]:
+  """When the resource's spec last changed: the newest managedFields update touching spec, else creation"""
+  times: List[str] = [
+    entry["time"] for entry in resource.get_value("metadata.managedFields", default=None) or []
+    if entry.get("time") and "f:spec" in (entry.get("fieldsV1") or {})
+  ]
+  latest: Optional[str] = max(times) if times else resource.get_value("metadata.creationTimestamp", default=None)
+  return parse_time(latest) if latest else None
+
+
+def parse_time(value: Any) -> float:
+  # yaml.safe_load turns timestamps into naive UTC datetimes
+  if isinstance(value, datetime):
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+  return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def span(trace: str, name: str, start: float, end: float, attributes: Dict[str, str], parent: str = "") -> Dict[str, Any]:
+  """One OTLP/JSON span; times are epoch seconds"""
+  return {
+    "traceId": trace,
+    "spanId": secrets.token_hex(8),
+    "parentSpanId": parent,
+    "name": name,
+    "kind": 1,
+    "startTimeUnixNano": str(int(start * 1e9)),
+    "endTimeUnixNano": str(int(end * 1e9)),
+    "attributes": [{"key": key, "value": {"stringValue": value}} for key, value in sorted(attributes.items())],
+  }
+
+
+def export(spans: List[Dict[str, Any]], service: str = SERVICE_NAME) -> bool:
+  """Send *spans* to OTEL_EXPORTER_OTLP_ENDPOINT, if set; return whether they were sent"""
+  endpoint: str = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+  if not endpoint or not spans:
+    return False
+
+  body: Dict[str, Any] = {"resourceSpans": [{
+    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+    "scopeSpans": [{"scope": {"name": service}, "spans": spans}],
+  }]}
+  request = urllib.request.Request(f"{endpoint.rstrip('/')}/v1/traces", data=json.dumps(body).encode("utf-8"), method="POST", headers={"Content-Type": "application/json"})
+  try:
+    with urllib.request.urlopen(request, timeout=5):
+      return True
+  except OSError as e:
+    print(f"WARNING: exporting {len(spans)} spans to {endpoint} failed: {e}")
+    return False
+
+
+class PipelineTrace:
+  """Spans of one pipeline run for a resource"""
+
+  def __init__(self, resource: ks.Resource, pipeline: str) -> None:
+    self.trace: str = trace_id(resource)
+    self.pipeline: str = pipeline
+    self.started: float = time.time()
+    self.attributes: Dict[str, str] = {
+      "kratix.resource.name": resource.get_name(),
+      "kratix.resource.kind": resource.get_group_version_kind().kind,
+      "team.id": str(resource.get_value("spec.id", default="")),
+    }
+    self.changed: Optional[float] = changed_at(resource)
+    print(f"trace_id={self.trace}")
+
+  def finish(self, error: Optional[BaseException] = None) -> List[Dict[str, Any]]:
+    """Build and export the queue and pipeline spans; return them"""
+    attributes: Dict[str, str] = dict(self.attributes)
+    if error is not None:
+      attributes["error"] = type(error).__name__
+    spans: List[Dict[str, Any]] = []
+    if self.changed is not None and self.changed <= self.started:
+      spans.append(span(self.trace, "kratix.queue", self.changed, self.started, self.attributes))
+    spans.append(span(self.trace, f"pipeline.{self.pipeline}", self.started, time.time(), attributes))
+    export(spans)
+    return spans
+
+
+def run_traced(resource: ks.Resource, pipeline: str, run: Callable[[], None]) -> None:
+  """Call *run*, exporting the pipeline's spans whether or not it fails"""
+  trace = PipelineTrace(resource, pipeline)
+  try:
+    run()
+  except Exception as e:
+    trace.finish(e)
+    raise
+  trace.finish()
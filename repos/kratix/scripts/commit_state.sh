@@ -0,0 +1,44 @@
+#!/usr/bin/env bash
+# Commit files under .tfstate/ and push them to main, rebasing onto commits
+# that landed since checkout.
+#
+# Usage: scripts/commit_state.sh <subject> <path>...
+#
+# TRACE_IDS, when set, is added as a Trace-Ids: trailer. Kratix pushes a
+# commit per Work change, so under churn the push is retried up to
+# STATE_PUSH_ATTEMPTS times (default 8) with a jittered exponential backoff:
+# up to 1s, 2s, 4s ... capped at 30s.
+
+set -euo pipefail
+
+subject="$1"
+shift
+attempts="${STATE_PUSH_ATTEMPTS:-8}"
+
+git config user.name "Gitea Actions"
+git config user.email "actions@gitea.local"
+git add -- "$@"
+if git diff --cached --quiet; then
+  echo "✅ No changes to commit in $*"
+  exit 0
+fi
+git commit -q -m "$subject" ${TRACE_IDS:+-m "Trace-Ids: $TRACE_IDS"}
+
+# A plain fetch into the shallow clone only brings commits pushed since
+# checkout, which is all the rebase needs
+for attempt in $(seq 1 "$attempts"); do
+  git fetch -q origin main
+  if git rebase -q origin/main && git push -q origin HEAD:main; then
+    echo "✅ Pushed $subject"
+    exit 0
+  fi
+  git rebase --abort 2>/dev/null || true
+  cap=$(( 1 << (attempt - 1) ))
+  [ "$cap" -gt 30 ] && cap=30
+  delay=$(( RANDOM % (cap * 1000 + 1) ))
+  echo "⏳ Push rejected, retrying in ${delay}ms ($attempt/$attempts)"
+  sleep "$(printf '%d.%03d' $(( delay / 1000 )) $(( delay % 1000 )))"
+done
+
+echo "::error::$* could not be pushed after $attempts attempts"
+exit 1
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Summarise a saved Terraform plan as JSON for dashboards.
+
+Reads ``terraform show -json tfplan`` output and writes add/change/destroy
+counts (counted as ``terraform plan`` reports them, so a replacement is one add
+and one destroy) together with the commit and plan/apply durations.
+
+Usage:
+  terraform show -json tfplan > plan.json
+  python3 ../scripts/plan_summary.py plan.json --commit "$SHA" --plan-seconds 12 --output plan-summary.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Optional
+
+
+def summarise(plan: dict[str, Any]) -> dict[str, int]:
+  """Count resource changes in a ``terraform show -json`` plan."""
+  counts = {"added": 0, "changed": 0, "destroyed": 0, "replaced": 0, "imported": 0, "moved": 0}
+  for resource in plan.get("resource_changes", []):
+    change = resource.get("change", {})
+    actions = change.get("actions", [])
+    if "create" in actions:
+      counts["added"] += 1
+    if "delete" in actions:
+      counts["destroyed"] += 1
+    if "create" in actions and "delete" in actions:
+      counts["replaced"] += 1
+    if actions == ["update"]:
+      counts["changed"] += 1
+    if change.get("importing"):
+      counts["imported"] += 1
+    if resource.get("previous_address"):
+      counts["moved"] += 1
+  return counts
+
+
+def optional_float(value: str) -> Optional[float]:
+  # Workflow step outputs are empty strings when the step was skipped
+  return float(value) if value else None
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("plan", help="Output of terraform show -json for the saved plan")
+  parser.add_argument("--commit", default="", help="Commit SHA the plan was made for")
+  parser.add_argument("--plan-seconds", type=optional_float, default=None)
+  parser.add_argument("--apply-seconds", type=optional_float, default=None)
+  parser.add_argument("--applied", default="", help="Outcome of the apply step (success, failure, skipped)")
+  parser.add_argument("--output", help="Write the summary here as well as to stdout")
+  args = parser.parse_args(argv)
+
+  with open(args.plan, "r") as f:
+    plan = json.load(f)
+
+  summary: dict[str, Any] = {
+    "commit": args.commit,
+    **summarise(plan),
+    "plan_seconds": args.plan_seconds,
+    "apply_seconds": args.apply_seconds,
+    "apply_outcome": args.applied or "skipped",
+    "terraform_version": plan.get("terraform_version"),
+  }
+  text = json.dumps(summary, indent=2, sort_keys=True)
+  if args.output:
+    with open(args.output, "w") as f:
+      f.write(text + "\n")
+  print(text)
+  print(
+    f"📋 Plan: {summary['added']} to add, {summary['changed']} to change, "
+    f"{summary['destroyed']} to destroy ({summary['imported']} imported, {summary['moved']} moved)"
+  )
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Sync Gitea team membership from members/*.json with a batched diff.
+
+Each file names an org, a team and the desired member list. Only files that
+changed since --base are synced, and by default the current membership is
+taken from the file's previous version, so adding or removing one member costs
+one API call however large the team is. --full (or a file with no previous
+version) lists the team's members from Gitea instead, which also repairs
+drift. Membership changes are sent concurrently by a small worker pool.
+
+With --pending, files whose sync failed are kept in that JSON list and synced
+in full on the next run, since a later --base no longer shows their change.
+The list is written before syncing too, so a run that dies part-way leaves
+every file it was given pending.
+
+Usage:
+  python3 scripts/sync_team_members.py --base <commit> --pending .tfstate/member-sync-pending.json
+  python3 scripts/sync_team_members.py --full members/team-alpha.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+MEMBERS_DIR = "members"
+PAGE_SIZE = 50
+NULL_COMMIT = "0" * 40
+
+
+class GiteaError(Exception):
+  def __init__(self, status: int, message: str) -> None:
+    super().__init__(f"HTTP {status}: {message}")
+    self.status = status
+
+
+class GiteaClient:
+  """Minimal Gitea API client for team membership."""
+
+  def __init__(self, base_url: str, token: str) -> None:
+    self.base_url = base_url.rstrip("/")
+    self.token = token
+
+  def request(self, method: str, path: str, params: Optional[dict[str, Any]] = None) -> Any:
+    url = f"{self.base_url}/api/v1{path}"
+    if params:
+      url += "?" + urllib.parse.urlencode(params)
+    request = urllib.request.Request(url, method=method, headers={
+      "Authorization": f"token {self.token}",
+      "Accept": "application/json",
+    })
+    try:
+      with urllib.request.urlopen(request, timeout=30) as response:
+        body = response.read()
+    except urllib.error.HTTPError as e:
+      raise GiteaError(e.code, e.read().decode("utf-8", "replace")) from e
+    return json.loads(body) if body else None
+
+  def team_id(self, org: str, team: str) -> int:
+    result = self.request("GET", f"/orgs/{org}/teams/search", {"q": team})
+    for candidate in result.get("data") or []:
+      if candidate["name"] == team:
+        return candidate["id"]
+    raise GiteaError(404, f"team {team} not found in org {org}")
+
+  def list_members(self, team_id: int) -> set[str]:
+    members: set[str] = set()
+    page = 1
+    while True:
+      batch = self.request("GET", f"/teams/{team_id}/members", {"page": page, "limit": PAGE_SIZE}) or []
+      members.update(user["login"] for user in batch)
+      if len(batch) < PAGE_SIZE:
+        return members
+      page += 1
+
+  def add_member(self, team_id: int, username: str) -> None:
+    self.request("PUT", f"/teams/{team_id}/members/{username}")
+
+  def remove_member(self, team_id: int, username: str) -> None:
+    self.request("DELETE", f"/teams/{team_id}/members/{username}")
+
+
+@dataclass
+class SyncStats:
+  teams: int = 0
+  added: int = 0
+  removed: int = 0
+  api_calls: int = 0
+  errors: list[str] = field(default_factory=list)
+
+  def summary(self) -> str:
+    return (
+      f"{self.teams} teams synced (added {self.added}, removed {self.removed}, "
+      f"{self.api_calls} membership calls, {len(self.errors)} errors)"
+    )
+
+
+def diff_members(current: set[str], desired: set[str]) -> tuple[list[str], list[str]]:
+  """Return (to_add, to_remove) taking *current* membership to *desired*."""
+  return sorted(desired - current), sorted(current - desired)
+
+
+def git(*args: str) -> Optional[str]:
+  result = subprocess.run(["git", *args], capture_output=True, text=True)
+  return result.stdout if result.returncode == 0 else None
+
+
+def changed_files(base: Optional[str]) -> list[str]:
+  """Membership files added or modified since *base*, or all of them without a base."""
+  if base and base != NULL_COMMIT:
+    output = git("diff", "--name-only", "--diff-filter=AM", base, "HEAD", "--", MEMBERS_DIR)
+    if output is not None:
+      return sorted(path for path in output.splitlines() if path.endswith(".json"))
+  if not os.path.isdir(MEMBERS_DIR):
+    return []
+  return sorted(os.path.join(MEMBERS_DIR, name) for name in os.listdir(MEMBERS_DIR) if name.endswith(".json"))
+
+
+def previous_members(path: str, base: Optional[str]) -> Optional[set[str]]:
+  """Member list from *path* at *base*, or None if the file did not exist there."""
+  if not base or base == NULL_COMMIT:
+    return None
+  content = git("show", f"{base}:{path}")
+  return set(json.loads(content)["members"]) if content else None
+
+
+def read_pending(path: Optional[str]) -> list[str]:
+  """Files listed in the *path* pending list that still exist."""
+  if not path or not os.path.exists(path):
+    return []
+  with open(path, "r") as f:
+    return sorted(p for p in json.load(f) if os.path.exists(p))
+
+
+def write_pending(path: Optional[str], files: list[str]) -> None:
+  if not path:
+    return
+  os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+  with open(path, "w") as f:
+    json.dump(sorted(set(files)), f, indent=2)
+    f.write("\n")
+
+
+def sync_file(
+  client: GiteaClient,
+  path: str,
+  stats: SyncStats,
+  base: Optional[str] = None,
+  full: bool = False,
+  workers: int = 8,
+) -> None:
+  """Apply the membership diff for one members/*.json file."""
+  with open(path, "r") as f:
+    membership = json.load(f)
+  org, team = membership["org"], membership["team"]
+  desired = set(membership["members"])
+
+  team_id = client.team_id(org, team)
+  current = None if full else previous_members(path, base)
+  if current is None:
+    current = client.list_members(team_id)
+  to_add, to_remove = diff_members(current, desired)
+
+  def apply(change: tuple[str, str]) -> None:
+    action, username = change
+    try:
+      if action == "add":
+        client.add_member(team_id, username)
+      else:
+        client.remove_member(team_id, username)
+    except GiteaError as e:
+      # Removing someone already gone is the desired end state
+      if not (action == "remove" and e.status == 404):
+        stats.errors.append(f"{org}/{team}: {action} {username}: {e}")
+
+  changes = [("add", u) for u in to_add] + [("remove", u) for u in to_remove]
+  with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+    list(pool.map(apply, changes))
+
+  stats.teams += 1
+  stats.added += len(to_add)
+  stats.removed += len(to_remove)
+  stats.api_calls += len(changes)
+  print(f"👥 {org}/{team}: +{len(to_add)} -{len(to_remove)} ({len(desired)} members)")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("files", nargs="*", help="Membership files to sync (default: changed since --base)")
+  parser.add_argument("--base", help="Commit to diff against, usually the previous HEAD")
+  parser.add_argument("--full", action="store_true", help="Diff against Gitea's current membership instead of --base")
+  parser.add_argument("--workers", type=int, default=8, help="Concurrent membership calls (default: 8)")
+  parser.add_argument("--pending", help="JSON list of files whose last sync failed; they are synced in full and the list is rewritten")
+  parser.add_argument("--gitea-url", default=os.environ.get("GITEA_URL", "http://localhost:8080"))
+  args = parser.parse_args(argv)
+
+  retry = read_pending(args.pending)
+  files = sorted(set(args.files or changed_files(args.base)) | set(retry))
+  write_pending(args.pending, files)
+  if not files:
+    print("✅ No membership changes")
+    return 0
+  if retry:
+    print(f"🔁 Retrying {len(retry)} files whose last sync failed")
+
+  token = os.environ.get("GITEA_TOKEN")
+  if not token:
+    print("❌ GITEA_TOKEN is not set")
+    return 1
+
+  client = GiteaClient(args.gitea_url, token)
+  stats = SyncStats()
+  failed: list[str] = []
+  for path in files:
+    errors = len(stats.errors)
+    try:
+      sync_file(client, path, stats, base=args.base, full=args.full or path in retry, workers=args.workers)
+    except (GiteaError, OSError, ValueError, KeyError) as e:
+      stats.errors.append(f"{path}: {e}")
+    if len(stats.errors) > errors:
+      failed.append(path)
+  write_pending(args.pending, failed)
+
+  for error in stats.errors:
+    print(f"❌ {error}")
+  print(f"✅ {stats.summary()}")
+  return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Join a deploy workflow run to the traces of the Team changes it applies.
+
+The team-configure pipeline writes each team's trace ID into the Terraform it
+renders: a ``# trace-id:`` comment on top of org-<id>.tf, or ``trace_id`` in
+teams/<name>.json. ``collect`` finds the IDs in the files changed since
+--base and logs them, so a workflow run can be searched by trace ID; in a
+workflow they are also set as the step's trace_ids output.
+``emit`` then sends the run's spans to OTEL_EXPORTER_OTLP_ENDPOINT as
+OTLP/HTTP JSON, one set per trace:
+
+  gitops.deploy_wait  the commit to the workflow run starting
+  deploy.workflow     the workflow run, parent of
+  deploy.plan         terraform plan
+  deploy.apply        terraform apply, when there were changes
+
+Usage:
+  python3 scripts/trace_spans.py collect --base <commit> --output traces.json
+  python3 scripts/trace_spans.py emit traces.json --started 1700000000 --plan-started ... --plan-seconds 12
+"""
+
+import argparse
+import json
+import os
+import re
+import secrets
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Any, Optional
+
+TERRAFORM_DIR = "terraform"
+NULL_COMMIT = "0" * 40
+TRACE_ID_PATTERNS = (
+  re.compile(r"^# trace-id: ([0-9a-f]{32})$", re.MULTILINE),
+  re.compile(r'"trace_id": "([0-9a-f]{32})"'),
+)
+SERVICE_NAME = "deploy-organizations"
+
+
+def git(*args: str) -> Optional[str]:
+  result = subprocess.run(["git", *args], capture_output=True, text=True)
+  return result.stdout if result.returncode == 0 else None
+
+
+def changed_files(base: Optional[str]) -> list[str]:
+  """Terraform files added or modified since *base*; none without a usable base."""
+  if not base or base == NULL_COMMIT:
+    return []
+  output = git("diff", "--name-only", "--diff-filter=AM", base, "HEAD", "--", TERRAFORM_DIR)
+  return output.split() if output else []
+
+
+def trace_ids(content: str) -> list[str]:
+  return sorted({match for pattern in TRACE_ID_PATTERNS for match in pattern.findall(content)})
+
+
+def collect(paths: list[str]) -> dict[str, list[str]]:
+  """Trace IDs found in *paths*, each with the files it was found in."""
+  traces: dict[str, list[str]] = {}
+  for path in paths:
+    try:
+      with open(path, "r") as f:
+        content = f.read()
+    except OSError:
+      continue
+    for trace in trace_ids(content):
+      traces.setdefault(trace, []).append(path)
+  return traces
+
+
+def span(trace: str, name: str, start: float, end: float, attributes: dict[str, str], parent: str = "") -> dict[str, Any]:
+  """One OTLP/JSON span; times are epoch seconds."""
+  return {
+    "traceId": trace,
+    "spanId": secrets.token_hex(8),
+    "parentSpanId": parent,
+    "name": name,
+    "kind": 1,
+    "startTimeUnixNano": str(int(start * 1e9)),
+    "endTimeUnixNano": str(int(end * 1e9)),
+    "attributes": [{"key": key, "value": {"stringValue": value}} for key, value in sorted(attributes.items())],
+  }
+
+
+def run_spans(traces: dict[str, list[str]], commit: str, committed: float, started: float, finished: float,
+              plan: Optional[tuple[float, float]], apply: Optional[tuple[float, float]], outcome: str) -> list[dict[str, Any]]:
+  """The workflow run's spans for every trace it applied; *plan* and *apply* are (start, seconds)."""
+  spans: list[dict[str, Any]] = []
+  for trace, paths in sorted(traces.items()):
+    attributes = {"vcs.commit": commit, "deploy.files": ",".join(paths), "deploy.apply_outcome": outcome}
+    workflow = span(trace, "deploy.workflow", started, finished, attributes)
+    spans += [span(trace, "gitops.deploy_wait", committed, started, attributes), workflow]
+    for name, timing in (("deploy.plan", plan), ("deploy.apply", apply)):
+      if timing is not None:
+        spans.append(span(trace, name, timing[0], timing[0] + timing[1], attributes, parent=workflow["spanId"]))
+  return spans
+
+
+def export(spans: list[dict[str, Any]], endpoint: str) -> None:
+  body = {"resourceSpans": [{
+    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+    "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": spans}],
+  }]}
+  request = urllib.request.Request(f"{endpoint.rstrip('/')}/v1/traces", data=json.dumps(body).encode("utf-8"), method="POST", headers={"Content-Type": "application/json"})
+  with urllib.request.urlopen(request, timeout=10):
+    pass
+
+
+def optional_float(value: str) -> Optional[float]:
+  # Workflow step outputs are empty strings when the step was skipped
+  return float(value) if value else None
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  commands = parser.add_subparsers(dest="command", required=True)
+
+  collect_parser = commands.add_parser("collect", help="Find the trace IDs in the Terraform changed since --base")
+  collect_parser.add_argument("--base", help="Commit before the push (github.event.before)")
+  collect_parser.add_argument("--output", default="traces.json")
+
+  emit_parser = commands.add_parser("emit", help="Export the workflow run's spans for the collected traces")
+  emit_parser.add_argument("traces", help="Output of collect")
+  emit_parser.add_argument("--commit", default="HEAD")
+  emit_parser.add_argument("--started", type=float, required=True, help="Epoch seconds the run started")
+  emit_parser.add_argument("--plan-started", type=optional_float, default=None)
+  emit_parser.add_argument("--plan-seconds", type=optional_float, default=None)
+  emit_parser.add_argument("--apply-started", type=optional_float, default=None)
+  emit_parser.add_argument("--apply-seconds", type=optional_float, default=None)
+  emit_parser.add_argument("--applied", default="", help="Outcome of the apply step (success, failure, skipped)")
+  args = parser.parse_args(argv)
+
+  if args.command == "collect":
+    traces = collect(changed_files(args.base))
+    for trace, paths in sorted(traces.items()):
+      print(f"🔗 trace_id={trace} {' '.join(paths)}")
+    with open(args.output, "w") as f:
+      json.dump(traces, f, indent=2, sort_keys=True)
+    if os.environ.get("GITHUB_OUTPUT"):
+      with open(os.environ["GITHUB_OUTPUT"], "a") as f:
+        f.write(f"trace_ids={' '.join(sorted(traces))}\n")
+    print(f"📋 {len(traces)} traces in this deploy")
+    return 0
+
+  with open(args.traces, "r") as f:
+    traces = json.load(f)
+  endpoint = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+  if not traces or not endpoint:
+    print("No traces to export" if not traces else "OTEL_EXPORTER_OTLP_ENDPOINT is not set; not exporting spans")
+    return 0
+
+  committed = float((git("log", "-1", "--format=%ct", args.commit) or "").strip() or args.started)
+  plan = (args.plan_started, args.plan_seconds) if args.plan_started is not None and args.plan_seconds is not None else None
+  apply = (args.apply_started, args.apply_seconds) if args.apply_started is not None and args.apply_seconds is not None else None
+  spans = run_spans(traces, args.commit, committed, args.started, time.time(), plan, apply, args.applied or "skipped")
+  try:
+    export(spans, endpoint)
+  except OSError as e:
+    # Tracing never fails a deploy
+    print(f"⚠️  Exporting {len(spans)} spans to {endpoint} failed: {e}")
+    return 0
+  print(f"📤 Exported {len(spans)} spans for {len(traces)} traces")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,56 @@
+locals {
+  # One entry per team and repository, keyed "<team>/<repo>"
+  repos = merge([
+    for team, names in var.repos : {
+      for repo in names : "${team}/${repo}" => { team = team, name = repo }
+    }
+  ]...)
+}
+
+resource "gitea_org" "team" {
+  for_each = var.teams
+
+  name        = each.value.id
+  full_name   = each.value.name
+  description = "Organization for team ${each.value.name} (${each.value.email})"
+  website     = ""
+  location    = ""
+  visibility  = "public"
+}
+
+resource "gitea_team" "members" {
+  for_each = { for key, team in var.teams : key => team if team.members != null && team.membership_sync != "api" }
+
+  name                     = "members"
+  organisation             = gitea_org.team[each.key].name
+  description              = "Members of team ${each.value.name}"
+  permission               = "write"
+  include_all_repositories = true
+  members                  = each.value.members
+}
+
+resource "gitea_team" "members_api" {
+  for_each = { for key, team in var.teams : key => team if team.members != null && team.membership_sync == "api" }
+
+  name                     = "members"
+  organisation             = gitea_org.team[each.key].name
+  description              = "Members of team ${each.value.name}"
+  permission               = "write"
+  include_all_repositories = true
+
+  # Membership is synced by the deploy workflow from members/team-<id>.json
+  lifecycle {
+    ignore_changes = [members]
+  }
+}
+
+resource "gitea_repository" "repo" {
+  for_each = local.repos
+
+  username       = gitea_org.team[each.value.team].name
+  name           = each.value.name
+  description    = "${each.value.name} repository for team ${var.teams[each.value.team].name}"
+  private        = false
+  auto_init      = true
+  default_branch = "main"
+}
@@ -0,0 +1,4 @@
+output "organizations" {
+  description = "Name and ID of each team's organization, keyed by Team resource name"
+  value       = { for key, org in gitea_org.team : key => { name = org.name, id = org.id } }
+}
@@ -0,0 +1,18 @@
+variable "teams" {
+  description = "Teams keyed by Team resource name, from terraform/teams/*.json"
+  type = map(object({
+    id              = string
+    name            = string
+    email           = string
+    members         = optional(list(string))
+    membership_sync = optional(string, "terraform")
+    # Correlates the team's change with this workflow run; not used in resources
+    trace_id = optional(string)
+  }))
+}
+
+variable "repos" {
+  description = "Default repository names keyed by Team resource name, from terraform/team-repos/*.json"
+  type        = map(list(string))
+  default     = {}
+}
@@ -0,0 +1,9 @@
+terraform {
+  required_version = ">= 1.3"
+  required_providers {
+    gitea = {
+      source  = "go-gitea/gitea"
+      version = "~> 0.6.0"
+    }
+  }
+}
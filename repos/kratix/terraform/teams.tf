@@ -0,0 +1,27 @@
+# Teams rendered with TERRAFORM_LAYOUT=data write JSON files instead of HCL:
+# teams/<name>.json for the org and members, team-repos/<name>.json for the
+# default repositories. They are merged here and created with one for_each
+# per resource type in the teams module.
+locals {
+  teams = {
+    for file in fileset("${path.module}/teams", "*.json") :
+    trimsuffix(file, ".json") => jsondecode(file("${path.module}/teams/${file}"))
+  }
+
+  team_repos = {
+    for file in fileset("${path.module}/team-repos", "*.json") :
+    trimsuffix(file, ".json") => jsondecode(file("${path.module}/team-repos/${file}")).repos
+  }
+}
+
+module "teams" {
+  source = "./modules/teams"
+
+  teams = local.teams
+  repos = local.team_repos
+}
+
+output "team_organizations" {
+  description = "Organization name and ID per team rendered with the data layout"
+  value       = module.teams.organizations
+}
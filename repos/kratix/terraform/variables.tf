@@ -5,7 +5,8 @@ variable "gitea_base_url" {
 }
 
 variable "gitea_admin_token" {
-  description = "Admin API token for Gitea instance"
+  description = "Admin API token for Gitea instance; when null the provider reads GITEA_TOKEN"
   type        = string
   sensitive   = true
+  default     = null
 }
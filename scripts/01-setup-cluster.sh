@@ -3,14 +3,26 @@
 set -e
 
 CLUSTER_NAME="kratix-poc"
+# Worker nodes next to the control plane; pipeline pods spread across them
+KIND_WORKERS="${KIND_WORKERS:-0}"
 
 echo "🚀 Stage 1: Setting up Kind cluster with ingress and port mappings..."
 
 # Check if cluster already exists
 if ! kind get clusters | grep -q "^${CLUSTER_NAME}$"; then
   # Create kind config with port mappings for SSH and ingress
-  echo "🔧 Creating Kind cluster '${CLUSTER_NAME}'..."
-  kind create cluster --name "${CLUSTER_NAME}" --config manifests/kind-cluster-config.yaml
+  KIND_CONFIG="manifests/kind-cluster-config.yaml"
+  if [ "$KIND_WORKERS" -gt 0 ]; then
+    # Ingress and the NodePorts stay on the control plane, which has the port mappings
+    KIND_CONFIG="/tmp/kind-config.yaml"
+    NODE_IMAGE=$(grep -m1 'image:' manifests/kind-cluster-config.yaml | awk '{print $2}')
+    cp manifests/kind-cluster-config.yaml "$KIND_CONFIG"
+    for _ in $(seq 1 "$KIND_WORKERS"); do
+      printf '  - role: worker\n    image: %s\n' "$NODE_IMAGE" >> "$KIND_CONFIG"
+    done
+  fi
+  echo "🔧 Creating Kind cluster '${CLUSTER_NAME}' with ${KIND_WORKERS} worker node(s)..."
+  kind create cluster --name "${CLUSTER_NAME}" --config "$KIND_CONFIG"
 fi
 
 echo "📦 Installing NGINX Ingress Controller..."
@@ -30,7 +42,7 @@ kubectl wait --namespace ingress-nginx \
 echo "✅ Stage 1 Complete!"
 echo ""
 echo "📋 Cluster Information:"
-echo "  Cluster: ${CLUSTER_NAME}"
+echo "  Cluster: ${CLUSTER_NAME} ($(kubectl get nodes --no-headers | wc -l | tr -d ' ') nodes)"
 echo "  Ingress: NGINX (ready)"
 echo "  Port Mappings:"
 echo "    - HTTP: localhost:8080 → cluster:80"
@@ -6,7 +6,22 @@ set -e
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "$SCRIPT_DIR/gitea-config.sh"
 
-echo "🚀 Stage 3: Setting up Gitea with Actions runner..."
+# Helm values profile: "single" (one pod) or "scaled" (several pods on shared
+# storage, see manifests/gitea-helm-values-scaled.yaml)
+GITEA_PROFILE="${GITEA_PROFILE:-single}"
+# ReadWriteMany StorageClass for the scaled profile; empty installs an
+# in-cluster NFS server and uses its "nfs" class
+GITEA_RWX_STORAGE_CLASS="${GITEA_RWX_STORAGE_CLASS:-}"
+
+echo "🚀 Stage 3: Setting up Gitea with Actions runner (profile: $GITEA_PROFILE)..."
+
+case "$GITEA_PROFILE" in
+  single|scaled) ;;
+  *)
+    echo "❌ Unknown GITEA_PROFILE '$GITEA_PROFILE' (expected single or scaled)"
+    exit 1
+    ;;
+esac
 
 # Check Kratix is ready
 if ! kubectl get deployment kratix-platform-controller-manager -n kratix-platform-system >/dev/null 2>&1; then
@@ -73,12 +88,41 @@ kubectl create secret generic gitea-security \
   --namespace=gitea \
   --dry-run=client -o yaml | kubectl apply -f -
 
+HELM_VALUES=(-f manifests/gitea-helm-values.yaml)
+if [ "$GITEA_PROFILE" = "scaled" ]; then
+  if [ -z "$GITEA_RWX_STORAGE_CLASS" ]; then
+    echo "📂 Installing an NFS server for shared Gitea storage..."
+    # Kind node images have no NFS client for the kubelet to mount with
+    for node in $(kind get nodes --name kratix-poc); do
+      docker exec "$node" sh -c 'command -v mount.nfs >/dev/null || (apt-get update -qq && apt-get install -y -qq nfs-common >/dev/null)'
+    done
+    if ! helm repo list | grep -q nfs-ganesha; then
+      helm repo add nfs-ganesha https://kubernetes-sigs.github.io/nfs-ganesha-server-and-external-provisioner/
+      helm repo update
+    fi
+    helm upgrade --install nfs-server nfs-ganesha/nfs-server-provisioner -n nfs --create-namespace \
+      --set persistence.enabled=true --set persistence.size=20Gi \
+      --set storageClass.name=nfs --set storageClass.allowVolumeExpansion=true
+    kubectl rollout status statefulset/nfs-server-nfs-server-provisioner -n nfs --timeout=180s
+    GITEA_RWX_STORAGE_CLASS="nfs"
+  fi
+  HELM_VALUES+=(-f manifests/gitea-helm-values-scaled.yaml --set persistence.storageClass="$GITEA_RWX_STORAGE_CLASS")
+fi
+
 echo "🏗️  Installing Gitea via Helm..."
-helm install gitea gitea-charts/gitea -n gitea -f manifests/gitea-helm-values.yaml
+# One pod first, so a single pod runs the database migrations and generates
+# the SSH host keys on the shared volume
+helm install gitea gitea-charts/gitea -n gitea "${HELM_VALUES[@]}" --set replicaCount=1
 
 echo "⏳ Waiting for Gitea to be ready..."
 kubectl wait --for=condition=ready pod -l app.kubernetes.io/name=gitea -n gitea --timeout=300s
 
+if [ "$GITEA_PROFILE" = "scaled" ]; then
+  echo "📈 Scaling Gitea to the profile's replicas..."
+  helm upgrade gitea gitea-charts/gitea -n gitea "${HELM_VALUES[@]}"
+  kubectl rollout status deployment/gitea -n gitea --timeout=600s
+fi
+
 echo "🏃 Setting up Actions runner..."
 ./scripts/setup-gitea-runner.sh
 
@@ -155,6 +199,7 @@ echo "  URL: http://localhost:8080"
 echo "  Username: $GITEA_USERNAME"
 echo "  Password: $GITEA_PASSWORD"
 echo "  SSH: localhost:30222"
+echo "  Profile: $GITEA_PROFILE ($(kubectl get deployment gitea -n gitea -o jsonpath='{.status.readyReplicas}') ready replicas)"
 echo ""
 echo "🔧 Verification:"
 kubectl get pods -n gitea
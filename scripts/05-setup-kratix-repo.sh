@@ -148,6 +148,24 @@ else
   exit 1
 fi
 
+# Optional: where the deploy workflow exports its trace spans (tools/trace_collector.py)
+if [ -n "${DEPLOY_OTLP_ENDPOINT:-}" ]; then
+  VARIABLE_PAYLOAD=$(printf '{"value": "%s"}' "$DEPLOY_OTLP_ENDPOINT")
+  VARIABLE_URL="$(gitea_local_url)/api/v1/repos/$REPO_OWNER/$REPO_NAME/actions/variables/OTEL_EXPORTER_OTLP_ENDPOINT"
+  # POST creates the variable, PUT updates an existing one
+  VARIABLE_STATUS=$(gitea_curl -s -o /dev/null -w '%{http_code}' -X POST "$VARIABLE_URL" \
+    -u "$GITEA_USERNAME:$GITEA_PASSWORD" -H "Content-Type: application/json" -d "$VARIABLE_PAYLOAD")
+  if [ "$VARIABLE_STATUS" = "409" ]; then
+    VARIABLE_STATUS=$(gitea_curl -s -o /dev/null -w '%{http_code}' -X PUT "$VARIABLE_URL" \
+      -u "$GITEA_USERNAME:$GITEA_PASSWORD" -H "Content-Type: application/json" -d "$VARIABLE_PAYLOAD")
+  fi
+  if [ "$VARIABLE_STATUS" = "201" ] || [ "$VARIABLE_STATUS" = "204" ]; then
+    echo "✅ Deploy workflow exports trace spans to $DEPLOY_OTLP_ENDPOINT"
+  else
+    echo "⚠️  Could not set the OTEL_EXPORTER_OTLP_ENDPOINT variable (HTTP $VARIABLE_STATUS); traces stay in the workflow logs"
+  fi
+fi
+
 echo "📄 Initializing repository structure from template..."
 
 # Copy template files from repos/kratix to temporary directory
@@ -142,7 +142,7 @@ echo "🎉 POC Setup Complete!"
 echo ""
 echo "📚 Access points:"
 echo "  Gitea: $(gitea_local_url) (admin: $GITEA_USERNAME)"
-echo "  Teams: kubectl get teams"
+echo "  Teams: kubectl get teams (live pipeline and Work status: python3 tools/teams_status.py)"
 echo "  GitStateStore: kubectl get gitstatestore"
 
 # Cleanup temporary files
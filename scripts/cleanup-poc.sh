@@ -26,6 +26,12 @@ else
     echo "⚠️  Cluster '${CLUSTER_NAME}' not found"
 fi
 
+echo "🗄️  Removing volumes of restored snapshots..."
+for volume in $(docker volume ls -q --filter "name=${CLUSTER_NAME}-control-plane-var-" 2>/dev/null); do
+    docker volume rm "$volume" >/dev/null && echo "  Removed $volume"
+done
+echo "  Snapshots are kept; remove them with ./scripts/cluster-snapshot.sh delete"
+
 echo "🧹 Cleaning up temporary files..."
 rm -f /tmp/kind-config.yaml
 rm -f /tmp/kratix-user-patch.yaml
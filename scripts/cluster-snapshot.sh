@@ -0,0 +1,202 @@
+#!/bin/bash
+
+# Snapshot and restore the bootstrapped PoC cluster (state after stage 5).
+#
+#   ./scripts/cluster-snapshot.sh save [name]      # snapshot the running cluster
+#   ./scripts/cluster-snapshot.sh restore [name]   # replace the cluster with a snapshot
+#   ./scripts/cluster-snapshot.sh ensure           # restore, or bootstrap stages 1-5 and save
+#                                                  # (never replaces a cluster it didn't create)
+#   ./scripts/cluster-snapshot.sh list
+#   ./scripts/cluster-snapshot.sh delete [name]
+#
+# The default name is "stage5-<key>", where the key hashes the stage 1-5
+# scripts, manifests and templates, so editing them invalidates old snapshots.
+# A snapshot holds the Kind node committed as an image, a tar of the node's
+# /var volume (etcd, containerd images, Gitea database and repository PVs), the
+# Actions runner's registration volume and the SSH key from stage 4.
+#
+# restore and ensure record the node container they leave running in
+# $SNAPSHOT_ROOT/<cluster>.owner. ensure only replaces a cluster whose node is
+# still that container, so a cluster built by hand or by CI is kept as it is.
+
+set -e
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+cd "$PROJECT_ROOT"
+
+CLUSTER_NAME="${CLUSTER_NAME:-kratix-poc}"
+NODE="${CLUSTER_NAME}-control-plane"
+RUNNER_CONTAINER="gitea-actions-runner"
+RUNNER_VOLUME="gitea-runner-data"
+SNAPSHOT_ROOT="${KRATIX_SNAPSHOT_DIR:-$HOME/.cache/kratix-poc/snapshots}"
+HELPER_IMAGE="busybox:1.36"
+
+COMMAND="${1:-}"
+NAME="${2:-stage5-$(python3 tools/kind_snapshot.py key)}"
+SNAPSHOT_DIR="$SNAPSHOT_ROOT/$NAME"
+NODE_IMAGE="kratix-poc-node:$NAME"
+OWNER_FILE="$SNAPSHOT_ROOT/$CLUSTER_NAME.owner"
+
+wait_for_cluster() {
+  echo "⏳ Waiting for the node and platform to be ready..."
+  kind export kubeconfig --name "$CLUSTER_NAME" >/dev/null
+  until kubectl get nodes >/dev/null 2>&1; do
+    sleep 1
+  done
+  kubectl wait --for=condition=Ready nodes --all --timeout=180s
+  kubectl wait --for=condition=Available deployment --all -n kratix-platform-system --timeout=300s
+  kubectl wait --for=condition=Ready pod --all -n gitea --timeout=300s
+}
+
+start_runner() {
+  # The restored volume still holds the runner's registration
+  if [ -f "$SNAPSHOT_DIR/runner-data.tar" ] || docker volume inspect "$RUNNER_VOLUME" >/dev/null 2>&1; then
+    "$SCRIPT_DIR/setup-gitea-runner.sh" >/dev/null
+    echo "🏃 Actions runner started"
+  fi
+}
+
+node_id() {
+  docker inspect -f '{{.Id}}' "$NODE" 2>/dev/null
+}
+
+mark_owned() {
+  mkdir -p "$SNAPSHOT_ROOT"
+  node_id > "$OWNER_FILE"
+}
+
+# True when the running node is one this script restored or bootstrapped
+owned() {
+  [ -f "$OWNER_FILE" ] && [ "$(node_id)" = "$(cat "$OWNER_FILE")" ]
+}
+
+save() {
+  if ! docker inspect "$NODE" >/dev/null 2>&1; then
+    echo "❌ Kind node $NODE not found. Run ./scripts/build-poc.sh (stages 1-5) first."
+    exit 1
+  fi
+  if [ "$(kind get nodes --name "$CLUSTER_NAME" | wc -l)" -gt 1 ]; then
+    echo "❌ Snapshots hold a single node; $CLUSTER_NAME has worker nodes (KIND_WORKERS)."
+    exit 1
+  fi
+
+  echo "📸 Saving snapshot $NAME to $SNAPSHOT_DIR..."
+  local start=$SECONDS
+  rm -rf "$SNAPSHOT_DIR"
+  mkdir -p "$SNAPSHOT_DIR"
+  docker inspect "$NODE" > "$SNAPSHOT_DIR/node.json"
+  local var_volume
+  var_volume=$(python3 tools/kind_snapshot.py var-volume "$SNAPSHOT_DIR/node.json")
+
+  # Stop writers so etcd and PostgreSQL are captured consistently
+  docker stop "$RUNNER_CONTAINER" >/dev/null 2>&1 || true
+  docker stop "$NODE" >/dev/null
+
+  docker commit "$NODE" "$NODE_IMAGE" >/dev/null
+  docker run --rm -v "$var_volume:/source:ro" -v "$SNAPSHOT_DIR:/snapshot" "$HELPER_IMAGE" \
+    tar -C /source -cf /snapshot/var.tar .
+  if docker volume inspect "$RUNNER_VOLUME" >/dev/null 2>&1; then
+    docker run --rm -v "$RUNNER_VOLUME:/source:ro" -v "$SNAPSHOT_DIR:/snapshot" "$HELPER_IMAGE" \
+      tar -C /source -cf /snapshot/runner-data.tar .
+  fi
+  cp /tmp/kratix-ssh-key /tmp/kratix-ssh-key.pub "$SNAPSHOT_DIR/" 2>/dev/null || true
+  echo "$NODE_IMAGE" > "$SNAPSHOT_DIR/image"
+
+  docker start "$NODE" >/dev/null
+  wait_for_cluster
+  docker start "$RUNNER_CONTAINER" >/dev/null 2>&1 || true
+
+  echo "✅ Snapshot $NAME saved in $((SECONDS - start))s ($(du -sh "$SNAPSHOT_DIR" | cut -f1) + node image $NODE_IMAGE)"
+}
+
+restore() {
+  if [ ! -f "$SNAPSHOT_DIR/var.tar" ] || ! docker image inspect "$NODE_IMAGE" >/dev/null 2>&1; then
+    echo "❌ Snapshot $NAME not found in $SNAPSHOT_DIR"
+    exit 1
+  fi
+
+  echo "♻️  Restoring snapshot $NAME (replaces cluster $CLUSTER_NAME)..."
+  local start=$SECONDS
+  docker rm -f "$RUNNER_CONTAINER" >/dev/null 2>&1 || true
+  if kind get clusters 2>/dev/null | grep -q "^${CLUSTER_NAME}$"; then
+    kind delete cluster --name "$CLUSTER_NAME"
+  fi
+  for volume in $(docker volume ls -q --filter "name=${NODE}-var-"); do
+    docker volume rm "$volume" >/dev/null
+  done
+  docker network inspect kind >/dev/null 2>&1 || docker network create kind >/dev/null
+
+  # A fresh volume per restore, so every run starts from the same state
+  local var_volume="${NODE}-var-$(date +%s)"
+  docker volume create "$var_volume" >/dev/null
+  docker run --rm -v "$var_volume:/target" -v "$SNAPSHOT_DIR:/snapshot:ro" "$HELPER_IMAGE" \
+    tar -C /target -xf /snapshot/var.tar
+  if [ -f "$SNAPSHOT_DIR/runner-data.tar" ]; then
+    docker volume rm -f "$RUNNER_VOLUME" >/dev/null 2>&1 || true
+    docker volume create "$RUNNER_VOLUME" >/dev/null
+    docker run --rm -v "$RUNNER_VOLUME:/target" -v "$SNAPSHOT_DIR:/snapshot:ro" "$HELPER_IMAGE" \
+      tar -C /target -xf /snapshot/runner-data.tar
+  fi
+  cp "$SNAPSHOT_DIR"/kratix-ssh-key* /tmp/ 2>/dev/null || true
+
+  # One argument per line; read without mapfile, which macOS bash lacks
+  local run_args=()
+  while IFS= read -r arg; do
+    run_args+=("$arg")
+  done < <(python3 tools/kind_snapshot.py run-args "$SNAPSHOT_DIR/node.json" "$NODE_IMAGE" "$var_volume")
+  docker run "${run_args[@]}" >/dev/null
+
+  wait_for_cluster
+  start_runner
+  mark_owned
+
+  echo "✅ Restored snapshot $NAME in $((SECONDS - start))s"
+}
+
+ensure() {
+  if node_id >/dev/null && ! owned; then
+    echo "ℹ️  Cluster $CLUSTER_NAME was not created by this script; using it as it is"
+    echo "   Run '$0 restore' to replace it with snapshot $NAME."
+    return
+  fi
+
+  if [ -f "$SNAPSHOT_DIR/var.tar" ] && docker image inspect "$NODE_IMAGE" >/dev/null 2>&1; then
+    restore
+    return
+  fi
+
+  if kubectl cluster-info >/dev/null 2>&1; then
+    echo "ℹ️  No snapshot $NAME; using the current cluster"
+    return
+  fi
+
+  echo "🏗️  No snapshot $NAME; bootstrapping stages 1-5 once..."
+  for stage in 01-setup-cluster.sh 02-install-kratix.sh 03-setup-gitea.sh 04-configure-ssh-gitea.sh 05-setup-kratix-repo.sh; do
+    "$SCRIPT_DIR/$stage"
+  done
+  save
+  mark_owned
+}
+
+case "$COMMAND" in
+  save) save ;;
+  restore) restore ;;
+  ensure) ensure ;;
+  list)
+    for dir in "$SNAPSHOT_ROOT"/*/; do
+      if [ -f "$dir/var.tar" ]; then
+        echo "  $(basename "$dir")  $(du -sh "$dir" | cut -f1)"
+      fi
+    done
+    ;;
+  delete)
+    rm -rf "$SNAPSHOT_DIR"
+    docker image rm "$NODE_IMAGE" >/dev/null 2>&1 || true
+    echo "🗑️  Deleted snapshot $NAME"
+    ;;
+  *)
+    echo "Usage: $0 {save|restore|ensure|list|delete} [name]"
+    exit 1
+    ;;
+esac
@@ -0,0 +1,42 @@
+#!/bin/bash
+
+# Benchmark runner script for team-promise
+# Runs the configure pipeline benchmarks and compares against tracked baselines
+#
+# Usage:
+#   ./scripts/run-benchmarks.sh            # run and compare
+#   ./scripts/run-benchmarks.sh --update   # run and replace the baseline
+
+set -e # Exit on any error
+
+echo "⏱️  Running team-promise benchmarks..."
+echo
+
+cd tests
+
+# Check if virtual environment exists
+if [ ! -d "test-env" ]; then
+  echo "Creating virtual environment in tests/test-env/..."
+  python -m venv test-env
+fi
+
+echo "Activating virtual environment..."
+source test-env/bin/activate
+
+echo "Installing/updating test dependencies..."
+pip install -r requirements.txt
+
+echo
+echo "Running benchmarks..."
+PYTHONPATH=../promises/team-promise/workflows/resource/configure/team-configure/python/scripts python -m pytest benchmark/ -v
+
+echo
+echo "Comparing against baseline..."
+python benchmark/compare_baselines.py benchmark/results/latest.json benchmark/baselines/configure.json \
+  --threshold "${BENCHMARK_THRESHOLD:-0.25}" "$@"
+
+echo
+echo "✅ Benchmarks completed within threshold!"
+
+deactivate
+echo "Virtual environment deactivated."
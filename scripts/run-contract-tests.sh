@@ -24,7 +24,7 @@ pip install -r requirements.txt
 
 echo
 echo "Running contract tests..."
-python -m pytest contract/ -v
+PYTHONPATH=../promises/team-promise/workflows/resource/configure/team-configure/python/scripts python -m pytest contract/ -v
 
 echo
 echo "✅ All contract tests completed successfully!"
@@ -1,7 +1,9 @@
 #!/bin/bash
 
 # End-to-end test runner script for team-promise
-# Requires a running Kind cluster with Kratix installed
+# Starts from the stage 5 cluster snapshot (see cluster-snapshot.sh),
+# bootstrapping and saving one on first use; USE_SNAPSHOT=false runs against
+# the current cluster as it is
 # Follows the pattern of run-integration-tests.sh
 
 set -e # Exit on any error
@@ -9,6 +11,14 @@ set -e # Exit on any error
 echo "🔬 Running team-promise end-to-end tests..."
 echo
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Restores a warm snapshot of stages 1-5. A cluster the snapshot script didn't
+# create (built by hand or by CI) is left alone and used as it is
+if [ "${USE_SNAPSHOT:-true}" = "true" ]; then
+  $SCRIPT_DIR/cluster-snapshot.sh ensure
+fi
+
 # Check cluster is accessible
 if ! kubectl cluster-info >/dev/null 2>&1; then
   echo "❌ Kubernetes cluster not accessible."
@@ -16,7 +26,6 @@ if ! kubectl cluster-info >/dev/null 2>&1; then
   exit 1
 fi
 
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 $SCRIPT_DIR/update-promise.sh
 
 echo "⏳ Waiting for Promise to be ready..."
@@ -38,7 +47,8 @@ pip install -r requirements.txt
 
 echo
 echo "Running end-to-end tests..."
-python -m pytest e2e/ -v -s
+# The soak runs take an hour or more; ./scripts/run-soak-tests.sh runs them
+python -m pytest e2e/ -v -s -m "not soak"
 
 echo
 echo "✅ All end-to-end tests completed successfully!"
@@ -1,7 +1,9 @@
 #!/bin/bash
 
 # Integration test runner script for team-promise
-# Requires a running Kind cluster with Kratix installed
+# Starts from the stage 5 cluster snapshot (see cluster-snapshot.sh),
+# bootstrapping and saving one on first use; USE_SNAPSHOT=false runs against
+# the current cluster as it is
 # Follows the instructions in CLAUDE.md
 
 set -e # Exit on any error
@@ -9,6 +11,14 @@ set -e # Exit on any error
 echo "🔗 Running team-promise integration tests..."
 echo
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Restores a warm snapshot of stages 1-5. A cluster the snapshot script didn't
+# create (built by hand or by CI) is left alone and used as it is
+if [ "${USE_SNAPSHOT:-true}" = "true" ]; then
+  $SCRIPT_DIR/cluster-snapshot.sh ensure
+fi
+
 # Check cluster is accessible
 if ! kubectl cluster-info >/dev/null 2>&1; then
   echo "❌ Kubernetes cluster not accessible."
@@ -16,7 +26,6 @@ if ! kubectl cluster-info >/dev/null 2>&1; then
   exit 1
 fi
 
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 $SCRIPT_DIR/update-promise.sh
 
 echo "⏳ Waiting for Promise to be ready..."
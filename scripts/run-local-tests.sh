@@ -0,0 +1,33 @@
+#!/bin/bash
+
+# Local pipeline test runner script for team-promise
+# Runs the Team Promise against the in-process fake Kratix harness
+
+set -e  # Exit on any error
+
+echo "🏠 Running team-promise local pipeline tests (no cluster required)..."
+echo
+
+cd tests
+
+# Check if virtual environment exists
+if [ ! -d "test-env" ]; then
+    echo "Creating virtual environment in tests/test-env/..."
+    python -m venv test-env
+fi
+
+echo "Activating virtual environment..."
+source test-env/bin/activate
+
+echo "Installing/updating test dependencies..."
+pip install -r requirements.txt
+
+echo
+echo "Running local pipeline tests..."
+PYTHONPATH=../promises/team-promise/workflows/resource/configure/team-configure/python/scripts python -m pytest local/ -v
+
+echo
+echo "✅ All local pipeline tests completed successfully!"
+
+deactivate
+echo "Virtual environment deactivated."
\ No newline at end of file
@@ -0,0 +1,81 @@
+#!/bin/bash
+
+# Soak and recovery test runner for team-promise
+# Runs sustained Team create/update/delete load with one fault per run
+# (controller restart, gitea-ssh outage, Actions runner death mid-apply) and
+# compares time-to-convergence and stuck/orphaned/duplicate orgs with the
+# releases tracked in tests/e2e/baselines/soak.json
+#
+# Usage:
+#   ./scripts/run-soak-tests.sh                    # all faults, compare with the last release
+#   ./scripts/run-soak-tests.sh -k runner-death    # one fault
+#   SOAK_RECORD=true ./scripts/run-soak-tests.sh   # also record this release's numbers
+#
+# Tuning: SOAK_TEAMS (20), SOAK_DURATION (600s), SOAK_OPS_PER_MINUTE (30),
+# SOAK_FAULT_SECONDS (60), SOAK_SETTLE_TIMEOUT (900s); SOAK_RELEASE defaults
+# to git describe
+
+set -e # Exit on any error
+
+echo "🌊 Running team-promise soak tests..."
+echo
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SOAK_RELEASE="${SOAK_RELEASE:-$(git -C "$SCRIPT_DIR/.." describe --tags --always --dirty)}"
+
+# Faults change the cluster, so each run starts from a fresh snapshot
+# (USE_SNAPSHOT=false to skip, see run-e2e-tests.sh)
+if [ "${USE_SNAPSHOT:-true}" = "true" ]; then
+  $SCRIPT_DIR/cluster-snapshot.sh ensure
+fi
+
+if ! kubectl cluster-info >/dev/null 2>&1; then
+  echo "❌ Kubernetes cluster not accessible."
+  echo "   Run ./scripts/build-poc.sh first."
+  exit 1
+fi
+
+$SCRIPT_DIR/update-promise.sh
+
+echo "⏳ Waiting for Promise to be ready..."
+kubectl wait --for=condition=Available promise/team --timeout=180s
+
+cd tests
+
+if [ ! -d "test-env" ]; then
+  echo "Creating virtual environment in tests/test-env/..."
+  python -m venv test-env
+fi
+
+echo "Activating virtual environment..."
+source test-env/bin/activate
+
+echo "Installing/updating test dependencies..."
+pip install -r requirements.txt
+
+echo
+echo "Running soak tests for release $SOAK_RELEASE..."
+# Compare even when a fault failed its assertions. A results file left by an
+# earlier run must not be compared (or recorded) as this one's
+rm -f e2e/results/soak.json
+STATUS=0
+python -m pytest e2e/test_soak.py -v -s -m soak "$@" || STATUS=$?
+
+if [ -f e2e/results/soak.json ]; then
+  echo
+  echo "📊 Comparing with earlier releases..."
+  RECORD_ARGS=()
+  if [ "${SOAK_RECORD:-false}" = "true" ]; then
+    RECORD_ARGS=(--record)
+  fi
+  python e2e/soak.py e2e/results/soak.json --release "$SOAK_RELEASE" "${RECORD_ARGS[@]}" || STATUS=1
+fi
+
+deactivate
+echo "Virtual environment deactivated."
+
+if [ "$STATUS" -ne 0 ]; then
+  echo "❌ Soak tests found regressions or unconverged changes"
+  exit "$STATUS"
+fi
+echo "✅ Soak tests completed!"
@@ -24,7 +24,7 @@ pip install -r requirements.txt
 
 echo
 echo "Running unit tests..."
-PYTHONPATH=../promises/team-promise/workflows/resource/configure/team-configure/python/scripts python -m pytest unit/ -v
+PYTHONPATH=../promises/team-promise/workflows/resource/configure/team-configure/python/scripts python -m pytest unit/ tools/ -v
 
 echo
 echo "✅ All unit tests completed successfully!"
@@ -0,0 +1,63 @@
+#!/bin/bash
+
+# Fan team outputs out to a catalog repository and the infra (kratix) repository
+# Run after Stage 6; replaces the single gitea-destination
+
+set -e
+
+# Source central Gitea configuration
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/gitea-config.sh"
+
+echo "🚀 Setting up catalog and infra Destinations..."
+
+if ! kubectl get gitstatestore default >/dev/null 2>&1; then
+  echo "❌ Default GitStateStore not found. Run Stages 4-6 first."
+  exit 1
+fi
+
+GITEA_USERNAME=$(kubectl get secret gitea-credentials -o jsonpath='{.data.username}' | base64 -d)
+GITEA_PASSWORD=$(kubectl get secret gitea-credentials -o jsonpath='{.data.password}' | base64 -d)
+
+echo "📁 Creating backstage-catalog repository..."
+REPO_RESPONSE=$(gitea_curl -s -X POST \
+  "$(gitea_local_url)/api/v1/user/repos" \
+  -u "$GITEA_USERNAME:$GITEA_PASSWORD" \
+  -H "Content-Type: application/json" \
+  -d '{
+    "name": "backstage-catalog",
+    "description": "Backstage catalog entities generated by Kratix",
+    "private": false,
+    "auto_init": true,
+    "default_branch": "main"
+  }')
+
+if echo "$REPO_RESPONSE" | grep -q "already exists"; then
+  echo "⚠️  backstage-catalog repository already exists, continuing..."
+elif echo "$REPO_RESPONSE" | grep -q "clone_url"; then
+  echo "✅ backstage-catalog repository created successfully"
+else
+  echo "❌ Failed to create repository: $REPO_RESPONSE"
+  exit 1
+fi
+
+echo "🏗️  Applying catalog GitStateStore and labelled Destinations..."
+kubectl apply -f manifests/gitea-multi-destination.yaml
+kubectl delete destination gitea-destination --ignore-not-found=true
+
+echo "📦 Enabling destination selectors in the Team Promise and its sub-promises..."
+for promise in team team-org team-catalog team-repos; do
+  sed -e '/name: CATALOG_DESTINATION_SELECTOR/{n;s/value: ""/value: repo=catalog/;}' \
+    -e '/name: INFRA_DESTINATION_SELECTOR/{n;s/value: ""/value: repo=infra/;}' \
+    "promises/$promise-promise/promise.yaml" | kubectl apply -f -
+done
+
+echo "✅ Multi-destination setup complete!"
+echo ""
+echo "📋 Destinations:"
+echo "  Catalog: $(gitea_local_url)/$GITEA_USERNAME/backstage-catalog (Backstage Groups)"
+echo "  Infra:   $(gitea_local_url)/$GITEA_USERNAME/kratix (Terraform, membership)"
+echo ""
+echo "🔧 Verification:"
+kubectl get gitstatestore
+kubectl get destinations --show-labels
@@ -27,5 +27,13 @@ else
 fi
 kind load docker-image -n "$CLUSTER_NAME" "$IMAGE_TAG"
 
+# Install the composite Team's sub-promises first; they share the image above
+for promise in team-org team-catalog team-repos; do
+  kubectl apply -f "promises/$promise-promise/promise.yaml"
+done
+
 # Install the Team Promise
 kubectl apply -f promises/team-promise/promise.yaml
+
+# Retention for finished pipeline Jobs and pods; runs from the same image
+kubectl apply -f manifests/pipeline-gc.yaml
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Time deploy-job checkouts of a state-store repo with long history.
+
+Builds a synthetic kratix repo with git fast-import. Its history matches what
+the POC produces: each Team gets a Work commit (Backstage file plus
+terraform/org-<id>.tf), followed by a "[skip ci] Update Terraform state" commit
+that rewrites .tfstate/terraform.tfstate. The script then times the checkout
+strategies a deploy job could use:
+
+  full     git clone (history and every file)
+  shallow  --depth 1
+  sparse   --depth 1 --filter=blob:none --sparse, limited to the paths the
+           deploy job reads (what actions/checkout does with sparse-checkout)
+
+Usage:
+  python benchmark/checkout_time.py --commits 10000
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+# Non-cone patterns, as in deploy-organizations.yml, so root files are skipped
+SPARSE_PATTERNS = ["/terraform/", "/.tfstate/", "/scripts/", "/members/"]
+
+ORG_TF = """resource "gitea_org" "team_{id}" {{
+  name        = "{id}"
+  full_name   = "Team {n}"
+  description = "Organization for team Team {n} ({id}@example.com)"
+  website     = ""
+  location    = ""
+  visibility  = "public"
+}}
+"""
+
+BACKSTAGE = """apiVersion: backstage.io/v1alpha1
+kind: Group
+metadata:
+  name: {id}
+  description: Team Team {n}
+spec:
+  type: team
+  displayName: Team {n}
+  children: []
+"""
+
+
+def _blob(data: str) -> bytes:
+  encoded = data.encode("utf-8")
+  return f"data {len(encoded)}\n".encode("utf-8") + encoded + b"\n"
+
+
+def build_repo(path: Path, commits: int, teams: int) -> None:
+  """Create a bare repo at *path* with *commits* commits alternating Work and state updates."""
+  subprocess.run(["git", "init", "-q", "--bare", str(path)], check=True)
+  importer = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=path, stdin=subprocess.PIPE)
+  assert importer.stdin is not None
+
+  state: dict[str, dict[str, str]] = {}
+  when = 1_700_000_000
+  for i in range(commits):
+    n = (i // 2) % teams
+    team_id = f"team-{n:05d}"
+    if i % 2 == 0:
+      message = f"Update from: {team_id}-team-configure"
+      files = {
+        f"backstage-team-{team_id}.yaml": BACKSTAGE.format(id=team_id, n=n),
+        f"terraform/org-{team_id}.tf": ORG_TF.format(id=team_id, n=n) + f"# revision {i}\n",
+      }
+    else:
+      message = "[skip ci] Update Terraform state"
+      state[team_id] = {"id": str(n), "name": team_id, "full_name": f"Team {n}", "serial": str(i)}
+      files = {".tfstate/terraform.tfstate": json.dumps({"version": 4, "serial": i, "resources": state}, indent=2)}
+
+    header = (
+      f"commit refs/heads/main\n"
+      f"committer Kratix <kratix@example.com> {when + i} +0000\n"
+    ).encode("utf-8")
+    # Without a from line, fast-import commits on top of the branch tip
+    importer.stdin.write(header + _blob(message))
+    for file_path, content in files.items():
+      importer.stdin.write(f"M 100644 inline {file_path}\n".encode("utf-8") + _blob(content))
+    importer.stdin.write(b"\n")
+
+  importer.stdin.close()
+  if importer.wait() != 0:
+    raise RuntimeError("git fast-import failed")
+  subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=path, check=True)
+  subprocess.run(["git", "gc", "-q", "--aggressive"], cwd=path, check=True)
+  # Shallow and filtered fetches need the server to allow them, as Gitea does
+  subprocess.run(["git", "config", "uploadpack.allowFilter", "true"], cwd=path, check=True)
+
+
+def clone(url: str, target: Path, strategy: str) -> float:
+  """Clone with *strategy* and return the elapsed seconds."""
+  args = ["git", "clone", "-q", "--no-local"]
+  if strategy in ("shallow", "sparse"):
+    args += ["--depth", "1"]
+  if strategy == "sparse":
+    args += ["--filter=blob:none", "--sparse"]
+
+  start = time.perf_counter()
+  subprocess.run([*args, url, str(target)], check=True)
+  if strategy == "sparse":
+    subprocess.run(["git", "sparse-checkout", "set", "--no-cone", *SPARSE_PATTERNS], cwd=target, check=True)
+  return time.perf_counter() - start
+
+
+def directory_size(path: Path) -> int:
+  return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--commits", type=int, default=10_000)
+  parser.add_argument("--teams", type=int, default=500, help="Distinct teams the commits cycle through")
+  parser.add_argument("--runs", type=int, default=3, help="Clones per strategy; the median is reported")
+  parser.add_argument("--output", type=Path, help="Write the results as JSON")
+  args = parser.parse_args(argv)
+
+  results: dict[str, dict[str, float]] = {}
+  with tempfile.TemporaryDirectory() as tmp:
+    repo = Path(tmp) / "kratix.git"
+    start = time.perf_counter()
+    build_repo(repo, args.commits, args.teams)
+    print(f"🏗️  Built {args.commits} commits in {time.perf_counter() - start:.1f}s ({directory_size(repo) / 1e6:.1f} MB packed)")
+
+    for strategy in ("full", "shallow", "sparse"):
+      timings = []
+      size = 0
+      for run in range(args.runs):
+        target = Path(tmp) / f"{strategy}-{run}"
+        timings.append(clone(f"file://{repo}", target, strategy))
+        size = directory_size(target)
+        shutil.rmtree(target)
+      timings.sort()
+      results[strategy] = {"seconds": round(timings[len(timings) // 2], 3), "bytes": size}
+      print(f"⏱️  {strategy:8s} {results[strategy]['seconds']:7.3f}s  {size / 1e6:8.1f} MB on disk")
+
+  if args.output:
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+      json.dump({"commits": args.commits, "teams": args.teams, "strategies": results}, f, indent=2)
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Compare benchmark results against a tracked baseline.
+
+Usage:
+  python compare_baselines.py results/latest.json baselines/configure.json
+  python compare_baselines.py results/latest.json baselines/configure.json --update
+
+Exits non-zero if any tracked metric regressed by more than the threshold.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+from typing import Any
+
+
+# Metrics where a higher value is a regression
+TRACKED_METRICS = ("seconds", "render_rss_kb", "bytes_written")
+
+
+def compare(latest: dict[str, Any], baseline: dict[str, Any], threshold: float, min_delta_seconds: float = 0.0, min_delta_rss_kb: int = 0) -> list[str]:
+  """Return a description of every metric that regressed beyond *threshold*.
+
+  Timing changes smaller than *min_delta_seconds* and RSS changes smaller than
+  *min_delta_rss_kb* are reported but never counted as regressions, so
+  millisecond-scale and small-heap scenarios don't flake.
+  """
+  regressions: list[str] = []
+  for name, base in sorted(baseline.get("scenarios", {}).items()):
+    current = latest.get("scenarios", {}).get(name)
+    if current is None:
+      regressions.append(f"{name}: missing from results")
+      continue
+    for metric in TRACKED_METRICS:
+      before = base.get(metric)
+      after = current.get(metric)
+      if not before or after is None:
+        continue
+      change = (after - before) / before
+      line = f"{name}.{metric}: {before} -> {after} ({change:+.1%})"
+      print(line)
+      if metric == "seconds" and after - before < min_delta_seconds:
+        continue
+      if metric == "render_rss_kb" and after - before < min_delta_rss_kb:
+        continue
+      if change > threshold:
+        regressions.append(line)
+  return regressions
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("latest", help="Results JSON written by the benchmark run")
+  parser.add_argument("baseline", help="Tracked baseline JSON")
+  parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression (default: 0.25)")
+  parser.add_argument("--min-delta-seconds", type=float, default=0.05, help="Ignore timing regressions smaller than this (default: 0.05)")
+  parser.add_argument("--min-delta-rss-kb", type=int, default=1024, help="Ignore RSS regressions smaller than this (default: 1024)")
+  parser.add_argument("--update", action="store_true", help="Replace the baseline with the latest results")
+  args = parser.parse_args()
+
+  if args.update:
+    shutil.copyfile(args.latest, args.baseline)
+    print(f"Updated baseline {args.baseline}")
+    return 0
+
+  with open(args.latest) as f:
+    latest = json.load(f)
+  with open(args.baseline) as f:
+    baseline = json.load(f)
+
+  regressions = compare(latest, baseline, args.threshold, args.min_delta_seconds, args.min_delta_rss_kb)
+  if regressions:
+    print(f"\nRegressions beyond {args.threshold:.0%}:")
+    for line in regressions:
+      print(f"  {line}")
+    return 1
+
+  print("\nNo regressions beyond threshold")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
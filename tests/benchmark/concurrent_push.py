@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Time concurrent pushes to a state-store repo, with rejection and rebase-conflict rates.
+
+Simulates the two kinds of writers the kratix repo sees:
+
+  kratix  one writer per Kratix reconcile in flight. Each commit writes a
+          Team's Backstage file and terraform/org-<id>.tf and is pushed
+          without a rebase. A rejected push starts over from a fresh fetch
+          after a jittered exponential backoff, as the requeued reconcile
+          would.
+  state   deploy-organizations.yml runs. Each checks out the tip, waits
+          --apply-seconds (plan and apply), rewrites .tfstate/terraform.tfstate
+          and commits. It then fetches, rebases and pushes up to 8 times with
+          the workflow's jittered backoff (up to 1s, 2s, 4s ... capped at
+          30s). A rebase that stops on a conflict is aborted and retried the
+          same way; the run fails once the attempts are used up.
+          The workflow's concurrency group allows one run at a time, so more
+          than one state writer shows what happens without it.
+
+A commit's latency runs from its first attempt to the accepted push. Without
+--remote the writers push to a local bare repo, which measures git alone. With
+--remote they push to a scratch branch of that repo (deleted afterwards), so
+running it against the POC's Gitea with each profile of 03-setup-gitea.sh
+compares them:
+
+  python benchmark/concurrent_push.py --kratix-writers 16 --commits 20
+  python benchmark/concurrent_push.py --remote ssh://git@localhost:30222/gitea_admin/kratix.git \\
+    --output benchmark/results/concurrent_push.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+STATE_FILE = ".tfstate/terraform.tfstate"
+# Retry policy of the Commit Terraform state step in deploy-organizations.yml
+STATE_PUSH_ATTEMPTS = 8
+STATE_BACKOFF_BASE_SECONDS = 1.0
+STATE_BACKOFF_MAX_SECONDS = 30.0
+# Kratix requeues a failed reconcile with controller-runtime's backoff
+BACKOFF_BASE_SECONDS = 0.05
+BACKOFF_MAX_SECONDS = 2.0
+# Messages git prints when another push won the race for the branch
+REJECTIONS = ("[rejected]", "fetch first", "non-fast-forward", "cannot lock ref", "failed to update ref")
+
+ORG_TF = """resource "gitea_org" "team_{id}" {{
+  name        = "{id}"
+  full_name   = "Team {id}"
+  description = "Organization for team Team {id} ({id}@example.com)"
+  visibility  = "public"
+}}
+# revision {revision}
+"""
+
+BACKSTAGE = """apiVersion: backstage.io/v1alpha1
+kind: Group
+metadata:
+  name: {id}
+spec:
+  type: team
+  displayName: Team {id}
+  children: []
+"""
+
+
+class PushError(RuntimeError):
+  """A push failed for a reason other than losing the race for the branch."""
+
+
+@dataclass
+class WriterStats:
+  """Outcomes of one kind of writer."""
+
+  latencies: list[float] = field(default_factory=list)
+  rejections: int = 0
+  rebase_conflicts: int = 0
+  failed: int = 0
+  errors: list[str] = field(default_factory=list)
+  lock: threading.Lock = field(default_factory=threading.Lock)
+
+  def summary(self) -> dict[str, Any]:
+    ordered = sorted(self.latencies)
+    attempted = len(ordered) + self.failed
+    return {
+      "commits": len(ordered),
+      "failed": self.failed,
+      "rejections_per_commit": round(self.rejections / attempted, 3) if attempted else None,
+      "rebase_conflicts": self.rebase_conflicts,
+      "rebase_conflict_rate": round(self.rebase_conflicts / attempted, 3) if attempted else None,
+      "p50_seconds": round(statistics.median(ordered), 3) if ordered else None,
+      "p95_seconds": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3) if ordered else None,
+      "max_seconds": round(ordered[-1], 3) if ordered else None,
+      "errors": self.errors[:5],
+    }
+
+
+def git(cwd: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+  return subprocess.run(
+    ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+    cwd=cwd, capture_output=True, text=True, check=check,
+  )
+
+
+def push(clone: Path, branch: str) -> bool:
+  """Push HEAD to *branch*; False when the push was rejected by a concurrent one."""
+  result = git(clone, "push", "-q", "origin", f"HEAD:refs/heads/{branch}", check=False)
+  if result.returncode == 0:
+    return True
+  if any(marker in result.stderr for marker in REJECTIONS):
+    return False
+  raise PushError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"git push exited {result.returncode}")
+
+
+def sync(clone: Path, branch: str) -> None:
+  git(clone, "fetch", "-q", "--depth=1", "origin", branch)
+  git(clone, "reset", "-q", "--hard", "FETCH_HEAD")
+
+
+def kratix_writer(url: str, branch: str, workdir: Path, writer: int, commits: int, retries: int, stats: WriterStats) -> None:
+  clone = workdir / f"kratix-{writer}"
+  git(workdir, "clone", "-q", "--depth=1", "--branch", branch, url, str(clone))
+  for n in range(commits):
+    team_id = f"w{writer:03d}-team-{n:04d}"
+    start = time.perf_counter()
+    rejected = 0
+    try:
+      for attempt in range(retries + 1):
+        if attempt:
+          time.sleep(random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)))
+        sync(clone, branch)
+        (clone / "terraform").mkdir(exist_ok=True)
+        (clone / f"backstage-team-{team_id}.yaml").write_text(BACKSTAGE.format(id=team_id))
+        (clone / "terraform" / f"org-{team_id}.tf").write_text(ORG_TF.format(id=team_id, revision=n))
+        git(clone, "add", "-A")
+        git(clone, "commit", "-q", "-m", f"Update from: {team_id}-team-configure")
+        if push(clone, branch):
+          break
+        rejected += 1
+      else:
+        raise PushError(f"still rejected after {retries} retries")
+      elapsed = time.perf_counter() - start
+      with stats.lock:
+        stats.latencies.append(elapsed)
+        stats.rejections += rejected
+    except (PushError, subprocess.CalledProcessError) as e:
+      with stats.lock:
+        stats.rejections += rejected
+        stats.failed += 1
+        stats.errors.append(f"kratix-{writer}: {e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) else e}")
+
+
+def state_writer(url: str, branch: str, workdir: Path, writer: int, commits: int, apply_seconds: float, stats: WriterStats) -> None:
+  clone = workdir / f"state-{writer}"
+  git(workdir, "clone", "-q", "--depth=1", "--branch", branch, url, str(clone))
+  for n in range(commits):
+    start = time.perf_counter()
+    rejected = 0
+    conflicts = 0
+    pushed = False
+    sync(clone, branch)
+    time.sleep(apply_seconds)
+    state = json.loads((clone / STATE_FILE).read_text())
+    state["serial"] += 1
+    state["lineage_writer"] = f"state-{writer}"
+    (clone / STATE_FILE).write_text(json.dumps(state, indent=2) + "\n")
+    git(clone, "commit", "-q", "-am", "[skip ci] Update Terraform state")
+    try:
+      for attempt in range(STATE_PUSH_ATTEMPTS):
+        if attempt:
+          time.sleep(random.uniform(0, min(STATE_BACKOFF_MAX_SECONDS, STATE_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))))
+        git(clone, "fetch", "-q", "origin", branch)
+        if git(clone, "rebase", "-q", "FETCH_HEAD", check=False).returncode != 0:
+          git(clone, "rebase", "--abort", check=False)
+          conflicts += 1
+          continue
+        if push(clone, branch):
+          pushed = True
+          break
+        rejected += 1
+    except PushError as e:
+      with stats.lock:
+        stats.errors.append(f"state-{writer}: {e}")
+    with stats.lock:
+      stats.rejections += rejected
+      stats.rebase_conflicts += conflicts
+      if pushed:
+        stats.latencies.append(time.perf_counter() - start)
+      else:
+        stats.failed += 1
+
+
+def seed_local(workdir: Path) -> str:
+  """A bare repo with a Terraform state file on main; returns its URL."""
+  bare = workdir / "kratix.git"
+  subprocess.run(["git", "init", "-q", "--bare", str(bare)], check=True)
+  seed = workdir / "seed"
+  seed.mkdir()
+  git(seed, "init", "-q")
+  (seed / ".tfstate").mkdir()
+  (seed / STATE_FILE).write_text(json.dumps({"version": 4, "serial": 0, "resources": []}, indent=2) + "\n")
+  git(seed, "add", "-A")
+  git(seed, "commit", "-q", "-m", "Seed state store")
+  git(seed, "push", "-q", f"file://{bare}", "HEAD:refs/heads/main")
+  return f"file://{bare}"
+
+
+def create_branch(url: str, base: str, branch: str, workdir: Path) -> None:
+  """Create *branch* from *base* on the remote, with a state file to rewrite."""
+  setup = workdir / "setup"
+  git(workdir, "clone", "-q", "--depth=1", "--branch", base, url, str(setup))
+  if not (setup / STATE_FILE).exists():
+    (setup / ".tfstate").mkdir(exist_ok=True)
+    (setup / STATE_FILE).write_text(json.dumps({"version": 4, "serial": 0, "resources": []}, indent=2) + "\n")
+    git(setup, "add", "-f", STATE_FILE)
+    git(setup, "commit", "-q", "-m", "[skip ci] Seed Terraform state")
+  git(setup, "push", "-q", "origin", f"HEAD:refs/heads/{branch}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--kratix-writers", type=int, default=8, help="Concurrent Kratix-style writers (default: 8)")
+  parser.add_argument("--state-writers", type=int, default=1, help="Concurrent deploy-workflow state pushers (default: 1)")
+  parser.add_argument("--commits", type=int, default=10, help="Commits per writer (default: 10)")
+  parser.add_argument("--retries", type=int, default=20, help="Retries per Kratix commit before it counts as failed (default: 20)")
+  parser.add_argument("--apply-seconds", type=float, default=1.0, help="Time between a state writer's checkout and its commit (default: 1)")
+  parser.add_argument("--remote", help="Push to a scratch branch of this repo instead of a local bare repo")
+  parser.add_argument("--base", default="main", help="Branch of --remote the scratch branch starts from (default: main)")
+  parser.add_argument("--output", type=Path, help="Write the results as JSON")
+  args = parser.parse_args(argv)
+
+  kinds = {"kratix": WriterStats(), "state": WriterStats()}
+  branch = f"bench/concurrent-push-{uuid.uuid4().hex[:8]}"
+  with tempfile.TemporaryDirectory() as tmp:
+    workdir = Path(tmp)
+    url = args.remote or seed_local(workdir)
+    create_branch(url, args.base if args.remote else "main", branch, workdir)
+
+    threads = [
+      threading.Thread(target=kratix_writer, args=(url, branch, workdir, n, args.commits, args.retries, kinds["kratix"]))
+      for n in range(args.kratix_writers)
+    ] + [
+      threading.Thread(target=state_writer, args=(url, branch, workdir, n, args.commits, args.apply_seconds, kinds["state"]))
+      for n in range(args.state_writers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    elapsed = time.perf_counter() - start
+
+    if args.remote:
+      git(workdir / "setup", "push", "-q", "origin", "--delete", branch, check=False)
+
+  results = {
+    "target": args.remote or "local",
+    "kratix_writers": args.kratix_writers,
+    "state_writers": args.state_writers,
+    "commits_per_writer": args.commits,
+    "seconds": round(elapsed, 3),
+    "commits_per_second": round(sum(len(stats.latencies) for stats in kinds.values()) / elapsed, 2),
+    "writers": {kind: stats.summary() for kind, stats in kinds.items() if stats.latencies or stats.failed},
+  }
+  for kind, summary in results["writers"].items():
+    print(
+      f"⏱️  {kind:7s} {summary['commits']:5d} commits  p50 {summary['p50_seconds']}s  p95 {summary['p95_seconds']}s"
+      f"  max {summary['max_seconds']}s  {summary['rejections_per_commit']} rejections/commit"
+      f"  {summary['rebase_conflicts']} rebase conflicts  {summary['failed']} failed"
+    )
+    for error in summary["errors"]:
+      print(f"   ❌ {error}")
+  print(f"📊 {results['commits_per_second']} commits/s over {results['seconds']}s")
+
+  if args.output:
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+      json.dump(results, f, indent=2, sort_keys=True)
+  return 1 if any(stats.failed for stats in kinds.values()) else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,21 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+
+RESULTS_PATH = Path(__file__).parent / "results" / "latest.json"
+
+
+@pytest.fixture(scope="session")
+def benchmark_results() -> Iterator[dict[str, Any]]:
+  """Collect scenario metrics and write them as JSON at the end of the session."""
+  results: dict[str, Any] = {}
+  yield results
+
+  output = Path(os.environ.get("BENCHMARK_OUTPUT", RESULTS_PATH))
+  output.parent.mkdir(parents=True, exist_ok=True)
+  with open(output, "w") as f:
+    json.dump({"scenarios": results}, f, indent=2, sort_keys=True)
@@ -0,0 +1,183 @@
+"""Benchmark harness for the Team Promise configure pipeline.
+
+Each scenario runs ``configure.main()`` in a fresh spawned interpreter against
+temporary input/output/metadata directories (the same ``ks.set_*_dir`` hooks
+the unit tests use), so wall time, RSS and bytes written are measured for the
+scenario alone rather than for the pytest process hosting it.
+
+The interpreter's imports set a peak RSS that is the same for every scenario
+and is never exceeded by a render, so ``render_rss_kb`` is the growth of the
+current RSS over the render loop instead.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import queue as queue_module
+import resource
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+
+@dataclass
+class Scenario:
+  """A named configure workload: how many teams and which templates."""
+
+  name: str
+  teams: int = 1
+  template_repeat: int = 1
+  display_name_length: int = 12
+
+
+@dataclass
+class BenchmarkResult:
+  """Metrics captured for one scenario run."""
+
+  scenario: str
+  teams: int
+  seconds: float
+  seconds_per_team: float
+  render_rss_kb: int
+  bytes_written: int
+  files_written: int
+
+  def to_dict(self) -> Dict[str, Any]:
+    return asdict(self)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+  "single-resource": Scenario("single-resource"),
+  "1k-resources": Scenario("1k-resources", teams=1000),
+  "large-template": Scenario("large-template", teams=50, template_repeat=200, display_name_length=200),
+}
+
+
+def team_resource(index: int, display_name_length: int = 12) -> Dict[str, Any]:
+  """Build a Team resource like the unit test fixtures."""
+  display_name = f"Bench Team {index} ".ljust(display_name_length, "x")
+  return {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": f"bench-team-{index}", "namespace": "default"},
+    "spec": {
+      "id": f"bench-{index}",
+      "name": display_name,
+      "email": f"bench-{index}@example.com",
+    },
+  }
+
+
+def _rss_kb() -> int:
+  """Current resident set size; ru_maxrss (the peak) where /proc is missing"""
+  try:
+    with open("/proc/self/status") as f:
+      for line in f:
+        if line.startswith("VmRSS:"):
+          return int(line.split()[1])
+  except OSError:
+    pass
+  return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _directory_size(path: Path) -> Tuple[int, int]:
+  total = 0
+  count = 0
+  for file in path.rglob("*"):
+    if file.is_file():
+      total += file.stat().st_size
+      count += 1
+  return total, count
+
+
+def _prepare_templates(configure: Any, work_dir: Path, repeat: int) -> None:
+  """Point configure at a template directory with *repeat* copies of the org template."""
+  if repeat == 1:
+    return
+
+  template_dir = work_dir / "templates"
+  shutil.copytree(configure.TEMPLATE_DIR, template_dir)
+  org_template = template_dir / "organization.tf.template"
+  content = org_template.read_text()
+  org_template.write_text("\n".join(
+    content.replace("team_{{team_id}}", f"team_{{{{team_id}}}}_{n}")
+    for n in range(repeat)
+  ))
+  configure.TEMPLATE_DIR = str(template_dir)
+
+
+def _run_scenario(scenario: Scenario, queue: "multiprocessing.Queue[Dict[str, Any]]") -> None:
+  import configure
+  import kratix_sdk as ks
+
+  with tempfile.TemporaryDirectory() as tmp:
+    work_dir = Path(tmp)
+    input_dir = work_dir / "input"
+    output_dir = work_dir / "output"
+    metadata_dir = work_dir / "metadata"
+    for d in (input_dir, output_dir, metadata_dir):
+      d.mkdir()
+
+    ks.set_input_dir(str(input_dir))
+    ks.set_output_dir(str(output_dir))
+    ks.set_metadata_dir(str(metadata_dir))
+    _prepare_templates(configure, work_dir, scenario.template_repeat)
+
+    inputs: List[str] = [
+      yaml.dump(team_resource(i, scenario.display_name_length))
+      for i in range(scenario.teams)
+    ]
+
+    elapsed = 0.0
+    rss_before = _rss_kb()
+    with contextlib.redirect_stdout(io.StringIO()):
+      for content in inputs:
+        (input_dir / "object.yaml").write_text(content)
+        start = time.perf_counter()
+        configure.main()
+        elapsed += time.perf_counter() - start
+    rss_after = _rss_kb()
+
+    bytes_written, files_written = _directory_size(output_dir)
+    queue.put(BenchmarkResult(
+      scenario=scenario.name,
+      teams=scenario.teams,
+      seconds=round(elapsed, 6),
+      seconds_per_team=round(elapsed / scenario.teams, 9),
+      render_rss_kb=rss_after - rss_before,
+      bytes_written=bytes_written,
+      files_written=files_written,
+    ).to_dict())
+
+
+def run_scenario(scenario: Scenario) -> BenchmarkResult:
+  """Run *scenario* in a spawned child process and return its metrics."""
+  ctx = multiprocessing.get_context("spawn")
+  queue = ctx.Queue()
+  proc = ctx.Process(target=_run_scenario, args=(scenario, queue))
+  proc.start()
+  deadline = time.monotonic() + float(os.environ.get("BENCHMARK_TIMEOUT", "600"))
+  data: Optional[Dict[str, Any]] = None
+  try:
+    # A child that crashed never reports, so stop waiting once it has exited
+    while data is None and time.monotonic() < deadline:
+      try:
+        data = queue.get(timeout=1)
+      except queue_module.Empty:
+        if not proc.is_alive():
+          break
+  finally:
+    if data is None and proc.is_alive():
+      proc.terminate()
+    proc.join()
+  if data is None:
+    raise RuntimeError(f"Benchmark scenario {scenario.name} exited with {proc.exitcode} before reporting")
+  if proc.exitcode != 0:
+    raise RuntimeError(f"Benchmark scenario {scenario.name} exited with {proc.exitcode}")
+  return BenchmarkResult(**data)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Measure the CPU and memory one team-configure pipeline container uses.
+
+Each run starts a fresh interpreter, as the pod's ``python3
+/scripts/configure.py`` does. The run imports the pipeline (kratix_sdk brings
+in the kubernetes client) and renders one Team. Its CPU seconds (user +
+system), peak RSS and wall time come from wait4(), so interpreter start-up and
+imports are included. The container's requests and limits have to cover them.
+Kratix's own reader and writer containers in the pod are not measured.
+
+Scenarios:
+
+  team        a Team like the unit test fixture
+  team-large  a Team with 200 members and 20 default repositories
+  team-data   the same, with TERRAFORM_LAYOUT=data
+
+The hierarchy index is a local file and the Gitea API is not called, so network
+time is left out. The CPU seconds are what a run costs, whatever the request.
+
+Usage:
+  python benchmark/pipeline_resources.py --runs 5 --output benchmark/results/pipeline_resources.json
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_DIR = PROJECT_ROOT / "promises/team-promise/workflows/resource/configure/team-configure/python/scripts"
+
+# Run in the child; the input, output and metadata directories are argv[1:4]
+DRIVER = """
+import sys
+import kratix_sdk as ks
+ks.set_input_dir(sys.argv[1])
+ks.set_output_dir(sys.argv[2])
+ks.set_metadata_dir(sys.argv[3])
+import configure
+configure.main()
+"""
+
+# Memory headroom over the highest peak RSS measured, then rounded up to MEMORY_STEP_MIB
+MEMORY_HEADROOM = 1.5
+MEMORY_STEP_MIB = 32
+
+
+def team(members: int = 0, repos: int = 0) -> dict[str, Any]:
+  spec: dict[str, Any] = {"id": "team-profile", "name": "Profile Team", "email": "profile@example.com"}
+  if members:
+    spec["members"] = [f"user-{n:04d}" for n in range(members)]
+  if repos:
+    spec["repos"] = [f"repo-{n:02d}" for n in range(repos)]
+  return {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "team-profile", "namespace": "default", "uid": "00000000-0000-0000-0000-000000000001", "generation": 1},
+    "spec": spec,
+  }
+
+
+SCENARIOS: dict[str, tuple[dict[str, Any], dict[str, str]]] = {
+  "team": (team(), {}),
+  "team-large": (team(members=200, repos=20), {}),
+  "team-data": (team(members=200, repos=20), {"TERRAFORM_LAYOUT": "data"}),
+}
+
+
+def run_once(resource: dict[str, Any], env: dict[str, str]) -> dict[str, float]:
+  """Run the pipeline once in a fresh interpreter; returns wall seconds, CPU seconds and peak RSS."""
+  with tempfile.TemporaryDirectory() as tmp:
+    work = Path(tmp)
+    dirs = [work / name for name in ("input", "output", "metadata")]
+    for d in dirs:
+      d.mkdir()
+    (dirs[0] / "object.yaml").write_text(yaml.safe_dump(resource))
+    child_env = {
+      **os.environ,
+      "PYTHONPATH": str(SCRIPTS_DIR),
+      "HIERARCHY_INDEX_PATH": str(work / "hierarchy.json"),
+      "GITEA_TOKEN": "",
+      "OTEL_EXPORTER_OTLP_ENDPOINT": "",
+      **env,
+    }
+    child_env.pop("HIERARCHY_INDEX_CONFIGMAP", None)
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+      [sys.executable, "-c", DRIVER, *map(str, dirs)],
+      env=child_env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    assert proc.stderr is not None
+    stderr = proc.stderr.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    # wait4 reaped the child, so Popen must not wait for it again
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    proc.stderr.close()
+    if proc.returncode != 0:
+      raise RuntimeError(f"Pipeline exited {proc.returncode}: {stderr.decode(errors='replace').strip()}")
+    return {
+      "seconds": elapsed,
+      "cpu_seconds": usage.ru_utime + usage.ru_stime,
+      # ru_maxrss is in KiB on Linux
+      "peak_rss_mib": usage.ru_maxrss / 1024,
+    }
+
+
+def profile(name: str, runs: int) -> dict[str, Any]:
+  resource, env = SCENARIOS[name]
+  samples = [run_once(resource, env) for _ in range(runs)]
+  return {
+    "runs": runs,
+    "seconds_p50": round(statistics.median(s["seconds"] for s in samples), 3),
+    "cpu_seconds_p50": round(statistics.median(s["cpu_seconds"] for s in samples), 3),
+    "cpu_seconds_max": round(max(s["cpu_seconds"] for s in samples), 3),
+    # CPU seconds per wall second: how many cores the run keeps busy
+    "cores_p50": round(statistics.median(s["cpu_seconds"] / s["seconds"] for s in samples), 2),
+    "peak_rss_mib_max": round(max(s["peak_rss_mib"] for s in samples), 1),
+  }
+
+
+def recommend(results: dict[str, dict[str, Any]]) -> dict[str, dict[str, str]]:
+  """Requests and limits covering the heaviest scenario.
+
+  Memory is requested at the peak RSS plus headroom and limited at twice that.
+  The pipeline is single-threaded and keeps one core busy for its whole run.
+  A small CPU request lets many short pods share a node. The one-core limit
+  still lets each pod run at full speed.
+  """
+  peak = max(result["peak_rss_mib_max"] for result in results.values())
+  memory = math.ceil(peak * MEMORY_HEADROOM / MEMORY_STEP_MIB) * MEMORY_STEP_MIB
+  return {
+    "requests": {"cpu": "100m", "memory": f"{memory}Mi"},
+    "limits": {"cpu": "1", "memory": f"{memory * 2}Mi"},
+  }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+  parser.add_argument("--runs", type=int, default=5, help="Pipeline runs per scenario (default: 5)")
+  parser.add_argument("--output", type=Path, help="Write the results as JSON")
+  args = parser.parse_args(argv)
+
+  results: dict[str, dict[str, Any]] = {}
+  for name in args.scenarios:
+    results[name] = profile(name, args.runs)
+    r = results[name]
+    print(
+      f"⏱️  {name:11s} {r['seconds_p50']:6.3f}s wall  {r['cpu_seconds_p50']:6.3f}s CPU (max {r['cpu_seconds_max']:.3f}s)"
+      f"  {r['cores_p50']:4.2f} cores  {r['peak_rss_mib_max']:6.1f} MiB peak RSS"
+    )
+  resources = recommend(results)
+  print(f"📊 Suggested container resources: {json.dumps(resources)}")
+
+  if args.output:
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+      json.dump({"python": sys.version.split()[0], "scenarios": results, "resources": resources}, f, indent=2, sort_keys=True)
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Measure Team-create to fully-provisioned latency per pipeline and provisioner mode.
+
+Needs a running POC cluster (./scripts/build-poc.sh). For each combination of
+pipeline mode (monolithic or composite) and provisioner, Teams are created
+with ``spec.pipelineMode``, ``spec.provisioner`` and ``spec.repos`` set and
+Gitea is polled for each milestone:
+
+  org      the organization exists
+  catalog  backstage-team-<id>.yaml is in the catalog state store repo
+  repos    every default repository exists
+
+The end-to-end latency is the time until all three are reached. terraform goes
+through Work -> Git -> Gitea Actions -> terraform apply; api creates the org
+from the pipeline. Composite Teams render through the TeamOrg,
+TeamCatalogEntry and TeamRepos pipelines in parallel. The Teams are then
+deleted.
+
+Usage:
+  python benchmark/provisioning_latency.py
+  python benchmark/provisioning_latency.py --pipeline-modes composite --modes api --samples 10
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+RESULTS_PATH = Path(__file__).parent / "results" / "provisioning.json"
+KRATIX_GROUP = "platform.kratix.io"
+KRATIX_VERSION = "v1alpha1"
+
+
+def gitea_token(core: Any) -> str:
+  """Admin token from GITEA_TOKEN or the gitea-admin-token Secret."""
+  if os.environ.get("GITEA_TOKEN"):
+    return os.environ["GITEA_TOKEN"]
+  secret = core.read_namespaced_secret("gitea-admin-token", "default")
+  return base64.b64decode(secret.data["token"]).decode("utf-8")
+
+
+def gitea_exists(gitea_url: str, token: str, api_path: str) -> bool:
+  request = urllib.request.Request(f"{gitea_url}/api/v1/{api_path}", headers={"Authorization": f"token {token}"})
+  try:
+    with urllib.request.urlopen(request, timeout=10):
+      return True
+  except urllib.error.HTTPError as e:
+    if e.code == 404:
+      return False
+    raise
+
+
+def milestones(team_id: str, repos: list[str], catalog_repo: str, catalog_prefix: str) -> dict[str, list[str]]:
+  """Gitea API paths that must all exist for each milestone."""
+  return {
+    "org": [f"orgs/{team_id}"],
+    "catalog": [f"repos/{catalog_repo}/contents/{catalog_prefix}backstage-team-{team_id}.yaml"],
+    "repos": [f"repos/{team_id}/{repo}" for repo in repos],
+  }
+
+
+def measure(custom: Any, args: argparse.Namespace, token: str, pipeline_mode: str, mode: str) -> dict[str, Optional[float]]:
+  """Create one Team and return seconds until each milestone, None for those that timed out."""
+  team_id = f"lat-{pipeline_mode[:4]}-{mode}-{uuid.uuid4().hex[:8]}"
+  body = {
+    "apiVersion": f"{KRATIX_GROUP}/{KRATIX_VERSION}",
+    "kind": "Team",
+    "metadata": {"name": team_id, "namespace": "default"},
+    "spec": {
+      "id": team_id,
+      "name": f"Latency {pipeline_mode} {mode}",
+      "provisioner": mode,
+      "pipelineMode": pipeline_mode,
+      "repos": args.repos,
+    },
+  }
+
+  pending = milestones(team_id, args.repos, args.catalog_repo, args.catalog_prefix)
+  reached: dict[str, Optional[float]] = {name: None for name in pending}
+  start = time.monotonic()
+  custom.create_namespaced_custom_object(KRATIX_GROUP, KRATIX_VERSION, "default", "teams", body)
+  try:
+    while pending and time.monotonic() - start < args.timeout:
+      for name, paths in list(pending.items()):
+        if all(gitea_exists(args.gitea_url, token, path) for path in paths):
+          reached[name] = time.monotonic() - start
+          del pending[name]
+      time.sleep(args.poll)
+  finally:
+    custom.delete_namespaced_custom_object(KRATIX_GROUP, KRATIX_VERSION, "default", "teams", team_id)
+
+  reached["end_to_end"] = None if pending else max(seconds for seconds in reached.values() if seconds is not None)
+  return reached
+
+
+def summarise(samples: list[float], timeouts: int) -> dict[str, Any]:
+  ordered = sorted(samples)
+  return {
+    "samples": len(samples),
+    "timeouts": timeouts,
+    "p50_seconds": round(statistics.median(ordered), 3) if ordered else None,
+    "p95_seconds": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3) if ordered else None,
+    "max_seconds": round(ordered[-1], 3) if ordered else None,
+  }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--pipeline-modes", nargs="+", default=["monolithic", "composite"], choices=["monolithic", "composite"])
+  parser.add_argument("--modes", nargs="+", default=["terraform", "api"], choices=["terraform", "api"], help="Provisioner modes")
+  parser.add_argument("--repos", nargs="*", default=["docs"], help="Default repositories per Team (default: docs)")
+  parser.add_argument("--samples", type=int, default=3, help="Teams created per combination (default: 3)")
+  parser.add_argument("--timeout", type=float, default=900, help="Seconds to wait for each Team (default: 900)")
+  parser.add_argument("--poll", type=float, default=1.0, help="Seconds between Gitea polls (default: 1)")
+  parser.add_argument("--gitea-url", default=os.environ.get("GITEA_URL", "http://localhost:8080"))
+  parser.add_argument("--catalog-repo", default="gitea_admin/kratix", help="owner/repo holding the Backstage files")
+  parser.add_argument("--catalog-prefix", default="", help="Directory of the Backstage files in that repo, with a trailing /")
+  parser.add_argument("--output", type=Path, default=RESULTS_PATH)
+  args = parser.parse_args(argv)
+
+  from kubernetes import client, config
+
+  config.load_kube_config()
+  custom = client.CustomObjectsApi()
+  token = gitea_token(client.CoreV1Api())
+
+  results: dict[str, Any] = {}
+  for pipeline_mode in args.pipeline_modes:
+    for mode in args.modes:
+      scenario = f"provisioning-{pipeline_mode}-{mode}"
+      samples: dict[str, list[float]] = {}
+      timeouts = 0
+      for n in range(args.samples):
+        reached = measure(custom, args, token, pipeline_mode, mode)
+        for name, seconds in reached.items():
+          if seconds is not None:
+            samples.setdefault(name, []).append(seconds)
+        if reached["end_to_end"] is None:
+          timeouts += 1
+          missed = ", ".join(name for name, seconds in reached.items() if seconds is None and name != "end_to_end")
+          print(f"⏱️  {scenario} #{n + 1}: timed out after {args.timeout:.0f}s waiting for {missed}")
+        else:
+          detail = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in reached.items() if name != "end_to_end")
+          print(f"⏱️  {scenario} #{n + 1}: {reached['end_to_end']:.1f}s ({detail})")
+
+      results[scenario] = summarise(samples.get("end_to_end", []), timeouts)
+      results[scenario]["milestones"] = {
+        name: summarise(values, args.samples - len(values)) for name, values in sorted(samples.items()) if name != "end_to_end"
+      }
+
+  args.output.parent.mkdir(parents=True, exist_ok=True)
+  with open(args.output, "w") as f:
+    json.dump({"repos": args.repos, "scenarios": results}, f, indent=2, sort_keys=True)
+
+  for name, summary in results.items():
+    print(f"📊 {name}: p50 {summary['p50_seconds']}s, p95 {summary['p95_seconds']}s, timeouts {summary['timeouts']}")
+  return 1 if any(summary["timeouts"] for summary in results.values()) else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
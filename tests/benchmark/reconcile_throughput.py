@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Measure how many Team reconciles per minute a cluster sustains, by node count.
+
+Needs a running POC cluster. Creates --teams Teams at once and polls their
+team-configure pipeline pods until every one has succeeded. It then records:
+
+  seconds            first create to the last pipeline pod finishing
+  per_minute         Teams reconciled per minute over that span
+  peak_running       the most pipeline pods running at once
+  schedule_wait      pod creation to pod start (p50/p95), where a full node
+                     shows up as a wait
+  pipeline           pod start to its last container finishing (p50/p95)
+  pods_per_node      where the pipeline pods ran
+
+The Teams use the Terraform provisioner, so no pipeline calls Gitea. They are
+deleted afterwards. Results are merged into --output under the count of nodes
+pipeline pods can run on (a tainted control plane is left out), and every
+recorded run is printed with its speedup over the smallest cluster. To
+compare, run it on clusters created with different worker counts:
+
+  KIND_WORKERS=0 ./scripts/build-poc.sh && python benchmark/reconcile_throughput.py --teams 100
+  ./scripts/cleanup-poc.sh
+  KIND_WORKERS=3 ./scripts/build-poc.sh && python benchmark/reconcile_throughput.py --teams 100
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+RESULTS_PATH = Path(__file__).parent / "results" / "reconcile_throughput.json"
+KRATIX_GROUP = "platform.kratix.io"
+KRATIX_VERSION = "v1alpha1"
+POD_SELECTOR = "kratix.io/promise-name=team,kratix.io/pipeline-name=team-configure"
+RESOURCE_NAME_LABEL = "kratix.io/resource-name"
+
+
+def percentiles(values: list[float]) -> dict[str, Optional[float]]:
+  ordered = sorted(values)
+  return {
+    "p50": round(statistics.median(ordered), 3) if ordered else None,
+    "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3) if ordered else None,
+  }
+
+
+def finished_at(pod: dict[str, Any]) -> Optional[datetime]:
+  """When the pod's last container (Kratix runs the pipeline as init containers) terminated."""
+  statuses = (pod["status"].get("initContainerStatuses") or []) + (pod["status"].get("containerStatuses") or [])
+  times = [s["state"]["terminated"]["finishedAt"] for s in statuses if (s.get("state") or {}).get("terminated")]
+  return max(times) if times else None
+
+
+def summarise(pods: list[dict[str, Any]], created: datetime, peak_running: int) -> dict[str, Any]:
+  """Throughput figures from the succeeded pipeline pods of one batch, newest pod per Team."""
+  latest: dict[str, dict[str, Any]] = {}
+  for pod in pods:
+    name = pod["metadata"]["labels"][RESOURCE_NAME_LABEL]
+    if name not in latest or pod["metadata"]["creationTimestamp"] > latest[name]["metadata"]["creationTimestamp"]:
+      latest[name] = pod
+  done = [pod for pod in latest.values() if pod["status"].get("phase") == "Succeeded" and finished_at(pod)]
+  end = max((finished_at(pod) for pod in done), default=created)
+  seconds = (end - created).total_seconds()
+  return {
+    "teams": len(done),
+    "seconds": round(seconds, 3),
+    "per_minute": round(len(done) / seconds * 60, 1) if seconds > 0 else None,
+    "peak_running": peak_running,
+    "schedule_wait": percentiles([(pod["status"]["startTime"] - pod["metadata"]["creationTimestamp"]).total_seconds() for pod in done]),
+    "pipeline": percentiles([(finished_at(pod) - pod["status"]["startTime"]).total_seconds() for pod in done]),
+    "pods_per_node": dict(Counter(pod["spec"].get("nodeName") or "" for pod in done)),
+  }
+
+
+def run(core: Any, custom: Any, args: argparse.Namespace) -> dict[str, Any]:
+  batch = uuid.uuid4().hex[:6]
+  names = [f"tp-{batch}-{n:04d}" for n in range(args.teams)]
+  wanted = set(names)
+
+  created = datetime.now().astimezone()
+  for name in names:
+    custom.create_namespaced_custom_object(KRATIX_GROUP, KRATIX_VERSION, args.namespace, "teams", {
+      "apiVersion": f"{KRATIX_GROUP}/{KRATIX_VERSION}",
+      "kind": "Team",
+      "metadata": {"name": name, "namespace": args.namespace},
+      "spec": {"id": name, "name": f"Throughput {name}", "provisioner": "terraform", "pipelineMode": "monolithic"},
+    })
+  print(f"🏗️  Created {args.teams} Teams in {(datetime.now().astimezone() - created).total_seconds():.1f}s")
+
+  peak_running = 0
+  pods: list[dict[str, Any]] = []
+  succeeded: set[str] = set()
+  try:
+    deadline = time.monotonic() + args.timeout
+    while time.monotonic() < deadline:
+      listed = core.list_namespaced_pod(args.namespace, label_selector=POD_SELECTOR).items
+      pods = [as_dict(pod) for pod in listed if pod.metadata.labels.get(RESOURCE_NAME_LABEL) in wanted]
+      peak_running = max(peak_running, sum(1 for pod in pods if pod["status"]["phase"] == "Running"))
+      succeeded = {pod["metadata"]["labels"][RESOURCE_NAME_LABEL] for pod in pods if pod["status"]["phase"] == "Succeeded"}
+      if succeeded >= wanted:
+        break
+      time.sleep(args.poll)
+    else:
+      print(f"⏱️  Timed out after {args.timeout:.0f}s with {len(wanted - succeeded)} Teams not reconciled")
+  finally:
+    if not args.keep:
+      for name in names:
+        custom.delete_namespaced_custom_object(KRATIX_GROUP, KRATIX_VERSION, args.namespace, "teams", name)
+
+  return summarise(pods, created, peak_running)
+
+
+def as_dict(pod: Any) -> dict[str, Any]:
+  """The fields summarise() reads, keeping the client's datetimes."""
+  def container(status: Any) -> dict[str, Any]:
+    terminated = status.state.terminated if status.state else None
+    return {"state": {"terminated": {"finishedAt": terminated.finished_at}} if terminated else {}}
+
+  return {
+    "metadata": {"labels": pod.metadata.labels, "creationTimestamp": pod.metadata.creation_timestamp},
+    "spec": {"nodeName": pod.spec.node_name},
+    "status": {
+      "phase": pod.status.phase,
+      "startTime": pod.status.start_time,
+      "initContainerStatuses": [container(s) for s in pod.status.init_container_statuses or []],
+      "containerStatuses": [container(s) for s in pod.status.container_statuses or []],
+    },
+  }
+
+
+def schedulable_nodes(nodes: list[Any]) -> list[Any]:
+  """Nodes pipeline pods can land on; Kind's control plane is tainted NoSchedule once there are workers."""
+  return [
+    node for node in nodes
+    if not node.spec.unschedulable and not any(taint.effect == "NoSchedule" for taint in node.spec.taints or [])
+  ]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--teams", type=int, default=50, help="Teams created at once (default: 50)")
+  parser.add_argument("--namespace", default="default")
+  parser.add_argument("--timeout", type=float, default=1800, help="Seconds to wait for every pipeline (default: 1800)")
+  parser.add_argument("--poll", type=float, default=1.0, help="Seconds between pod listings (default: 1)")
+  parser.add_argument("--keep", action="store_true", help="Leave the Teams in place")
+  parser.add_argument("--output", type=Path, default=RESULTS_PATH)
+  args = parser.parse_args(argv)
+
+  from kubernetes import client, config
+
+  config.load_kube_config()
+  core = client.CoreV1Api()
+  custom = client.CustomObjectsApi()
+  nodes = schedulable_nodes(core.list_node().items)
+
+  result = run(core, custom, args)
+  result["nodes"] = len(nodes)
+  result["allocatable_cpu"] = [node.status.allocatable.get("cpu") for node in nodes]
+  print(
+    f"⏱️  {len(nodes)} nodes: {result['teams']}/{args.teams} Teams in {result['seconds']}s ({result['per_minute']}/min),"
+    f" peak {result['peak_running']} pipeline pods, schedule wait p95 {result['schedule_wait']['p95']}s"
+  )
+
+  recorded: dict[str, Any] = {"runs": {}}
+  if args.output.exists():
+    recorded = json.loads(args.output.read_text())
+  recorded["runs"][f"{len(nodes)}-nodes"] = result
+  args.output.parent.mkdir(parents=True, exist_ok=True)
+  args.output.write_text(json.dumps(recorded, indent=2, sort_keys=True))
+
+  runs = sorted(recorded["runs"].values(), key=lambda r: r["nodes"])
+  base = runs[0]["per_minute"]
+  print("📊 nodes  teams/min  speedup  peak pods")
+  for r in runs:
+    speedup = f"{r['per_minute'] / base:.2f}x" if base and r["per_minute"] else "-"
+    print(f"   {r['nodes']:5d}  {r['per_minute'] or 0:9.1f}  {speedup:>7s}  {r['peak_running']:9d}")
+  return 0 if result["teams"] == args.teams else 1
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Compare Terraform parse and plan time for the hcl and data layouts.
+
+For each team count, renders that many teams into a copy of the kratix repo's
+terraform/ directory in both layouts:
+
+  hcl   one org-<id>.tf and repos-<id>.tf per team (an org, two outputs, a
+        members team and the default repositories as separate resources)
+  data  one teams/<name>.json and team-repos/<name>.json per team, created by
+        the teams module with one for_each per resource type
+
+It then times, per layout, the pipeline's rendering, ``terraform validate``
+(parsing and evaluating the configuration) and a ``terraform plan`` against
+empty state (every team planned as a create, as on a fresh cluster).
+``terraform init`` runs once per directory and is not timed.
+
+Plan needs the go-gitea provider to reach a Gitea (the POC's, by default), as
+it fetches the server version on start. Use --skip-plan to time parsing only.
+Without a terraform binary on PATH only the rendering is measured.
+
+Usage:
+  python benchmark/terraform_layout.py --teams 1000 10000 --output benchmark/results/terraform_layout.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import kratix_sdk as ks
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_DIR = PROJECT_ROOT / "promises/team-promise/workflows/resource/configure/team-configure/python/scripts"
+KRATIX_TERRAFORM = PROJECT_ROOT / "repos/kratix/terraform"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import configure  # noqa: E402
+
+LAYOUTS = ("hcl", "data")
+
+
+def render(target: Path, layout: str, teams: int, members: int, repos: list[str]) -> dict[str, Any]:
+  """Render *teams* teams in *layout* into *target* and return the render time and output size."""
+  shutil.copytree(KRATIX_TERRAFORM, target, ignore=shutil.ignore_patterns(".terraform*", "*.tfstate*"))
+  # Outputs are written relative to the state store root, i.e. terraform/...
+  ks.set_output_dir(str(target.parent))
+  sdk = ks.KratixSDK()
+
+  start = time.perf_counter()
+  with open(os.devnull, "w") as devnull:
+    stdout, sys.stdout = sys.stdout, devnull
+    try:
+      for n in range(teams):
+        team_id = f"team-{n:05d}"
+        key = f"bench-{n:05d}"
+        team_members = [f"user-{n}-{m}" for m in range(members)]
+        configure.render_org(sdk, team_id, f"Team {n}", f"{team_id}@example.com", [], team_members, "terraform", "terraform", layout, key)
+        configure.render_repos(sdk, team_id, f"Team {n}", repos, [], layout, key)
+    finally:
+      sys.stdout = stdout
+  seconds = time.perf_counter() - start
+
+  files = [p for p in target.rglob("*") if p.is_file()]
+  return {"render_seconds": round(seconds, 3), "files": len(files), "bytes": sum(p.stat().st_size for p in files)}
+
+
+def terraform(directory: Path, *args: str, env: Optional[dict[str, str]] = None) -> float:
+  """Run terraform in *directory* and return the elapsed seconds."""
+  start = time.perf_counter()
+  result = subprocess.run(["terraform", *args], cwd=directory, env={**os.environ, **(env or {})}, capture_output=True, text=True)
+  if result.returncode != 0:
+    raise RuntimeError(f"terraform {' '.join(args)} failed:\n{result.stderr[-2000:]}")
+  return time.perf_counter() - start
+
+
+def median(values: list[float]) -> float:
+  values = sorted(values)
+  return round(values[len(values) // 2], 3)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--teams", type=int, nargs="+", default=[1000, 10000])
+  parser.add_argument("--members", type=int, default=3, help="Members per team (default: 3)")
+  parser.add_argument("--repos", default="docs", help="Comma-separated default repositories per team (default: docs)")
+  parser.add_argument("--runs", type=int, default=3, help="Runs of validate and plan; the median is reported")
+  parser.add_argument("--skip-plan", action="store_true", help="Time terraform validate only")
+  parser.add_argument("--gitea-url", default="http://localhost:8080", help="Gitea the provider connects to during plan")
+  parser.add_argument("--output", type=Path, help="Write the results as JSON")
+  args = parser.parse_args(argv)
+
+  repos = [repo.strip() for repo in args.repos.split(",") if repo.strip()]
+  has_terraform = shutil.which("terraform") is not None
+  if not has_terraform:
+    print("⚠️  terraform not found on PATH; measuring rendering only")
+
+  plan_env = {"TF_VAR_gitea_base_url": args.gitea_url, "GITEA_TOKEN": os.environ.get("GITEA_TOKEN", "benchmark")}
+  results: dict[str, dict[str, dict[str, Any]]] = {}
+  with tempfile.TemporaryDirectory() as tmp:
+    for teams in args.teams:
+      results[str(teams)] = {}
+      for layout in LAYOUTS:
+        directory = Path(tmp) / f"{layout}-{teams}" / "terraform"
+        directory.parent.mkdir()
+        result = render(directory, layout, teams, args.members, repos)
+
+        if has_terraform:
+          terraform(directory, "init", "-input=false")
+          result["validate_seconds"] = median([terraform(directory, "validate") for _ in range(args.runs)])
+          if not args.skip_plan:
+            result["plan_seconds"] = median([
+              terraform(directory, "plan", "-input=false", "-lock=false", "-refresh=false", "-out=tfplan", env=plan_env)
+              for _ in range(args.runs)
+            ])
+
+        results[str(teams)][layout] = result
+        timings = "  ".join(f"{k.removesuffix('_seconds')} {v:7.3f}s" for k, v in result.items() if k.endswith("_seconds"))
+        print(f"⏱️  {teams:6d} teams  {layout:4s}  {result['files']:6d} files  {result['bytes'] / 1e6:6.1f} MB  {timings}")
+
+      shutil.rmtree(Path(tmp) / f"hcl-{teams}")
+      shutil.rmtree(Path(tmp) / f"data-{teams}")
+
+  if args.output:
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+      json.dump({"members": args.members, "repos": repos, "teams": results}, f, indent=2)
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,25 @@
+"""Benchmarks for the Team Promise configure pipeline.
+
+Run with ./scripts/run-benchmarks.sh, which writes results/latest.json and
+compares it against baselines/configure.json.
+"""
+
+from typing import Any
+
+import pytest
+
+from harness import SCENARIOS, run_scenario
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_configure_scenario(name: str, benchmark_results: dict[str, Any]) -> None:
+  """Each scenario should render every team and record its metrics."""
+  scenario = SCENARIOS[name]
+  result = run_scenario(scenario)
+
+  # Every team emits a Backstage file and an org file
+  assert result.files_written == scenario.teams * 2
+  assert result.bytes_written > 0
+
+  benchmark_results[name] = result.to_dict()
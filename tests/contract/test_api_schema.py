@@ -1,26 +1,17 @@
 #!/usr/bin/env python3
 
 import unittest
-import yaml
 import jsonschema
-from jsonschema import validate
+
+import schemas
 
 class TestAPISchema(unittest.TestCase):
     
     def setUp(self):
-        """Load the Promise definition"""
-        import os
-        # Get path relative to test file location
-        test_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.join(test_dir, '..', '..')
-        promise_path = os.path.join(project_root, 'promises', 'team-promise', 'promise.yaml')
-        
-        with open(promise_path, 'r') as f:
-            self.promise = yaml.safe_load(f)
-        
-        # Extract the CRD schema
-        self.crd = self.promise['spec']['api']
-        self.schema = self.crd['spec']['versions'][0]['schema']['openAPIV3Schema']
+        """Load the compiled Team CRD schema (cached across tests)"""
+        self.crd = schemas.team_crd()
+        self.schema = schemas.team_schema()
+        self.validator = schemas.team_validator()
     
     def test_crd_metadata(self):
         """Test that CRD metadata is correct"""
@@ -61,7 +52,7 @@ class TestAPISchema(unittest.TestCase):
         }
         
         try:
-            validate(instance=valid_team, schema=self.schema)
+            self.validator.validate(valid_team)
         except jsonschema.ValidationError as e:
             self.fail(f"Valid team resource failed schema validation: {e}")
     
@@ -77,7 +68,7 @@ class TestAPISchema(unittest.TestCase):
         # Note: The current schema doesn't mark fields as required
         # This test documents current behavior
         try:
-            validate(instance=invalid_team, schema=self.schema)
+            self.validator.validate(invalid_team)
             # Currently passes because no required fields are defined
         except jsonschema.ValidationError:
             pass  # Would fail if required fields were defined
@@ -92,7 +83,7 @@ class TestAPISchema(unittest.TestCase):
         }
         
         with self.assertRaises(jsonschema.ValidationError):
-            validate(instance=invalid_team, schema=self.schema)
+            self.validator.validate(invalid_team)
     
     def test_schema_extensibility(self):
         """Test that the schema allows for future extensions"""
@@ -107,7 +98,7 @@ class TestAPISchema(unittest.TestCase):
         }
         
         try:
-            validate(instance=extended_team, schema=self.schema)
+            self.validator.validate(extended_team)
         except jsonschema.ValidationError as e:
             self.fail(f"Extended team resource failed validation: {e}")
 
@@ -122,7 +113,7 @@ class TestAPISchema(unittest.TestCase):
         }
         
         try:
-            validate(instance=valid_team_with_email, schema=self.schema)
+            self.validator.validate(valid_team_with_email)
         except jsonschema.ValidationError as e:
             self.fail(f"Valid team with email failed validation: {e}")
 
@@ -147,7 +138,47 @@ class TestAPISchema(unittest.TestCase):
             
             with self.assertRaises(jsonschema.ValidationError, 
                                  msg=f"Email '{invalid_email}' should have failed validation"):
-                validate(instance=invalid_team, schema=self.schema)
+                self.validator.validate(invalid_team)
+
+    def test_members_and_membership_sync(self):
+        """Test that members must be usernames and membershipSync a known mode"""
+        team_with_members = {
+            'spec': {
+                'id': 'team-members',
+                'name': 'Members Team',
+                'members': ['alice', 'bob.smith'],
+                'membershipSync': 'api'
+            }
+        }
+        self.validator.validate(team_with_members)
+
+        for spec_update in ({'members': ['not a user']}, {'membershipSync': 'manual'}):
+            invalid_team = {'spec': {**team_with_members['spec'], **spec_update}}
+            with self.assertRaises(jsonschema.ValidationError):
+                self.validator.validate(invalid_team)
+
+    def test_composite_sub_resources_match_sub_promises(self):
+        """Test that a composite Team's sub-resources validate against their Promises"""
+        import kratix_sdk as ks
+        import composite
+
+        team = ks.Resource({
+            'metadata': {'name': 'team-composite', 'namespace': 'default', 'uid': '1234'},
+            'spec': {'pipelineMode': 'composite', 'repos': ['docs']},
+        })
+        self.validator.validate({'spec': {'id': 'team-composite', 'name': 'Composite Team', **team.get_value('spec')}})
+
+        promises = {'TeamOrg': 'team-org', 'TeamCatalogEntry': 'team-catalog', 'TeamRepos': 'team-repos'}
+        bodies = composite.sub_resources(team, 'team-composite', 'Composite Team', 'team@example.com', 'platform', ['alice'], 'api', 'terraform', ['docs'], 'abc123')
+        for body in bodies:
+            promise_path = schemas.PROMISE_PATH.parent.parent / f"{promises[body['kind']]}-promise" / "promise.yaml"
+            self.assertEqual(schemas.team_crd(promise_path)['spec']['names']['plural'], composite.SUB_RESOURCES[body['kind']])
+            schemas.team_validator(promise_path).validate(body)
+
+    def test_validator_is_compiled_once(self):
+        """Test that the Team validator is compiled once and reused"""
+        self.assertIs(schemas.team_validator(), self.validator)
+        self.assertIsNotNone(self.validator.format_checker)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -3,77 +3,14 @@
 import unittest
 import yaml
 import jsonschema
-from jsonschema import validate
+
+import schemas
 
 class TestBackstageFormat(unittest.TestCase):
     
     def setUp(self):
-        """Set up Backstage Group schema for validation"""
-        # Backstage Group schema based on official spec
-        self.backstage_group_schema = {
-            "type": "object",
-            "required": ["apiVersion", "kind", "metadata", "spec"],
-            "properties": {
-                "apiVersion": {
-                    "type": "string",
-                    "enum": ["backstage.io/v1alpha1"]
-                },
-                "kind": {
-                    "type": "string",
-                    "enum": ["Group"]
-                },
-                "metadata": {
-                    "type": "object",
-                    "required": ["name"],
-                    "properties": {
-                        "name": {
-                            "type": "string",
-                            "pattern": "^[a-zA-Z0-9_-]+$"
-                        },
-                        "description": {
-                            "type": "string"
-                        },
-                        "annotations": {
-                            "type": "object"
-                        },
-                        "labels": {
-                            "type": "object"
-                        }
-                    }
-                },
-                "spec": {
-                    "type": "object",
-                    "required": ["type"],
-                    "properties": {
-                        "type": {
-                            "type": "string",
-                            "enum": ["team", "business-unit", "product-area", "department"]
-                        },
-                        "displayName": {
-                            "type": "string"
-                        },
-                        "description": {
-                            "type": "string"
-                        },
-                        "parent": {
-                            "type": "string"
-                        },
-                        "children": {
-                            "type": "array",
-                            "items": {
-                                "type": "string"
-                            }
-                        },
-                        "members": {
-                            "type": "array",
-                            "items": {
-                                "type": "string"
-                            }
-                        }
-                    }
-                }
-            }
-        }
+        """Set up the compiled Backstage Group schema for validation"""
+        self.validator = schemas.backstage_group_validator()
         
         # Load expected output from fixtures
         import os
@@ -86,7 +23,7 @@ class TestBackstageFormat(unittest.TestCase):
     def test_expected_output_valid_backstage_format(self):
         """Test that our expected output is valid Backstage Group format"""
         try:
-            validate(instance=self.expected_output, schema=self.backstage_group_schema)
+            self.validator.validate(self.expected_output)
         except jsonschema.ValidationError as e:
             self.fail(f"Expected output is not valid Backstage format: {e}")
     
@@ -152,14 +89,14 @@ class TestBackstageFormat(unittest.TestCase):
         del invalid_output['apiVersion']
         
         with self.assertRaises(jsonschema.ValidationError):
-            validate(instance=invalid_output, schema=self.backstage_group_schema)
+            self.validator.validate(invalid_output)
         
         # Test missing kind
         invalid_output = self.expected_output.copy()
         del invalid_output['kind']
         
         with self.assertRaises(jsonschema.ValidationError):
-            validate(instance=invalid_output, schema=self.backstage_group_schema)
+            self.validator.validate(invalid_output)
     
     def test_invalid_api_version(self):
         """Test that invalid apiVersion is rejected"""
@@ -167,7 +104,7 @@ class TestBackstageFormat(unittest.TestCase):
         invalid_output['apiVersion'] = 'invalid.io/v1alpha1'
         
         with self.assertRaises(jsonschema.ValidationError):
-            validate(instance=invalid_output, schema=self.backstage_group_schema)
+            self.validator.validate(invalid_output)
     
     def test_invalid_group_type(self):
         """Test that invalid group type is rejected"""
@@ -175,7 +112,12 @@ class TestBackstageFormat(unittest.TestCase):
         invalid_output['spec']['type'] = 'invalid-type'
         
         with self.assertRaises(jsonschema.ValidationError):
-            validate(instance=invalid_output, schema=self.backstage_group_schema)
+            self.validator.validate(invalid_output)
+
+    def test_validator_is_compiled_once(self):
+        """Test that the Backstage validator is compiled once and reused"""
+        self.assertIs(schemas.backstage_group_validator(), self.validator)
+        self.assertIsNotNone(self.validator.format_checker)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,537 @@
+"""Workload, faults and convergence checks for the soak suite (test_soak.py).
+
+A soak run keeps a pool of Teams under a steady mix of operations:
+
+  create      a Team that doesn't exist yet
+  rename      spec.name changes (the org's full_name)
+  move        spec.id changes (the org is renamed through a moved block)
+  delete      the Team is deleted
+
+Gitea is the source of truth. An operation has converged once Gitea shows
+its result: an org named after the current spec.id with full_name ==
+spec.name, no org left under any earlier id of the Team, or no org at all
+after a delete. Operations replaced by a newer one on the same Team before
+converging are counted as superseded.
+
+Midway through, one fault is injected and recovered after a fixed time:
+
+  controller-restart  the Kratix controller pods are deleted
+  gitea-ssh-outage    the gitea-ssh Service (the state stores' SSH endpoint
+                      and NodePort 30222) selects no pods
+  runner-death        the Actions runner and its job containers are killed
+                      while a deploy job runs, so an apply can end with
+                      tfstate that was never committed
+
+At the end, the run waits for every operation to converge and audits the
+orgs. A Team is stuck when its last change never converged. An orphaned
+org has no Team left. A duplicate is an extra org for a live Team under an
+earlier id.
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from kubernetes.client.rest import ApiException
+
+KRATIX_GROUP = "platform.kratix.io"
+KRATIX_VERSION = "v1alpha1"
+KRATIX_NAMESPACE = "kratix-platform-system"
+KRATIX_CONTROLLER = "kratix-platform-controller-manager"
+GITEA_SSH_SERVICE = ("gitea", "gitea-ssh")
+RUNNER_CONTAINER = "gitea-actions-runner"
+RUNNER_TASK_PREFIX = "GITEA-ACTIONS-TASK"
+HISTORY_PATH = Path(__file__).parent / "baselines" / "soak.json"
+
+# Relative weights of the operations on an existing Team
+OPERATIONS = {"rename": 6, "move": 1, "delete": 3}
+
+
+@dataclass
+class Operation:
+  """One change to a Team and what Gitea should show once it converged."""
+
+  team: str
+  kind: str
+  at: float
+  # None after a delete, else {"id": ..., "name": ...}
+  desired: Optional[dict[str, str]]
+  # Every spec.id the Team has had, including the current one
+  ids: set[str] = field(default_factory=set)
+  converged_at: Optional[float] = None
+  superseded: bool = False
+
+
+def converged(op: Operation, orgs: dict[str, str], team_exists: bool) -> bool:
+  """Whether *orgs* (name -> full_name) shows the result of *op*."""
+  if op.desired is None:
+    return not team_exists and not any(team_id in orgs for team_id in op.ids)
+  stale = op.ids - {op.desired["id"]}
+  return orgs.get(op.desired["id"]) == op.desired["name"] and not any(team_id in orgs for team_id in stale)
+
+
+def audit(latest: dict[str, Operation], orgs: dict[str, str], prefix: str) -> dict[str, list[str]]:
+  """Stuck Teams, orphaned orgs and duplicate orgs once the run has settled.
+
+  A Team is stuck when its last change never converged, whether or not it was
+  a delete.
+  """
+  live = {team: op for team, op in latest.items() if op.desired is not None}
+  known = {team_id: team for team, op in latest.items() for team_id in op.ids}
+  stuck = sorted(team for team, op in latest.items() if op.converged_at is None)
+  orphans = sorted(org for org in orgs if org.startswith(prefix) and known.get(org) not in live)
+  duplicates = sorted(org for org in orgs if known.get(org) in live and org != live[known[org]].desired["id"])
+  return {"stuck": stuck, "orphans": orphans, "duplicates": duplicates}
+
+
+class Gitea:
+  """The few Gitea API calls the soak needs, with the admin token."""
+
+  def __init__(self, url: str, token: str) -> None:
+    self.url = url.rstrip("/")
+    self.token = token
+
+  @classmethod
+  def from_cluster(cls, core: Any) -> "Gitea":
+    token = os.environ.get("GITEA_TOKEN")
+    if not token:
+      secret = core.read_namespaced_secret("gitea-admin-token", "default")
+      token = base64.b64decode(secret.data["token"]).decode("utf-8")
+    return cls(os.environ.get("GITEA_URL", "http://localhost:8080"), token)
+
+  def request(self, method: str, path: str) -> Any:
+    request = urllib.request.Request(f"{self.url}/api/v1/{path}", method=method, headers={"Authorization": f"token {self.token}"})
+    with urllib.request.urlopen(request, timeout=15) as response:
+      body = response.read()
+    return json.loads(body) if body else None
+
+  def orgs(self, prefix: str) -> dict[str, str]:
+    """Orgs whose name starts with *prefix*, as name -> full_name."""
+    orgs: dict[str, str] = {}
+    page = 1
+    while True:
+      batch = self.request("GET", f"admin/orgs?page={page}&limit=50")
+      names = {org.get("name") or org["username"]: org.get("full_name", "") for org in batch}
+      orgs.update({name: full_name for name, full_name in names.items() if name.startswith(prefix)})
+      if len(batch) < 50:
+        return orgs
+      page += 1
+
+  def delete_org(self, name: str) -> None:
+    try:
+      self.request("DELETE", f"orgs/{name}")
+    except urllib.error.HTTPError as e:
+      if e.code != 404:
+        raise
+
+
+class Workload:
+  """Keeps a pool of Teams changing and tracks when each change converges."""
+
+  def __init__(self, custom: Any, gitea: Gitea, prefix: str, teams: int, seed: int = 0) -> None:
+    self.custom = custom
+    self.gitea = gitea
+    self.prefix = prefix
+    self.names = [f"{prefix}{n:03d}" for n in range(teams)]
+    self.random = random.Random(seed)
+    self.ops: list[Operation] = []
+    self.latest: dict[str, Operation] = {}
+    # Creates skipped because the Team's delete was still finalizing
+    self.deferred = 0
+    self.lock = threading.Lock()
+
+  def step(self) -> Optional[Operation]:
+    """Apply one operation to a random Team; None when its create had to be deferred."""
+    at = time.monotonic()
+    team = self.random.choice(self.names)
+    previous = self.latest.get(team)
+    alive = previous is not None and previous.desired is not None
+    kind = self.random.choices(list(OPERATIONS), weights=list(OPERATIONS.values()))[0] if alive else "create"
+    ids = set(previous.ids) if previous else set()
+    revision = sum(1 for op in self.ops if op.team == team)
+
+    if kind == "delete":
+      desired = None
+      self.delete(team)
+    else:
+      desired = {"id": previous.desired["id"] if alive else team, "name": f"Soak {team} r{revision}"}
+      if kind == "move":
+        desired["id"] = f"{team}-m{revision}"
+      if alive:
+        self.update(team, desired)
+      elif not self.create(team, desired):
+        # Picked again by a later step; waiting here would stall the workload
+        self.deferred += 1
+        return None
+      ids.add(desired["id"])
+
+    op = Operation(team, kind, at, desired, ids)
+    with self.lock:
+      if previous is not None and previous.converged_at is None:
+        previous.superseded = True
+      self.ops.append(op)
+      self.latest[team] = op
+    return op
+
+  def create(self, team: str, desired: dict[str, str]) -> bool:
+    """Create the Team; False while a delete of it is still finalizing."""
+    try:
+      self.custom.create_namespaced_custom_object(KRATIX_GROUP, KRATIX_VERSION, "default", "teams", {
+        "apiVersion": f"{KRATIX_GROUP}/{KRATIX_VERSION}",
+        "kind": "Team",
+        "metadata": {"name": team, "namespace": "default"},
+        "spec": {"id": desired["id"], "name": desired["name"], "provisioner": "terraform"},
+      })
+    except ApiException as e:
+      if e.status != 409:
+        raise
+      return False
+    return True
+
+  def update(self, team: str, desired: dict[str, str]) -> None:
+    self.custom.patch_namespaced_custom_object(KRATIX_GROUP, KRATIX_VERSION, "default", "teams", team, {"spec": desired})
+
+  def delete(self, team: str) -> None:
+    try:
+      self.custom.delete_namespaced_custom_object(KRATIX_GROUP, KRATIX_VERSION, "default", "teams", team)
+    except ApiException as e:
+      if e.status != 404:
+        raise
+
+  def exists(self, team: str) -> bool:
+    try:
+      self.custom.get_namespaced_custom_object(KRATIX_GROUP, KRATIX_VERSION, "default", "teams", team)
+      return True
+    except ApiException as e:
+      if e.status == 404:
+        return False
+      raise
+
+  def wait_gone(self, team: str, timeout: float = 300) -> None:
+    deadline = time.monotonic() + timeout
+    while self.exists(team) and time.monotonic() < deadline:
+      time.sleep(2)
+
+  def check(self) -> int:
+    """Mark the operations Gitea now shows as converged; returns how many are still pending."""
+    try:
+      orgs = self.gitea.orgs(self.prefix)
+    except (urllib.error.URLError, OSError):
+      # Gitea itself can be down during a fault
+      with self.lock:
+        return sum(1 for op in self.latest.values() if op.converged_at is None)
+    now = time.monotonic()
+    with self.lock:
+      pending = [op for op in self.latest.values() if op.converged_at is None]
+    for op in pending:
+      if converged(op, orgs, op.desired is not None or self.exists(op.team)):
+        op.converged_at = now
+    return sum(1 for op in pending if op.converged_at is None)
+
+  def cleanup(self) -> None:
+    """Delete the pool's Teams and any orgs they left behind."""
+    for team in self.names:
+      self.delete(team)
+    for team in self.names:
+      self.wait_gone(team)
+    for org in self.gitea.orgs(self.prefix):
+      self.gitea.delete_org(org)
+
+
+# -- faults -------------------------------------------------------------------
+
+class Fault:
+  """A disruption with an inject() and a recover() step."""
+
+  name = "none"
+
+  def inject(self) -> None:
+    pass
+
+  def recover(self) -> None:
+    pass
+
+
+class ControllerRestart(Fault):
+  name = "controller-restart"
+
+  def __init__(self, k8s_clients: dict[str, Any]) -> None:
+    self.apps = k8s_clients["apps"]
+    self.core = k8s_clients["core"]
+
+  def inject(self) -> None:
+    deployment = self.apps.read_namespaced_deployment(KRATIX_CONTROLLER, KRATIX_NAMESPACE)
+    selector = ",".join(f"{key}={value}" for key, value in deployment.spec.selector.match_labels.items())
+    for pod in self.core.list_namespaced_pod(KRATIX_NAMESPACE, label_selector=selector).items:
+      self.core.delete_namespaced_pod(pod.metadata.name, KRATIX_NAMESPACE, grace_period_seconds=0)
+
+  def recover(self) -> None:
+    # The Deployment replaces the pods; wait for them to be available
+    deadline = time.monotonic() + 300
+    while time.monotonic() < deadline:
+      status = self.apps.read_namespaced_deployment_status(KRATIX_CONTROLLER, KRATIX_NAMESPACE).status
+      if (status.available_replicas or 0) >= 1 and not status.unavailable_replicas:
+        return
+      time.sleep(2)
+    raise TimeoutError(f"{KRATIX_CONTROLLER} not available after the restart")
+
+
+class GiteaSshOutage(Fault):
+  name = "gitea-ssh-outage"
+
+  def __init__(self, k8s_clients: dict[str, Any]) -> None:
+    self.core = k8s_clients["core"]
+    self.selector: Optional[dict[str, str]] = None
+
+  def inject(self) -> None:
+    namespace, name = GITEA_SSH_SERVICE
+    self.selector = self.core.read_namespaced_service(name, namespace).spec.selector
+    self.core.patch_namespaced_service(name, namespace, {"spec": {"selector": {**self.selector, "soak.kratix.io/outage": "true"}}})
+
+  def recover(self) -> None:
+    namespace, name = GITEA_SSH_SERVICE
+    # A JSON merge patch can't drop a key by setting the whole map, so replace it
+    service = self.core.read_namespaced_service(name, namespace)
+    service.spec.selector = self.selector
+    self.core.replace_namespaced_service(name, namespace, service)
+
+
+class RunnerDeath(Fault):
+  name = "runner-death"
+
+  def __init__(self, k8s_clients: dict[str, Any], into_job_seconds: float = 20) -> None:
+    self.into_job_seconds = into_job_seconds
+
+  def inject(self) -> None:
+    # Wait for a deploy job, then give it time to reach terraform apply
+    deadline = time.monotonic() + 300
+    while not self.tasks() and time.monotonic() < deadline:
+      time.sleep(1)
+    time.sleep(self.into_job_seconds)
+    subprocess.run(["docker", "kill", RUNNER_CONTAINER, *self.tasks()], check=False, capture_output=True)
+
+  def recover(self) -> None:
+    subprocess.run(["docker", "start", RUNNER_CONTAINER], check=True, capture_output=True)
+
+  @staticmethod
+  def tasks() -> list[str]:
+    result = subprocess.run(
+      ["docker", "ps", "--filter", f"name={RUNNER_TASK_PREFIX}", "--format", "{{.Names}}"],
+      check=False, capture_output=True, text=True,
+    )
+    return result.stdout.split()
+
+
+FAULTS: dict[str, Callable[[dict[str, Any]], Fault]] = {
+  "none": lambda clients: Fault(),
+  ControllerRestart.name: ControllerRestart,
+  GiteaSshOutage.name: GiteaSshOutage,
+  RunnerDeath.name: RunnerDeath,
+}
+
+
+# -- run and report -----------------------------------------------------------
+
+@dataclass
+class SoakConfig:
+  teams: int = 20
+  duration: float = 600
+  ops_per_minute: float = 30
+  fault_seconds: float = 60
+  settle_timeout: float = 900
+  poll: float = 5
+
+  @classmethod
+  def from_env(cls) -> "SoakConfig":
+    defaults = cls()
+    return cls(
+      teams=int(os.environ.get("SOAK_TEAMS", defaults.teams)),
+      duration=float(os.environ.get("SOAK_DURATION", defaults.duration)),
+      ops_per_minute=float(os.environ.get("SOAK_OPS_PER_MINUTE", defaults.ops_per_minute)),
+      fault_seconds=float(os.environ.get("SOAK_FAULT_SECONDS", defaults.fault_seconds)),
+      settle_timeout=float(os.environ.get("SOAK_SETTLE_TIMEOUT", defaults.settle_timeout)),
+    )
+
+
+def run_soak(workload: Workload, fault: Fault, config: SoakConfig) -> dict[str, Any]:
+  """Run the workload with *fault* a third of the way in; returns the tracked numbers."""
+  start = time.monotonic()
+  interval = 60 / config.ops_per_minute
+  fault_at = start + config.duration / 3
+  injected_at = recovered_at = None
+  stop = threading.Event()
+
+  def poll() -> None:
+    while not stop.wait(config.poll):
+      workload.check()
+
+  poller = threading.Thread(target=poll, daemon=True)
+  poller.start()
+  try:
+    while time.monotonic() - start < config.duration:
+      workload.step()
+      if injected_at is None and time.monotonic() >= fault_at:
+        injected_at = time.monotonic()
+        fault.inject()
+      if injected_at is not None and recovered_at is None and time.monotonic() - injected_at >= config.fault_seconds:
+        fault.recover()
+        recovered_at = time.monotonic()
+      time.sleep(interval)
+  finally:
+    stop.set()
+    poller.join()
+    if injected_at is not None and recovered_at is None:
+      fault.recover()
+      recovered_at = time.monotonic()
+
+  ended = time.monotonic()
+  settled_at = None
+  while time.monotonic() - ended < config.settle_timeout:
+    if workload.check() == 0:
+      settled_at = time.monotonic()
+      break
+    time.sleep(config.poll)
+
+  return summarise(workload, start, recovered_at, ended, settled_at)
+
+
+def percentile(values: list[float], p: float) -> Optional[float]:
+  ordered = sorted(values)
+  return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1) if ordered else None
+
+
+def summarise(workload: Workload, start: float, recovered_at: Optional[float], ended: float, settled_at: Optional[float]) -> dict[str, Any]:
+  ops = workload.ops
+  latencies = [op.converged_at - op.at for op in ops if op.converged_at is not None]
+  before_recovery = [op for op in ops if recovered_at is not None and op.at < recovered_at and not op.superseded]
+  found = audit(workload.latest, workload.gitea.orgs(workload.prefix), workload.prefix)
+  recovery = None
+  if before_recovery and all(op.converged_at is not None for op in before_recovery):
+    recovery = round(max(0.0, max(op.converged_at for op in before_recovery) - recovered_at), 1)
+  return {
+    "operations": len(ops),
+    "converged": len(latencies),
+    "superseded": sum(1 for op in ops if op.superseded and op.converged_at is None),
+    "deferred_creates": workload.deferred,
+    "convergence_p50_seconds": round(statistics.median(latencies), 1) if latencies else None,
+    "convergence_p95_seconds": percentile(latencies, 0.95),
+    "convergence_max_seconds": round(max(latencies), 1) if latencies else None,
+    # Fault recovered to the last change made before it converging; None if one never did
+    "recovery_seconds": recovery,
+    "settle_seconds": round(settled_at - ended, 1) if settled_at is not None else None,
+    "stuck": len(found["stuck"]),
+    "orphans": len(found["orphans"]),
+    "duplicates": len(found["duplicates"]),
+    "details": found,
+    "seconds": round(ended - start, 1),
+  }
+
+
+# Numbers compared across releases; higher is worse for all of them
+TRACKED = ("convergence_p95_seconds", "recovery_seconds", "settle_seconds", "stuck", "orphans", "duplicates")
+COUNTS = ("stuck", "orphans", "duplicates")
+# Timing changes below this are noise on a Kind cluster
+MIN_DELTA_SECONDS = 5
+
+
+def entry(results: dict[str, dict[str, Any]], release: str) -> dict[str, Any]:
+  """The tracked numbers of one run, per fault."""
+  return {
+    "release": release,
+    "faults": {fault: {key: result[key] for key in TRACKED} for fault, result in sorted(results.items())},
+  }
+
+
+def record(results: dict[str, dict[str, Any]], release: str, path: Path = HISTORY_PATH) -> None:
+  """Store this release's tracked numbers in the history file.
+
+  Faults in *results* replace an earlier run's numbers for them; faults this
+  run didn't cover (a -k run of one fault) keep the numbers recorded before.
+  """
+  history: dict[str, Any] = json.loads(path.read_text()) if path.exists() else {"releases": []}
+  faults: dict[str, Any] = {}
+  for e in history["releases"]:
+    if e["release"] == release:
+      faults.update(e["faults"])
+  faults.update(entry(results, release)["faults"])
+  releases = [e for e in history["releases"] if e["release"] != release] + [{"release": release, "faults": dict(sorted(faults.items()))}]
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(json.dumps({"releases": releases}, indent=2) + "\n")
+
+
+def regressions(results: dict[str, dict[str, Any]], history: dict[str, Any], release: str, threshold: float = 0.25) -> list[str]:
+  """Tracked numbers worse than the last release recorded before *release*.
+
+  Timings regress when they grow by more than *threshold* and by more than
+  MIN_DELTA_SECONDS. A fault that never recovered or settled regresses against
+  one that did. Any increase in stuck Teams, orphans or duplicates regresses.
+  """
+  earlier = [e for e in history.get("releases") or [] if e["release"] != release]
+  if not earlier:
+    return []
+  last = earlier[-1]
+  found: list[str] = []
+  for fault, result in sorted(results.items()):
+    before = last["faults"].get(fault)
+    if before is None:
+      continue
+    for key in TRACKED:
+      old, new = before.get(key), result.get(key)
+      if key in COUNTS:
+        worse = (new or 0) > (old or 0)
+      elif new is None or old is None:
+        worse = new is None and old is not None
+      else:
+        worse = new > old * (1 + threshold) and new - old > MIN_DELTA_SECONDS
+      if worse:
+        found.append(f"{fault}.{key}: {old} ({last['release']}) -> {new}")
+  return found
+
+
+def render(history: dict[str, Any]) -> str:
+  """One row per recorded release and fault."""
+  lines = [f"{'release':20s}  {'fault':20s}" + "".join(f"  {key.replace('_seconds', ''):>15s}" for key in TRACKED)]
+  for e in history.get("releases") or []:
+    for fault, numbers in e["faults"].items():
+      cells = "".join(f"  {'-' if numbers.get(key) is None else numbers[key]:>15}" for key in TRACKED)
+      lines.append(f"{e['release'][:20]:20s}  {fault:20s}{cells}")
+  return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description="Compare soak results with earlier releases and record them.")
+  parser.add_argument("results", type=Path, help="JSON written by test_soak.py")
+  parser.add_argument("--release", required=True, help="Release the results belong to, e.g. git describe")
+  parser.add_argument("--record", action="store_true", help="Add the results to the tracked history")
+  parser.add_argument("--history", type=Path, default=HISTORY_PATH)
+  parser.add_argument("--threshold", type=float, default=0.25, help="Allowed growth of the timings (default: 0.25)")
+  args = parser.parse_args(argv)
+
+  results = json.loads(args.results.read_text())["faults"]
+  history = json.loads(args.history.read_text()) if args.history.exists() else {"releases": []}
+  found = regressions(results, history, args.release, args.threshold)
+  if args.record:
+    record(results, args.release, args.history)
+  shown = [e for e in history["releases"] if e["release"] != args.release] + [entry(results, args.release)]
+  print(render({"releases": shown}))
+  if len(shown) == 1:
+    print(f"ℹ️  No earlier release in {args.history}; record one with --record (SOAK_RECORD=true) to compare against")
+  for line in found:
+    print(f"❌ {line}")
+  return 1 if found else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
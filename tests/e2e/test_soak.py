@@ -0,0 +1,55 @@
+"""Soak and recovery tests: sustained Team churn with one fault injected per run.
+
+Each test keeps a pool of Teams changing for SOAK_DURATION seconds and injects
+its fault a third of the way in (see soak.py). It then waits for every change
+to reach Gitea. The tracked numbers per fault are written to
+results/soak.json. ./scripts/run-soak-tests.sh compares them with the
+releases in baselines/soak.json.
+
+Prerequisites: the POC cluster from ./scripts/build-poc.sh, with the Actions
+runner. The tests are marked soak and left out of the regular e2e run.
+"""
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+import soak
+
+RESULTS_PATH = Path(__file__).parent / "results" / "soak.json"
+
+
+@pytest.fixture(scope="module")
+def soak_results() -> Iterator[dict[str, Any]]:
+  """Collect the numbers of every fault and write them at the end of the module."""
+  results: dict[str, Any] = {}
+  yield results
+
+  if results:
+    output = Path(os.environ.get("SOAK_OUTPUT", RESULTS_PATH))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"config": soak.SoakConfig.from_env().__dict__, "faults": results}, indent=2, sort_keys=True))
+
+
+@pytest.mark.soak
+@pytest.mark.parametrize("fault_name", list(soak.FAULTS))
+def test_converges_after_fault(fault_name: str, k8s_clients: dict[str, Any], soak_results: dict[str, Any]) -> None:
+  """Every change converges after the fault, with no stuck, orphaned or duplicate orgs."""
+  config = soak.SoakConfig.from_env()
+  gitea = soak.Gitea.from_cluster(k8s_clients["core"])
+  workload = soak.Workload(k8s_clients["custom"], gitea, f"soak-{uuid.uuid4().hex[:4]}-", config.teams)
+  fault = soak.FAULTS[fault_name](k8s_clients)
+
+  try:
+    result = soak.run_soak(workload, fault, config)
+  finally:
+    workload.cleanup()
+  soak_results[fault_name] = result
+  print(f"\n📊 {fault_name}: {json.dumps({key: result[key] for key in soak.TRACKED})}")
+
+  assert result["settle_seconds"] is not None, f"Not converged {config.settle_timeout:.0f}s after the workload: {result['details']}"
+  assert not result["stuck"] and not result["orphans"] and not result["duplicates"], result["details"]
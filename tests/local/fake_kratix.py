@@ -0,0 +1,358 @@
+"""In-process stand-in for the Kratix resource pipeline contract.
+
+FakeKratix emulates just enough of Kratix to exercise the Team Promise
+without a cluster:
+
+1. Validate the Team against the CRD ``openAPIV3Schema`` in ``promise.yaml``
+   (what the API server does on ``kubectl apply``).
+2. Run ``configure.main()`` in-process with ``/kratix/input``,
+   ``/kratix/output`` and ``/kratix/metadata`` redirected to temp dirs.
+3. Package the outputs into a Work-like object whose workload contents are
+   gzip + base64, the format ``_decode_workload`` in the e2e tests reverses.
+4. Write the Work to local bare Git repositories the way GitStateStore
+   Destinations with ``filepath.mode: none`` would, one commit per change.
+   Workload groups follow ``destination-selectors.yaml``, so each
+   Destination only receives the groups whose selectors match its labels.
+
+Usage:
+  kratix = FakeKratix(tmp_path)
+  work = kratix.apply(team)
+  files = extract_workloads(work)
+"""
+
+import base64
+import contextlib
+import copy
+import gzip
+import hashlib
+import io
+import os
+import subprocess
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+import schemas
+
+
+KRATIX_GROUP = "platform.kratix.io"
+KRATIX_VERSION = "v1alpha1"
+
+
+def encode_workload(content: bytes) -> str:
+  """Encode workload content the way Kratix stores it in a Work (gzip + base64)."""
+  # Kratix uses Go's compress/gzip at its default level
+  return base64.b64encode(gzip.compress(content, compresslevel=6)).decode("ascii")
+
+
+def work_payload_size(work: dict[str, Any]) -> int:
+  """Return the bytes of encoded content and file paths carried by a Work."""
+  return sum(
+    len(wl["content"]) + len(wl["filepath"])
+    for group in work.get("spec", {}).get("workloadGroups", [])
+    for wl in group.get("workloads", [])
+  )
+
+
+def decode_workload(workload: dict[str, Any]) -> str:
+  """Decode a Kratix workload content (base64 + gzip)."""
+  raw = base64.b64decode(workload["content"])
+  return gzip.decompress(raw).decode("utf-8")
+
+
+def extract_workloads(work: dict[str, Any]) -> dict[str, str]:
+  """Return a {filepath: decoded_content} mapping from a Work resource."""
+  result: dict[str, str] = {}
+  for group in work.get("spec", {}).get("workloadGroups", []):
+    for wl in group.get("workloads", []):
+      result[wl["filepath"]] = decode_workload(wl)
+  return result
+
+
+class PipelineError(Exception):
+  """Raised when the configure pipeline exits with an error."""
+
+
+def selector_matches(selectors: list[dict[str, Any]], labels: dict[str, str]) -> bool:
+  """Whether a workload group with *selectors* is scheduled to a Destination with *labels*."""
+  return all(
+    all(labels.get(key) == value for key, value in selector.get("matchLabels", {}).items())
+    for selector in selectors
+  )
+
+
+@dataclass
+class Destination:
+  """A Destination backed by its own bare Git state store."""
+
+  name: str
+  labels: dict[str, str]
+  path: str
+  state_store: Path
+  checkout: Path
+  # Files each resource's Work placed here, for cleanup
+  placed: dict[str, set[str]] = field(default_factory=dict)
+
+
+class FakeKratix:
+  """Run the Team Promise pipeline in-process against local Git state stores."""
+
+  def __init__(
+    self,
+    work_dir: Path,
+    destination_path: str = "",
+    promise_path: Path = schemas.PROMISE_PATH,
+    destinations: Optional[dict[str, dict[str, str]]] = None,
+  ) -> None:
+    self.work_dir = Path(work_dir)
+    self.validator = schemas.team_validator(promise_path)
+
+    self.teams: dict[str, dict[str, Any]] = {}
+    self.works: dict[str, dict[str, Any]] = {}
+    self.logs: dict[str, str] = {}
+
+    # One unlabelled Destination unless a {name: labels} mapping is given
+    self.destinations: dict[str, Destination] = {}
+    for name, labels in (destinations or {"default": {}}).items():
+      store_name = "state-store" if destinations is None else f"state-store-{name}"
+      self.destinations[name] = Destination(
+        name=name,
+        labels=labels,
+        path=destination_path,
+        state_store=self.work_dir / f"{store_name}.git",
+        checkout=self.work_dir / store_name,
+      )
+      self._init_state_store(self.destinations[name])
+
+  # -- Team API ---------------------------------------------------------------
+
+  def apply(self, team: dict[str, Any]) -> dict[str, Any]:
+    """Create or update a Team and reconcile it, returning the resulting Work."""
+    self.validator.validate(team)
+
+    name = team["metadata"]["name"]
+    previous = self.teams.get(name)
+    stored = copy.deepcopy(team)
+    metadata = stored.setdefault("metadata", {})
+    metadata.setdefault("namespace", "default")
+    # Like the API server: uid is set on create, generation bumps on spec changes
+    if previous is None:
+      metadata["uid"] = str(uuid.uuid4())
+      metadata["generation"] = 1
+    else:
+      metadata["uid"] = previous["metadata"]["uid"]
+      changed = previous.get("spec") != stored.get("spec")
+      metadata["generation"] = previous["metadata"]["generation"] + int(changed)
+    # Status is owned by the controller, not the caller
+    stored["status"] = copy.deepcopy(previous.get("status", {}) if previous else {})
+    self.teams[name] = stored
+
+    outputs, status, selectors = self._run_pipeline(stored, "configure")
+    stored["status"] = {**stored["status"], **status, "message": "Resource requested"}
+
+    work = self._build_work(stored, outputs, selectors)
+    self.works[name] = work
+    self._write_state_store(name, work)
+    return work
+
+  def delete(self, name: str) -> None:
+    """Run the delete pipeline and remove the Team's Work and files."""
+    team = self.teams[name]
+    self._run_pipeline(team, "delete")
+    self.works.pop(name, None)
+    self._write_state_store(name, None)
+    del self.teams[name]
+
+  def get_team(self, name: str) -> dict[str, Any]:
+    return self.teams[name]
+
+  def get_work(self, name: str) -> Optional[dict[str, Any]]:
+    return self.works.get(name)
+
+  # -- pipeline ---------------------------------------------------------------
+
+  def _run_pipeline(
+    self, team: dict[str, Any], action: str,
+  ) -> tuple[dict[str, bytes], dict[str, Any], list[dict[str, Any]]]:
+    """Run configure.main() for *team* and return (outputs, status, destination selectors)."""
+    import configure
+    import kratix_sdk as ks
+
+    with tempfile.TemporaryDirectory(dir=self.work_dir) as tmp:
+      input_dir = Path(tmp) / "input"
+      output_dir = Path(tmp) / "output"
+      metadata_dir = Path(tmp) / "metadata"
+      for d in (input_dir, output_dir, metadata_dir):
+        d.mkdir()
+
+      with open(input_dir / "object.yaml", "w") as f:
+        yaml.dump(team, f)
+
+      ks.set_input_dir(str(input_dir))
+      ks.set_output_dir(str(output_dir))
+      ks.set_metadata_dir(str(metadata_dir))
+
+      env = {
+        "KRATIX_WORKFLOW_ACTION": action,
+        "KRATIX_WORKFLOW_TYPE": "resource",
+        "KRATIX_PROMISE_NAME": "team",
+        "KRATIX_PIPELINE_NAME": f"team-{action}",
+      }
+      previous_env = {key: os.environ.get(key) for key in env}
+      os.environ.update(env)
+      log = io.StringIO()
+      try:
+        with contextlib.redirect_stdout(log):
+          configure.main()
+      except Exception as e:
+        raise PipelineError(f"team-{action} failed for {team['metadata']['name']}: {e}") from e
+      finally:
+        for key, value in previous_env.items():
+          if value is None:
+            os.environ.pop(key, None)
+          else:
+            os.environ[key] = value
+        self.logs[team["metadata"]["name"]] = log.getvalue()
+
+      outputs = {
+        path.relative_to(output_dir).as_posix(): path.read_bytes()
+        for path in sorted(output_dir.rglob("*"))
+        if path.is_file()
+      }
+
+      status: dict[str, Any] = {}
+      status_path = metadata_dir / "status.yaml"
+      if status_path.exists():
+        with open(status_path, "r") as f:
+          status = yaml.safe_load(f) or {}
+
+      selectors: list[dict[str, Any]] = []
+      selectors_path = metadata_dir / "destination-selectors.yaml"
+      if selectors_path.exists():
+        with open(selectors_path, "r") as f:
+          selectors = yaml.safe_load(f) or []
+
+    return outputs, status, selectors
+
+  def _build_work(
+    self, team: dict[str, Any], outputs: dict[str, bytes], selectors: list[dict[str, Any]],
+  ) -> dict[str, Any]:
+    """Group outputs by selector directory; the rest form the "." group."""
+    name = team["metadata"]["name"]
+    groups: dict[str, dict[str, bytes]] = {}
+    group_selectors: dict[str, list[dict[str, Any]]] = {".": []}
+    for selector in selectors:
+      directory = selector.get("directory") or "."
+      group_selectors.setdefault(directory, []).append({"matchLabels": selector.get("matchLabels", {})})
+
+    for path, content in outputs.items():
+      top = path.split("/", 1)[0]
+      if top in group_selectors and top != "." and "/" in path:
+        # Kratix stores grouped workloads relative to their directory
+        groups.setdefault(top, {})[path.split("/", 1)[1]] = content
+      else:
+        groups.setdefault(".", {})[path] = content
+
+    return {
+      "apiVersion": f"{KRATIX_GROUP}/{KRATIX_VERSION}",
+      "kind": "Work",
+      "metadata": {
+        "name": f"team-{name}-team-configure",
+        "namespace": team["metadata"]["namespace"],
+        "labels": {
+          "kratix.io/promise-name": "team",
+          "kratix.io/resource-name": name,
+          "kratix.io/pipeline-name": "team-configure",
+        },
+      },
+      "spec": {
+        "promiseName": "team",
+        "resourceName": name,
+        "workloadGroups": [
+          {
+            "id": hashlib.sha256(directory.encode("utf-8")).hexdigest()[:10],
+            "directory": directory,
+            "destinationSelectors": group_selectors[directory],
+            "workloads": [
+              {"filepath": path, "content": encode_workload(content)}
+              for path, content in files.items()
+            ],
+          }
+          for directory, files in sorted(groups.items())
+        ],
+      },
+    }
+
+  # -- state store ------------------------------------------------------------
+
+  def _git(self, *args: str, cwd: Path) -> str:
+    result = subprocess.run(
+      ["git", *args],
+      cwd=cwd,
+      check=True,
+      capture_output=True,
+      text=True,
+    )
+    return result.stdout
+
+  def _init_state_store(self, destination: Destination) -> None:
+    self.work_dir.mkdir(parents=True, exist_ok=True)
+    checkout = destination.checkout
+    self._git("init", "--bare", "--initial-branch=main", str(destination.state_store), cwd=self.work_dir)
+    self._git("clone", str(destination.state_store), str(checkout), cwd=self.work_dir)
+    self._git("config", "user.name", "kratix", cwd=checkout)
+    self._git("config", "user.email", "kratix@platform.local", cwd=checkout)
+    self._git("checkout", "-b", "main", cwd=checkout)
+    self._git("commit", "--allow-empty", "-m", "Initial commit", cwd=checkout)
+    self._git("push", "origin", "main", cwd=checkout)
+
+  def _write_state_store(self, name: str, work: Optional[dict[str, Any]]) -> None:
+    """Place *work* in each Destination it is scheduled to, removing files it no longer contains."""
+    for destination in self.destinations.values():
+      files: dict[str, str] = {}
+      for group in (work or {}).get("spec", {}).get("workloadGroups", []):
+        if selector_matches(group.get("destinationSelectors", []), destination.labels):
+          files.update({wl["filepath"]: decode_workload(wl) for wl in group["workloads"]})
+      self._write_destination(destination, name, work, files)
+
+  def _write_destination(
+    self, destination: Destination, name: str, work: Optional[dict[str, Any]], files: dict[str, str],
+  ) -> None:
+    checkout = destination.checkout
+    root = checkout / destination.path
+
+    for stale in destination.placed.get(name, set()) - set(files):
+      (root / stale).unlink(missing_ok=True)
+    for filepath, content in files.items():
+      dest = root / filepath
+      dest.parent.mkdir(parents=True, exist_ok=True)
+      dest.write_text(content)
+    destination.placed[name] = set(files)
+
+    self._git("add", "--all", cwd=checkout)
+    if not self._git("status", "--porcelain", cwd=checkout).strip():
+      return
+    work_name = work["metadata"]["name"] if work else f"team-{name}-team-configure"
+    verb = "Update" if files else "Delete"
+    self._git("commit", "-m", f"{verb} from: {work_name}", cwd=checkout)
+    self._git("push", "origin", "main", cwd=checkout)
+
+  def _destination(self, name: Optional[str]) -> Destination:
+    return self.destinations[name] if name else next(iter(self.destinations.values()))
+
+  def state_store_files(self, destination: Optional[str] = None) -> dict[str, str]:
+    """Return {path: content} for every file at the tip of a Destination's state store."""
+    store = self._destination(destination).state_store
+    listing = self._git("ls-tree", "-r", "--name-only", "main", cwd=store)
+    return {
+      path: self._git("show", f"main:{path}", cwd=store)
+      for path in listing.splitlines()
+    }
+
+  def state_store_log(self, destination: Optional[str] = None) -> list[str]:
+    """Return commit subjects on a Destination's state store, newest first."""
+    return self._git("log", "--format=%s", "main", cwd=self._destination(destination).state_store).splitlines()
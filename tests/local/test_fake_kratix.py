@@ -0,0 +1,151 @@
+"""Fast lifecycle tests for the Team Promise using the in-process FakeKratix.
+
+These mirror the assertions in e2e/test_team_provisioning.py but run the
+configure pipeline in-process against a local bare Git state store, so they
+need neither a cluster nor Gitea.
+"""
+
+from pathlib import Path
+from typing import Any
+
+import jsonschema
+import pytest
+import yaml
+
+from fake_kratix import FakeKratix, encode_workload, decode_workload, extract_workloads, work_payload_size
+
+
+def _team(name: str, spec: dict[str, Any]) -> dict[str, Any]:
+  return {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": name, "namespace": "default"},
+    "spec": spec,
+  }
+
+
+@pytest.fixture
+def kratix(tmp_path: Path) -> FakeKratix:
+  return FakeKratix(tmp_path)
+
+
+@pytest.mark.local
+def test_workload_encoding_round_trip() -> None:
+  """Workload contents should use the gzip + base64 encoding Kratix uses"""
+  content = "kind: Group\n"
+  assert decode_workload({"content": encode_workload(content.encode("utf-8"))}) == content
+
+
+@pytest.mark.local
+def test_team_lifecycle(kratix: FakeKratix) -> None:
+  """Full lifecycle: create, verify outputs, update, verify, delete, verify."""
+  # -- Create -----------------------------------------------------------------
+  work = kratix.apply(_team("local-lifecycle", {
+    "id": "team-lifecycle",
+    "name": "Lifecycle Team",
+    "email": "lifecycle@test.com",
+  }))
+
+  assert work["metadata"]["labels"]["kratix.io/resource-name"] == "local-lifecycle"
+  files = extract_workloads(work)
+
+  backstage = yaml.safe_load(files["backstage-team-team-lifecycle.yaml"])
+  assert backstage["kind"] == "Group"
+  assert backstage["metadata"]["name"] == "team-lifecycle"
+  assert backstage["metadata"]["annotations"]["contact.email"] == "lifecycle@test.com"
+  assert "Lifecycle Team" in files["terraform/org-team-lifecycle.tf"]
+
+  # The state store holds exactly what the Work contains
+  assert kratix.state_store_files() == files
+  assert kratix.get_team("local-lifecycle")["status"]["teamId"] == "team-lifecycle"
+
+  # -- Update -----------------------------------------------------------------
+  work = kratix.apply(_team("local-lifecycle", {
+    "id": "team-lifecycle",
+    "name": "Updated Lifecycle Team",
+    "email": "updated@test.com",
+  }))
+  files = extract_workloads(work)
+
+  backstage = yaml.safe_load(files["backstage-team-team-lifecycle.yaml"])
+  assert backstage["spec"]["displayName"] == "Updated Lifecycle Team"
+  assert kratix.state_store_files()["terraform/org-team-lifecycle.tf"] == files["terraform/org-team-lifecycle.tf"]
+
+  # -- Delete -----------------------------------------------------------------
+  kratix.delete("local-lifecycle")
+
+  assert kratix.get_work("local-lifecycle") is None
+  assert kratix.state_store_files() == {}
+  assert kratix.state_store_log()[0] == "Delete from: team-local-lifecycle-team-configure"
+
+
+@pytest.mark.local
+def test_team_id_change_replaces_files_in_one_commit(kratix: FakeKratix) -> None:
+  """Changing spec.id should swap the files in a single state store commit."""
+  kratix.apply(_team("local-rename", {"id": "team-old", "name": "Rename Team"}))
+  commits_before = len(kratix.state_store_log())
+
+  kratix.apply(_team("local-rename", {"id": "team-new", "name": "Rename Team"}))
+
+  files = kratix.state_store_files()
+  assert set(files) == {"backstage-team-team-new.yaml", "terraform/org-team-new.tf"}
+  assert "from = gitea_org.team_team-old" in files["terraform/org-team-new.tf"]
+  assert len(kratix.state_store_log()) == commits_before + 1
+
+
+@pytest.mark.local
+def test_unchanged_team_does_not_commit(kratix: FakeKratix) -> None:
+  """Re-applying an unchanged team should not create a new commit."""
+  team = _team("local-noop", {"id": "team-noop", "name": "Noop Team"})
+  kratix.apply(team)
+  commits_before = len(kratix.state_store_log())
+
+  kratix.apply(team)
+
+  assert len(kratix.state_store_log()) == commits_before
+
+
+@pytest.mark.local
+def test_invalid_team_rejected(kratix: FakeKratix) -> None:
+  """Teams that fail the CRD schema should be rejected before the pipeline runs."""
+  with pytest.raises(jsonschema.ValidationError):
+    kratix.apply(_team("local-invalid", {
+      "id": "team-invalid",
+      "name": "Invalid Team",
+      "email": "not-an-email",
+    }))
+
+  assert "local-invalid" not in kratix.teams
+  assert kratix.state_store_files() == {}
+
+
+@pytest.mark.local
+def test_projected_work_size_matches_work(kratix: FakeKratix) -> None:
+  """The status Work size projected by the pipeline should match the real Work."""
+  work = kratix.apply(_team("local-size", {"id": "team-size", "name": "Size Team"}))
+
+  assert kratix.get_team("local-size")["status"]["workSizeBytes"] == work_payload_size(work)
+
+
+@pytest.mark.local
+def test_fan_out_to_catalog_and_infra_destinations(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Catalog and infra outputs should land in separate state stores."""
+  monkeypatch.setenv("CATALOG_DESTINATION_SELECTOR", "repo=catalog")
+  monkeypatch.setenv("INFRA_DESTINATION_SELECTOR", "repo=infra")
+  kratix = FakeKratix(tmp_path, destinations={"catalog": {"repo": "catalog"}, "infra": {"repo": "infra"}})
+
+  kratix.apply(_team("local-fan-out", {"id": "team-fan-out", "name": "Fan Out Team"}))
+
+  assert set(kratix.state_store_files("catalog")) == {"backstage-team-team-fan-out.yaml"}
+  assert set(kratix.state_store_files("infra")) == {"terraform/org-team-fan-out.tf"}
+
+  # A catalog-only change never commits to the infra repo
+  infra_commits = len(kratix.state_store_log("infra"))
+  kratix.apply(_team("local-fan-out", {"id": "team-fan-out", "name": "Fan Out Team", "parent": "platform"}))
+
+  assert len(kratix.state_store_log("infra")) == infra_commits
+  assert "parent: platform" in kratix.state_store_files("catalog")["backstage-team-team-fan-out.yaml"]
+
+  kratix.delete("local-fan-out")
+  assert kratix.state_store_files("catalog") == {}
+  assert kratix.state_store_files("infra") == {}
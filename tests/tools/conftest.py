@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Operator tools live in tools/ at the project root; scripts run by the
+# GitOps repository's workflows live in repos/kratix/scripts; the soak
+# suite's checks live next to it in tests/e2e
+for tools_dir in (PROJECT_ROOT / "tools", PROJECT_ROOT / "repos" / "kratix" / "scripts", PROJECT_ROOT / "tests" / "e2e"):
+  if str(tools_dir) not in sys.path:
+    sys.path.insert(0, str(tools_dir))
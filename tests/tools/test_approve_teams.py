@@ -0,0 +1,56 @@
+"""Tests for the batch Team approval tool."""
+
+from typing import Any
+
+import approve_teams
+
+
+def gated_team(name: str, status: str, approved_by: str = "") -> dict[str, Any]:
+  annotations = {"platform.kratix.io/approved-by": approved_by} if approved_by else {}
+  return {
+    "metadata": {"name": name, "annotations": annotations},
+    "status": {"conditions": [{"type": "Approved", "status": status, "reason": "PendingApproval"}]},
+  }
+
+
+class FakeCustomObjectsApi:
+  """Records merge patches, failing those for names in *fail*."""
+
+  def __init__(self, fail: set[str] = set()) -> None:
+    self.fail = fail
+    self.patched: dict[str, dict[str, Any]] = {}
+
+  def patch_namespaced_custom_object(self, **kwargs: Any) -> dict[str, Any]:
+    if kwargs["name"] in self.fail:
+      raise RuntimeError("HTTP 500")
+    self.patched[kwargs["name"]] = kwargs["body"]
+    return kwargs["body"]
+
+
+def test_group_teams_by_approval_state() -> None:
+  """Teams should be counted as pending, approving or approved; ungated ones are skipped."""
+  teams = [
+    gated_team("beta", "False"),
+    gated_team("alpha", "False"),
+    gated_team("gamma", "False", approved_by="alice"),
+    gated_team("delta", "True", approved_by="alice"),
+    {"metadata": {"name": "legacy"}, "status": {"teamId": "legacy"}},
+  ]
+  groups = approve_teams.group_teams(teams)
+  assert groups == {"pending": ["alpha", "beta"], "approving": ["gamma"], "approved": ["delta"]}
+
+  metrics = approve_teams.metrics_text(groups)
+  assert 'team_approval_teams{state="pending"} 2' in metrics
+  assert 'team_approval_teams{state="approved"} 1' in metrics
+
+
+def test_approve_sets_annotation_and_requeues() -> None:
+  """Approval should annotate and label every team in one patch, reporting failures."""
+  api = FakeCustomObjectsApi(fail={"beta"})
+  errors = approve_teams.approve(api, "default", ["alpha", "beta", "gamma"], "alice", workers=2)
+
+  assert errors == ["beta: HTTP 500"]
+  assert sorted(api.patched) == ["alpha", "gamma"]
+  metadata = api.patched["alpha"]["metadata"]
+  assert metadata["annotations"] == {"platform.kratix.io/approved-by": "alice"}
+  assert metadata["labels"] == {"kratix.io/manual-reconciliation": "true"}
@@ -0,0 +1,151 @@
+"""Tests for the bulk Team import tool."""
+
+import asyncio
+import io
+from typing import Any
+
+import pytest
+
+import import_teams
+
+
+class FakeApiException(Exception):
+  def __init__(self, status: int, headers: dict[str, str] | None = None) -> None:
+    super().__init__(f"HTTP {status}")
+    self.status = status
+    self.headers = headers or {}
+
+
+class FakeCustomObjectsApi:
+  """Records server-side apply calls, failing the first *throttle* with 429."""
+
+  def __init__(self, throttle: int = 0) -> None:
+    self.throttle = throttle
+    self.applied: list[dict[str, Any]] = []
+
+  def patch_namespaced_custom_object(self, **kwargs: Any) -> dict[str, Any]:
+    assert kwargs["_content_type"] == "application/apply-patch+yaml"
+    assert kwargs["field_manager"] == import_teams.FIELD_MANAGER
+    if self.throttle:
+      self.throttle -= 1
+      raise FakeApiException(429, {"Retry-After": "0"})
+    self.applied.append(kwargs["body"])
+    return kwargs["body"]
+
+
+def test_read_records_formats() -> None:
+  """CSV, JSON array, JSON lines and multi-document YAML should all parse."""
+  csv_input = io.StringIO("id,name,email\nalpha,Team Alpha,alpha@company.com\nbeta,Team Beta,\n")
+  assert list(import_teams.read_records(csv_input, "csv")) == [
+    {"id": "alpha", "name": "Team Alpha", "email": "alpha@company.com"},
+    {"id": "beta", "name": "Team Beta"},
+  ]
+
+  json_array = io.StringIO('[{"id": "alpha", "name": "Team Alpha"}]')
+  json_lines = io.StringIO('{"id": "alpha", "name": "Team Alpha"}\n{"id": "beta", "name": "Team Beta"}\n')
+  assert len(list(import_teams.read_records(json_array, "json"))) == 1
+  assert len(list(import_teams.read_records(json_lines, "json"))) == 2
+
+  yaml_input = io.StringIO(
+    "apiVersion: platform.kratix.io/v1alpha1\nkind: Team\nmetadata:\n  name: team-alpha\n"
+    "spec:\n  id: alpha\n  name: Team Alpha\n---\nid: beta\nname: Team Beta\n"
+  )
+  teams = [import_teams.to_team(r, "default") for r in import_teams.read_records(yaml_input, "yaml")]
+  assert [t["metadata"]["name"] for t in teams] == ["team-alpha", "beta"]
+
+
+def test_plan_skips_unchanged_and_invalid() -> None:
+  """Only new or changed valid teams should be planned for apply."""
+  records = [
+    {"id": "alpha", "name": "Team Alpha"},
+    {"id": "beta", "name": "Team Beta Renamed"},
+    {"id": "gamma", "name": "Team Gamma"},
+    {"id": "bad", "name": "Bad Email", "email": "not-an-email"},
+    {"id": "alpha", "name": "Duplicate Alpha"},
+  ]
+  existing = {
+    "alpha": {"id": "alpha", "name": "Team Alpha"},
+    "beta": {"id": "beta", "name": "Team Beta"},
+  }
+  stats = import_teams.ImportStats()
+
+  pending = import_teams.plan_import(records, existing, "default", stats)
+
+  assert [(t["metadata"]["name"], is_new) for t, is_new in pending] == [("beta", False), ("gamma", True)]
+  trace_ids = [t["metadata"]["annotations"]["platform.kratix.io/trace-id"] for t, _ in pending]
+  assert len(set(trace_ids)) == 2 and all(len(trace_id) == 32 for trace_id in trace_ids)
+  assert stats.unchanged == 1
+  assert stats.invalid == 2
+  assert any(error.startswith("bad:") for error in stats.errors)
+
+
+def test_plan_ignores_server_side_defaults() -> None:
+  """Fields the import never sets should not make a stored Team look changed."""
+  records = [
+    {"id": "alpha", "name": "Team Alpha"},
+    {"id": "beta", "name": "Team Beta"},
+  ]
+  existing = {
+    "alpha": {"id": "alpha", "name": "Team Alpha", "membershipSync": "terraform", "members": ["alice"]},
+    "beta": {"id": "beta", "name": "Team Beta", "email": "beta@example.com", "membershipSync": "terraform"},
+  }
+  stats = import_teams.ImportStats()
+
+  pending = import_teams.plan_import(records, existing, "default", stats)
+
+  # beta's email was dropped from the input, so it is re-applied without it
+  assert [t["metadata"]["name"] for t, _ in pending] == ["beta"]
+  assert stats.unchanged == 1
+
+
+def test_import_retries_throttled_requests() -> None:
+  """429 responses should be retried and counted, then the team applied."""
+  api = FakeCustomObjectsApi(throttle=2)
+  stats = import_teams.ImportStats()
+  pending = import_teams.plan_import(
+    [{"id": "alpha", "name": "Team Alpha"}, {"id": "beta", "name": "Team Beta"}],
+    {"beta": {"id": "beta", "name": "Old Beta"}},
+    "default",
+    stats,
+  )
+
+  asyncio.run(import_teams.import_teams(api, pending, stats, workers=2, rate=0))
+
+  assert sorted(t["metadata"]["name"] for t in api.applied) == ["alpha", "beta"]
+  assert (stats.created, stats.updated, stats.failed, stats.retries) == (1, 1, 0, 2)
+
+
+def test_import_gives_up_on_client_errors() -> None:
+  """Non-retryable errors should fail the team without retrying."""
+
+  class RejectingApi(FakeCustomObjectsApi):
+    def patch_namespaced_custom_object(self, **kwargs: Any) -> dict[str, Any]:
+      raise FakeApiException(422)
+
+  stats = import_teams.ImportStats()
+  pending = import_teams.plan_import([{"id": "alpha", "name": "Team Alpha"}], {}, "default", stats)
+
+  asyncio.run(import_teams.import_teams(RejectingApi(), pending, stats, rate=0))
+
+  assert (stats.failed, stats.retries) == (1, 0)
+
+
+def test_rate_limiter_bounds_request_rate() -> None:
+  """The token bucket should hold requests to roughly the configured rate."""
+
+  async def run() -> float:
+    limiter = import_teams.RateLimiter(rate=50, burst=1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(11):
+      await limiter.acquire()
+    return loop.time() - start
+
+  # One token up front, then ten more at 50/s
+  assert asyncio.run(run()) >= 0.18
+
+
+@pytest.mark.parametrize("path,fmt", [("teams.csv", "csv"), ("teams.jsonl", "json"), ("teams.yml", "yaml")])
+def test_detect_format(path: str, fmt: str) -> None:
+  """Input format should follow the file extension."""
+  assert import_teams.detect_format(path) == fmt
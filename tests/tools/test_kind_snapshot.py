@@ -0,0 +1,74 @@
+"""Tests for the Kind snapshot helpers."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import kind_snapshot
+
+# Trimmed docker inspect output of a Kind control-plane node
+NODE_INSPECT: dict[str, Any] = {
+  "Name": "/kratix-poc-control-plane",
+  "Config": {
+    "Hostname": "kratix-poc-control-plane",
+    "Tty": True,
+    "StopSignal": "SIGRTMIN+3",
+    "Labels": {"io.x-k8s.kind.cluster": "kratix-poc", "io.x-k8s.kind.role": "control-plane"},
+  },
+  "HostConfig": {
+    "Privileged": True,
+    "SecurityOpt": ["seccomp=unconfined", "apparmor=unconfined"],
+    "CgroupnsMode": "private",
+    "RestartPolicy": {"Name": "on-failure", "MaximumRetryCount": 1},
+    "Tmpfs": {"/run": "", "/tmp": ""},
+    "Binds": ["/lib/modules:/lib/modules:ro"],
+    "Devices": [{"PathOnHost": "/dev/fuse", "PathInContainer": "/dev/fuse", "CgroupPermissions": "rwm"}],
+    "NetworkMode": "kind",
+    "PortBindings": {
+      "6443/tcp": [{"HostIp": "127.0.0.1", "HostPort": "41234"}],
+      "80/tcp": [{"HostIp": "", "HostPort": "8080"}],
+    },
+  },
+  "Mounts": [
+    {"Type": "bind", "Destination": "/lib/modules", "Source": "/lib/modules"},
+    {"Type": "volume", "Destination": "/var", "Name": "3f2a9c"},
+  ],
+  "NetworkSettings": {"Networks": {"kind": {"IPAddress": "172.18.0.2"}}},
+}
+
+
+def test_run_args_recreate_kind_node() -> None:
+  """The node should come back with Kind's labels, ports, IP and the restored /var volume."""
+  assert kind_snapshot.var_volume(NODE_INSPECT) == "3f2a9c"
+
+  args = kind_snapshot.run_args(NODE_INSPECT, "kratix-poc-node:stage5", "restored-var")
+  pairs = set(zip(args, args[1:]))
+  assert args[-1] == "kratix-poc-node:stage5"
+  assert ("--name", "kratix-poc-control-plane") in pairs
+  assert ("--label", "io.x-k8s.kind.cluster=kratix-poc") in pairs
+  assert ("--volume", "restored-var:/var") in pairs
+  assert ("--volume", "/lib/modules:/lib/modules:ro") in pairs
+  assert ("--ip", "172.18.0.2") in pairs
+  assert ("--publish", "127.0.0.1:41234:6443/tcp") in pairs
+  assert ("--publish", "8080:80/tcp") in pairs
+  assert ("--restart", "on-failure:1") in pairs
+  assert ("--device", "/dev/fuse:/dev/fuse:rwm") in pairs
+  assert {"--privileged", "--tty", "--cgroupns=private"} <= set(args)
+
+  with pytest.raises(ValueError, match="no /var volume"):
+    kind_snapshot.var_volume({"Mounts": []})
+
+
+def test_snapshot_key_tracks_bootstrap_inputs(tmp_path: Path) -> None:
+  """Editing any bootstrap input should change the snapshot key."""
+  (tmp_path / "manifests").mkdir()
+  (tmp_path / "manifests" / "kind.yaml").write_text("kind: Cluster\n")
+  (tmp_path / "setup.sh").write_text("echo setup\n")
+  inputs = ["setup.sh", "manifests", "missing"]
+
+  key = kind_snapshot.snapshot_key(tmp_path, inputs)
+  assert key == kind_snapshot.snapshot_key(tmp_path, inputs)
+
+  (tmp_path / "manifests" / "kind.yaml").write_text("kind: Cluster\nnodes: []\n")
+  assert kind_snapshot.snapshot_key(tmp_path, inputs) != key
@@ -0,0 +1,42 @@
+"""Tests for the Terraform plan summary script."""
+
+import json
+from pathlib import Path
+
+import plan_summary
+
+
+PLAN = {
+  "terraform_version": "1.5.7",
+  "resource_changes": [
+    {"address": "gitea_org.team_alpha", "change": {"actions": ["create"]}},
+    {"address": "gitea_org.team_beta", "change": {"actions": ["update"]}},
+    {"address": "gitea_org.team_gamma", "change": {"actions": ["delete"]}},
+    {"address": "gitea_team.team_delta_members", "change": {"actions": ["delete", "create"]}},
+    {"address": "gitea_org.team_api", "change": {"actions": ["no-op"], "importing": {"id": "42"}}},
+    {"address": "gitea_org.team_new", "previous_address": "gitea_org.team_old", "change": {"actions": ["no-op"]}},
+  ],
+}
+
+
+def test_summarise_counts_like_terraform_plan() -> None:
+  """A replacement should count as one add and one destroy."""
+  assert plan_summary.summarise(PLAN) == {
+    "added": 2, "changed": 1, "destroyed": 2, "replaced": 1, "imported": 1, "moved": 1,
+  }
+
+
+def test_main_writes_summary(tmp_path: Path) -> None:
+  """Skipped apply steps pass empty durations, which should become null."""
+  plan_path = tmp_path / "plan.json"
+  plan_path.write_text(json.dumps(PLAN))
+  output = tmp_path / "plan-summary.json"
+
+  assert plan_summary.main([
+    str(plan_path), "--commit", "abc123", "--plan-seconds", "7", "--apply-seconds", "", "--output", str(output),
+  ]) == 0
+
+  summary = json.loads(output.read_text())
+  assert summary["commit"] == "abc123"
+  assert (summary["plan_seconds"], summary["apply_seconds"], summary["apply_outcome"]) == (7.0, None, "skipped")
+  assert summary["terraform_version"] == "1.5.7"
@@ -0,0 +1,72 @@
+"""Tests for the offline render-and-diff tool."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+import render_teams
+
+TEAMS = [
+  {"apiVersion": "platform.kratix.io/v1alpha1", "kind": "Team", "metadata": {"name": "alpha"}, "spec": {"id": "alpha", "name": "Alpha", "repos": ["docs"]}},
+  {"apiVersion": "platform.kratix.io/v1alpha1", "kind": "Team", "metadata": {"name": "beta"}, "spec": {"id": "beta", "name": "Beta", "parent": "alpha"}},
+]
+
+
+def write_teams(path: Path, teams: list[dict]) -> None:
+  path.write_text(yaml.safe_dump_all(teams))
+
+
+def test_render_saves_baseline_then_reports_diffs(tmp_path: Path) -> None:
+  """The first run saves the baseline; a changed input makes the render differ."""
+  teams_file = tmp_path / "teams.yaml"
+  write_teams(teams_file, TEAMS)
+  args = [str(teams_file), "--output", str(tmp_path / "current"), "--baseline", str(tmp_path / "baseline")]
+
+  assert render_teams.main(args) == 0
+  baseline = render_teams.read_snapshots(tmp_path / "baseline")
+  assert set(baseline) == {"alpha", "beta"}
+  assert "terraform/repos-alpha.tf" in baseline["alpha"]
+  # The parent was re-rendered once its child was in the hierarchy index
+  assert "beta" in baseline["alpha"]["backstage-team-alpha.yaml"]
+  assert "templateVersion" not in baseline["alpha"]["status.yaml"]
+
+  write_teams(teams_file, [TEAMS[0], {**TEAMS[1], "spec": {**TEAMS[1]["spec"], "name": "Beta Renamed"}}])
+  assert render_teams.main(args) == 1
+  lines = render_teams.diff(baseline, render_teams.read_snapshots(tmp_path / "current"))
+  assert "+++ b/beta/terraform/org-beta.tf\n" in lines
+  assert not any(line.startswith("+++ b/alpha/") for line in lines)
+
+
+def test_watch_rerenders_only_affected_teams(tmp_path: Path) -> None:
+  """Input edits re-render their Teams; template edits the Teams that read the template; code edits all."""
+  teams_file = tmp_path / "teams.yaml"
+  write_teams(teams_file, TEAMS)
+  renderer = render_teams.Renderer(tmp_path, render_teams.pipeline_env())
+  sources = {teams_file: render_teams.read_teams(teams_file)}
+  renders, errors = renderer.render_teams(sources[teams_file], ["alpha", "beta"])
+  assert not errors
+  assert "repository.tf.template" in renders["alpha"].templates
+  assert renders["beta"].templates == {"organization.tf.template"}
+
+  template = render_teams.TEMPLATE_DIR / "repository.tf.template"
+  assert render_teams.plan_rerender({template}, sources, renders) == ("teams", {"alpha"})
+
+  write_teams(teams_file, [TEAMS[0], {**TEAMS[1], "spec": {**TEAMS[1]["spec"], "id": "beta-2"}}])
+  assert render_teams.plan_rerender({teams_file}, sources, renders) == ("teams", {"beta"})
+  assert render_teams.plan_rerender({render_teams.PROMISE_PATH}, sources, renders) == ("all", set())
+
+  # Statuses carry over between renders, so the id change renders moved blocks
+  renders, _ = renderer.render_teams(render_teams.read_teams(teams_file), ["beta"])
+  assert "from = gitea_org.team_beta\n  to   = gitea_org.team_beta-2" in renders["beta"].files["terraform/org-beta-2.tf"]
+
+
+def test_one_audit_hook_for_all_renderers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Audit hooks can't be removed, so Renderers share one instead of adding their own."""
+  hooks: list = []
+  monkeypatch.setattr(render_teams, "_audit_hook_installed", False)
+  monkeypatch.setattr(render_teams.sys, "addaudithook", hooks.append)
+
+  for n in range(3):
+    render_teams.Renderer(tmp_path / str(n), render_teams.pipeline_env())
+  assert hooks == [render_teams._audit]
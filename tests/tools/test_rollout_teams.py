@@ -0,0 +1,96 @@
+"""Tests for the template rollout tool."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import rollout_teams
+
+
+def team(name: str, version: str, sub_resources: list[str] = []) -> dict[str, Any]:
+  status: dict[str, Any] = {"teamId": name, "templateVersion": version}
+  if sub_resources:
+    status["subResources"] = sub_resources
+  return {"metadata": {"name": name}, "status": status}
+
+
+class FakeFleet:
+  """Teams that report *target* once reconciled, except *failing* ones whose pipeline pod fails."""
+
+  def __init__(self, teams: dict[str, dict[str, Any]], target: str, failing: set[str] = set()) -> None:
+    self.teams = teams
+    self.target = target
+    self.failing = failing
+    self.failed_pods: list[Any] = []
+    self.patched: list[str] = []
+
+  def patch_namespaced_custom_object(self, **kwargs: Any) -> dict[str, Any]:
+    name = kwargs["name"]
+    self.patched.append(name)
+    if name in self.failing:
+      labels = {rollout_teams.RESOURCE_NAME_LABEL: name}
+      self.failed_pods.append(SimpleNamespace(
+        metadata=SimpleNamespace(labels=labels, creation_timestamp=datetime.now(timezone.utc)),
+        status=SimpleNamespace(phase="Failed"),
+      ))
+    else:
+      self.teams[name]["status"]["templateVersion"] = self.target
+    return kwargs["body"]
+
+  def list_namespaced_custom_object(self, **kwargs: Any) -> dict[str, Any]:
+    return {"items": list(self.teams.values()) if kwargs["plural"] == "teams" else []}
+
+  def list_namespaced_pod(self, namespace: str, label_selector: str) -> Any:
+    return SimpleNamespace(items=self.failed_pods)
+
+
+def test_waves_and_composite_versions() -> None:
+  """Waves should start with the canary and double up to the cap; composite Teams wait for their sub-resources."""
+  names = [f"team-{n:02d}" for n in range(20)]
+  waves = rollout_teams.plan_waves(names, canary=1, wave_size=2, max_wave_size=5)
+  assert [len(wave) for wave in waves] == [1, 2, 4, 5, 5, 3]
+  assert sum(waves, []) == names
+
+  composite_team = team("alpha", "v2", ["TeamOrg/alpha", "TeamRepos/alpha"])
+  sub_resources = {"TeamOrg/alpha": {"status": {"templateVersion": "v2"}}, "TeamRepos/alpha": {"status": {"templateVersion": "v1"}}}
+  assert rollout_teams.rendered_version(composite_team, sub_resources) is None
+  sub_resources["TeamRepos/alpha"]["status"]["templateVersion"] = "v2"
+  assert rollout_teams.rendered_version(composite_team, sub_resources) == "v2"
+
+
+def test_rollout_pauses_when_a_wave_fails() -> None:
+  """A failing pipeline should pause the rollout after its wave and leave later waves untouched."""
+  teams = {name: team(name, "v1") for name in ("a", "b", "c", "d", "e", "f", "g")}
+  fleet = FakeFleet(teams, "v2", failing={"c"})
+  waves = rollout_teams.plan_waves(sorted(teams), canary=1, wave_size=2, max_wave_size=4)
+  stats = rollout_teams.RolloutStats(total=len(teams))
+  messages: list[str] = []
+
+  rollout_teams.rollout(fleet, fleet, "default", "v2", waves, stats, poll=0, sleep=lambda _: None, report=messages.append)
+
+  assert sorted(fleet.patched) == ["a", "b", "c"]
+  assert stats.current == 2 and stats.rendered == 2
+  assert stats.failed == ["c"]
+  assert stats.paused == "1 of 2 teams failed in wave 2/3: c"
+  assert 'team_rollout_paused 1' in rollout_teams.metrics_text(stats, "v2")
+
+
+def test_rollout_skips_teams_awaiting_approval() -> None:
+  """Teams held by the approval gate have no template version and should not be rolled out or block a wave."""
+  teams = {name: team(name, "v1") for name in ("a", "b")}
+  teams["held"] = {
+    "metadata": {"name": "held"},
+    "status": {"conditions": [{"type": "Approved", "status": "False", "reason": "PendingApproval"}], "outputs": []},
+  }
+  fleet = FakeFleet(teams, "v2")
+
+  versions = rollout_teams.fleet_versions(fleet, "default")
+  assert versions == {"a": "v1", "b": "v1"}
+
+  waves = rollout_teams.plan_waves(sorted(versions), canary=1, wave_size=2, max_wave_size=4)
+  stats = rollout_teams.RolloutStats(total=len(versions))
+  rollout_teams.rollout(fleet, fleet, "default", "v2", waves, stats, poll=0, sleep=lambda _: None, report=lambda _: None)
+
+  assert sorted(fleet.patched) == ["a", "b"]
+  assert stats.paused is None and not stats.failed
+  assert stats.current == 2
@@ -0,0 +1,150 @@
+"""Tests for the soak suite's convergence checks, audit and release history (tests/e2e/soak.py)."""
+
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+from kubernetes.client.rest import ApiException
+
+import soak
+
+
+class FakeTeams:
+  """Records the Team API calls the soak workload makes."""
+
+  def __init__(self, finalizing: Optional[set[str]] = None) -> None:
+    self.calls: list[str] = []
+    self.finalizing = finalizing or set()
+
+  def create_namespaced_custom_object(self, *args: Any) -> None:
+    name = args[-1]["metadata"]["name"]
+    self.calls.append(f"create {name}")
+    if name in self.finalizing:
+      raise ApiException(status=409)
+
+  def patch_namespaced_custom_object(self, *args: Any) -> None:
+    self.calls.append(f"patch {args[-2]}")
+
+  def delete_namespaced_custom_object(self, *args: Any) -> None:
+    self.calls.append(f"delete {args[-1]}")
+
+
+def op(team: str, desired: Optional[dict[str, str]], ids: set[str], converged_at: Optional[float] = None) -> soak.Operation:
+  return soak.Operation(team, "rename" if desired else "delete", 0.0, desired, ids, converged_at)
+
+
+def numbers(**overrides: Any) -> dict[str, Any]:
+  result: dict[str, Any] = {
+    "convergence_p95_seconds": 40.0, "recovery_seconds": 30.0, "settle_seconds": 20.0,
+    "stuck": 0, "orphans": 0, "duplicates": 0,
+  }
+  result.update(overrides)
+  return result
+
+
+def test_converged_after_moves_and_deletes() -> None:
+  """A move converges once the old org is gone; a delete only once the Team has finished finalizing."""
+  moved = op("soak-000", {"id": "soak-000-m1", "name": "Soak r1"}, {"soak-000", "soak-000-m1"})
+  assert not soak.converged(moved, {"soak-000-m1": "Soak r1", "soak-000": "Soak r0"}, True)
+  assert not soak.converged(moved, {"soak-000-m1": "Soak r0"}, True)
+  assert soak.converged(moved, {"soak-000-m1": "Soak r1"}, True)
+
+  deleted = op("soak-000", None, {"soak-000", "soak-000-m1"})
+  assert not soak.converged(deleted, {}, team_exists=True)
+  assert not soak.converged(deleted, {"soak-000-m1": "Soak r1"}, team_exists=False)
+  assert soak.converged(deleted, {"other": "Other"}, team_exists=False)
+
+
+def test_superseded_operations() -> None:
+  """A change replaced before it converged is superseded; one that converged is not."""
+  teams = FakeTeams()
+  workload = soak.Workload(teams, None, "soak-", teams=1)
+
+  first = workload.step()
+  second = workload.step()
+  assert first.kind == "create" and teams.calls[0] == "create soak-000"
+  assert first.superseded and not second.superseded
+
+  second.converged_at = 1.0
+  third = workload.step()
+  assert not second.superseded
+  assert workload.latest["soak-000"] is third
+
+
+def test_create_deferred_while_delete_finalizes() -> None:
+  """A create that conflicts with a finalizing delete is skipped, not waited on, and retried by a later step."""
+  teams = FakeTeams(finalizing={"soak-000"})
+  workload = soak.Workload(teams, None, "soak-", teams=1)
+
+  assert workload.step() is None
+  assert (teams.calls, workload.ops, workload.deferred) == (["create soak-000"], [], 1)
+
+  teams.finalizing.clear()
+  op = workload.step()
+  assert op.kind == "create" and workload.latest["soak-000"] is op
+
+
+def test_audit_finds_stuck_orphans_and_duplicates() -> None:
+  """The audit reports unconverged Teams, orgs without a live Team and live Teams' orgs under an old id."""
+  latest = {
+    "soak-000": op("soak-000", {"id": "soak-000-m2", "name": "A"}, {"soak-000", "soak-000-m2"}, converged_at=1.0),
+    "soak-001": op("soak-001", None, {"soak-001"}, converged_at=2.0),
+    "soak-002": op("soak-002", {"id": "soak-002", "name": "C"}, {"soak-002"}),
+  }
+  orgs = {"soak-000": "A", "soak-000-m2": "A", "soak-001": "B", "soak-002": "B", "soak-099": "X", "platform": "P"}
+
+  assert soak.audit(latest, orgs, "soak-") == {
+    "stuck": ["soak-002"],
+    "orphans": ["soak-001", "soak-099"],
+    "duplicates": ["soak-000"],
+  }
+
+
+def test_regressions_against_last_release() -> None:
+  """Timings regress beyond the threshold and minimum delta, a lost recovery regresses, any count increase does."""
+  history = {"releases": [
+    soak.entry({"runner-death": numbers(settle_seconds=1000.0)}, "v1.0.0"),
+    soak.entry({"runner-death": numbers(recovery_seconds=None)}, "v1.1.0"),
+    soak.entry({"runner-death": numbers(stuck=5)}, "v1.2.0"),
+  ]}
+
+  # A re-run of v1.2.0 compares with v1.1.0, not with itself or older releases
+  results = {
+    "runner-death": numbers(convergence_p95_seconds=54.0, recovery_seconds=300.0, settle_seconds=None, orphans=1),
+    "gitea-ssh-outage": numbers(stuck=3),
+  }
+  assert soak.regressions(results, history, "v1.2.0") == [
+    "runner-death.convergence_p95_seconds: 40.0 (v1.1.0) -> 54.0",
+    "runner-death.settle_seconds: 20.0 (v1.1.0) -> None",
+    "runner-death.orphans: 0 (v1.1.0) -> 1",
+  ]
+
+  # Growth under MIN_DELTA_SECONDS is noise; recovering where the last release never did is not a regression
+  assert soak.regressions({"runner-death": numbers(convergence_p95_seconds=3.0)}, {"releases": [
+    soak.entry({"runner-death": numbers(convergence_p95_seconds=2.0, recovery_seconds=None)}, "v1.1.0"),
+  ]}, "v1.2.0") == []
+  assert soak.regressions(results, {"releases": []}, "v1.2.0") == []
+
+
+def test_record_and_compare(tmp_path: Path, capsys: Any) -> None:
+  """Recording merges into an earlier run of the same release per fault; without history there is nothing to compare."""
+  history = tmp_path / "baselines" / "soak.json"
+  results = tmp_path / "soak.json"
+  results.write_text(json.dumps({"faults": {"controller-restart": numbers(details={})}}))
+
+  assert soak.main([str(results), "--release", "v1.0.0", "--history", str(history)]) == 0
+  assert "No earlier release" in capsys.readouterr().out
+  assert not history.exists()
+
+  soak.record({"controller-restart": numbers(recovery_seconds=90.0)}, "v1.0.0", history)
+  soak.record({"controller-restart": numbers()}, "v1.1.0", history)
+  soak.record({"controller-restart": numbers(recovery_seconds=35.0)}, "v1.0.0", history)
+  soak.record({"runner-death": numbers(stuck=2)}, "v1.0.0", history)
+  recorded = json.loads(history.read_text())["releases"]
+  assert [e["release"] for e in recorded] == ["v1.1.0", "v1.0.0"]
+  assert recorded[-1]["faults"]["controller-restart"]["recovery_seconds"] == 35.0
+  assert recorded[-1]["faults"]["runner-death"]["stuck"] == 2
+
+  results.write_text(json.dumps({"faults": {"controller-restart": numbers(stuck=1)}}))
+  assert soak.main([str(results), "--release", "v1.2.0", "--history", str(history)]) == 1
+  assert "❌ controller-restart.stuck: 0 (v1.0.0) -> 1" in capsys.readouterr().out
@@ -0,0 +1,130 @@
+"""Tests for the Gitea team membership sync script."""
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import sync_team_members
+
+
+class FakeGiteaClient:
+  """Holds team membership in memory and counts API calls."""
+
+  def __init__(self, members: set[str]) -> None:
+    self.members = set(members)
+    self.listed = 0
+    self.calls: list[tuple[str, str]] = []
+
+  def team_id(self, org: str, team: str) -> int:
+    return 1
+
+  def list_members(self, team_id: int) -> set[str]:
+    self.listed += 1
+    return set(self.members)
+
+  def add_member(self, team_id: int, username: str) -> None:
+    self.calls.append(("add", username))
+    self.members.add(username)
+
+  def remove_member(self, team_id: int, username: str) -> None:
+    self.calls.append(("remove", username))
+    if username not in self.members:
+      raise sync_team_members.GiteaError(404, "not a member")
+    self.members.discard(username)
+
+
+def write_members(path: Path, members: list[str]) -> None:
+  path.write_text(json.dumps({"org": "alpha", "team": "members", "members": members}))
+
+
+@pytest.fixture
+def repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+  monkeypatch.chdir(tmp_path)
+  (tmp_path / "members").mkdir()
+  for args in (["init", "-q"], ["config", "user.email", "test@example.com"], ["config", "user.name", "Test"]):
+    subprocess.run(["git", *args], check=True)
+  return tmp_path
+
+
+def commit(message: str) -> str:
+  subprocess.run(["git", "add", "-A"], check=True)
+  subprocess.run(["git", "commit", "-q", "-m", message], check=True)
+  return subprocess.run(["git", "rev-parse", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def test_diff_members() -> None:
+  """Only the set difference should be applied."""
+  assert sync_team_members.diff_members({"a", "b", "c"}, {"b", "c", "d"}) == (["d"], ["a"])
+
+
+def test_one_member_change_is_one_call(repo: Path) -> None:
+  """Diffing against the previous file should not list or touch other members."""
+  path = Path("members/team-alpha.json")
+  members = [f"user{i:04d}" for i in range(5000)]
+  write_members(path, members)
+  base = commit("initial")
+  write_members(path, members[1:] + ["newcomer"])
+  commit("change one member")
+
+  client = FakeGiteaClient(set(members))
+  stats = sync_team_members.SyncStats()
+  for changed in sync_team_members.changed_files(base):
+    sync_team_members.sync_file(client, changed, stats, base=base)
+
+  assert client.listed == 0
+  assert sorted(client.calls) == [("add", "newcomer"), ("remove", "user0000")]
+  assert (stats.teams, stats.added, stats.removed, stats.errors) == (1, 1, 1, [])
+
+
+def test_full_sync_repairs_drift(repo: Path) -> None:
+  """A full sync should diff against Gitea and tolerate already-removed members."""
+  path = Path("members/team-alpha.json")
+  write_members(path, ["alice", "bob"])
+  commit("initial")
+
+  client = FakeGiteaClient({"alice", "mallory"})
+  stats = sync_team_members.SyncStats()
+  sync_team_members.sync_file(client, str(path), stats, full=True)
+
+  assert client.listed == 1
+  assert client.members == {"alice", "bob"}
+  assert stats.errors == []
+
+
+def test_new_file_without_base_lists_members(repo: Path) -> None:
+  """Files with no previous version should fall back to Gitea's membership."""
+  write_members(Path("members/team-alpha.json"), ["alice"])
+  commit("initial")
+
+  assert sync_team_members.changed_files(sync_team_members.NULL_COMMIT) == ["members/team-alpha.json"]
+  assert sync_team_members.previous_members("members/team-alpha.json", None) is None
+
+
+def test_failed_sync_is_retried_in_full(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """A file whose sync failed should stay pending and be synced against Gitea on the next run."""
+  path = Path("members/team-alpha.json")
+  write_members(path, ["alice"])
+  base = commit("initial")
+  write_members(path, ["alice", "bob"])
+  head = commit("add bob")
+
+  client = FakeGiteaClient({"alice"})
+  monkeypatch.setenv("GITEA_TOKEN", "token")
+  monkeypatch.setattr(sync_team_members, "GiteaClient", lambda url, token: client)
+  pending = repo / ".tfstate" / "member-sync-pending.json"
+
+  def unavailable(team_id: int, username: str) -> None:
+    raise sync_team_members.GiteaError(503, "unavailable")
+
+  client.add_member = unavailable  # type: ignore[method-assign]
+  assert sync_team_members.main(["--base", base, "--pending", str(pending)]) == 1
+  assert json.loads(pending.read_text()) == [str(path)]
+
+  # The next push doesn't touch the file, so only the pending list brings it back
+  del client.add_member
+  assert sync_team_members.main(["--base", head, "--pending", str(pending)]) == 0
+  assert client.listed == 1
+  assert client.members == {"alice", "bob"}
+  assert json.loads(pending.read_text()) == []
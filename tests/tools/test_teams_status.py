@@ -0,0 +1,78 @@
+"""Tests for the watch-backed Team status tool."""
+
+import threading
+from typing import Any, Iterator
+
+import teams_status
+
+
+def obj(name: str, uid: str, created: str, resource_name: str = "", **fields: Any) -> dict[str, Any]:
+  labels = {teams_status.RESOURCE_NAME_LABEL: resource_name} if resource_name else {}
+  return {"metadata": {"name": name, "uid": uid, "creationTimestamp": created, "labels": labels}, **fields}
+
+
+def pod(name: str, team: str, phase: str, created: str, finished: str = "") -> dict[str, Any]:
+  statuses = [{"state": {"terminated": {"finishedAt": finished}}}] if finished else [{"state": {"running": {}}}]
+  return obj(name, name, created, team, status={"phase": phase, "containerStatuses": statuses})
+
+
+def test_teams_joined_with_works_and_pods() -> None:
+  """Works and pods should be joined by resource name into per-team states and latency histograms."""
+  teams = [
+    obj("alpha", "t1", "2024-01-01T00:00:00Z"),
+    obj("beta", "t2", "2024-01-01T00:00:00Z"),
+    obj("gamma", "t3", "2024-01-01T00:00:00Z"),
+    obj("delta", "t4", "2024-01-01T00:00:00Z", status={"conditions": [{"type": "Approved", "status": "False"}]}),
+  ]
+  works = [obj("alpha-work", "w1", "2024-01-01T00:00:20Z", "alpha")]
+  pods = [
+    pod("alpha-1", "alpha", "Succeeded", "2024-01-01T00:00:05Z", "2024-01-01T00:00:15Z"),
+    pod("beta-1", "beta", "Succeeded", "2024-01-01T00:00:05Z", "2024-01-01T00:00:08Z"),
+    pod("beta-2", "beta", "Failed", "2024-01-01T00:01:00Z", "2024-01-01T00:01:40Z"),
+    pod("gamma-1", "gamma", "Running", "2024-01-01T00:00:05Z"),
+  ]
+
+  rows = {row["name"]: row for row in teams_status.team_rows(teams, works, pods)}
+  assert {name: row["state"] for name, row in rows.items()} == {"alpha": "written", "beta": "failed", "gamma": "running", "delta": "pending"}
+  assert rows["alpha"]["first_render_seconds"] == 20
+  assert rows["beta"]["pipeline_seconds"] == [3, 40]
+  assert rows["delta"]["awaiting_approval"]
+
+  totals = teams_status.summary(list(rows.values()))
+  assert totals["states"] == {"pending": 1, "running": 1, "written": 1, "failed": 1}
+  assert totals["pipeline_seconds"]["le_5"] == 1 and totals["pipeline_seconds"]["le_10"] == 2
+  assert totals["pipeline_seconds"]["le_inf"] == 3
+  assert "failed   beta" in teams_status.render_table(list(rows.values()), totals)
+
+
+def test_informer_lists_then_applies_watch_events() -> None:
+  """The cache should page through the list, apply watch events and relist on 410 Gone."""
+  pages = {
+    None: {"items": [obj("alpha", "t1", "")], "metadata": {"continue": "next"}},
+    "next": {"items": [obj("beta", "t2", "")], "metadata": {"resourceVersion": "10"}},
+  }
+  lists: list[Any] = []
+
+  def list_fn(**kwargs: Any) -> dict[str, Any]:
+    lists.append(kwargs.get("_continue"))
+    return pages[kwargs.get("_continue")]
+
+  stop = threading.Event()
+  watches: list[str] = []
+
+  def stream(fn: Any, resource_version: str, **kwargs: Any) -> Iterator[dict[str, Any]]:
+    watches.append(resource_version)
+    if len(watches) == 1:
+      yield {"type": "ADDED", "object": obj("gamma", "t3", "")}
+      yield {"type": "DELETED", "object": obj("alpha", "t1", "")}
+      yield {"type": "ERROR", "object": {"code": 410, "message": "too old"}}
+    else:
+      yield {"type": "MODIFIED", "object": obj("gamma", "t3", "")}
+      stop.set()
+
+  informer = teams_status.Informer(list_fn, label_selector="x")
+  informer.run(stop, stream)
+
+  assert lists == [None, "next", None, "next"]
+  assert watches == ["10", "10"]
+  assert sorted(item["metadata"]["name"] for item in informer.items()) == ["alpha", "beta", "gamma"]
@@ -0,0 +1,68 @@
+"""Tests for the trace collector stand-in, the deploy workflow's spans and the latency report."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import trace_collector
+import trace_report
+import trace_spans
+import tracing
+
+TRACE = "0af7651916cd43dd8448eb211c80319c"
+
+
+def test_pipeline_and_deploy_spans_join_into_hops(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Spans exported by the pipeline and the workflow should break one Team change down per hop."""
+  output = tmp_path / "traces.jsonl"
+  server, spans = trace_collector.serve(0, str(output), "127.0.0.1")
+  endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+  monkeypatch.setenv("OTEL_EXPORTER_OTLP_ENDPOINT", endpoint)
+  try:
+    attributes = {"kratix.resource.name": "alpha", "kratix.resource.kind": "Team"}
+    assert tracing.export([
+      tracing.span(TRACE, "kratix.queue", 100, 103, attributes),
+      tracing.span(TRACE, "pipeline.configure", 103, 110, attributes),
+    ])
+    trace_spans.export(trace_spans.run_spans(
+      {TRACE: ["terraform/org-alpha.tf"]}, "abc123", committed=115, started=160, finished=200,
+      plan=(170, 12), apply=(182, 8), outcome="success",
+    ), endpoint)
+  finally:
+    server.shutdown()
+
+  assert spans.count == 6
+  traces = trace_report.read_spans(str(output))
+  services = {span["service"] for span in traces[TRACE]}
+  assert services == {"team-configure", "deploy-organizations"}
+
+  row = trace_report.breakdown(traces[TRACE])
+  assert row["team"] == "alpha"
+  assert row["hops"] == {"controller": 3, "pipeline": 7, "commit": 5, "deploy_wait": 45, "plan": 12, "apply": 8, "total": 100}
+
+
+def test_collect_finds_trace_ids_and_report_percentiles(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+  """Trace IDs are read from both Terraform layouts; percentiles use the nearest rank."""
+  org = tmp_path / "org-alpha.tf"
+  org.write_text(f'# trace-id: {TRACE}\nresource "gitea_org" "team_alpha" {{}}\n')
+  data = tmp_path / "beta.json"
+  data.write_text(json.dumps({"id": "beta", "trace_id": "f" * 32}, indent=2, sort_keys=True))
+  untraced = tmp_path / "repos-alpha.tf"
+  untraced.write_text('resource "gitea_repository" "team_alpha_docs" {}\n')
+
+  assert trace_spans.collect([str(org), str(data), str(untraced), str(tmp_path / "deleted.tf")]) == {
+    TRACE: [str(org)], "f" * 32: [str(data)],
+  }
+
+  rows = [{"hops": {"total": float(seconds)}} for seconds in range(1, 101)]
+  assert trace_report.fleet_percentiles(rows) == {"total": {"count": 100, "p50": 50.0, "p90": 90.0, "p99": 99.0}}
+
+  spans_file = tmp_path / "spans.jsonl"
+  spans_file.write_text("".join(json.dumps(span) + "\n" for span in trace_collector.flatten({"resourceSpans": [{
+    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "team-configure"}}]},
+    "scopeSpans": [{"spans": [tracing.span(TRACE, "pipeline.configure", 10, 12.5, {"kratix.resource.name": "alpha"})]}],
+  }]})))
+  assert trace_report.main([str(spans_file), "--json"]) == 0
+  report = json.loads(capsys.readouterr().out)
+  assert report["traces"][TRACE]["hops"] == {"pipeline": 2.5, "total": 2.5}
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+import yaml
+import pytest
+from typing import Dict, Any, List
+from pathlib import Path
+import kratix_sdk as ks
+
+
+class FakeSubResourceClient:
+  """Records applied sub-resources and serves their status"""
+
+  def __init__(self) -> None:
+    self.applied: List[Dict[str, Any]] = []
+    self.statuses: Dict[str, Dict[str, Any]] = {}
+
+  def apply(self, body: Dict[str, Any]) -> str:
+    self.applied.append(body)
+    return "created"
+
+  def status(self, kind: str, namespace: str, name: str) -> Dict[str, Any]:
+    return self.statuses.get(kind, {})
+
+
+def run_pipeline(entrypoint: Any, resource: Dict[str, Any], root: Path) -> Dict[str, str]:
+  """Run *entrypoint* on *resource* with fresh Kratix directories and return its outputs"""
+  for name in ("input", "output", "metadata"):
+    (root / name).mkdir(parents=True)
+  with open(root / "input" / "object.yaml", "w") as f:
+    yaml.dump(resource, f)
+
+  ks.set_input_dir(str(root / "input"))
+  ks.set_output_dir(str(root / "output"))
+  ks.set_metadata_dir(str(root / "metadata"))
+  entrypoint()
+
+  return {
+    path.relative_to(root / "output").as_posix(): path.read_text()
+    for path in sorted((root / "output").rglob("*")) if path.is_file()
+  }
+
+
+def composite_team(spec: Dict[str, Any]) -> Dict[str, Any]:
+  return {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "composite-team", "namespace": "default", "uid": "1234"},
+    "spec": {"id": "team-composite", "name": "Composite Team", "members": ["alice"], "repos": ["docs", "infra"], **spec},
+  }
+
+
+def test_composite_team_requests_owned_sub_resources(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that a composite Team applies its sub-resources instead of rendering outputs"""
+  import configure
+
+  client = FakeSubResourceClient()
+  monkeypatch.setattr(configure.composite, "sub_resource_client", lambda: client)
+
+  outputs: Dict[str, str] = run_pipeline(configure.main, composite_team({"pipelineMode": "composite", "parent": "platform"}), tmp_path)
+
+  assert outputs == {}
+  assert [body["kind"] for body in client.applied] == ["TeamOrg", "TeamCatalogEntry", "TeamRepos"]
+  for body in client.applied:
+    assert body["metadata"]["name"] == "composite-team"
+    assert body["metadata"]["ownerReferences"][0]["uid"] == "1234"
+    assert body["metadata"]["annotations"]["platform.kratix.io/trace-id"] == configure.tracing.trace_id(ks.Resource(composite_team({})))
+
+  org, catalog, repos = (body["spec"] for body in client.applied)
+  assert org["members"] == ["alice"] and org["provisioner"] == "terraform"
+  assert catalog["parent"] == "platform"
+  assert repos["repos"] == ["docs", "infra"]
+  assert repos["templateVersion"] == configure.template_version()
+
+  with open(tmp_path / "metadata" / "status.yaml", "r") as f:
+    status: Dict[str, Any] = yaml.safe_load(f)
+  assert status["pipelineMode"] == "composite"
+  assert status["subResources"] == ["TeamOrg/composite-team", "TeamCatalogEntry/composite-team", "TeamRepos/composite-team"]
+
+
+def test_composite_renders_same_files_as_monolithic(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that the sub-resource pipelines together render the monolithic outputs"""
+  import configure
+  import subresources
+
+  client = FakeSubResourceClient()
+  client.statuses["TeamOrg"] = {"teamId": "team-composite"}
+  monkeypatch.setattr(configure.composite, "sub_resource_client", lambda: client)
+
+  monolithic: Dict[str, str] = run_pipeline(configure.main, composite_team({}), tmp_path / "monolithic")
+  assert "terraform/repos-team-composite.tf" in monolithic
+
+  run_pipeline(configure.main, composite_team({"pipelineMode": "composite"}), tmp_path / "team")
+  rendered: Dict[str, str] = {}
+  for body in client.applied:
+    rendered.update(run_pipeline(subresources.main, body, tmp_path / body["kind"]))
+
+  assert rendered == monolithic
+
+
+def test_repos_wait_for_org(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that repositories are not rendered before the org, and the pipeline retries instead of waiting"""
+  import subresources
+
+  client = FakeSubResourceClient()
+  monkeypatch.setattr(subresources.composite, "sub_resource_client", lambda: client)
+
+  repos: Dict[str, Any] = {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "TeamRepos",
+    "metadata": {"name": "composite-team", "namespace": "default"},
+    "spec": {"id": "team-composite", "name": "Composite Team", "repos": ["docs"]},
+  }
+  assert run_pipeline(subresources.main, repos, tmp_path / "waiting") == {}
+  control: Dict[str, Any] = yaml.safe_load((tmp_path / "waiting" / "metadata" / "workflow-control.yaml").read_text())
+  assert control == {"retryAfter": "15s", "message": "Waiting for organization team-composite"}
+  assert yaml.safe_load((tmp_path / "waiting" / "metadata" / "status.yaml").read_text())["outputs"] == []
+
+  client.statuses["TeamOrg"] = {"teamId": "team-composite"}
+  outputs: Dict[str, str] = run_pipeline(subresources.main, repos, tmp_path / "ready")
+  assert 'username       = gitea_org.team_team-composite.name' in outputs["terraform/repos-team-composite.tf"]
+  assert not (tmp_path / "ready" / "metadata" / "workflow-control.yaml").exists()
+
+  # Renamed before the org caught up: keep the old id's repositories in the Work
+  repos["spec"]["id"] = "team-renamed"
+  repos["status"] = {"teamId": "team-composite", "outputs": ["terraform/repos-team-composite.tf"]}
+  outputs = run_pipeline(subresources.main, repos, tmp_path / "renaming")
+  assert list(outputs) == ["terraform/repos-team-composite.tf"]
+  assert (tmp_path / "renaming" / "metadata" / "workflow-control.yaml").exists()
+
+
+def test_pipeline_mode_is_fixed_once_rendered(tmp_path: Path) -> None:
+  """Test that a rendered team cannot switch pipeline mode"""
+  import configure
+
+  team: Dict[str, Any] = composite_team({"pipelineMode": "composite"})
+  team["status"] = {"teamId": "team-composite"}
+
+  with pytest.raises(ValueError, match="rendered in monolithic mode"):
+    run_pipeline(configure.main, team, tmp_path)
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 
 import os
+import json
 import yaml
 import pytest
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import kratix_sdk as ks
 
@@ -254,3 +255,830 @@ def test_terraform_with_explicit_email(tmp_path: Path) -> None:
 
   # Verify explicit email is used in description
   assert 'description = "Organization for team Terraform Email Test (terraform@company.com)"' in org_content
+
+
+def test_outputs_recorded_in_status(test_data: Dict[str, Any], tmp_path: Path) -> None:
+  """Test that emitted paths and the team id are recorded in the status"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  # Write test team resource to input file
+  input_file: Path = input_dir / "object.yaml"
+  with open(input_file, "w") as f:
+    yaml.dump(test_data["team_resource"], f)
+
+  # Set Kratix SDK directories to use our test directories
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  # Import and run the configure script
+  import configure
+
+  configure.main()
+
+  with open(metadata_dir / "status.yaml", "r") as f:
+    status: Dict[str, Any] = yaml.safe_load(f)
+
+  assert status["teamId"] == "team-test"
+  assert status["outputs"] == ["backstage-team-team-test.yaml", "terraform/org-team-test.tf"]
+  assert status["previousIds"] == []
+  assert status["removedOutputs"] == []
+
+  # No moved blocks for a team that has never been renamed
+  with open(output_dir / "terraform" / "org-team-test.tf", "r") as f:
+    assert "moved {" not in f.read()
+
+
+def test_team_id_change_emits_moved_block(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+  """Test that changing spec.id renames the org and drops the old outputs"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  # Team previously rendered as team-old, now renamed to team-new
+  renamed_team = {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "renamed-team", "namespace": "default"},
+    "spec": {
+      "id": "team-new",
+      "name": "Renamed Team"
+    },
+    "status": {
+      "teamId": "team-old",
+      "outputs": ["backstage-team-team-old.yaml", "terraform/org-team-old.tf"],
+      "previousIds": []
+    }
+  }
+
+  # Write test team resource to input file
+  input_file: Path = input_dir / "object.yaml"
+  with open(input_file, "w") as f:
+    yaml.dump(renamed_team, f)
+
+  # Set Kratix SDK directories to use our test directories
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  # Import and run the configure script
+  import configure
+
+  configure.main()
+
+  # Only the new outputs are written
+  assert not (output_dir / "backstage-team-team-old.yaml").exists()
+  assert not (output_dir / "terraform" / "org-team-old.tf").exists()
+
+  with open(output_dir / "terraform" / "org-team-new.tf", "r") as f:
+    org_content: str = f.read()
+
+  assert "from = gitea_org.team_team-old" in org_content
+  assert "to   = gitea_org.team_team-new" in org_content
+
+  with open(metadata_dir / "status.yaml", "r") as f:
+    status: Dict[str, Any] = yaml.safe_load(f)
+
+  assert status["teamId"] == "team-new"
+  assert status["previousIds"] == ["team-old"]
+  assert status["removedOutputs"] == ["backstage-team-team-old.yaml", "terraform/org-team-old.tf"]
+
+  captured = capsys.readouterr()
+  assert "Team id changed from team-old to team-new" in captured.out
+
+
+def test_team_id_changed_back_drops_moved_chain(tmp_path: Path) -> None:
+  """Test that renaming back to an old id does not move the org from itself"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  renamed_back_team = {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "renamed-back-team", "namespace": "default"},
+    "spec": {
+      "id": "team-a",
+      "name": "Renamed Back Team"
+    },
+    "status": {
+      "teamId": "team-b",
+      "outputs": ["backstage-team-team-b.yaml", "terraform/org-team-b.tf"],
+      "previousIds": ["team-a"]
+    }
+  }
+
+  # Write test team resource to input file
+  input_file: Path = input_dir / "object.yaml"
+  with open(input_file, "w") as f:
+    yaml.dump(renamed_back_team, f)
+
+  # Set Kratix SDK directories to use our test directories
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  # Import and run the configure script
+  import configure
+
+  configure.main()
+
+  with open(output_dir / "terraform" / "org-team-a.tf", "r") as f:
+    org_content: str = f.read()
+
+  assert "from = gitea_org.team_team-b" in org_content
+  assert "from = gitea_org.team_team-a" not in org_content
+
+  with open(metadata_dir / "status.yaml", "r") as f:
+    status: Dict[str, Any] = yaml.safe_load(f)
+
+  assert status["previousIds"] == ["team-b"]
+
+
+def test_delete_action_writes_no_outputs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+  """Test that the delete workflow lists the retired outputs and writes nothing"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  deleted_team = {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "deleted-team", "namespace": "default"},
+    "spec": {
+      "id": "team-deleted",
+      "name": "Deleted Team"
+    },
+    "status": {
+      "teamId": "team-deleted",
+      "outputs": ["backstage-team-team-deleted.yaml", "terraform/org-team-deleted.tf"]
+    }
+  }
+
+  # Write test team resource to input file
+  input_file: Path = input_dir / "object.yaml"
+  with open(input_file, "w") as f:
+    yaml.dump(deleted_team, f)
+
+  # Set Kratix SDK directories to use our test directories
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+  monkeypatch.setenv("KRATIX_WORKFLOW_ACTION", "delete")
+
+  # Import and run the configure script
+  import configure
+
+  configure.main()
+
+  assert list(output_dir.iterdir()) == []
+
+  captured = capsys.readouterr()
+  assert "Deleting team: team-deleted" in captured.out
+  assert "Removing output: terraform/org-team-deleted.tf" in captured.out
+
+
+def test_output_validation_rejects_invalid_backstage_name(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that runtime output validation fails the pipeline on an invalid Group"""
+  import jsonschema
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  # Spaces are not allowed in Backstage entity names
+  invalid_team = {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "invalid-name-team", "namespace": "default"},
+    "spec": {
+      "id": "team with spaces",
+      "name": "Invalid Name Team"
+    }
+  }
+
+  # Write test team resource to input file
+  input_file: Path = input_dir / "object.yaml"
+  with open(input_file, "w") as f:
+    yaml.dump(invalid_team, f)
+
+  # Set Kratix SDK directories to use our test directories
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+  monkeypatch.setenv("VALIDATE_OUTPUTS", "true")
+
+  # Import and run the configure script
+  import configure
+
+  with pytest.raises(jsonschema.ValidationError):
+    configure.main()
+
+  # Nothing is written when validation fails
+  assert list(output_dir.iterdir()) == []
+
+
+def test_work_size_recorded_and_budget_enforced(test_data: Dict[str, Any], tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+  """Test that the projected Work size is reported and the budget is enforced"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  # Write test team resource to input file
+  input_file: Path = input_dir / "object.yaml"
+  with open(input_file, "w") as f:
+    yaml.dump(test_data["team_resource"], f)
+
+  # Set Kratix SDK directories to use our test directories
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  # Import and run the configure script
+  import configure
+
+  configure.main()
+
+  with open(metadata_dir / "status.yaml", "r") as f:
+    status: Dict[str, Any] = yaml.safe_load(f)
+
+  work_size: int = status["workSizeBytes"]
+  assert work_size > 0
+  assert work_size == configure.projected_work_size(output_dir, status["outputs"])
+
+  captured = capsys.readouterr()
+  assert f'team_work_size_bytes{{team="team-test"}} {work_size}' in captured.out
+
+  # Close to the budget warns
+  monkeypatch.setenv("WORK_SIZE_BUDGET_BYTES", str(work_size))
+  configure.main()
+  captured = capsys.readouterr()
+  assert "WARNING: Projected Work size" in captured.out
+
+  # Over the budget fails the pipeline
+  monkeypatch.setenv("WORK_SIZE_BUDGET_BYTES", str(work_size - 1))
+  with pytest.raises(RuntimeError, match="exceeds budget"):
+    configure.main()
+
+
+def test_hierarchy_renders_parent_and_children(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+  """Test that parent and children come from the hierarchy index"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+  monkeypatch.setenv("HIERARCHY_INDEX_PATH", str(tmp_path / "hierarchy.json"))
+
+  import configure
+
+  def configure_team(team_id: str, parent: str = "") -> Dict[str, Any]:
+    team: Dict[str, Any] = {
+      "apiVersion": "platform.kratix.io/v1alpha1",
+      "kind": "Team",
+      "metadata": {"name": team_id, "namespace": "default"},
+      "spec": {"id": team_id, "name": team_id.title()}
+    }
+    if parent:
+      team["spec"]["parent"] = parent
+    with open(input_dir / "object.yaml", "w") as f:
+      yaml.dump(team, f)
+    configure.main()
+    with open(output_dir / f"backstage-team-{team_id}.yaml", "r") as f:
+      return yaml.safe_load(f)
+
+  assert configure_team("platform")["spec"]["children"] == []
+
+  child: Dict[str, Any] = configure_team("payments", parent="platform")
+  assert child["spec"]["parent"] == "platform"
+
+  captured = capsys.readouterr()
+  assert "Parent team platform needs reconciling" in captured.out
+
+  # Reconciling the parent picks up its new child
+  assert configure_team("platform")["spec"]["children"] == ["payments"]
+
+  # A cycle fails the pipeline
+  with pytest.raises(configure.hierarchy.HierarchyError, match="cycle"):
+    configure_team("platform", parent="payments")
+
+
+def test_reused_retired_id_fails_the_team(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that a team cannot take an id another team's moved blocks still start from"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+  monkeypatch.setenv("HIERARCHY_INDEX_PATH", str(tmp_path / "hierarchy.json"))
+
+  import configure
+
+  def run(name: str, team_id: str, status: Optional[Dict[str, Any]] = None) -> None:
+    team: Dict[str, Any] = {
+      "apiVersion": "platform.kratix.io/v1alpha1",
+      "kind": "Team",
+      "metadata": {"name": name, "namespace": "default"},
+      "spec": {"id": team_id, "name": name.title()},
+    }
+    if status:
+      team["status"] = status
+    with open(input_dir / "object.yaml", "w") as f:
+      yaml.dump(team, f)
+    configure.main()
+
+  # alpha renames its org from team-a to team-b, keeping a moved block from team-a
+  run("alpha", "team-b", {"teamId": "team-a", "outputs": ["terraform/org-team-a.tf"]})
+
+  with pytest.raises(configure.hierarchy.RetiredIdError, match="team-a was retired by Team alpha"):
+    run("gamma", "team-a")
+  assert not (output_dir / "terraform" / "org-team-a.tf").exists()
+
+  # Once alpha is deleted its moved blocks are gone and the id is free again
+  monkeypatch.setenv("KRATIX_WORKFLOW_ACTION", "delete")
+  run("alpha", "team-b", {"teamId": "team-b", "previousIds": ["team-a"]})
+  monkeypatch.delenv("KRATIX_WORKFLOW_ACTION")
+  run("gamma", "team-a")
+  assert (output_dir / "terraform" / "org-team-a.tf").exists()
+
+
+def test_members_rendered_per_sync_mode(tmp_path: Path) -> None:
+  """Test that members go into Terraform, or into a membership file in api mode"""
+  import json
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  import configure
+
+  def configure_team(spec: Dict[str, Any], status: Dict[str, Any] = {}) -> str:
+    team: Dict[str, Any] = {
+      "apiVersion": "platform.kratix.io/v1alpha1",
+      "kind": "Team",
+      "metadata": {"name": "members-team", "namespace": "default"},
+      "spec": {"name": "Members Team", "members": ["bob", "alice", "bob"], **spec},
+      "status": status
+    }
+    with open(input_dir / "object.yaml", "w") as f:
+      yaml.dump(team, f)
+    configure.main()
+    with open(output_dir / "terraform" / f"org-{spec['id']}.tf", "r") as f:
+      return f.read()
+
+  org_content: str = configure_team({"id": "team-members"})
+  assert 'resource "gitea_team" "team_team-members_members"' in org_content
+  assert '    "alice",\n    "bob",\n  ]' in org_content
+  assert not (output_dir / "members").exists()
+
+  with open(output_dir / "backstage-team-team-members.yaml", "r") as f:
+    assert yaml.safe_load(f)["spec"]["members"] == ["alice", "bob"]
+
+  # api mode leaves membership to the workflow's diff sync
+  org_content = configure_team({"id": "team-renamed", "membershipSync": "api"}, {"teamId": "team-members"})
+  assert "ignore_changes = [members]" in org_content
+  assert "from = gitea_team.team_team-members_members" in org_content
+  assert "to   = gitea_team.team_team-renamed_members" in org_content
+
+  with open(output_dir / "members" / "team-team-renamed.json", "r") as f:
+    assert json.load(f) == {"org": "team-renamed", "team": "members", "members": ["alice", "bob"]}
+
+  with open(metadata_dir / "status.yaml", "r") as f:
+    assert "members/team-team-renamed.json" in yaml.safe_load(f)["outputs"]
+
+
+def test_api_provisioner_adopts_org_in_terraform(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+  """Test that api mode provisions the org directly and Terraform imports it"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  api_team = {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "api-team", "namespace": "default"},
+    "spec": {"id": "team-api", "name": "API Team", "provisioner": "api"}
+  }
+  with open(input_dir / "object.yaml", "w") as f:
+    yaml.dump(api_team, f)
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  import configure
+
+  reconciled: List[Dict[str, str]] = []
+
+  def reconcile(self: Any, org: Dict[str, str]) -> Any:
+    reconciled.append(org)
+    return 42, "created"
+
+  monkeypatch.setenv("GITEA_TOKEN", "token")
+  monkeypatch.setattr(configure.gitea_provisioner.GiteaOrgProvisioner, "reconcile", reconcile)
+  configure.main()
+
+  assert reconciled[0]["name"] == "team-api"
+  with open(output_dir / "terraform" / "org-team-api.tf", "r") as f:
+    org_content: str = f.read()
+  assert 'resource "gitea_org" "team_team-api"' in org_content
+  assert 'to = gitea_org.team_team-api\n  id = "42"' in org_content
+  assert "Provisioned organization team-api through the Gitea API (created, id 42)" in capsys.readouterr().out
+
+  # Without a token the pipeline falls back to Terraform alone
+  monkeypatch.delenv("GITEA_TOKEN")
+  configure.main()
+  with open(output_dir / "terraform" / "org-team-api.tf", "r") as f:
+    assert "import {" not in f.read()
+  assert "falling back to Terraform" in capsys.readouterr().out
+
+
+def test_default_repos_rendered_and_moved_on_rename(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that default repositories follow the org through a rename"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  repos_team = {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "repos-team", "namespace": "default"},
+    "spec": {"id": "team-renamed", "name": "Repos Team"},
+    "status": {"teamId": "team-repos"}
+  }
+  with open(input_dir / "object.yaml", "w") as f:
+    yaml.dump(repos_team, f)
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  import configure
+
+  monkeypatch.setenv("DEFAULT_TEAM_REPOS", "infra, docs")
+  configure.main()
+
+  with open(output_dir / "terraform" / "repos-team-renamed.tf", "r") as f:
+    repos_content: str = f.read()
+  assert repos_content.index('"team_team-renamed_docs"') < repos_content.index('"team_team-renamed_infra"')
+  assert "from = gitea_repository.team_team-repos_docs\n  to   = gitea_repository.team_team-renamed_docs" in repos_content
+
+  with open(metadata_dir / "status.yaml", "r") as f:
+    status: Dict[str, Any] = yaml.safe_load(f)
+  assert "terraform/repos-team-renamed.tf" in status["outputs"]
+  assert status["pipelineMode"] == "monolithic"
+  assert status["templateVersion"] == configure.template_version()
+
+
+def test_template_version_tracks_renderers_only(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that only renderer modules and templates change the template version"""
+  import shutil
+  import configure
+
+  scripts_dir: Path = tmp_path / "scripts"
+  shutil.copytree(configure.SCRIPTS_DIR, scripts_dir, ignore=shutil.ignore_patterns("__pycache__"))
+  monkeypatch.setattr(configure, "SCRIPTS_DIR", str(scripts_dir))
+  monkeypatch.setattr(configure, "TEMPLATE_DIR", str(scripts_dir / "terraform_templates"))
+  configure.template_version.cache_clear()
+
+  def version_after(path: str) -> str:
+    with open(scripts_dir / path, "a") as f:
+      f.write("\n# edited\n")
+    configure.template_version.cache_clear()
+    return configure.template_version()
+
+  try:
+    base: str = configure.template_version()
+    assert version_after("tracing.py") == base
+    assert version_after("pipeline_gc.py") == base
+    renderer: str = version_after("terraform_data.py")
+    assert renderer != base
+    templated: str = version_after("terraform_templates/moved.tf.template")
+    assert templated != renderer
+
+    # Tools that point TEMPLATE_DIR at a copy (the benchmarks) hash the copy
+    shutil.copytree(scripts_dir / "terraform_templates", tmp_path / "templates")
+    monkeypatch.setattr(configure, "TEMPLATE_DIR", str(tmp_path / "templates"))
+    configure.template_version.cache_clear()
+    assert configure.template_version() == templated
+  finally:
+    configure.template_version.cache_clear()
+
+
+def test_approval_gate_defers_new_teams(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+  """Test that unapproved new teams record a pending condition and render nothing"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  import configure
+
+  def configure_team(annotations: Dict[str, str], status: Dict[str, Any]) -> Dict[str, Any]:
+    team = {
+      "apiVersion": "platform.kratix.io/v1alpha1",
+      "kind": "Team",
+      "metadata": {"name": "gated-team", "namespace": "default", "annotations": annotations},
+      "spec": {"id": "team-gated", "name": "Gated Team"},
+      "status": status
+    }
+    with open(input_dir / "object.yaml", "w") as f:
+      yaml.dump(team, f)
+    configure.main()
+    with open(metadata_dir / "status.yaml", "r") as f:
+      return yaml.safe_load(f)
+
+  monkeypatch.setenv("APPROVAL_REQUIRED", "true")
+  status: Dict[str, Any] = configure_team({}, {})
+  assert list(output_dir.rglob("*.*")) == []
+  assert "teamId" not in status
+  assert status["conditions"][0]["type"] == "Approved"
+  assert status["conditions"][0]["status"] == "False"
+  assert 'team_approval_pending{team="team-gated"} 1' in capsys.readouterr().out
+
+  status = configure_team({"platform.kratix.io/approved-by": "alice"}, status)
+  assert (output_dir / "backstage-team-team-gated.yaml").exists()
+  assert status["conditions"][0]["status"] == "True"
+  assert status["conditions"][0]["message"] == "Approved by alice"
+
+  # Already rendered teams are never held back
+  status = configure_team({}, status)
+  assert status["conditions"][0]["reason"] == "NotRequired"
+  assert (output_dir / "terraform" / "org-team-gated.tf").exists()
+
+
+def test_data_layout_writes_json_fragments(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that the data layout writes escaped JSON instead of HCL and adopts API-created orgs"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  data_team = {
+    "apiVersion": "platform.kratix.io/v1alpha1",
+    "kind": "Team",
+    "metadata": {"name": "data-team", "namespace": "default", "annotations": {"platform.kratix.io/trace-id": "0af7651916cd43dd8448eb211c80319c"}},
+    "spec": {"id": "team-data", "name": 'Data "${team}" Team', "members": ["bob", "alice"], "repos": ["docs"], "provisioner": "api"}
+  }
+  with open(input_dir / "object.yaml", "w") as f:
+    yaml.dump(data_team, f)
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  import configure
+
+  monkeypatch.setenv("TERRAFORM_LAYOUT", "data")
+  monkeypatch.setenv("GITEA_TOKEN", "token")
+  monkeypatch.setattr(configure.gitea_provisioner.GiteaOrgProvisioner, "reconcile", lambda self, org: (42, "created"))
+  configure.main()
+
+  assert not list((output_dir / "terraform").glob("org-*.tf"))
+  with open(output_dir / "terraform" / "teams" / "data-team.json", "r") as f:
+    team: Dict[str, Any] = json.load(f)
+  assert team == {
+    "id": "team-data", "name": 'Data "${team}" Team', "email": "team-data@example.com", "members": ["alice", "bob"], "membership_sync": "terraform",
+    "trace_id": "0af7651916cd43dd8448eb211c80319c",
+  }
+  with open(output_dir / "terraform" / "team-repos" / "data-team.json", "r") as f:
+    assert json.load(f) == {"repos": ["docs"]}
+  with open(output_dir / "terraform" / "adopt-data-team.tf", "r") as f:
+    assert 'to = module.teams.gitea_org.team["data-team"]\n  id = "42"' in f.read()
+
+  with open(metadata_dir / "status.yaml", "r") as f:
+    status: Dict[str, Any] = yaml.safe_load(f)
+  assert status["terraformLayout"] == "data"
+  assert status["outputs"] == [
+    "backstage-team-team-data.yaml", "terraform/teams/data-team.json", "terraform/adopt-data-team.tf", "terraform/team-repos/data-team.json",
+  ]
+
+
+def test_data_layout_moves_hcl_teams_into_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that teams rendered with the hcl layout keep their resources when switched to data"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  import configure
+
+  def configure_team(status: Dict[str, Any]) -> Dict[str, Any]:
+    team = {
+      "apiVersion": "platform.kratix.io/v1alpha1",
+      "kind": "Team",
+      "metadata": {"name": "moving-team", "namespace": "default"},
+      "spec": {"id": "team-moving", "name": "Moving Team", "members": ["alice"], "membershipSync": "api", "repos": ["docs"]},
+      "status": status
+    }
+    with open(input_dir / "object.yaml", "w") as f:
+      yaml.dump(team, f)
+    configure.main()
+    with open(metadata_dir / "status.yaml", "r") as f:
+      return yaml.safe_load(f)
+
+  monkeypatch.setenv("TERRAFORM_LAYOUT", "data")
+  status: Dict[str, Any] = configure_team({"teamId": "team-moving", "outputs": ["terraform/org-team-moving.tf"]})
+
+  with open(output_dir / "terraform" / "adopt-moving-team.tf", "r") as f:
+    adopt_content: str = f.read()
+  assert 'from = gitea_org.team_team-moving\n  to   = module.teams.gitea_org.team["moving-team"]' in adopt_content
+  assert 'to   = module.teams.gitea_team.members_api["moving-team"]' in adopt_content
+  with open(output_dir / "terraform" / "adopt-repos-moving-team.tf", "r") as f:
+    assert 'to   = module.teams.gitea_repository.repo["moving-team/docs"]' in f.read()
+  assert status["hclTeamId"] == "team-moving"
+  assert "terraform/org-team-moving.tf" in status["removedOutputs"]
+
+  # The moved blocks stay after the switch, and going back is refused
+  status = configure_team(status)
+  assert status["hclTeamId"] == "team-moving"
+  assert "terraform/adopt-moving-team.tf" in status["outputs"]
+
+  monkeypatch.setenv("TERRAFORM_LAYOUT", "hcl")
+  with pytest.raises(ValueError, match="cannot switch back to hcl"):
+    configure_team(status)
+
+
+def test_trace_id_propagated_to_outputs_and_spans(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that one trace ID per generation reaches the status, the org Terraform and the exported spans"""
+
+  # Set up temporary directories
+  input_dir: Path = tmp_path / "input"
+  output_dir: Path = tmp_path / "output"
+  metadata_dir: Path = tmp_path / "metadata"
+
+  input_dir.mkdir()
+  output_dir.mkdir()
+  metadata_dir.mkdir()
+
+  ks.set_input_dir(str(input_dir))
+  ks.set_output_dir(str(output_dir))
+  ks.set_metadata_dir(str(metadata_dir))
+
+  import configure
+
+  exported: List[List[Dict[str, Any]]] = []
+  monkeypatch.setattr(configure.tracing, "export", lambda spans: exported.append(spans))
+
+  def configure_team(generation: int) -> str:
+    team = {
+      "apiVersion": "platform.kratix.io/v1alpha1",
+      "kind": "Team",
+      "metadata": {"name": "traced-team", "namespace": "default", "uid": "5678", "generation": generation, "creationTimestamp": "2024-01-01T00:00:00Z"},
+      "spec": {"id": "team-traced", "name": "Traced Team"}
+    }
+    with open(input_dir / "object.yaml", "w") as f:
+      yaml.dump(team, f)
+    configure.main()
+    with open(metadata_dir / "status.yaml", "r") as f:
+      return yaml.safe_load(f)["traceId"]
+
+  trace_id: str = configure_team(1)
+  assert len(trace_id) == 32
+  assert configure_team(1) == trace_id
+  assert configure_team(2) != trace_id
+
+  configure_team(1)
+  with open(output_dir / "terraform" / "org-team-traced.tf", "r") as f:
+    assert f.readline() == f"# trace-id: {trace_id}\n"
+
+  spans: List[Dict[str, Any]] = exported[-1]
+  assert [span["name"] for span in spans] == ["kratix.queue", "pipeline.configure"]
+  assert {span["traceId"] for span in spans} == {trace_id}
+  assert spans[0]["startTimeUnixNano"] == str(1704067200 * 10**9)
+  assert spans[0]["endTimeUnixNano"] == spans[1]["startTimeUnixNano"]
+
+
+def test_org_trace_id_only_changes_with_the_org(tmp_path: Path) -> None:
+  """Test that a catalog-only change leaves the org Terraform, trace ID included, untouched"""
+  import configure
+
+  def render(generation: int, spec: Dict[str, Any], status: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+    root: Path = tmp_path / f"generation-{generation}"
+    for name in ("input", "output", "metadata"):
+      (root / name).mkdir(parents=True)
+    team: Dict[str, Any] = {
+      "apiVersion": "platform.kratix.io/v1alpha1",
+      "kind": "Team",
+      "metadata": {"name": "traced-team", "namespace": "default", "uid": "5678", "generation": generation},
+      "spec": spec,
+    }
+    if status:
+      team["status"] = status
+    with open(root / "input" / "object.yaml", "w") as f:
+      yaml.dump(team, f)
+    ks.set_input_dir(str(root / "input"))
+    ks.set_output_dir(str(root / "output"))
+    ks.set_metadata_dir(str(root / "metadata"))
+    configure.main()
+    with open(root / "metadata" / "status.yaml", "r") as f:
+      return yaml.safe_load(f), (root / "output" / "terraform" / "org-team-traced.tf").read_text()
+
+  first, org = render(1, {"id": "team-traced", "name": "Traced Team"}, None)
+  assert first["infraTraceId"] == first["traceId"]
+
+  reparented, reparented_org = render(2, {"id": "team-traced", "name": "Traced Team", "parent": "platform"}, first)
+  assert reparented["traceId"] != first["traceId"]
+  assert reparented_org == org
+  assert reparented["infraTraceId"] == first["traceId"]
+
+  renamed, renamed_org = render(3, {"id": "team-traced", "name": "Renamed Team", "parent": "platform"}, reparented)
+  assert renamed["infraTraceId"] == renamed["traceId"] != first["traceId"]
+  assert renamed_org.startswith(f"# trace-id: {renamed['traceId']}\n")
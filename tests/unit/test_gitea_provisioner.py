@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import pytest
+from typing import Dict, Any, List, Optional, Tuple
+
+from gitea_provisioner import GiteaOrgProvisioner, GiteaApiError, org_definition
+
+
+class FakeGitea(GiteaOrgProvisioner):
+  """Provisioner whose HTTP requests are served from an in-memory org table"""
+
+  def __init__(self, orgs: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    super().__init__("http://gitea.test", "token")
+    self.orgs: Dict[str, Dict[str, Any]] = orgs or {}
+    self.calls: List[Tuple[str, str]] = []
+
+  def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+    self.calls.append((method, path))
+    if method == "POST":
+      org = {"id": len(self.orgs) + 1, **body}
+      self.orgs[body["username"]] = org
+      return org
+    name: str = path.rsplit("/", 1)[1]
+    if name not in self.orgs:
+      raise GiteaApiError(404, "not found")
+    if method == "PATCH":
+      self.orgs[name].update(body)
+    return self.orgs[name]
+
+
+def test_reconcile_is_idempotent() -> None:
+  """Test that the org is created once, then left alone until it drifts"""
+  gitea = FakeGitea()
+  org: Dict[str, str] = org_definition("alpha", "Team Alpha", "alpha@example.com")
+
+  assert gitea.reconcile(org) == (1, "created")
+  assert gitea.reconcile(org) == (1, "unchanged")
+  assert gitea.calls == [("GET", "/orgs/alpha"), ("POST", "/orgs"), ("GET", "/orgs/alpha")]
+
+  gitea.orgs["alpha"]["full_name"] = "Drifted"
+  assert gitea.reconcile(org) == (1, "updated")
+  assert gitea.calls[-1] == ("PATCH", "/orgs/alpha")
+  assert gitea.orgs["alpha"]["full_name"] == "Team Alpha"
+
+
+def test_org_definition_matches_terraform_template() -> None:
+  """Test that the API and Terraform describe the same organization"""
+  import configure
+
+  with open(os.path.join(configure.TEMPLATE_DIR, "organization.tf.template"), "r") as f:
+    template: str = f.read()
+  rendered: str = template.replace("{{team_id}}", "alpha").replace("{{team_name}}", "Team Alpha").replace("{{team_email}}", "alpha@example.com")
+
+  for field, value in org_definition("alpha", "Team Alpha", "alpha@example.com").items():
+    assert re.search(rf'^\s*{field}\s*= "{re.escape(value)}"$', rendered, re.MULTILINE), field
+
+
+def test_from_env_requires_token(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Test that api mode without a token is reported rather than guessed"""
+  monkeypatch.delenv("GITEA_TOKEN", raising=False)
+  with pytest.raises(ValueError, match="GITEA_TOKEN"):
+    GiteaOrgProvisioner.from_env()
+
+  monkeypatch.setenv("GITEA_TOKEN", "token")
+  monkeypatch.setenv("GITEA_INSECURE_SKIP_VERIFY", "true")
+  assert GiteaOrgProvisioner.from_env().context is not None
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import pytest
+from typing import Dict
+
+from hierarchy import HierarchyIndex, HierarchyError, RetiredIdError, FileIndexStore
+
+
+def chain(length: int) -> Dict[str, str]:
+  """Parents for a straight line of teams t0 <- t1 <- ... <- t{length-1}"""
+  return {f"t{i}": f"t{i - 1}" for i in range(1, length)}
+
+
+def test_set_parent_returns_affected_parents() -> None:
+  """Test that moving a team reports both the old and new parent"""
+  index = HierarchyIndex()
+
+  assert index.set_parent("a", "root", "a") == {"root"}
+  assert index.set_parent("a", "root", "a") == set()
+  assert index.set_parent("a", "other", "a") == {"root", "other"}
+
+  assert index.children_of("root") == []
+  assert index.children_of("other") == ["a"]
+  assert index.remove("a") == {"other"}
+  assert index.children_of("other") == []
+
+
+def test_cycles_rejected() -> None:
+  """Test that self-parenting and indirect cycles are rejected"""
+  index = HierarchyIndex(chain(4))
+
+  with pytest.raises(HierarchyError, match="own parent"):
+    index.check_parent("t1", "t1")
+  with pytest.raises(HierarchyError, match="cycle"):
+    index.set_parent("t0", "t3", "t0")
+
+  # The index is left unchanged
+  assert index.parents == chain(4)
+
+
+def test_depth_limit_counts_moved_subtree() -> None:
+  """Test that the depth limit includes the subtree below a moved team"""
+  index = HierarchyIndex(chain(3))
+  index.set_parent("x1", "x0", "x1")
+
+  # x0 -> x1 under t2 would put x1 at depth 4
+  index.check_parent("x0", "t2", max_depth=4)
+  with pytest.raises(HierarchyError, match="limit of 3"):
+    index.check_parent("x0", "t2", max_depth=3)
+
+
+def test_retired_ids_are_refused_to_other_teams() -> None:
+  """Test that a retired id stays with the team that retired it until that team lets it go"""
+  index = HierarchyIndex()
+  index.claim_id("b", "team-a", ["a"])
+
+  with pytest.raises(RetiredIdError, match="retired by Team team-a"):
+    index.claim_id("a", "team-c", [])
+
+  # Renaming back takes the id again and retires the other one
+  index.claim_id("a", "team-a", ["b"])
+  assert index.retired == {"b": "team-a"}
+  assert HierarchyIndex.from_dict(index.to_dict()).retired == {"b": "team-a"}
+
+  index.release("team-a")
+  index.claim_id("b", "team-c", [])
+  assert "retired" not in index.to_dict()
+
+
+def test_file_store_round_trips(tmp_path) -> None:
+  """Test that the file store persists updates between runs"""
+  store = FileIndexStore(str(tmp_path / "index.json"))
+
+  store.update(lambda index: index.set_parent("a", "root", "team-a"))
+  index, affected = store.update(lambda index: index.set_parent("b", "root", "team-b"))
+
+  assert affected == {"root"}
+  assert index.children_of("root") == ["a", "b"]
+  assert index.names == {"a": "team-a", "b": "team-b"}
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List
+
+
+def job(name: str, resource: str, created: str, state: str, finished: str = "2024-01-10T00:00:00Z", pipeline: str = "team-configure") -> Dict[str, Any]:
+  conditions: List[Dict[str, str]] = []
+  if state != "running":
+    conditions.append({"type": "Complete" if state == "succeeded" else "Failed", "status": "True", "lastTransitionTime": finished})
+  return {
+    "metadata": {
+      "name": name,
+      "creationTimestamp": created,
+      "labels": {"kratix.io/promise-name": "team", "kratix.io/resource-name": resource, "kratix.io/pipeline-name": pipeline},
+    },
+    "status": {"conditions": conditions},
+  }
+
+
+def test_retention_keeps_newest_runs_and_recent_failures() -> None:
+  """Test that old succeeded runs and expired failures are deleted per resource and pipeline"""
+  import pipeline_gc
+
+  jobs: List[Dict[str, Any]] = [
+    job("alpha-1", "alpha", "2024-01-01T00:00:00Z", "succeeded"),
+    job("alpha-2", "alpha", "2024-01-02T00:00:00Z", "failed", finished="2024-01-02T00:01:00Z"),
+    job("alpha-3", "alpha", "2024-01-03T00:00:00Z", "succeeded"),
+    job("alpha-4", "alpha", "2024-01-04T00:00:00Z", "succeeded"),
+    job("alpha-5", "alpha", "2024-01-05T00:00:00Z", "failed", finished="2024-01-09T12:00:00Z"),
+    job("alpha-6", "alpha", "2024-01-06T00:00:00Z", "running"),
+    job("alpha-delete", "alpha", "2023-12-01T00:00:00Z", "succeeded", pipeline="team-delete"),
+    job("beta-1", "beta", "2024-01-01T00:00:00Z", "succeeded"),
+  ]
+  now: datetime = datetime(2024, 1, 10, tzinfo=timezone.utc)
+
+  deletions = pipeline_gc.plan_deletions(jobs, keep_succeeded=2, failed_ttl=timedelta(hours=24), now=now)
+
+  assert sorted((j["metadata"]["name"], reason) for j, reason in deletions) == [("alpha-1", "retention"), ("alpha-2", "ttl")]
+
+
+def test_orphaned_pods_and_batched_deletes(monkeypatch: Any) -> None:
+  """Test that finished pods without a Job are collected and deletes run in batches"""
+  import pipeline_gc
+
+  pods: List[Dict[str, Any]] = [
+    {"metadata": {"name": "kept", "ownerReferences": [{"kind": "Job", "name": "alpha-3"}]}, "status": {"phase": "Succeeded"}},
+    {"metadata": {"name": "orphan", "ownerReferences": [{"kind": "Job", "name": "alpha-1"}]}, "status": {"phase": "Failed"}},
+    {"metadata": {"name": "running", "ownerReferences": []}, "status": {"phase": "Running"}},
+  ]
+  assert [p["metadata"]["name"] for p in pipeline_gc.orphan_pods(pods, ["alpha-3"])] == ["orphan"]
+
+  sleeps: List[float] = []
+  monkeypatch.setattr(pipeline_gc.time, "sleep", sleeps.append)
+  deleted: List[str] = []
+
+  class NotFound(Exception):
+    status = 404
+
+  def delete(name: str) -> None:
+    if name == "gone":
+      raise NotFound()
+    if name == "broken":
+      raise RuntimeError("HTTP 500")
+    deleted.append(name)
+
+  count, errors = pipeline_gc.delete_in_batches(delete, ["a", "b", "gone", "broken", "c"], batch_size=2, interval=0.5)
+  assert count == 4
+  assert errors == ["broken: HTTP 500"]
+  assert sorted(deleted) == ["a", "b", "c"]
+  assert sleeps == [0.5, 0.5]
+
+  metrics: str = pipeline_gc.metrics_text({("job", "retention"): 3, ("pod", "orphaned"): 1}, 0.8, 0.2, 10)
+  assert 'team_pipeline_gc_reclaimed{kind="job",reason="retention"} 3' in metrics
+  assert 'team_pipeline_gc_list_seconds{phase="after"} 0.2000' in metrics
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""List and approve Teams waiting for approval, in batches.
+
+With APPROVAL_REQUIRED=true on the Team Promise, new Teams record an
+Approved=False condition and are not rendered. Approving a Team sets the
+approved-by annotation and the manual reconciliation label in one patch, so
+Kratix re-runs the configure pipeline and the Team's outputs are written.
+Teams are listed once (paginated) and approvals are patched concurrently.
+
+Usage:
+  python tools/approve_teams.py                                # list pending Teams
+  python tools/approve_teams.py --approve team-a team-b --approver alice
+  python tools/approve_teams.py --all-pending --approver alice --workers 16
+  python tools/approve_teams.py --metrics-file /var/lib/node-exporter/team_approval.prom
+
+Counts by approval state are printed as Prometheus metrics, and written to
+--metrics-file for the node exporter's textfile collector.
+"""
+
+import argparse
+import getpass
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional
+
+import team_api  # puts the pipeline scripts on sys.path
+import approval
+import hierarchy
+
+# Approval states reported as metrics
+STATES = ("pending", "approving", "approved")
+
+
+def classify(team: dict[str, Any]) -> Optional[str]:
+  """Return pending, approving (annotated, not yet re-rendered), approved, or None if not gated."""
+  condition = approval.condition(team)
+  if condition is None or condition.get("reason") == approval.NOT_REQUIRED:
+    return None
+  if condition.get("status") == "True":
+    return "approved"
+  return "approving" if approval.approved_by(team) else "pending"
+
+
+def group_teams(teams: Iterable[dict[str, Any]]) -> dict[str, list[str]]:
+  """Team names by approval state."""
+  groups: dict[str, list[str]] = {state: [] for state in STATES}
+  for team in teams:
+    state = classify(team)
+    if state is not None:
+      groups[state].append(team["metadata"]["name"])
+  for names in groups.values():
+    names.sort()
+  return groups
+
+
+def approval_patch(approver: str) -> dict[str, Any]:
+  return {
+    "metadata": {
+      "annotations": {approval.APPROVED_BY_ANNOTATION: approver},
+      "labels": {hierarchy.MANUAL_RECONCILIATION_LABEL: "true"},
+    }
+  }
+
+
+def approve(api: Any, namespace: str, names: list[str], approver: str, workers: int = 8) -> list[str]:
+  """Approve *names* concurrently and return an error message per failed Team."""
+  body = approval_patch(approver)
+
+  def patch(name: str) -> Optional[str]:
+    try:
+      api.patch_namespaced_custom_object(
+        group=team_api.KRATIX_GROUP,
+        version=team_api.KRATIX_VERSION,
+        namespace=namespace,
+        plural=team_api.TEAM_PLURAL,
+        name=name,
+        body=body,
+      )
+      return None
+    except Exception as e:
+      return f"{name}: {e}"
+
+  with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+    return [error for error in pool.map(patch, names) if error]
+
+
+def metrics_text(groups: dict[str, list[str]]) -> str:
+  lines = [
+    "# HELP team_approval_teams Teams by approval state",
+    "# TYPE team_approval_teams gauge",
+  ]
+  lines += [f'team_approval_teams{{state="{state}"}} {len(groups[state])}' for state in STATES]
+  return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--namespace", default="default", help="Namespace of the Team resources (default: default)")
+  parser.add_argument("--approve", nargs="+", default=[], metavar="TEAM", help="Team resource names to approve")
+  parser.add_argument("--all-pending", action="store_true", help="Approve every pending Team")
+  parser.add_argument("--approver", default=getpass.getuser(), help="Recorded in the approved-by annotation (default: current user)")
+  parser.add_argument("--workers", type=int, default=8, help="Concurrent approval patches (default: 8)")
+  parser.add_argument("--metrics-file", help="Also write the metrics here (Prometheus textfile format)")
+  args = parser.parse_args(argv)
+
+  api = team_api.custom_objects_api()
+  groups = group_teams(team_api.list_teams(api, args.namespace))
+
+  targets = list(groups["pending"]) if args.all_pending else []
+  unknown = [name for name in args.approve if name not in groups["pending"]]
+  targets += [name for name in args.approve if name in groups["pending"] and name not in targets]
+  for name in unknown:
+    print(f"⚠️  {name} is not waiting for approval, skipping")
+
+  errors: list[str] = []
+  if targets:
+    errors = approve(api, args.namespace, targets, args.approver, args.workers)
+    failed = {error.split(":", 1)[0] for error in errors}
+    approved = [name for name in targets if name not in failed]
+    groups["pending"] = [name for name in groups["pending"] if name not in approved]
+    groups["approving"] = sorted(groups["approving"] + approved)
+    print(f"✅ Approved {len(approved)} teams as {args.approver}")
+  elif not args.approve:
+    for name in groups["pending"]:
+      print(f"⏳ {name}")
+    print(f"📋 {len(groups['pending'])} teams waiting for approval")
+
+  for error in errors:
+    print(f"❌ {error}")
+
+  text = metrics_text(groups)
+  print(text, end="")
+  if args.metrics_file:
+    team_api.write_metrics_file(args.metrics_file, text)
+  return 1 if errors else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Bulk-import Team resources from CSV, JSON or YAML.
+
+Teams are validated against the Team CRD schema in promise.yaml, then
+created or updated with server-side apply by a bounded pool of async workers.
+Requests are rate limited client-side and retried with exponential backoff on
+429 (honouring Retry-After) and 5xx responses. Existing Teams are listed once
+up front and unchanged ones are skipped, so a re-run only touches teams whose
+spec changed. Each applied Team gets a fresh platform.kratix.io/trace-id
+annotation, so its provisioning can be followed with tools/trace_report.py.
+
+Usage:
+  python tools/import_teams.py teams.csv
+  python tools/import_teams.py teams.yaml --workers 16 --rate 50
+  cat teams.jsonl | python tools/import_teams.py - --format json --dry-run
+  python tools/import_teams.py teams.csv --validate-only
+
+Records may be full Team manifests or flat rows with ``id``, ``name`` and
+optional ``email`` (and ``resourceName`` to override metadata.name, which
+otherwise defaults to the id).
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import secrets
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+import yaml
+
+import team_api  # puts the pipeline scripts on sys.path
+import schemas
+import tracing
+
+FIELD_MANAGER = "team-import"
+SPEC_FIELDS = ("id", "name", "email")
+
+
+@dataclass
+class ImportStats:
+  """Counters reported as the import progresses."""
+
+  total: int = 0
+  created: int = 0
+  updated: int = 0
+  unchanged: int = 0
+  invalid: int = 0
+  failed: int = 0
+  retries: int = 0
+  started: float = field(default_factory=time.monotonic)
+  errors: list[str] = field(default_factory=list)
+
+  @property
+  def processed(self) -> int:
+    return self.created + self.updated + self.unchanged + self.invalid + self.failed
+
+  def throughput(self) -> float:
+    elapsed = time.monotonic() - self.started
+    return self.processed / elapsed if elapsed > 0 else 0.0
+
+  def summary(self) -> str:
+    return (
+      f"{self.processed}/{self.total} processed "
+      f"(created {self.created}, updated {self.updated}, unchanged {self.unchanged}, "
+      f"invalid {self.invalid}, failed {self.failed}, retries {self.retries}) "
+      f"{self.throughput():.1f} teams/s"
+    )
+
+
+# -- input --------------------------------------------------------------------
+
+def detect_format(path: str) -> str:
+  """Guess the input format from a file extension."""
+  if path.endswith(".csv"):
+    return "csv"
+  if path.endswith((".json", ".jsonl", ".ndjson")):
+    return "json"
+  return "yaml"
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[dict[str, Any]]:
+  """Yield raw records from a CSV, JSON (array or lines) or YAML stream."""
+  if fmt == "csv":
+    for row in csv.DictReader(stream):
+      yield {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+  elif fmt == "json":
+    text = stream.read()
+    if text.lstrip().startswith("["):
+      yield from json.loads(text)
+    else:
+      for line in text.splitlines():
+        if line.strip():
+          yield json.loads(line)
+  else:
+    for doc in yaml.safe_load_all(stream):
+      if isinstance(doc, list):
+        yield from doc
+      elif doc:
+        yield doc
+
+
+def to_team(record: dict[str, Any], namespace: str) -> dict[str, Any]:
+  """Normalise a flat row or a Team manifest into a Team body."""
+  if record.get("kind") == team_api.TEAM_KIND:
+    name = record.get("metadata", {}).get("name") or record.get("spec", {}).get("id")
+    return team_api.team_body(name, dict(record.get("spec", {})), namespace)
+
+  spec = {key: record[key] for key in SPEC_FIELDS if record.get(key)}
+  name = record.get("resourceName") or spec.get("id")
+  return team_api.team_body(name, spec, namespace)
+
+
+def validate_team(team: dict[str, Any]) -> Optional[str]:
+  """Return a validation error message, or None if the Team is valid."""
+  if not team["metadata"]["name"]:
+    return "missing resource name and spec.id"
+  error = next(iter(schemas.team_validator().iter_errors(team)), None)
+  return error.message if error else None
+
+
+# -- rate limiting and retries ------------------------------------------------
+
+class RateLimiter:
+  """Async token bucket allowing *rate* requests per second with a small burst."""
+
+  def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+    self.rate = rate
+    self.capacity = float(burst or max(1, int(rate)))
+    self.tokens = self.capacity
+    self.updated = time.monotonic()
+    self._lock = asyncio.Lock()
+
+  async def acquire(self) -> None:
+    if self.rate <= 0:
+      return
+    async with self._lock:
+      while True:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+          self.tokens -= 1
+          return
+        await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _retry_delay(error: Exception, attempt: int, base_delay: float) -> Optional[float]:
+  """Return how long to wait before retrying *error*, or None if it is fatal."""
+  status = getattr(error, "status", None)
+  if status != 429 and not (isinstance(status, int) and status >= 500):
+    return None
+  headers = getattr(error, "headers", None) or {}
+  retry_after = headers.get("Retry-After") if hasattr(headers, "get") else None
+  if retry_after:
+    try:
+      return float(retry_after)
+    except ValueError:
+      pass
+  return base_delay * (2 ** attempt) * (0.5 + random.random() / 2)
+
+
+async def apply_team(
+  api: Any,
+  team: dict[str, Any],
+  limiter: RateLimiter,
+  stats: ImportStats,
+  max_retries: int = 5,
+  base_delay: float = 0.5,
+) -> None:
+  """Server-side apply *team*, retrying throttled and transient failures."""
+  for attempt in range(max_retries + 1):
+    await limiter.acquire()
+    try:
+      await asyncio.to_thread(
+        api.patch_namespaced_custom_object,
+        group=team_api.KRATIX_GROUP,
+        version=team_api.KRATIX_VERSION,
+        namespace=team["metadata"]["namespace"],
+        plural=team_api.TEAM_PLURAL,
+        name=team["metadata"]["name"],
+        body=team,
+        field_manager=FIELD_MANAGER,
+        force=True,
+        _content_type="application/apply-patch+yaml",
+      )
+      return
+    except Exception as e:
+      delay = _retry_delay(e, attempt, base_delay)
+      if delay is None or attempt == max_retries:
+        raise
+      stats.retries += 1
+      await asyncio.sleep(delay)
+
+
+# -- import -------------------------------------------------------------------
+
+def spec_unchanged(current: dict[str, Any], spec: dict[str, Any]) -> bool:
+  """Whether the fields the import sets match *current*, ignoring server-side defaults."""
+  fields = set(SPEC_FIELDS) | set(spec)
+  return all(current.get(key) == spec.get(key) for key in fields)
+
+
+def plan_import(
+  records: Iterable[dict[str, Any]],
+  existing: dict[str, dict[str, Any]],
+  namespace: str,
+  stats: ImportStats,
+) -> list[tuple[dict[str, Any], bool]]:
+  """Validate records and return (team, is_new) pairs for those needing apply."""
+  pending: list[tuple[dict[str, Any], bool]] = []
+  seen: set[str] = set()
+  for record in records:
+    stats.total += 1
+    team = to_team(record, namespace)
+    name = team["metadata"]["name"]
+
+    error = validate_team(team)
+    if error is None and name in seen:
+      error = "duplicate resource name in input"
+    if error:
+      stats.invalid += 1
+      stats.errors.append(f"{name or '<unnamed>'}: {error}")
+      continue
+    seen.add(name)
+
+    if name in existing and spec_unchanged(existing[name], team["spec"]):
+      stats.unchanged += 1
+      continue
+    # One trace per change, from this apply to the org in Gitea
+    team["metadata"]["annotations"] = {tracing.TRACE_ID_ANNOTATION: secrets.token_hex(16)}
+    pending.append((team, name not in existing))
+  return pending
+
+
+async def import_teams(
+  api: Any,
+  pending: list[tuple[dict[str, Any], bool]],
+  stats: ImportStats,
+  workers: int = 8,
+  rate: float = 20.0,
+  progress_interval: float = 2.0,
+  max_retries: int = 5,
+) -> ImportStats:
+  """Apply *pending* teams with *workers* concurrent requests at most *rate*/s."""
+  limiter = RateLimiter(rate)
+  queue: asyncio.Queue[tuple[dict[str, Any], bool]] = asyncio.Queue()
+  for item in pending:
+    queue.put_nowait(item)
+
+  async def worker() -> None:
+    while True:
+      try:
+        team, is_new = queue.get_nowait()
+      except asyncio.QueueEmpty:
+        return
+      try:
+        await apply_team(api, team, limiter, stats, max_retries=max_retries)
+        if is_new:
+          stats.created += 1
+        else:
+          stats.updated += 1
+      except Exception as e:
+        stats.failed += 1
+        stats.errors.append(f"{team['metadata']['name']}: {e}")
+
+  async def report() -> None:
+    while True:
+      await asyncio.sleep(progress_interval)
+      print(f"⏳ {stats.summary()}", flush=True)
+
+  reporter = asyncio.create_task(report())
+  try:
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+  finally:
+    reporter.cancel()
+  return stats
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("inputs", nargs="+", help="Input files, or - for stdin")
+  parser.add_argument("--format", choices=["csv", "json", "yaml"], help="Input format (default: from file extension)")
+  parser.add_argument("--namespace", default="default", help="Namespace for Team resources (default: default)")
+  parser.add_argument("--workers", type=int, default=8, help="Concurrent apply requests (default: 8)")
+  parser.add_argument("--rate", type=float, default=20.0, help="Max requests per second, 0 for unlimited (default: 20)")
+  parser.add_argument("--max-retries", type=int, default=5, help="Retries per team on 429/5xx (default: 5)")
+  parser.add_argument("--dry-run", action="store_true", help="Validate and diff against the cluster without applying")
+  parser.add_argument("--validate-only", action="store_true", help="Validate the input without contacting the cluster")
+  args = parser.parse_args(argv)
+
+  stats = ImportStats()
+  records: list[dict[str, Any]] = []
+  for path in args.inputs:
+    fmt = args.format or ("yaml" if path == "-" else detect_format(path))
+    if path == "-":
+      records.extend(read_records(sys.stdin, fmt))
+    else:
+      with open(path, "r", newline="") as f:
+        records.extend(read_records(f, fmt))
+
+  api = None if args.validate_only else team_api.custom_objects_api()
+  existing: dict[str, dict[str, Any]] = {}
+  if api is not None:
+    existing = {
+      team["metadata"]["name"]: team.get("spec", {})
+      for team in team_api.list_teams(api, args.namespace)
+    }
+
+  pending = plan_import(records, existing, args.namespace, stats)
+  print(f"📋 {stats.total} teams read, {len(pending)} to apply, {stats.unchanged} unchanged, {stats.invalid} invalid")
+
+  if api is not None and pending and not args.dry_run:
+    asyncio.run(import_teams(
+      api, pending, stats,
+      workers=args.workers,
+      rate=args.rate,
+      max_retries=args.max_retries,
+    ))
+
+  for error in stats.errors:
+    print(f"❌ {error}")
+  print(f"✅ {stats.summary()}")
+  return 1 if stats.failed or stats.invalid else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
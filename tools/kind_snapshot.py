@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Helpers for scripts/cluster-snapshot.sh.
+
+A snapshot is the Kind node container committed as an image, plus a tar of its
+/var volume (etcd, containerd images, local-path PVs holding the Gitea
+database and repositories). Restoring recreates the node with the same docker
+run options Kind used. Those options are read back from the saved
+``docker inspect`` output, so the API server keeps its host port and the node
+keeps its IP and certificates.
+
+Usage:
+  python tools/kind_snapshot.py key                       # snapshot key for the current bootstrap scripts
+  python tools/kind_snapshot.py var-volume node.json      # name of the node's /var volume
+  python tools/kind_snapshot.py run-args node.json IMAGE VOLUME   # docker run arguments, one per line
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Everything stages 1-5 read; editing any of it invalidates existing snapshots
+BOOTSTRAP_INPUTS = [
+  "scripts/01-setup-cluster.sh",
+  "scripts/02-install-kratix.sh",
+  "scripts/03-setup-gitea.sh",
+  "scripts/04-configure-ssh-gitea.sh",
+  "scripts/05-setup-kratix-repo.sh",
+  "scripts/gitea-config.sh",
+  "scripts/setup-gitea-runner.sh",
+  "manifests",
+  "repos/kratix",
+  "runner-config",
+]
+
+
+def snapshot_key(root: Path = PROJECT_ROOT, inputs: list[str] = BOOTSTRAP_INPUTS) -> str:
+  """Short hash over the paths and contents of the bootstrap inputs."""
+  digest = hashlib.sha256()
+  for entry in inputs:
+    path = root / entry
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path] if path.exists() else []
+    for file in files:
+      digest.update(file.relative_to(root).as_posix().encode("utf-8") + b"\0")
+      digest.update(file.read_bytes() + b"\0")
+  return digest.hexdigest()[:12]
+
+
+def var_volume(inspect: dict[str, Any]) -> str:
+  """Name of the volume Kind mounts at /var in the node."""
+  for mount in inspect.get("Mounts", []):
+    if mount.get("Destination") == "/var" and mount.get("Type") == "volume":
+      return mount["Name"]
+  raise ValueError("Node has no /var volume; is this a Kind node?")
+
+
+def run_args(inspect: dict[str, Any], image: str, volume: str) -> list[str]:
+  """docker run arguments recreating the node from *image* with *volume* at /var."""
+  config = inspect.get("Config", {})
+  host = inspect.get("HostConfig", {})
+  args = ["--detach", "--name", inspect["Name"].lstrip("/"), "--hostname", config.get("Hostname", "")]
+
+  for key, value in sorted((config.get("Labels") or {}).items()):
+    args += ["--label", f"{key}={value}"]
+  if config.get("Tty"):
+    args.append("--tty")
+  if config.get("StopSignal"):
+    args += ["--stop-signal", config["StopSignal"]]
+
+  if host.get("Privileged"):
+    args.append("--privileged")
+  for option in host.get("SecurityOpt") or []:
+    args += ["--security-opt", option]
+  if host.get("CgroupnsMode"):
+    args.append(f"--cgroupns={host['CgroupnsMode']}")
+  restart = host.get("RestartPolicy") or {}
+  if restart.get("Name") and restart["Name"] != "no":
+    retries = restart.get("MaximumRetryCount") or 0
+    args += ["--restart", f"{restart['Name']}:{retries}" if restart["Name"] == "on-failure" and retries else restart["Name"]]
+
+  for path, options in sorted((host.get("Tmpfs") or {}).items()):
+    args += ["--tmpfs", f"{path}:{options}" if options else path]
+  for bind in host.get("Binds") or []:
+    args += ["--volume", bind]
+  args += ["--volume", f"{volume}:/var"]
+  for device in host.get("Devices") or []:
+    args += ["--device", f"{device['PathOnHost']}:{device['PathInContainer']}:{device.get('CgroupPermissions', 'rwm')}"]
+
+  network = host.get("NetworkMode") or "kind"
+  args += ["--network", network]
+  address = ((inspect.get("NetworkSettings", {}).get("Networks") or {}).get(network) or {}).get("IPAddress")
+  if address:
+    # The API server certificate and kubeadm config name the node IP
+    args += ["--ip", address]
+
+  for port, bindings in sorted((host.get("PortBindings") or {}).items()):
+    for binding in bindings or []:
+      host_ip = binding.get("HostIp") or ""
+      prefix = f"{host_ip}:" if host_ip else ""
+      args += ["--publish", f"{prefix}{binding.get('HostPort', '')}:{port}"]
+
+  return args + [image]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  commands = parser.add_subparsers(dest="command", required=True)
+  commands.add_parser("key", help="Snapshot key for the current bootstrap inputs")
+  volume_parser = commands.add_parser("var-volume", help="Name of the node's /var volume")
+  volume_parser.add_argument("inspect", type=Path)
+  args_parser = commands.add_parser("run-args", help="docker run arguments, one per line")
+  args_parser.add_argument("inspect", type=Path)
+  args_parser.add_argument("image")
+  args_parser.add_argument("volume")
+  args = parser.parse_args(argv)
+
+  if args.command == "key":
+    print(snapshot_key())
+    return 0
+
+  with open(args.inspect, "r") as f:
+    inspect = json.load(f)
+  # docker inspect prints a list, one entry per container
+  if isinstance(inspect, list):
+    inspect = inspect[0]
+
+  if args.command == "var-volume":
+    print(var_volume(inspect))
+  else:
+    print("\n".join(run_args(inspect, args.image, args.volume)))
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
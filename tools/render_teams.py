@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""Render Team outputs offline and diff them against a previous render.
+
+Runs configure.main() in-process for each Team YAML, with the configure
+pipeline's environment from the Team Promise's promise.yaml. No image build,
+cluster or Work decoding is needed. Cluster-only settings are replaced:
+
+  - The hierarchy index is a local file. Parents are re-rendered when their
+    children change, as Kratix would requeue them.
+  - GITEA_TOKEN is empty, so api-provisioned Teams fall back to Terraform,
+    the same as when the Gitea API is unreachable.
+  - Composite Teams are rendered as monolithic. The sub-resource pipelines
+    write the same files (see tests/unit/test_composite.py).
+  - No trace spans are exported.
+
+Every Team's files and status (without templateVersion and condition
+timestamps) are written to --output/<team>/ and compared with --baseline.
+The first run, or --update, saves the baseline. Without --watch the exit code
+is 1 when the render differs from the baseline.
+
+With --watch the inputs, pipeline code, templates and promise.yaml are
+polled. Only what a change affects is re-rendered:
+
+  Team YAML    the Teams in that file that were added or changed
+  template     the Teams whose last render read that template
+  *.py         every Team, after reloading the pipeline modules
+  promise.yaml every Team, with the new pipeline environment
+
+Statuses carry over between renders as they do between reconciles, so an
+edited spec.id shows its moved blocks.
+
+Usage:
+  python tools/render_teams.py                                # example-resource.yaml and the unit fixture
+  python tools/render_teams.py teams/ --env TERRAFORM_LAYOUT=data
+  python tools/render_teams.py --update                       # accept the current render as the baseline
+  python tools/render_teams.py --watch
+"""
+
+import argparse
+import contextlib
+import copy
+import difflib
+import importlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import yaml
+
+import team_api  # puts the pipeline scripts on sys.path
+
+PROMISE_PATH = team_api.PROJECT_ROOT / "promises" / "team-promise" / "promise.yaml"
+TEMPLATE_DIR = team_api.PIPELINE_SCRIPTS_DIR / "terraform_templates"
+DEFAULT_INPUTS = [
+  team_api.PROJECT_ROOT / "promises" / "team-promise" / "example-resource.yaml",
+  team_api.PROJECT_ROOT / "tests" / "unit" / "fixtures" / "team_resource.yaml",
+]
+DEFAULT_RENDER_DIR = team_api.PROJECT_ROOT / ".render"
+
+# Reloaded in this order, so each module imports the fresh copies of the ones before it
+PIPELINE_MODULES = ["schemas", "hierarchy", "gitea_provisioner", "approval", "terraform_data", "tracing", "composite", "configure"]
+
+# Cluster-only settings and their offline replacements (None unsets)
+OFFLINE_ENV: dict[str, Optional[str]] = {"HIERARCHY_INDEX_CONFIGMAP": None, "GITEA_TOKEN": "", "OTEL_EXPORTER_OTLP_ENDPOINT": ""}
+# Differ on every render; conditions also drop their lastTransitionTime
+VOLATILE_STATUS = ("templateVersion",)
+STATUS_FILE = "status.yaml"
+
+
+class RenderError(Exception):
+  """Raised when the configure pipeline fails for a Team."""
+
+
+def pipeline_env(promise_path: Path = PROMISE_PATH) -> dict[str, Optional[str]]:
+  """The configure pipeline container's env from promise.yaml, made offline."""
+  with open(promise_path, "r") as f:
+    promise = yaml.safe_load(f)
+  container = promise["spec"]["workflows"]["resource"]["configure"][0]["spec"]["containers"][0]
+  env: dict[str, Optional[str]] = {item["name"]: str(item["value"]) for item in container.get("env") or [] if "value" in item}
+  return {**env, **OFFLINE_ENV}
+
+
+def yaml_files(paths: Iterable[Path]) -> list[Path]:
+  files: list[Path] = []
+  for path in paths:
+    if path.is_dir():
+      files += sorted(p for p in path.rglob("*") if p.suffix in (".yaml", ".yml"))
+    else:
+      files.append(path)
+  return files
+
+
+def read_teams(path: Path) -> dict[str, dict[str, Any]]:
+  """Team manifests in a (multi-document) YAML file, by resource name."""
+  with open(path, "r") as f:
+    docs = [doc for doc in yaml.safe_load_all(f) if isinstance(doc, dict)]
+  teams: dict[str, dict[str, Any]] = {}
+  for doc in docs:
+    if doc.get("kind") != team_api.TEAM_KIND:
+      continue
+    team = copy.deepcopy(doc)
+    team["metadata"].setdefault("namespace", "default")
+    team.pop("status", None)
+    if (team.get("spec") or {}).get("pipelineMode") == "composite":
+      team["spec"]["pipelineMode"] = "monolithic"
+    teams[team["metadata"]["name"]] = team
+  return teams
+
+
+@dataclass
+class Render:
+  """One Team's rendered files, status, and the templates the render read."""
+
+  files: dict[str, str]
+  status: dict[str, Any]
+  templates: set[str] = field(default_factory=set)
+  requeued: list[str] = field(default_factory=list)
+  log: str = ""
+
+  def snapshot(self) -> dict[str, str]:
+    status = {key: value for key, value in self.status.items() if key not in VOLATILE_STATUS}
+    if status.get("conditions"):
+      status["conditions"] = [{k: v for k, v in condition.items() if k != "lastTransitionTime"} for condition in status["conditions"]]
+    return {**self.files, STATUS_FILE: yaml.safe_dump(status, sort_keys=True)}
+
+
+# Templates opened by the render in progress; None outside a render. Audit
+# hooks can't be removed, so one hook for the process writes here rather than
+# one per Renderer piling up
+_recording: Optional[set[str]] = None
+_audit_hook_installed = False
+
+
+def _audit(event: str, args: tuple[Any, ...]) -> None:
+  # Records which templates a render opens, so template edits only re-render their Teams
+  if _recording is not None and event == "open" and isinstance(args[0], str) and args[0].startswith(str(TEMPLATE_DIR)):
+    _recording.add(os.path.basename(args[0]))
+
+
+def install_audit_hook() -> None:
+  global _audit_hook_installed
+  if not _audit_hook_installed:
+    sys.addaudithook(_audit)
+    _audit_hook_installed = True
+
+
+class Renderer:
+  """Runs configure.main() in-process, keeping statuses and the hierarchy index between renders."""
+
+  def __init__(self, work_dir: Path, env: dict[str, Optional[str]]) -> None:
+    self.work_dir = work_dir
+    self.env = {**env, "HIERARCHY_INDEX_PATH": str(work_dir / "hierarchy.json")}
+    self.statuses: dict[str, dict[str, Any]] = {}
+    install_audit_hook()
+
+  def reset(self) -> None:
+    self.statuses.clear()
+    (self.work_dir / "hierarchy.json").unlink(missing_ok=True)
+
+  def render(self, team: dict[str, Any]) -> Render:
+    global _recording
+    import configure
+    import kratix_sdk as ks
+
+    name = team["metadata"]["name"]
+    body = {**copy.deepcopy(team), "status": copy.deepcopy(self.statuses.get(name, {}))}
+    with tempfile.TemporaryDirectory(dir=self.work_dir) as tmp:
+      dirs = {d: Path(tmp) / d for d in ("input", "output", "metadata")}
+      for d in dirs.values():
+        d.mkdir()
+      with open(dirs["input"] / "object.yaml", "w") as f:
+        yaml.safe_dump(body, f)
+      ks.set_input_dir(str(dirs["input"]))
+      ks.set_output_dir(str(dirs["output"]))
+      ks.set_metadata_dir(str(dirs["metadata"]))
+
+      env = {**self.env, "KRATIX_WORKFLOW_ACTION": "configure", "KRATIX_WORKFLOW_TYPE": "resource", "KRATIX_PROMISE_NAME": "team"}
+      previous = {key: os.environ.get(key) for key in env}
+      log = io.StringIO()
+      # Hashes every template on first use; read it before recording
+      configure.template_version()
+      templates: set[str] = set()
+      _recording = templates
+      try:
+        set_env(env)
+        with contextlib.redirect_stdout(log):
+          configure.main()
+      except Exception as e:
+        raise RenderError(f"{name}: {type(e).__name__}: {e}\n{log.getvalue()}") from e
+      finally:
+        _recording = None
+        set_env(previous)
+
+      files = {path.relative_to(dirs["output"]).as_posix(): path.read_text() for path in sorted(dirs["output"].rglob("*")) if path.is_file()}
+      status: dict[str, Any] = {}
+      if (dirs["metadata"] / "status.yaml").exists():
+        with open(dirs["metadata"] / "status.yaml", "r") as f:
+          status = yaml.safe_load(f) or {}
+
+    self.statuses[name] = {**self.statuses.get(name, {}), **status}
+    requeued = [line.split()[2] for line in log.getvalue().splitlines() if line.startswith("Parent team ") and "needs reconciling" in line]
+    return Render(files, status, templates, requeued, log.getvalue())
+
+  def render_teams(self, teams: dict[str, dict[str, Any]], names: Iterable[str]) -> tuple[dict[str, Render], dict[str, str]]:
+    """Render *names*, then the parents they requeue; return the renders and the errors."""
+    renders: dict[str, Render] = {}
+    errors: dict[str, str] = {}
+    queue = list(dict.fromkeys(names))
+    # Each Team can be requeued once per Team rendered before it
+    budget = len(queue) + len(teams)
+    while queue and budget > 0:
+      name = queue.pop(0)
+      budget -= 1
+      try:
+        renders[name] = self.render(teams[name])
+      except RenderError as e:
+        errors[name] = str(e)
+        continue
+      queue += [parent for parent in renders[name].requeued if parent in teams and parent not in queue]
+    return renders, errors
+
+
+def set_env(env: dict[str, Optional[str]]) -> None:
+  for key, value in env.items():
+    if value is None:
+      os.environ.pop(key, None)
+    else:
+      os.environ[key] = value
+
+
+def reload_pipeline() -> None:
+  for name in PIPELINE_MODULES:
+    if name in sys.modules:
+      importlib.reload(sys.modules[name])
+
+
+# -- snapshots and diffs ------------------------------------------------------
+
+def read_snapshots(directory: Path) -> dict[str, dict[str, str]]:
+  """{team: {path: content}} from a render directory."""
+  if not directory.is_dir():
+    return {}
+  return {
+    team.name: {path.relative_to(team).as_posix(): path.read_text() for path in sorted(team.rglob("*")) if path.is_file()}
+    for team in sorted(directory.iterdir()) if team.is_dir()
+  }
+
+
+def write_snapshots(directory: Path, snapshots: dict[str, dict[str, str]], teams: Optional[Iterable[str]] = None) -> None:
+  """Write *snapshots* under *directory*, replacing only *teams* (all when None)."""
+  if teams is None:
+    shutil.rmtree(directory, ignore_errors=True)
+    teams = snapshots
+  for team in teams:
+    shutil.rmtree(directory / team, ignore_errors=True)
+    for path, content in (snapshots.get(team) or {}).items():
+      target = directory / team / path
+      target.parent.mkdir(parents=True, exist_ok=True)
+      target.write_text(content)
+
+
+def diff(old: dict[str, dict[str, str]], new: dict[str, dict[str, str]], teams: Optional[Iterable[str]] = None) -> list[str]:
+  """Unified diff lines between two sets of snapshots, for *teams* (all when None)."""
+  lines: list[str] = []
+  for team in sorted(teams if teams is not None else set(old) | set(new)):
+    before, after = old.get(team, {}), new.get(team, {})
+    for path in sorted(set(before) | set(after)):
+      if before.get(path) == after.get(path):
+        continue
+      lines += difflib.unified_diff(
+        (before.get(path) or "").splitlines(keepends=True), (after.get(path) or "").splitlines(keepends=True),
+        fromfile=f"a/{team}/{path}" if path in before else "/dev/null", tofile=f"b/{team}/{path}" if path in after else "/dev/null",
+      )
+  return [line if line.endswith("\n") else line + "\n" for line in lines]
+
+
+# -- watch --------------------------------------------------------------------
+
+def mtimes(paths: Iterable[Path]) -> dict[Path, float]:
+  stamps: dict[Path, float] = {}
+  for path in paths:
+    with contextlib.suppress(OSError):
+      stamps[path] = path.stat().st_mtime_ns
+  return stamps
+
+
+def watched_paths(inputs: list[Path]) -> list[Path]:
+  return [
+    *yaml_files(inputs),
+    *sorted(team_api.PIPELINE_SCRIPTS_DIR.glob("*.py")),
+    *sorted(TEMPLATE_DIR.glob("*")),
+    PROMISE_PATH,
+  ]
+
+
+def changed(before: dict[Path, float], after: dict[Path, float]) -> set[Path]:
+  return {path for path in set(before) | set(after) if before.get(path) != after.get(path)}
+
+
+def plan_rerender(paths: set[Path], sources: dict[Path, dict[str, dict[str, Any]]], renders: dict[str, Render]) -> tuple[str, set[str]]:
+  """What a set of changed files requires: "all", or "teams" with the Teams to re-render."""
+  if PROMISE_PATH in paths or any(path.suffix == ".py" for path in paths):
+    return "all", set()
+  names: set[str] = set()
+  for path in paths:
+    if path.parent == TEMPLATE_DIR:
+      names |= {name for name, render in renders.items() if path.name in render.templates}
+    elif path in sources:
+      fresh = read_teams(path) if path.exists() else {}
+      names |= {name for name, team in fresh.items() if sources[path].get(name) != team}
+      names |= set(sources[path]) - set(fresh)
+  return "teams", names
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("inputs", nargs="*", type=Path, default=DEFAULT_INPUTS, help="Team YAML files or directories")
+  parser.add_argument("--output", type=Path, default=DEFAULT_RENDER_DIR / "current", help="Where this render is written")
+  parser.add_argument("--baseline", type=Path, default=DEFAULT_RENDER_DIR / "baseline", help="Previous render to diff against")
+  parser.add_argument("--update", action="store_true", help="Save this render as the baseline")
+  parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Override a pipeline env var, e.g. TERRAFORM_LAYOUT=data")
+  parser.add_argument("--watch", action="store_true", help="Re-render on changes until interrupted")
+  parser.add_argument("--interval", type=float, default=0.2, help="Seconds between polls in watch mode (default: 0.2)")
+  args = parser.parse_args(argv)
+
+  overrides = dict(item.split("=", 1) for item in args.env)
+
+  def load_sources() -> dict[Path, dict[str, dict[str, Any]]]:
+    return {path: read_teams(path) for path in yaml_files(args.inputs)}
+
+  def merged(sources: dict[Path, dict[str, dict[str, Any]]]) -> dict[str, dict[str, Any]]:
+    return {name: team for teams in sources.values() for name, team in teams.items()}
+
+  with tempfile.TemporaryDirectory() as work_dir:
+    renderer = Renderer(Path(work_dir), {**pipeline_env(), **overrides})
+    sources = load_sources()
+    teams = merged(sources)
+
+    start = time.perf_counter()
+    renders, errors = renderer.render_teams(teams, sorted(teams))
+    snapshots = {name: render.snapshot() for name, render in renders.items()}
+    write_snapshots(args.output, snapshots)
+    print(f"🧩 Rendered {len(renders)} teams in {(time.perf_counter() - start) * 1000:.0f}ms into {args.output}")
+    for error in errors.values():
+      print(f"❌ {error}", file=sys.stderr)
+
+    baseline = read_snapshots(args.baseline)
+    if args.update or not args.baseline.is_dir():
+      write_snapshots(args.baseline, snapshots)
+      baseline = copy.deepcopy(snapshots)
+      print(f"📌 Saved the baseline in {args.baseline}")
+    lines = diff(baseline, snapshots)
+    sys.stdout.writelines(lines)
+    print(f"📋 {'No differences' if not lines else 'Differs'} from the baseline")
+    if not args.watch:
+      return 1 if lines or errors else 0
+
+    stamps = mtimes(watched_paths(args.inputs))
+    print(f"👀 Watching {len(stamps)} files; Ctrl-C to stop")
+    try:
+      while True:
+        time.sleep(args.interval)
+        current = mtimes(watched_paths(args.inputs))
+        paths = changed(stamps, current)
+        stamps = current
+        if not paths:
+          continue
+
+        start = time.perf_counter()
+        scope, names = plan_rerender(paths, sources, renders)
+        if scope == "all":
+          reload_pipeline()
+          renderer.env = {**renderer.env, **pipeline_env(), **overrides}
+          renderer.reset()
+        sources = load_sources()
+        teams = merged(sources)
+        names = set(teams) if scope == "all" else names
+        removed = {name for name in names | set(snapshots) if name not in teams}
+        fresh, errors = renderer.render_teams(teams, sorted(names - removed))
+        for name in removed:
+          renders.pop(name, None)
+          snapshots.pop(name, None)
+          renderer.statuses.pop(name, None)
+        renders.update(fresh)
+        snapshots.update({name: render.snapshot() for name, render in fresh.items()})
+        write_snapshots(args.output, snapshots, set(fresh) | removed)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n⚡ {', '.join(sorted(p.name for p in paths))}: re-rendered {len(fresh)} teams in {elapsed:.0f}ms")
+        for error in errors.values():
+          print(f"❌ {error}", file=sys.stderr)
+        lines = diff(baseline, snapshots, set(fresh) | removed)
+        sys.stdout.writelines(lines)
+        print(f"📋 {'No differences' if not lines else 'Differs'} from the baseline", flush=True)
+    except KeyboardInterrupt:
+      return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Re-render the Team fleet in waves after a template change.
+
+The configure pipeline stamps status.templateVersion with a hash of its
+templates and renderer modules (configure.template_version()). Once a new pipeline image
+is loaded, this tool re-reconciles the Teams rendered with an older version in
+waves: a canary wave first, then waves that double from --wave-size up to
+--max-wave-size. A wave sets the manual reconciliation label on its Teams.
+It is done once each Team reports the new version, its pipeline pod has
+failed, or --wave-timeout has passed. A composite Team counts once all its
+sub-resources report the new version too. Teams awaiting approval are left
+out; they render with the current templates once approved.
+
+The rollout pauses (exit code 2) when:
+- a wave's failure rate exceeds --max-failure-rate;
+- with --gitea-url, a deploy workflow run fails;
+- with --gitea-url, the median deploy duration since the rollout started
+  exceeds --max-deploy-slowdown times the median before it.
+Progress is kept in the Teams' status, so running the tool again resumes
+where it stopped.
+
+Usage:
+  python tools/rollout_teams.py                                   # Teams per template version
+  python tools/rollout_teams.py --rollout --canary 2 --wave-size 10 --max-wave-size 100
+  GITEA_TOKEN=... python tools/rollout_teams.py --rollout --gitea-url http://localhost:8080 \\
+    --metrics-file /var/lib/node-exporter/team_rollout.prom
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+import team_api  # puts the pipeline scripts on sys.path
+import approval
+import composite
+import configure
+import gitea_provisioner
+import hierarchy
+
+RESOURCE_NAME_LABEL = "kratix.io/resource-name"
+DEPLOY_WORKFLOW = "deploy-organizations.yml"
+
+
+@dataclass
+class RolloutStats:
+  """Fleet progress reported after every wave."""
+
+  total: int = 0
+  current: int = 0
+  rendered: int = 0
+  failed: list[str] = field(default_factory=list)
+  waves: int = 0
+  paused: Optional[str] = None
+  started: float = field(default_factory=time.monotonic)
+
+  def throughput(self) -> float:
+    """Teams re-rendered per minute since the rollout started."""
+    elapsed = time.monotonic() - self.started
+    return self.rendered * 60 / elapsed if elapsed > 0 else 0.0
+
+
+def rendered_version(team: dict[str, Any], sub_resources: dict[str, dict[str, Any]]) -> Optional[str]:
+  """Template version of the Team's outputs; None while a composite Team's sub-resources lag behind."""
+  status = team.get("status") or {}
+  version = status.get("templateVersion")
+  for reference in status.get("subResources") or []:
+    if ((sub_resources.get(reference) or {}).get("status") or {}).get("templateVersion") != version:
+      return None
+  return version
+
+
+def list_sub_resources(api: Any, namespace: str) -> dict[str, dict[str, Any]]:
+  """Every TeamOrg, TeamCatalogEntry and TeamRepos keyed "Kind/name", as in status.subResources."""
+  return {
+    f"{kind}/{body['metadata']['name']}": body
+    for kind, plural in composite.SUB_RESOURCES.items()
+    for body in team_api.list_objects(api, plural, namespace)
+  }
+
+
+def awaiting_approval(team: dict[str, Any]) -> bool:
+  """Whether the approval gate holds the Team; it renders nothing, so has no version to catch up on."""
+  condition = approval.condition(team)
+  return bool(condition and condition.get("status") == "False")
+
+
+def fleet_versions(api: Any, namespace: str) -> dict[str, Optional[str]]:
+  """Rendered template version per Team name, leaving out Teams awaiting approval."""
+  teams = [team for team in team_api.list_teams(api, namespace) if not awaiting_approval(team)]
+  sub_resources: dict[str, dict[str, Any]] = {}
+  if any((team.get("status") or {}).get("subResources") for team in teams):
+    sub_resources = list_sub_resources(api, namespace)
+  return {team["metadata"]["name"]: rendered_version(team, sub_resources) for team in teams}
+
+
+def plan_waves(names: list[str], canary: int, wave_size: int, max_wave_size: int) -> list[list[str]]:
+  """Split *names* into a canary wave followed by waves doubling from *wave_size* up to *max_wave_size*."""
+  waves = [names[:canary]] if canary > 0 else []
+  remaining = names[max(canary, 0):]
+  size = max(1, wave_size)
+  while remaining:
+    waves.append(remaining[:size])
+    remaining = remaining[size:]
+    size = min(size * 2, max(max_wave_size, wave_size))
+  return [wave for wave in waves if wave]
+
+
+def failed_pipelines(core: Any, namespace: str, since: datetime) -> set[str]:
+  """Names of resources whose pipeline pod failed after *since*."""
+  pods = core.list_namespaced_pod(namespace, label_selector=RESOURCE_NAME_LABEL)
+  return {
+    pod.metadata.labels[RESOURCE_NAME_LABEL]
+    for pod in pods.items
+    if pod.status.phase == "Failed" and pod.metadata.creation_timestamp >= since
+  }
+
+
+def reconcile(api: Any, namespace: str, names: list[str], workers: int = 8) -> list[str]:
+  """Set the manual reconciliation label on *names* concurrently; return an error per failed Team."""
+  body = {"metadata": {"labels": {hierarchy.MANUAL_RECONCILIATION_LABEL: "true"}}}
+
+  def patch(name: str) -> Optional[str]:
+    try:
+      api.patch_namespaced_custom_object(
+        group=team_api.KRATIX_GROUP,
+        version=team_api.KRATIX_VERSION,
+        namespace=namespace,
+        plural=team_api.TEAM_PLURAL,
+        name=name,
+        body=body,
+      )
+      return None
+    except Exception as e:
+      return f"{name}: {e}"
+
+  with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+    return [error for error in pool.map(patch, names) if error]
+
+
+class DeployMonitor:
+  """Deploy workflow runs of the kratix repo, read from Gitea's Actions tasks API."""
+
+  def __init__(self, gitea: Any, repository: str = "gitea_admin/kratix", history: int = 20) -> None:
+    self.gitea = gitea
+    self.repository = repository
+    self.history = history
+    self.baseline: Optional[float] = None
+    self.started = datetime.now(timezone.utc)
+
+  def runs(self) -> list[dict[str, Any]]:
+    """Completed deploy runs, newest first."""
+    page = self.gitea.request("GET", f"/repos/{self.repository}/actions/tasks?limit=50") or {}
+    return [
+      run for run in page.get("workflow_runs") or []
+      if run.get("workflow_id") == DEPLOY_WORKFLOW and run.get("status") not in ("running", "waiting", "blocked")
+    ]
+
+  def start(self) -> None:
+    """Record the median deploy duration before the rollout."""
+    self.started = datetime.now(timezone.utc)
+    durations = [duration(run) for run in self.runs()[:self.history] if run.get("status") == "success"]
+    self.baseline = statistics.median(durations) if durations else None
+
+  def check(self, max_slowdown: float) -> Optional[str]:
+    """Return why the rollout should pause, judging deploy runs since it started."""
+    recent = [run for run in self.runs() if parse_time(run["run_started_at"]) >= self.started]
+    failed = [run for run in recent if run.get("status") == "failure"]
+    if failed:
+      return f"deploy run {failed[0].get('run_number')} failed"
+    durations = [duration(run) for run in recent if run.get("status") == "success"]
+    if durations and self.baseline and statistics.median(durations) > self.baseline * max_slowdown:
+      return f"median deploy took {statistics.median(durations):.0f}s, over {max_slowdown}x the {self.baseline:.0f}s baseline"
+    return None
+
+
+def parse_time(value: str) -> datetime:
+  return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def duration(run: dict[str, Any]) -> float:
+  return (parse_time(run["updated_at"]) - parse_time(run["run_started_at"])).total_seconds()
+
+
+def rollout(api: Any, core: Any, namespace: str, target: str, waves: list[list[str]], stats: RolloutStats,
+            wave_timeout: float = 600, poll: float = 5, max_failure_rate: float = 0.0, workers: int = 8,
+            deploys: Optional[DeployMonitor] = None, max_deploy_slowdown: float = 2.0,
+            sleep: Callable[[float], None] = time.sleep, report: Callable[[str], None] = print) -> RolloutStats:
+  """Re-render *waves* one after the other, pausing on failures or deploy regressions."""
+  if deploys:
+    deploys.start()
+
+  for number, wave in enumerate(waves, start=1):
+    since = datetime.now(timezone.utc).replace(microsecond=0)
+    started = time.monotonic()
+    label = f"wave {number}/{len(waves)}"
+    report(f"🌊 {label}: re-rendering {len(wave)} teams")
+    errors = reconcile(api, namespace, wave, workers)
+    for error in errors:
+      report(f"❌ {error}")
+
+    pending = set(wave) - {error.split(":", 1)[0] for error in errors}
+    failed = set(wave) - pending
+    while pending and time.monotonic() - started < wave_timeout:
+      sleep(poll)
+      versions = fleet_versions(api, namespace)
+      done = {name for name in pending if versions.get(name, target) == target}
+      failed |= failed_pipelines(core, namespace, since) & (pending - done)
+      pending -= done | failed
+      stats.rendered += len(done)
+    failed |= pending
+
+    stats.waves += 1
+    stats.failed += sorted(failed)
+    stats.current = sum(1 for version in fleet_versions(api, namespace).values() if version == target)
+    remaining = stats.total - stats.current
+    eta = f", ~{remaining / stats.throughput():.0f} min left" if stats.throughput() and remaining else ""
+    report(f"📈 {stats.current}/{stats.total} teams on {target}, {len(failed)} failed in {label}, {stats.throughput():.1f} teams/min{eta}")
+
+    if len(failed) / len(wave) > max_failure_rate:
+      stats.paused = f"{len(failed)} of {len(wave)} teams failed in {label}: {', '.join(sorted(failed))}"
+    elif deploys:
+      stats.paused = deploys.check(max_deploy_slowdown)
+    if stats.paused:
+      report(f"⏸️  Paused: {stats.paused}")
+      break
+  return stats
+
+
+def metrics_text(stats: RolloutStats, target: str) -> str:
+  lines = [
+    "# HELP team_rollout_teams Teams by template version state",
+    "# TYPE team_rollout_teams gauge",
+    f'team_rollout_teams{{state="current",version="{target}"}} {stats.current}',
+    f'team_rollout_teams{{state="stale",version="{target}"}} {stats.total - stats.current}',
+    "# HELP team_rollout_failed_teams Teams that failed to re-render in this rollout",
+    "# TYPE team_rollout_failed_teams gauge",
+    f"team_rollout_failed_teams {len(stats.failed)}",
+    "# HELP team_rollout_throughput_teams_per_minute Teams re-rendered per minute",
+    "# TYPE team_rollout_throughput_teams_per_minute gauge",
+    f"team_rollout_throughput_teams_per_minute {stats.throughput():.2f}",
+    "# HELP team_rollout_paused Whether the rollout paused on a failure or regression",
+    "# TYPE team_rollout_paused gauge",
+    f"team_rollout_paused {int(stats.paused is not None)}",
+  ]
+  return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--namespace", default="default", help="Namespace of the Team resources (default: default)")
+  parser.add_argument("--target-version", help="Version to roll out (default: the pipeline scripts in this checkout)")
+  parser.add_argument("--rollout", action="store_true", help="Re-render stale Teams; without it only report versions")
+  parser.add_argument("--canary", type=int, default=1, help="Teams in the first wave (default: 1)")
+  parser.add_argument("--wave-size", type=int, default=10, help="Teams in the first wave after the canary (default: 10)")
+  parser.add_argument("--max-wave-size", type=int, default=100, help="Waves double up to this many Teams (default: 100)")
+  parser.add_argument("--wave-timeout", type=float, default=600, help="Seconds to wait for a wave (default: 600)")
+  parser.add_argument("--max-failure-rate", type=float, default=0.0, help="Pause when more of a wave fails (default: 0)")
+  parser.add_argument("--workers", type=int, default=8, help="Concurrent reconcile patches (default: 8)")
+  parser.add_argument("--gitea-url", help="Watch deploy workflow runs through this Gitea (needs GITEA_TOKEN)")
+  parser.add_argument("--max-deploy-slowdown", type=float, default=2.0, help="Pause when the median deploy is this much slower (default: 2.0)")
+  parser.add_argument("--metrics-file", help="Also write the metrics here (Prometheus textfile format)")
+  args = parser.parse_args(argv)
+
+  target = args.target_version or configure.template_version()
+  api = team_api.custom_objects_api()
+  versions = fleet_versions(api, args.namespace)
+  for version, count in sorted(Counter(str(v) for v in versions.values()).items()):
+    print(f"  {version:12s} {count:6d} teams{'  (target)' if version == target else ''}")
+
+  stale = sorted(name for name, version in versions.items() if version != target)
+  stats = RolloutStats(total=len(versions), current=len(versions) - len(stale))
+  if args.rollout and stale:
+    deploys = None
+    if args.gitea_url:
+      deploys = DeployMonitor(gitea_provisioner.GiteaOrgProvisioner(args.gitea_url, os.environ.get("GITEA_TOKEN", "")))
+    waves = plan_waves(stale, args.canary, args.wave_size, args.max_wave_size)
+    print(f"🚀 Rolling out {target} to {len(stale)} teams in {len(waves)} waves, starting with {len(waves[0])} canary teams")
+    rollout(
+      api, team_api.core_v1_api(), args.namespace, target, waves, stats,
+      wave_timeout=args.wave_timeout, max_failure_rate=args.max_failure_rate, workers=args.workers,
+      deploys=deploys, max_deploy_slowdown=args.max_deploy_slowdown,
+    )
+    if not stats.paused:
+      print(f"✅ {stats.current}/{stats.total} teams on {target}")
+  else:
+    print(f"📋 {len(stale)} of {len(versions)} teams not on {target}")
+
+  text = metrics_text(stats, target)
+  print(text, end="")
+  if args.metrics_file:
+    team_api.write_metrics_file(args.metrics_file, text)
+  return 2 if stats.paused else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
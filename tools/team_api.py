@@ -0,0 +1,94 @@
+"""Shared Kubernetes helpers for the Team Promise operator tools.
+
+The tools run from a repository checkout, so the pipeline scripts directory
+(``configure.py``, ``schemas.py``) is put on ``sys.path`` here to share the
+same schema validators and rendering code the pipeline uses.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PIPELINE_SCRIPTS_DIR = (
+  PROJECT_ROOT / "promises" / "team-promise" / "workflows" / "resource"
+  / "configure" / "team-configure" / "python" / "scripts"
+)
+if str(PIPELINE_SCRIPTS_DIR) not in sys.path:
+  sys.path.insert(0, str(PIPELINE_SCRIPTS_DIR))
+
+KRATIX_GROUP = "platform.kratix.io"
+KRATIX_VERSION = "v1alpha1"
+TEAM_PLURAL = "teams"
+TEAM_KIND = "Team"
+
+
+def load_kube_config() -> None:
+  """Load in-cluster config, falling back to the local kubeconfig."""
+  from kubernetes import config
+
+  try:
+    config.load_incluster_config()
+  except config.ConfigException:
+    config.load_kube_config()
+
+
+def custom_objects_api() -> Any:
+  """Return a CustomObjectsApi client for the current kube context."""
+  from kubernetes import client
+
+  load_kube_config()
+  return client.CustomObjectsApi()
+
+
+def team_body(name: str, spec: dict[str, Any], namespace: str = "default") -> dict[str, Any]:
+  """Build a Team custom resource body."""
+  return {
+    "apiVersion": f"{KRATIX_GROUP}/{KRATIX_VERSION}",
+    "kind": TEAM_KIND,
+    "metadata": {"name": name, "namespace": namespace},
+    "spec": spec,
+  }
+
+
+def core_v1_api() -> Any:
+  """Return a CoreV1Api client for the current kube context."""
+  from kubernetes import client
+
+  load_kube_config()
+  return client.CoreV1Api()
+
+
+def list_teams(api: Any, namespace: str = "default", page_size: int = 500) -> Iterator[dict[str, Any]]:
+  """Yield every Team in *namespace*, following list pagination."""
+  return list_objects(api, TEAM_PLURAL, namespace, page_size)
+
+
+def list_objects(api: Any, plural: str, namespace: str = "default", page_size: int = 500) -> Iterator[dict[str, Any]]:
+  """Yield every platform.kratix.io object of *plural* in *namespace*, following list pagination."""
+  continue_token = None
+  while True:
+    kwargs: dict[str, Any] = {"limit": page_size}
+    if continue_token:
+      kwargs["_continue"] = continue_token
+    page = api.list_namespaced_custom_object(
+      group=KRATIX_GROUP,
+      version=KRATIX_VERSION,
+      namespace=namespace,
+      plural=plural,
+      **kwargs,
+    )
+    yield from page.get("items", [])
+    continue_token = page.get("metadata", {}).get("continue")
+    if not continue_token:
+      return
+
+
+def write_metrics_file(path: str, text: str) -> None:
+  """Write *text* atomically so the textfile collector never reads a partial file."""
+  directory = os.path.dirname(os.path.abspath(path))
+  with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as f:
+    f.write(text)
+  os.replace(f.name, path)
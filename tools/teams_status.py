@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Live status of every Team, from a watch-backed cache of Teams, Works and pipeline pods.
+
+Teams, Works and pipeline pods are each listed once (paginated) and then
+watched, so the cache stays current with three long-lived requests instead of
+one kubectl call per Team. Works and pods are joined to their Team by the
+kratix.io/resource-name label; composite sub-resources share the Team's name,
+so their Works and pods count towards it too. Each Team is shown as:
+
+  pending   no pipeline has run for it yet (or it is waiting for approval)
+  running   a pipeline pod is pending or running
+  written   the last pipeline succeeded and its Work exists
+  failed    the last pipeline pod failed
+
+Reconcile latency is reported as two histograms:
+- first render: Team creation to its first Work
+- pipeline: pod creation to its container finishing
+
+Usage:
+  python tools/teams_status.py                # refresh a table every 2s
+  python tools/teams_status.py --once         # list once and exit
+  python tools/teams_status.py --once --json  # machine-readable, for automation
+  python tools/teams_status.py --json         # one JSON document per line on every refresh
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional
+
+import team_api  # puts the pipeline scripts on sys.path
+import approval
+
+RESOURCE_NAME_LABEL = "kratix.io/resource-name"
+STATES = ("pending", "running", "written", "failed")
+LATENCY_BUCKETS = (1, 2, 5, 10, 30, 60, 120, 300, 600)
+
+
+class Informer:
+  """List once, then watch, keeping the latest copy of every object.
+
+  *list_fn* is a kubernetes client list call; it is passed to Watch.stream as
+  is, so the watch resumes from the list's resourceVersion. A 410 Gone (the
+  version fell out of the watch cache) triggers a fresh list.
+  """
+
+  def __init__(self, list_fn: Callable[..., Any], serialize: Callable[[Any], dict[str, Any]] = lambda obj: obj, page_size: int = 500, **kwargs: Any) -> None:
+    self.list_fn = list_fn
+    self.serialize = serialize
+    self.page_size = page_size
+    self.kwargs = kwargs
+    self.objects: dict[str, dict[str, Any]] = {}
+    self.resource_version: Optional[str] = None
+    self.synced = threading.Event()
+    self.lock = threading.Lock()
+
+  def items(self) -> list[dict[str, Any]]:
+    with self.lock:
+      return list(self.objects.values())
+
+  def relist(self) -> None:
+    objects: dict[str, dict[str, Any]] = {}
+    continue_token = None
+    while True:
+      kwargs = {**self.kwargs, "limit": self.page_size}
+      if continue_token:
+        kwargs["_continue"] = continue_token
+      page = self.serialize(self.list_fn(**kwargs))
+      for item in page.get("items") or []:
+        objects[item["metadata"]["uid"]] = item
+      continue_token = (page.get("metadata") or {}).get("continue")
+      if not continue_token:
+        break
+    with self.lock:
+      self.objects = objects
+      self.resource_version = (page.get("metadata") or {}).get("resourceVersion")
+    self.synced.set()
+
+  def apply(self, event: dict[str, Any]) -> bool:
+    """Apply one watch event to the cache; False once the watch has to be restarted from a fresh list."""
+    obj = self.serialize(event["object"])
+    if event["type"] == "ERROR":
+      if obj.get("code") == 410:
+        self.relist()
+        return False
+      raise RuntimeError(f"Watch error: {obj.get('message')}")
+    with self.lock:
+      if event["type"] == "DELETED":
+        self.objects.pop(obj["metadata"]["uid"], None)
+      else:
+        self.objects[obj["metadata"]["uid"]] = obj
+      self.resource_version = obj["metadata"].get("resourceVersion", self.resource_version)
+    return True
+
+  def run(self, stop: threading.Event, stream: Optional[Callable[..., Iterable[dict[str, Any]]]] = None) -> None:
+    """Keep the cache in sync until *stop* is set."""
+    if stream is None:
+      from kubernetes import watch
+      stream = watch.Watch().stream
+    self.relist()
+    while not stop.is_set():
+      try:
+        for event in stream(self.list_fn, resource_version=self.resource_version, timeout_seconds=60, **self.kwargs):
+          if not self.apply(event) or stop.is_set():
+            break
+      except Exception as e:
+        if getattr(e, "status", None) != 410:
+          print(f"⚠️  Watch interrupted ({e}); relisting", file=sys.stderr)
+          time.sleep(1)
+        self.relist()
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+  return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def pipeline_seconds(pod: dict[str, Any]) -> Optional[float]:
+  """Seconds from the pod's creation to its last container finishing, once it has."""
+  created = parse_time(pod["metadata"].get("creationTimestamp"))
+  finished = [
+    parse_time(((status.get("state") or {}).get("terminated") or {}).get("finishedAt"))
+    for status in (pod.get("status") or {}).get("containerStatuses") or []
+  ]
+  if not created or not finished or None in finished:
+    return None
+  return (max(f for f in finished if f) - created).total_seconds()
+
+
+def by_resource_name(objects: Iterable[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+  grouped: dict[str, list[dict[str, Any]]] = {}
+  for obj in objects:
+    name = (obj["metadata"].get("labels") or {}).get(RESOURCE_NAME_LABEL)
+    if name:
+      grouped.setdefault(name, []).append(obj)
+  for items in grouped.values():
+    items.sort(key=lambda obj: obj["metadata"].get("creationTimestamp") or "")
+  return grouped
+
+
+def team_rows(teams: Iterable[dict[str, Any]], works: Iterable[dict[str, Any]], pods: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+  """One row per Team with its state, Works, last pipeline and latencies."""
+  works_by_team = by_resource_name(works)
+  pods_by_team = by_resource_name(pods)
+  rows: list[dict[str, Any]] = []
+  for team in sorted(teams, key=lambda t: t["metadata"]["name"]):
+    name = team["metadata"]["name"]
+    team_works = works_by_team.get(name, [])
+    team_pods = pods_by_team.get(name, [])
+    last_pod = team_pods[-1] if team_pods else None
+    phase = (last_pod.get("status") or {}).get("phase") if last_pod else None
+
+    if phase in ("Pending", "Running"):
+      state = "running"
+    elif phase == "Failed":
+      state = "failed"
+    elif team_works:
+      state = "written"
+    else:
+      state = "pending"
+
+    first_render = None
+    created = parse_time(team["metadata"].get("creationTimestamp"))
+    first_work = parse_time(team_works[0]["metadata"].get("creationTimestamp")) if team_works else None
+    if created and first_work:
+      first_render = (first_work - created).total_seconds()
+
+    condition = approval.condition(team)
+    rows.append({
+      "name": name,
+      "id": (team.get("status") or {}).get("teamId") or (team.get("spec") or {}).get("id"),
+      "state": state,
+      "awaiting_approval": bool(condition and condition.get("status") == "False"),
+      "works": len(team_works),
+      "pipeline_pods": len(team_pods),
+      "last_pipeline": last_pod["metadata"]["name"] if last_pod else None,
+      "first_render_seconds": first_render,
+      "pipeline_seconds": [s for s in (pipeline_seconds(pod) for pod in team_pods) if s is not None],
+    })
+  return rows
+
+
+def histogram(values: Iterable[float], buckets: tuple[int, ...] = LATENCY_BUCKETS) -> dict[str, int]:
+  """Cumulative counts per upper bound in seconds, as in a Prometheus histogram."""
+  values = list(values)
+  counts = {f"le_{bound}": sum(1 for v in values if v <= bound) for bound in buckets}
+  counts["le_inf"] = len(values)
+  return counts
+
+
+def summary(rows: list[dict[str, Any]]) -> dict[str, Any]:
+  states = Counter(row["state"] for row in rows)
+  return {
+    "teams": len(rows),
+    "states": {state: states.get(state, 0) for state in STATES},
+    "awaiting_approval": sum(1 for row in rows if row["awaiting_approval"]),
+    "first_render_seconds": histogram(row["first_render_seconds"] for row in rows if row["first_render_seconds"] is not None),
+    "pipeline_seconds": histogram(s for row in rows for s in row["pipeline_seconds"]),
+  }
+
+
+def render_table(rows: list[dict[str, Any]], totals: dict[str, Any], limit: int = 50) -> str:
+  """Aggregate counts and histograms, then the first *limit* Teams that aren't written."""
+  lines = [
+    f"📋 {totals['teams']} teams  " + "  ".join(f"{state} {count}" for state, count in totals["states"].items())
+    + (f"  (awaiting approval {totals['awaiting_approval']})" if totals["awaiting_approval"] else ""),
+  ]
+  for key, title in (("first_render_seconds", "first render"), ("pipeline_seconds", "pipeline")):
+    counts = totals[key]
+    if counts["le_inf"]:
+      buckets = "  ".join(f"≤{bound.removeprefix('le_')}s {count}" for bound, count in counts.items() if bound != "le_inf")
+      lines.append(f"⏱️  {title:12s} {buckets}  total {counts['le_inf']}")
+
+  attention = [row for row in rows if row["state"] != "written"]
+  for row in attention[:limit]:
+    lines.append(f"  {row['state']:8s} {row['name']:40s} works {row['works']}  pods {row['pipeline_pods']}  {row['last_pipeline'] or ''}")
+  if len(attention) > limit:
+    lines.append(f"  ... {len(attention) - limit} more")
+  return "\n".join(lines)
+
+
+def informers(namespace: str) -> tuple[Informer, Informer, Informer]:
+  """Informers for Teams, Works and pipeline pods in *namespace*."""
+  from kubernetes import client
+
+  custom = team_api.custom_objects_api()
+  core = client.CoreV1Api()
+  serialize = client.ApiClient().sanitize_for_serialization
+
+  def custom_objects(plural: str, **kwargs: Any) -> Informer:
+    def list_fn(**list_kwargs: Any) -> Any:
+      return custom.list_namespaced_custom_object(team_api.KRATIX_GROUP, team_api.KRATIX_VERSION, namespace, plural, **list_kwargs)
+    return Informer(list_fn, **kwargs)
+
+  def list_pods(**list_kwargs: Any) -> Any:
+    return core.list_namespaced_pod(namespace, **list_kwargs)
+
+  return (
+    custom_objects(team_api.TEAM_PLURAL),
+    custom_objects("works", label_selector=RESOURCE_NAME_LABEL),
+    Informer(list_pods, serialize=serialize, label_selector=RESOURCE_NAME_LABEL),
+  )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--namespace", default="default", help="Namespace of the Team resources (default: default)")
+  parser.add_argument("--once", action="store_true", help="List once and exit instead of watching")
+  parser.add_argument("--json", action="store_true", help="Print JSON (one document per refresh) instead of a table")
+  parser.add_argument("--interval", type=float, default=2.0, help="Seconds between refreshes (default: 2)")
+  parser.add_argument("--limit", type=int, default=50, help="Teams listed individually in the table (default: 50)")
+  args = parser.parse_args(argv)
+
+  caches = informers(args.namespace)
+  stop = threading.Event()
+  if args.once:
+    for cache in caches:
+      cache.relist()
+  else:
+    for cache in caches:
+      threading.Thread(target=cache.run, args=(stop,), daemon=True).start()
+    for cache in caches:
+      cache.synced.wait()
+
+  try:
+    while True:
+      rows = team_rows(*(cache.items() for cache in caches))
+      totals = summary(rows)
+      if args.json:
+        print(json.dumps({"summary": totals, "teams": rows}, indent=None if not args.once else 2), flush=True)
+      else:
+        if not args.once:
+          print("\033[2J\033[H", end="")
+        print(render_table(rows, totals, args.limit), flush=True)
+      if args.once:
+        return 0
+      time.sleep(args.interval)
+  except KeyboardInterrupt:
+    stop.set()
+    return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Local stand-in for an OpenTelemetry collector.
+
+Accepts OTLP/HTTP JSON on POST /v1/traces and appends every span to a JSON
+Lines file, one flattened span per line. tools/trace_report.py reads that
+file. The team-configure pipeline and the deploy workflow export here when
+OTEL_EXPORTER_OTLP_ENDPOINT points at it. Only JSON is accepted: protobuf
+requests get 415, so point a real SDK exporter at a real collector instead.
+
+Usage:
+  python tools/trace_collector.py --port 4318 --output traces.jsonl
+
+Pipeline pods in Kind reach the host through the kind network's gateway,
+e.g. OTEL_EXPORTER_OTLP_ENDPOINT=http://172.18.0.1:4318 (see
+docker network inspect kind). The runner shares the host network, so the
+deploy workflow can use http://localhost:4318.
+"""
+
+import argparse
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+
+def attribute_value(value: dict[str, Any]) -> Any:
+  for kind in ("stringValue", "intValue", "doubleValue", "boolValue"):
+    if kind in value:
+      return value[kind]
+  return None
+
+
+def attributes(items: Optional[list[dict[str, Any]]]) -> dict[str, Any]:
+  return {item["key"]: attribute_value(item.get("value") or {}) for item in items or []}
+
+
+def flatten(request: dict[str, Any]) -> list[dict[str, Any]]:
+  """One record per span of an OTLP ExportTraceServiceRequest."""
+  records: list[dict[str, Any]] = []
+  for resource_spans in request.get("resourceSpans") or []:
+    service = attributes((resource_spans.get("resource") or {}).get("attributes")).get("service.name", "")
+    for scope_spans in resource_spans.get("scopeSpans") or []:
+      for span in scope_spans.get("spans") or []:
+        records.append({
+          "trace_id": span["traceId"],
+          "span_id": span.get("spanId", ""),
+          "parent_span_id": span.get("parentSpanId", ""),
+          "service": service,
+          "name": span["name"],
+          "start": int(span["startTimeUnixNano"]) / 1e9,
+          "end": int(span["endTimeUnixNano"]) / 1e9,
+          "attributes": attributes(span.get("attributes")),
+        })
+  return records
+
+
+class SpanFile:
+  """Appends span records to a JSON Lines file from many request threads."""
+
+  def __init__(self, path: str) -> None:
+    self.path = path
+    self.lock = threading.Lock()
+    self.count = 0
+
+  def append(self, records: list[dict[str, Any]]) -> None:
+    with self.lock:
+      with open(self.path, "a") as f:
+        for record in records:
+          f.write(json.dumps(record, sort_keys=True) + "\n")
+      self.count += len(records)
+
+
+def handler(spans: SpanFile) -> type[BaseHTTPRequestHandler]:
+  class Handler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+      if self.path.rstrip("/") != "/v1/traces":
+        self.send_error(404)
+        return
+      if not (self.headers.get("Content-Type") or "").startswith("application/json"):
+        self.send_error(415, "Only OTLP/HTTP JSON is supported")
+        return
+      try:
+        records = flatten(json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0))))
+      except (ValueError, KeyError, TypeError) as e:
+        self.send_error(400, str(e))
+        return
+      spans.append(records)
+      body = b"{}"
+      self.send_response(200)
+      self.send_header("Content-Type", "application/json")
+      self.send_header("Content-Length", str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+      pass
+
+  return Handler
+
+
+def serve(port: int, output: str, host: str = "0.0.0.0") -> tuple[ThreadingHTTPServer, SpanFile]:
+  """Start the collector in a background thread and return it with its span file."""
+  spans = SpanFile(output)
+  server = ThreadingHTTPServer((host, port), handler(spans))
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return server, spans
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--host", default="0.0.0.0")
+  parser.add_argument("--port", type=int, default=4318, help="OTLP/HTTP port (default: 4318)")
+  parser.add_argument("--output", default="traces.jsonl", help="JSON Lines file spans are appended to")
+  args = parser.parse_args(argv)
+
+  server, spans = serve(args.port, args.output, args.host)
+  print(f"📡 Collecting OTLP/HTTP JSON spans on {args.host}:{server.server_address[1]} into {args.output}")
+  try:
+    threading.Event().wait()
+  except KeyboardInterrupt:
+    server.shutdown()
+    print(f"\n📋 Collected {spans.count} spans")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
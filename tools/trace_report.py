@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Per-team provisioning latency by hop, from the spans tools/trace_collector.py wrote.
+
+Each Team change is one trace (see the tracing module of the team-configure
+pipeline). Its spans are joined into these hops:
+
+  controller   Team change to the first pipeline pod starting (kratix.queue)
+  pipeline     first pipeline start to the last pipeline end; composite Teams
+               include their sub-resources' pipelines
+  commit       pipeline end to the state store commit the deploy picked up
+  deploy_wait  that commit to the deploy workflow run starting
+  plan         terraform plan
+  apply        terraform apply
+  total        Team change to the end of the apply (or of the run, if it had
+               nothing to apply)
+
+Hops whose spans are missing are left out. For example, without
+OTEL_EXPORTER_OTLP_ENDPOINT on the pipelines there is no controller or
+pipeline hop. A trace applied by several runs is reported for the first run.
+Fleet-wide p50/p90/p99 per hop follow the slowest teams.
+
+Usage:
+  python tools/trace_report.py traces.jsonl
+  python tools/trace_report.py traces.jsonl --json
+  python tools/trace_report.py traces.jsonl --trace 0af7651916cd43dd8448eb211c80319c
+"""
+
+import argparse
+import json
+import math
+import sys
+from typing import Any, Iterable, Optional
+
+HOPS = ("controller", "pipeline", "commit", "deploy_wait", "plan", "apply", "total")
+PERCENTILES = (50, 90, 99)
+
+
+def read_spans(path: str) -> dict[str, list[dict[str, Any]]]:
+  """Spans from the collector's JSON Lines file, grouped by trace ID."""
+  traces: dict[str, list[dict[str, Any]]] = {}
+  with open(path, "r") as f:
+    for line in f:
+      if line.strip():
+        span = json.loads(line)
+        traces.setdefault(span["trace_id"], []).append(span)
+  return traces
+
+
+def first(spans: Iterable[dict[str, Any]], name: str, after: float = float("-inf")) -> Optional[dict[str, Any]]:
+  candidates = [span for span in spans if span["name"] == name and span["start"] >= after]
+  return min(candidates, key=lambda span: span["start"]) if candidates else None
+
+
+def breakdown(spans: list[dict[str, Any]]) -> dict[str, Any]:
+  """Hop durations in seconds for one trace, with the team it belongs to."""
+  queues = [span for span in spans if span["name"] == "kratix.queue"]
+  pipelines = [span for span in spans if span["name"].startswith("pipeline.")]
+  deploy_wait = first(spans, "gitops.deploy_wait")
+
+  # Pipelines after the commit belong to a later reconcile of the same change
+  if deploy_wait is not None:
+    pipelines = [span for span in pipelines if span["end"] <= deploy_wait["start"] + 1] or pipelines
+  hops: dict[str, float] = {}
+  changed = min(span["start"] for span in queues) if queues else None
+  pipeline_start = min(span["start"] for span in pipelines) if pipelines else None
+  pipeline_end = max(span["end"] for span in pipelines) if pipelines else None
+
+  if changed is not None and pipeline_start is not None:
+    hops["controller"] = pipeline_start - changed
+  if pipeline_start is not None:
+    hops["pipeline"] = pipeline_end - pipeline_start
+  end: Optional[float] = pipeline_end
+  if deploy_wait is not None:
+    if pipeline_end is not None:
+      # Commit times have a resolution of one second
+      hops["commit"] = max(0.0, deploy_wait["start"] - pipeline_end)
+    hops["deploy_wait"] = deploy_wait["end"] - deploy_wait["start"]
+    workflow = first(spans, "deploy.workflow", deploy_wait["end"])
+    end = workflow["end"] if workflow else deploy_wait["end"]
+    for hop in ("plan", "apply"):
+      span = first(spans, f"deploy.{hop}", deploy_wait["end"])
+      if span is not None:
+        hops[hop] = span["end"] - span["start"]
+        end = max(end, span["end"])
+  start = changed if changed is not None else pipeline_start if pipeline_start is not None else deploy_wait["start"] if deploy_wait else None
+  if start is not None and end is not None:
+    hops["total"] = end - start
+
+  teams = [span["attributes"].get("kratix.resource.name") for span in pipelines if span["attributes"].get("kratix.resource.kind") == "Team"]
+  teams += [span["attributes"].get("kratix.resource.name") for span in pipelines]
+  files = deploy_wait["attributes"].get("deploy.files", "") if deploy_wait else ""
+  return {
+    "team": next((team for team in teams if team), None) or files or "",
+    "hops": {hop: round(hops[hop], 3) for hop in HOPS if hop in hops},
+    "applied": bool(deploy_wait) and "apply" in hops,
+  }
+
+
+def percentile(values: list[float], p: float) -> float:
+  """Nearest-rank percentile."""
+  ordered = sorted(values)
+  return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def fleet_percentiles(breakdowns: Iterable[dict[str, Any]]) -> dict[str, dict[str, float]]:
+  values: dict[str, list[float]] = {hop: [] for hop in HOPS}
+  for row in breakdowns:
+    for hop, seconds in row["hops"].items():
+      values[hop].append(seconds)
+  return {
+    hop: {"count": len(seconds), **{f"p{p}": round(percentile(seconds, p), 3) for p in PERCENTILES}}
+    for hop, seconds in values.items() if seconds
+  }
+
+
+def render(rows: dict[str, dict[str, Any]], fleet: dict[str, dict[str, float]], limit: int) -> str:
+  lines = [f"{'trace':32s}  {'team':30s}  " + "  ".join(f"{hop:>11s}" for hop in HOPS)]
+  slowest = sorted(rows.items(), key=lambda item: item[1]["hops"].get("total", 0.0), reverse=True)
+  for trace, row in slowest[:limit]:
+    cells = "  ".join(f"{row['hops'][hop]:10.1f}s" if hop in row["hops"] else f"{'-':>11s}" for hop in HOPS)
+    lines.append(f"{trace:32s}  {row['team'][:30]:30s}  {cells}")
+  if len(rows) > limit:
+    lines.append(f"... {len(rows) - limit} more")
+
+  lines.append("")
+  lines.append(f"📊 {len(rows)} traces")
+  lines.append(f"   {'hop':12s}" + "".join(f"{'p' + str(p):>10s}" for p in PERCENTILES) + f"{'count':>8s}")
+  for hop, stats in fleet.items():
+    lines.append(f"   {hop:12s}" + "".join(f"{stats[f'p{p}']:9.1f}s" for p in PERCENTILES) + f"{stats['count']:8d}")
+  return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("spans", help="JSON Lines file written by tools/trace_collector.py")
+  parser.add_argument("--trace", action="append", default=[], help="Only report this trace ID (repeatable)")
+  parser.add_argument("--limit", type=int, default=20, help="Slowest traces listed individually (default: 20)")
+  parser.add_argument("--json", action="store_true", help="Print the breakdowns and percentiles as JSON")
+  args = parser.parse_args(argv)
+
+  traces = read_spans(args.spans)
+  if args.trace:
+    traces = {trace: spans for trace, spans in traces.items() if trace in args.trace}
+  rows = {trace: breakdown(spans) for trace, spans in traces.items()}
+  fleet = fleet_percentiles(rows.values())
+
+  if args.json:
+    print(json.dumps({"traces": rows, "percentiles": fleet}, indent=2, sort_keys=True))
+  else:
+    print(render(rows, fleet, args.limit))
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())